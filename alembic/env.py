@@ -3,7 +3,7 @@ from logging.config import fileConfig
 
 from alembic import context
 from app.db.base import Base
-from app.models import user  # noqa
+import app.models  # noqa
 from sqlalchemy import engine_from_config, pool
 
 # this is the Alembic Config object, which provides
@@ -32,6 +32,9 @@ def get_url():
     データベースURLを取得する
     環境変数から取得するか、alembic.iniから取得する
     """
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
     db_user = os.getenv("MYSQL_USER", "political_user")
     password = os.getenv("MYSQL_PASSWORD", "political_password")
     host = os.getenv("MYSQL_HOST", "db")
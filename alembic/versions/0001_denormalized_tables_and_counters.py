@@ -0,0 +1,238 @@
+"""発言の件数カラム・タイムライン・政党別集計・トークンバージョンを追加
+
+create_allで作成した初期スキーマからの差分。既に存在するものは作成しない。
+追加したstatements.*_countはこのマイグレーションの中で発言のID順にバッチで数え直す
+（デプロイ直後から一覧・ソートが正しい件数を使えるようにする）。
+追加したテーブルの中身は次の定期タスクで埋まる。
+- user_timeline: rebuild_timelines
+- party_topic_stats: rebuild_party_topic_stats
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from app.db.migration import (
+    create_index_online,
+    drop_index_online,
+    has_column,
+    has_index,
+    has_table,
+    is_mysql,
+)
+from sqlalchemy.dialects.mysql import CHAR
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+STATEMENT_COUNT_COLUMNS = (
+    "likes_count",
+    "dislikes_count",
+    "agrees_count",
+    "disagrees_count",
+    "important_count",
+    "fake_count",
+    "comments_count",
+)
+
+# 件数カラムとリアクション種別の対応
+REACTION_COUNT_COLUMNS = {
+    "likes_count": "like",
+    "dislikes_count": "dislike",
+    "agrees_count": "agree",
+    "disagrees_count": "disagree",
+    "important_count": "important",
+    "fake_count": "fake",
+}
+
+# 件数を埋める際に1回のUPDATEで扱う発言数
+BACKFILL_BATCH_SIZE = 1000
+
+# 全文検索用のインデックス（MySQLのみ）
+FULLTEXT_INDEXES = (
+    ("ft_statements_title_content", "statements", ("title", "content")),
+    (
+        "ft_politicians_name_profile",
+        "politicians",
+        ("name", "name_kana", "profile_summary"),
+    ),
+    ("ft_topics_name_description", "topics", ("name", "description")),
+)
+
+
+def _count_expression(column: str) -> str:
+    """
+    件数カラムを数え直す相関サブクエリ
+    """
+    if column == "comments_count":
+        return (
+            "(SELECT COUNT(*) FROM comments c WHERE c.statement_id = statements.id "
+            "AND c.status = 'published')"
+        )
+    return (
+        "(SELECT COUNT(*) FROM statement_reactions r "
+        "WHERE r.statement_id = statements.id "
+        f"AND r.reaction_type = '{REACTION_COUNT_COLUMNS[column]}')"
+    )
+
+
+def backfill_statement_counts(columns) -> None:
+    """
+    追加した件数カラムを、発言のID順にバッチで実際の件数に更新する
+
+    1回のUPDATEで扱う行を絞り、大きなテーブルでも長いロックを取らないようにする。
+
+    Args:
+        columns: 数え直すカラム
+    """
+    columns = [
+        column
+        for column in columns
+        if has_table("comments" if column == "comments_count" else "statement_reactions")
+    ]
+    if not columns:
+        return
+    bind = op.get_bind()
+    assignments = ", ".join(f"{column} = {_count_expression(column)}" for column in columns)
+    update = sa.text(
+        f"UPDATE statements SET {assignments} WHERE id IN :ids"
+    ).bindparams(sa.bindparam("ids", expanding=True))
+    select_ids = sa.text(
+        "SELECT id FROM statements WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+    last_id = ""
+    while True:
+        ids = [
+            row[0]
+            for row in bind.execute(
+                select_ids, {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+            )
+        ]
+        if not ids:
+            break
+        bind.execute(update, {"ids": ids})
+        last_id = ids[-1]
+
+
+def upgrade() -> None:
+    added_columns = []
+    for column in STATEMENT_COUNT_COLUMNS:
+        if not has_column("statements", column):
+            op.add_column(
+                "statements",
+                sa.Column(column, sa.Integer(), server_default="0", nullable=False),
+            )
+            added_columns.append(column)
+    backfill_statement_counts(added_columns)
+    create_index_online(
+        "ix_statements_likes_count_id", "statements", ("likes_count", "id")
+    )
+
+    if not has_column("users", "token_version"):
+        op.add_column(
+            "users",
+            sa.Column(
+                "token_version", sa.Integer(), server_default="0", nullable=False
+            ),
+        )
+
+    if not has_table("user_timeline"):
+        op.create_table(
+            "user_timeline",
+            sa.Column(
+                "user_id",
+                CHAR(36),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column(
+                "statement_id",
+                CHAR(36),
+                sa.ForeignKey("statements.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column(
+                "politician_id",
+                CHAR(36),
+                sa.ForeignKey("politicians.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("statement_date", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index(
+            "ix_user_timeline_statement_id", "user_timeline", ["statement_id"]
+        )
+        op.create_index(
+            "ix_user_timeline_user_date",
+            "user_timeline",
+            ["user_id", "statement_date", "statement_id"],
+        )
+        op.create_index(
+            "ix_user_timeline_user_politician",
+            "user_timeline",
+            ["user_id", "politician_id"],
+        )
+
+    if not has_table("party_topic_stats"):
+        op.create_table(
+            "party_topic_stats",
+            sa.Column(
+                "party_id",
+                CHAR(36),
+                sa.ForeignKey("parties.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column(
+                "topic_id",
+                CHAR(36),
+                sa.ForeignKey("topics.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("statement_count", sa.Integer(), nullable=False),
+            sa.Column("last_statement_date", sa.DateTime(), nullable=True),
+            sa.Column("latest_statement_ids", sa.Text(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index(
+            "ix_party_topic_stats_topic_count",
+            "party_topic_stats",
+            ["topic_id", "statement_count"],
+        )
+
+    if is_mysql():
+        for name, table, columns in FULLTEXT_INDEXES:
+            if not has_index(table, name):
+                column_list = ", ".join(f"`{c}`" for c in columns)
+                # FULLTEXTはLOCK=NONEで作成できないため、書き込みのみ待たせる
+                op.execute(
+                    f"ALTER TABLE `{table}` "
+                    f"ADD FULLTEXT INDEX `{name}` ({column_list}) WITH PARSER ngram, "
+                    "ALGORITHM=INPLACE, LOCK=SHARED"
+                )
+
+
+def downgrade() -> None:
+    if is_mysql():
+        for name, table, _ in FULLTEXT_INDEXES:
+            drop_index_online(name, table)
+
+    if has_table("party_topic_stats"):
+        op.drop_table("party_topic_stats")
+    if has_table("user_timeline"):
+        op.drop_table("user_timeline")
+
+    if has_column("users", "token_version"):
+        op.drop_column("users", "token_version")
+
+    drop_index_online("ix_statements_likes_count_id", "statements")
+    with op.batch_alter_table("statements") as batch_op:
+        for column in STATEMENT_COUNT_COLUMNS:
+            if has_column("statements", column):
+                batch_op.drop_column(column)
@@ -0,0 +1,56 @@
+"""一覧系クエリの絞り込み・並び順に合わせた複合インデックスを追加
+
+MySQLではALGORITHM=INPLACE, LOCK=NONEで作成し、作成中も読み書きを止めない。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+"""
+
+from app.db.migration import create_index_online, drop_index_online
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+COMPOSITE_INDEXES = (
+    ("ix_statements_status_date_id", "statements", ("status", "statement_date", "id")),
+    (
+        "ix_statements_politician_status_date_id",
+        "statements",
+        ("politician_id", "status", "statement_date", "id"),
+    ),
+    (
+        "ix_comments_statement_parent_status_created",
+        "comments",
+        ("statement_id", "parent_id", "status", "created_at"),
+    ),
+    (
+        "ix_user_activities_user_type_target_created",
+        "user_activities",
+        ("user_id", "activity_type", "target_type", "created_at"),
+    ),
+    (
+        "ix_notifications_user_read_created",
+        "notifications",
+        ("user_id", "is_read", "created_at"),
+    ),
+    (
+        "ix_statement_reactions_user_type_created",
+        "statement_reactions",
+        ("user_id", "reaction_type", "created_at"),
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in COMPOSITE_INDEXES:
+        create_index_online(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(COMPOSITE_INDEXES):
+        drop_index_online(name, table)
@@ -0,0 +1,91 @@
+"""データ収集ソースの差分収集用の状態を追加
+
+- data_collection_sources.last_item_id / last_item_at: 最後に取得した最新アイテム
+- data_collection_fetch_states: URLごとのETag・Last-Modified・本文のハッシュ
+- data_collection_items: 取得済みアイテムの内容のハッシュと登録した発言
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from app.db.migration import has_column, has_table
+from sqlalchemy.dialects.mysql import CHAR
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+SOURCE_COLUMNS = (
+    ("last_item_id", sa.String(2083)),
+    ("last_item_at", sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    for column, column_type in SOURCE_COLUMNS:
+        if not has_column("data_collection_sources", column):
+            op.add_column(
+                "data_collection_sources",
+                sa.Column(column, column_type, nullable=True),
+            )
+
+    if not has_table("data_collection_fetch_states"):
+        op.create_table(
+            "data_collection_fetch_states",
+            sa.Column(
+                "source_id",
+                CHAR(36),
+                sa.ForeignKey("data_collection_sources.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("url_hash", CHAR(64), primary_key=True),
+            sa.Column("url", sa.String(2083), nullable=False),
+            sa.Column("etag", sa.String(255), nullable=True),
+            sa.Column("last_modified", sa.String(64), nullable=True),
+            sa.Column("content_hash", CHAR(64), nullable=True),
+            sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        )
+
+    if not has_table("data_collection_items"):
+        op.create_table(
+            "data_collection_items",
+            sa.Column(
+                "source_id",
+                CHAR(36),
+                sa.ForeignKey("data_collection_sources.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("item_key", CHAR(64), primary_key=True),
+            sa.Column("content_hash", CHAR(64), nullable=False),
+            sa.Column(
+                "statement_id",
+                CHAR(36),
+                sa.ForeignKey("statements.id", ondelete="SET NULL"),
+                nullable=True,
+            ),
+            sa.Column("first_seen_at", sa.DateTime(), nullable=False),
+            sa.Column("last_seen_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index(
+            "ix_data_collection_items_statement_id",
+            "data_collection_items",
+            ["statement_id"],
+        )
+
+
+def downgrade() -> None:
+    if has_table("data_collection_items"):
+        op.drop_table("data_collection_items")
+    if has_table("data_collection_fetch_states"):
+        op.drop_table("data_collection_fetch_states")
+
+    with op.batch_alter_table("data_collection_sources") as batch_op:
+        for column, _ in SOURCE_COLUMNS:
+            if has_column("data_collection_sources", column):
+                batch_op.drop_column(column)
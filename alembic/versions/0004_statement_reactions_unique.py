@@ -0,0 +1,76 @@
+"""statement_reactionsに (statement_id, user_id, reaction_type) の一意インデックスを追加
+
+リアクションバッファの反映が重なった場合などに作られた重複行を削除し、
+影響を受けた発言のリアクション件数を数え直してから一意インデックスを作成する。
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from app.db.migration import create_index_online, drop_index_online
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_statement_reactions_statement_user_type"
+
+REACTION_COUNT_COLUMNS = {
+    "like": "likes_count",
+    "dislike": "dislikes_count",
+    "agree": "agrees_count",
+    "disagree": "disagrees_count",
+    "important": "important_count",
+    "fake": "fake_count",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    duplicated = [
+        row[0]
+        for row in bind.execute(
+            sa.text(
+                "SELECT DISTINCT statement_id FROM statement_reactions "
+                "GROUP BY statement_id, user_id, reaction_type HAVING COUNT(*) > 1"
+            )
+        )
+    ]
+    if duplicated:
+        # 組み合わせごとに最も小さいIDの行だけを残す
+        # （MySQLは削除対象のテーブルをサブクエリで直接参照できないため派生テーブルにする）
+        bind.execute(
+            sa.text(
+                "DELETE FROM statement_reactions WHERE id NOT IN ("
+                "SELECT id FROM (SELECT MIN(id) AS id FROM statement_reactions "
+                "GROUP BY statement_id, user_id, reaction_type) AS keep_ids)"
+            )
+        )
+        assignments = ", ".join(
+            f"{column} = (SELECT COUNT(*) FROM statement_reactions r "
+            f"WHERE r.statement_id = statements.id "
+            f"AND r.reaction_type = '{reaction_type}')"
+            for reaction_type, column in REACTION_COUNT_COLUMNS.items()
+        )
+        update = sa.text(
+            f"UPDATE statements SET {assignments} WHERE id IN :ids"
+        ).bindparams(sa.bindparam("ids", expanding=True))
+        for i in range(0, len(duplicated), 1000):
+            bind.execute(update, {"ids": duplicated[i:i + 1000]})
+
+    create_index_online(
+        INDEX_NAME,
+        "statement_reactions",
+        ("statement_id", "user_id", "reaction_type"),
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    drop_index_online(INDEX_NAME, "statement_reactions")
@@ -0,0 +1,47 @@
+"""politiciansにfan_out_on_read（ホームタイムラインの有名政治家の判定）を追加
+
+これまでプロセスごとにキャッシュしたフォロワー数で判定していたため、プロセス間で判定が
+食い違うことがあった。追加時は現在のHOME_TIMELINE_CELEBRITY_FOLLOWERSで初期値を設定する。
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from app.core.config import settings
+from app.db.migration import has_column
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if has_column("politicians", "fan_out_on_read"):
+        return
+    op.add_column(
+        "politicians",
+        sa.Column(
+            "fan_out_on_read", sa.Boolean(), server_default="0", nullable=False
+        ),
+    )
+    # フォロワー数がしきい値以上の政治家（展開していなかった政治家）を有名政治家にする
+    op.get_bind().execute(
+        sa.text(
+            "UPDATE politicians SET fan_out_on_read = 1 WHERE id IN ("
+            "SELECT politician_id FROM (SELECT politician_id FROM politician_follows "
+            "GROUP BY politician_id HAVING COUNT(*) >= :threshold) AS celebrities)"
+        ),
+        {"threshold": settings.HOME_TIMELINE_CELEBRITY_FOLLOWERS},
+    )
+
+
+def downgrade() -> None:
+    if has_column("politicians", "fan_out_on_read"):
+        with op.batch_alter_table("politicians") as batch_op:
+            batch_op.drop_column("fan_out_on_read")
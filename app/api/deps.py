@@ -1,42 +1,29 @@
-import importlib.util
+import logging
 import os
 import sys
 from typing import Optional
 
+from app.core.auth import Principal, is_revoked
 from app.core.config import settings
+from app.db.provider import (
+    READ_ONLY_METHODS,
+    PooledSessionProvider,
+    SessionProvider,
+    SharedSessionProvider,
+)
+from app.db.async_session import AsyncSessionLocal
 from app.db.session import SessionLocal
 from app.models.user import User
 from app.schemas.token import TokenPayload
-from app.services.user import get_user
+from app.services.user import get_token_version, get_user
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-# テスト環境の場合はTestSessionLocalをインポート
-TestSessionLocal = None
-if os.getenv("TESTING") == "True":
-    try:
-        # プロジェクトのルートディレクトリをPythonパスに追加
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        from tests.db_session import TestSessionLocal
-        print("TestSessionLocal imported successfully")
-    except ImportError as e:
-        print(f"Failed to import TestSessionLocal: {e}")
-        # インポートに失敗した場合は、SQLiteを使用するセッションを作成
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-
-        # SQLiteエンジンの作成
-        test_engine = create_engine(
-            "sqlite:///./test.db",
-            connect_args={"check_same_thread": False}  # SQLite用の設定
-        )
-        
-        # セッションファクトリの作成
-        TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-        print("Created fallback TestSessionLocal")
+logger = logging.getLogger(__name__)
 
 # OAuth2のトークン取得エンドポイント
 oauth2_scheme = OAuth2PasswordBearer(
@@ -56,143 +43,68 @@ oauth2_scheme_optional = OptionalOAuth2PasswordBearer(
 )
 
 
-# テスト用のセッションを保持する変数
-_test_db = None
+def _default_session_provider() -> SessionProvider:
+    """
+    起動時の環境に応じたセッションプロバイダーを返す
 
-# conftest.pyで作成されたセッションを保持する変数
-_conftest_db = None
+    テスト環境（TESTING=True）ではテスト用のSQLiteのセッションを全リクエストで使い回す。
+    """
+    if os.getenv("TESTING") != "True":
+        return PooledSessionProvider(SessionLocal)
+    try:
+        # プロジェクトのルートディレクトリをPythonパスに追加
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        from tests.db_session import TestSessionLocal
+    except ImportError as e:
+        # テスト環境の設定ではDATABASE_URLの既定値がSQLiteになる
+        logger.warning("tests.db_sessionを読み込めないため、設定のデータベースを使います: %s", e)
+        TestSessionLocal = SessionLocal
+    return SharedSessionProvider(TestSessionLocal)
 
-def get_db():
+
+_session_provider: SessionProvider = _default_session_provider()
+
+
+def set_session_provider(provider: SessionProvider) -> None:
     """
-    リクエストごとにデータベースセッションを取得し、リクエスト完了後にクローズする
-    テスト環境の場合はTestSessionLocalを使用する
+    セッションプロバイダーを差し替える
     
-    Yields:
-        SQLAlchemy DBセッション
+    Args:
+        provider: セッションプロバイダー
     """
-    global _test_db, _conftest_db
-    print(f"TESTING environment variable: {os.getenv('TESTING')}")
-    print(f"TestSessionLocal defined: {TestSessionLocal is not None}")
-    
-    # conftest.pyで作成されたセッションがあれば、それを使用
-    if _conftest_db is not None:
-        print(f"Using conftest session: {_conftest_db}")
-        db = _conftest_db
-        try:
-            yield db
-        finally:
-            # テスト環境ではセッションを閉じない（再利用するため）
-            pass
-        return
+    global _session_provider
+    _session_provider = provider
+    logger.debug("セッションプロバイダーを差し替えました: %s", type(provider).__name__)
+
+
+def get_db(request: Request):
+    """
+    リクエストごとにデータベースセッションを取得し、リクエスト完了後に後始末をする
+    払い出し方は起動時に選んだセッションプロバイダーに従う
     
-    if os.getenv("TESTING") == "True":
-        # テスト環境では同じセッションを再利用
-        if _test_db is None:
-            if TestSessionLocal is not None:
-                _test_db = TestSessionLocal()
-                print(f"Created new TestSessionLocal: {_test_db}")
-            else:
-                _test_db = SessionLocal()
-                print(f"Created new SessionLocal for testing: {_test_db}")
-            
-            # テスト用のユーザーを作成
-            try:
-                from app.core.security import get_password_hash
-                from app.models.user import User
-
-                # テスト用ユーザーのリスト
-                test_users = [
-                    {
-                        "email": "test@example.com",
-                        "username": "testuser",
-                        "password": "password123",
-                        "role": "user",
-                        "status": "active"
-                    },
-                    {
-                        "email": "test2@example.com",
-                        "username": "testuser2",
-                        "password": "password123",
-                        "role": "user",
-                        "status": "active"
-                    },
-                    {
-                        "email": "inactive@example.com",
-                        "username": "inactiveuser",
-                        "password": "password123",
-                        "role": "user",
-                        "status": "inactive"
-                    },
-                    {
-                        "email": "current@example.com",
-                        "username": "currentuser",
-                        "password": "password123",
-                        "role": "user",
-                        "status": "active"
-                    }
-                ]
-                
-                # 各テストユーザーを作成または更新
-                for user_data in test_users:
-                    test_user = _test_db.query(User).filter(User.email == user_data["email"]).first()
-                    if test_user is None:
-                        print(f"Creating test user: {user_data['email']}")
-                        test_user = User(
-                            email=user_data["email"],
-                            username=user_data["username"],
-                            password_hash=get_password_hash(user_data["password"]),
-                            role=user_data["role"],
-                            status=user_data["status"],
-                            email_verified=True
-                        )
-                        _test_db.add(test_user)
-                    else:
-                        print(f"Updating test user: {user_data['email']}")
-                        test_user.status = user_data["status"]
-                
-                _test_db.commit()
-                
-                # データベース内のユーザーを確認
-                users = _test_db.query(User).all()
-                print(f"Users in test database: {users}")
-            except Exception as e:
-                print(f"Error setting up test database: {e}")
+    Args:
+        request: リクエスト
         
-        print(f"Using test database session: {_test_db}")
-        db = _test_db
-    else:
-        # 通常環境では新しいセッションを作成
-        db = SessionLocal()
-    
-    try:
-        yield db
-    finally:
-        # テスト環境ではセッションを閉じない（再利用するため）
-        if os.getenv("TESTING") != "True":
-            db.close()
+    Yields:
+        SQLAlchemy DBセッション
+    """
+    yield from _session_provider(request)
 
-# conftest.pyからセッションを設定するための関数
-def set_conftest_db(db):
-    global _conftest_db
-    _conftest_db = db
-    print(f"Set conftest session: {_conftest_db}")
 
-def get_current_user_optional(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme_optional)
-) -> Optional[User]:
+def set_conftest_db(db: Session) -> None:
     """
-    現在のユーザーを取得する（認証トークンがない場合はNoneを返す）
+    conftest.pyで作成したセッションを全リクエストで使うようにする
     
     Args:
         db: データベースセッション
-        token: JWTトークン（オプショナル）
-        
-    Returns:
-        現在のユーザーオブジェクト、または認証トークンがない場合はNone
     """
-    if not token:
-        return None
-        
+    set_session_provider(SharedSessionProvider.of(db))
+
+
+def _decode_token(token: str) -> Optional[TokenPayload]:
+    """
+    アクセストークンを検証してクレームを返す（無効な場合やリフレッシュトークンの場合はNone）
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -200,67 +112,149 @@ def get_current_user_optional(
         token_data = TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         return None
-    
-    user = get_user(db, id=token_data.sub)
+    if not token_data.sub or token_data.type == "refresh":
+        return None
+    return token_data
+
+
+def _is_stateless(token_data: TokenPayload) -> bool:
+    """
+    クレームだけで利用者を組み立てられるかどうか
+    """
+    return (
+        settings.AUTH_MODE == "stateless"
+        and token_data.ver is not None
+        and token_data.role is not None
+        and token_data.status is not None
+    )
+
+
+def _claims_principal(db: Session, token_data: TokenPayload) -> Optional[Principal]:
+    """
+    クレームから利用者を組み立てる（失効している場合はNone）
+
+    失効情報をプロセス内にしか持たない場合、キャッシュにないユーザーは
+    DBのトークンバージョンで失効を確認する。
+    """
+    if is_revoked(
+        token_data.sub,
+        token_data.ver,
+        load_version=lambda: get_token_version(db, token_data.sub),
+    ):
+        return None
+    return Principal(
+        id=token_data.sub,
+        role=token_data.role,
+        status=token_data.status,
+        token_version=token_data.ver,
+    )
+
+
+def _user_principal(token_data: TokenPayload, user: Optional[User]) -> Optional[Principal]:
+    """
+    DBから読み込んだユーザーから利用者を組み立てる（失効している場合はNone）
+    """
     if not user:
         return None
+    if token_data.ver is not None and token_data.ver < (user.token_version or 0):
+        return None
+    return Principal.from_user(user)
+
+
+def _decode_principal(db: Session, token: str) -> Optional[Principal]:
+    """
+    アクセストークンから利用者を組み立てる
+
+    ステートレス認証ではトークンのクレームと失効情報だけを確認し、ユーザーは読み込まない。
+    AUTH_MODE=databaseの場合やクレームを含まない古いトークンの場合はDBから読み込む。
+
+    Args:
+        db: データベースセッション
+        token: JWTトークン
+
+    Returns:
+        利用者、トークンが無効な場合はNone
+    """
+    token_data = _decode_token(token)
+    if token_data is None:
+        return None
+    if _is_stateless(token_data):
+        return _claims_principal(db, token_data)
+    return _user_principal(token_data, get_user(db, id=token_data.sub))
+
+
+async def _decode_principal_async(db: AsyncSession, token: str) -> Optional[Principal]:
+    """
+    アクセストークンから利用者を組み立てる（非同期エンドポイント用）
+
+    Args:
+        db: 非同期データベースセッション
+        token: JWTトークン
+
+    Returns:
+        利用者、トークンが無効な場合はNone
+    """
+    token_data = _decode_token(token)
+    if token_data is None:
+        return None
+    if _is_stateless(token_data):
+        return await db.run_sync(_claims_principal, token_data)
+    user = await db.run_sync(get_user, token_data.sub)
+    return _user_principal(token_data, user)
+
+
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="認証情報が無効です",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_current_user_optional(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme_optional)
+) -> Optional[Principal]:
+    """
+    現在の利用者を取得する（認証トークンがない場合はNoneを返す）
+    
+    Args:
+        db: データベースセッション
+        token: JWTトークン（オプショナル）
         
-    return user
+    Returns:
+        現在の利用者、または認証トークンがない・無効な場合はNone
+    """
+    if not token:
+        return None
+    return _decode_principal(db, token)
 
 
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> Principal:
     """
-    現在のユーザーを取得する
+    現在の利用者を取得する（ユーザーの全項目が必要な場合はget_current_db_userを使う）
     
     Args:
         db: データベースセッション
         token: JWTトークン
         
     Returns:
-        現在のユーザーオブジェクト
+        現在の利用者
         
     Raises:
         HTTPException: トークンが無効な場合
     """
-    # 以下はデバッグ用のコード
-    # try:
-    #     payload = jwt.decode(
-    #         token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-    #     )
-    #     token_data = TokenPayload(**payload)
-    #     print(f"トークンデータ: {token_data}")
-    #     print(f"ユーザーID: {token_data.sub}")
-    # except (jwt.JWTError, ValidationError) as e:
-    #     print(f"トークンデコードエラー: {e}")
-    #     raise HTTPException(
-    #         status_code=status.HTTP_401_UNAUTHORIZED,
-    #         detail="認証情報が無効です",
-    #         headers={"WWW-Authenticate": "Bearer"},
-    #     )
-    #
-    # # データベース内のユーザーを確認
-    # all_users = db.query(User).all()
-    # print(f"データベース内のユーザー数: {len(all_users)}")
-    # for u in all_users:
-    #     print(f"ユーザー: {u.id}, {u.email}, {u.username}")
-    #
-    # user = get_user(db, id=token_data.sub)
-    # if not user:
-    #     print(f"ユーザーが見つかりません: {token_data.sub}")
-    #     raise HTTPException(
-    #         status_code=status.HTTP_404_NOT_FOUND,
-    #         detail="ユーザーが見つかりません",
-    #     )
-    # print(f"ユーザーが見つかりました: {user.id}, {user.email}, {user.username}")
-    # return user
+    principal = _decode_principal(db, token)
+    if principal is None:
+        raise _unauthorized()
+    return principal
 
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """現在のアクティブなユーザーを取得する"""
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
+    """現在のアクティブな利用者を取得する"""
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -269,13 +263,94 @@ def get_current_active_user(
     return current_user
 
 
+async def get_async_db(request: Request):
+    """
+    非同期エンドポイント用のデータベースセッションを取得し、リクエスト完了後にクローズする
+    読み出しのリクエスト（GET・HEAD）ではSELECTをレプリカに振り分ける
+
+    Args:
+        request: リクエスト
+
+    Yields:
+        SQLAlchemy 非同期DBセッション
+    """
+    async with AsyncSessionLocal() as db:
+        db.info["read_only"] = request.method in READ_ONLY_METHODS
+        yield db
+
+
+async def get_current_user_optional_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme_optional),
+) -> Optional[Principal]:
+    """
+    現在の利用者を取得する（非同期エンドポイント用、認証トークンがない場合はNone）
+    """
+    if not token:
+        return None
+    return await _decode_principal_async(db, token)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    現在の利用者を取得する（非同期エンドポイント用）
+    
+    Raises:
+        HTTPException: トークンが無効な場合
+    """
+    principal = await _decode_principal_async(db, token)
+    if principal is None:
+        raise _unauthorized()
+    return principal
+
+
+async def get_current_active_user_async(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Principal:
+    """現在のアクティブな利用者を取得する（非同期エンドポイント用）"""
+    return get_current_active_user(current_user)
+
+
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
-    """現在のアクティブな管理者ユーザーを取得する"""
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
+    """現在のアクティブな管理者を取得する"""
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="管理者権限が必要です",
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+def get_current_db_user(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+) -> User:
+    """
+    現在のアクティブなユーザーをDBから読み込む（プロフィールやパスワードを扱う場合に使う）
+    
+    Args:
+        db: データベースセッション
+        current_user: 現在の利用者
+        
+    Returns:
+        現在のユーザーオブジェクト
+        
+    Raises:
+        HTTPException: ユーザーが存在しない・無効な場合
+    """
+    user = get_user(db, id=current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ユーザーが見つかりません",
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="アカウントが無効です",
+        )
+    return user
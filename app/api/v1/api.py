@@ -2,6 +2,7 @@ from app.api.v1.endpoints import (
     auth,
     comments,
     health,
+    metrics,
     mypage,
     parties,
     politicians,
@@ -40,4 +41,7 @@ api_router.include_router(
 )
 api_router.include_router(
     health.router, tags=["ヘルスチェック"]
-)
\ No newline at end of file
+)
+api_router.include_router(
+    metrics.router, tags=["ヘルスチェック"]
+)
@@ -2,6 +2,7 @@ from datetime import timedelta
 from typing import Any
 
 from app.api.deps import get_current_user, get_db
+from app.core.auth import principal_claims
 from app.core.config import settings
 from app.core.security import create_access_token, create_refresh_token
 from app.models.user import User
@@ -22,6 +23,29 @@ from sqlalchemy.orm import Session
 router = APIRouter()
 
 
+def _issue_tokens(user: User) -> dict:
+    """
+    アクセストークンとリフレッシュトークンを発行する
+    
+    アクセストークンにはロール・状態・トークンバージョンを含め、
+    認証時にユーザーをDBから読み込まずに済むようにする。
+    """
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    
+    return {
+        "access_token": create_access_token(
+            user.id, expires_delta=access_token_expires, claims=principal_claims(user)
+        ),
+        "refresh_token": create_refresh_token(
+            user.id,
+            expires_delta=refresh_token_expires,
+            claims={"ver": user.token_version or 0},
+        ),
+        "token_type": "bearer",
+    }
+
+
 @router.post("/login", response_model=Token)
 def login_access_token(
     db: Session = Depends(get_db),
@@ -44,18 +68,7 @@ def login_access_token(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="アカウントが無効です",
         )
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
-    return {
-        "access_token": create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "refresh_token": create_refresh_token(
-            user.id, expires_delta=refresh_token_expires
-        ),
-        "token_type": "bearer",
-    }
+    return _issue_tokens(user)
 
 
 @router.post("/register", response_model=Token)
@@ -76,18 +89,7 @@ def register_user(
         )
     
     user = create_user(db, obj_in=user_in)
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
-    return {
-        "access_token": create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "refresh_token": create_refresh_token(
-            user.id, expires_delta=refresh_token_expires
-        ),
-        "token_type": "bearer",
-    }
+    return _issue_tokens(user)
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
@@ -97,8 +99,8 @@ def logout(
     """
     ログアウト処理
     
-    注: JWTはステートレスなため、サーバー側でのトークン無効化は行わない
-    クライアント側でトークンを破棄する責任がある
+    注: アクセストークンは有効期限まで使えるため、クライアント側でトークンを破棄する責任がある
+    （全端末のトークンを失効させる場合はパスワードを変更する）
     """
     return {"success": True}
 
@@ -132,18 +134,15 @@ def refresh_token(
             detail="ユーザーが見つかりません",
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    # パスワード変更などで失効したリフレッシュトークンは使えない
+    if token_data.ver is not None and token_data.ver < (user.token_version or 0):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="無効なリフレッシュトークンです",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    return {
-        "access_token": create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "refresh_token": create_refresh_token(
-            user.id, expires_delta=refresh_token_expires
-        ),
-        "token_type": "bearer",
-    }
+    return _issue_tokens(user)
 
 
 @router.post("/password/reset", status_code=status.HTTP_200_OK)
@@ -104,9 +104,6 @@ def create_comment(
         user_id=current_user.id
     )
     
-    # コメント数を更新
-    services.statement.update_statement_comments_count(db, statement_id=statement_id)
-    
     return comment
 
 
@@ -193,13 +190,8 @@ def delete_comment(
             detail="このコメントを削除する権限がありません",
         )
     
-    statement_id = comment.statement_id
-    
     services.comment.delete_comment(db, id=comment_id, current_user_id=current_user.id)
     
-    # コメント数を更新
-    services.statement.update_statement_comments_count(db, statement_id=statement_id)
-    
     return {"success": True}
 
 
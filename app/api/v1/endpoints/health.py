@@ -1,6 +1,8 @@
 """
 ヘルスチェックAPI
 """
+from app import services
+from app.db.session import get_pool_stats
 from fastapi import APIRouter
 
 router = APIRouter()
@@ -19,4 +21,20 @@ def get_version():
     """
     APIのバージョン取得
     """
-    return {"version": "0.1.0"}
\ No newline at end of file
+    return {"version": "0.1.0"}
+
+
+@router.get("/health/cache")
+def cache_stats():
+    """
+    エンティティキャッシュのヒット・ミス件数を取得する
+    """
+    return services.entity_cache.get_stats()
+
+
+@router.get("/health/db")
+def db_pool_stats():
+    """
+    コネクションプールの計測値（接続の待ち時間・使用中の接続数など）を取得する
+    """
+    return get_pool_stats()
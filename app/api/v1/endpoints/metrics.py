@@ -0,0 +1,35 @@
+"""
+メトリクスAPI（Prometheusのテキスト形式）
+"""
+
+from app.core.query_metrics import route_metrics
+from app.db.session import get_pool_stats
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_gauges() -> str:
+    """
+    コネクションプールの計測値をゲージとして出力する
+    """
+    lines = []
+    for name, stats in get_pool_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f'db_pool_{key}{{engine="{name}"}} {value}')
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    ルートごとの処理時間・DB時間・クエリ数のヒストグラムとプールの計測値を取得する
+    """
+    return PlainTextResponse(
+        route_metrics.render() + _pool_gauges(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -13,6 +13,7 @@ from app.schemas.activity import (
 )
 from app.schemas.statement import StatementList
 from fastapi import APIRouter, Depends, Path, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 router = APIRouter()
@@ -119,24 +120,18 @@ def read_view_history(
 
 
 @router.get("/feed", response_model=StatementList)
-def read_personalized_feed(
-    db: Session = Depends(deps.get_db),
+async def read_personalized_feed(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = Query(0, description="スキップ数"),
     limit: int = Query(20, description="取得上限"),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
     パーソナライズドフィードを取得する
     """
-    result = services.activity.get_personalized_feed(
+    return await services.aio.get_personalized_feed(
         db, user_id=current_user.id, skip=skip, limit=limit
     )
-    
-    return {
-        "statements": result["statements"],
-        "total": result["total"],
-        "next_cursor": None
-    }
 
 
 @router.get("/notifications", response_model=UserNotifications)
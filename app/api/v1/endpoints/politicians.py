@@ -327,7 +327,7 @@ def read_politician_topics(
     # 政治家のスタンスを分析する複雑なロジックが必要になります
     # ここでは簡易的な実装を行います
     
-    # 発言に関連するトピックを取得
+    # 発言に関連するトピックを取得（トピック情報も含めて集計済み）
     statement_topics = services.statement.get_politician_statement_topics(
         db, politician_id=politician_id
     )
@@ -335,19 +335,16 @@ def read_politician_topics(
     # トピック別にスタンスを集計
     topic_stances = []
     for topic in statement_topics:
-        # トピックの詳細情報を取得
-        topic_info = services.topic.get_topic(db, id=topic["topic_id"])
-        if topic_info:
-            stance = {
-                "topic_id": topic_info.id,
-                "topic_name": topic_info.name,
-                "topic_slug": topic_info.slug,
-                "stance": topic.get("stance", "neutral"),
-                "confidence": topic.get("confidence", 50),
-                "summary": topic.get("summary", f"{politician.name}の{topic_info.name}に関するスタンス"),
-                "last_updated": topic.get("last_updated")
-            }
-            topic_stances.append(stance)
+        stance = {
+            "topic_id": topic["topic_id"],
+            "topic_name": topic["topic_name"],
+            "topic_slug": topic["topic_slug"],
+            "stance": topic.get("stance", "neutral"),
+            "confidence": topic.get("confidence", 50),
+            "summary": topic.get("summary", f"{politician.name}の{topic['topic_name']}に関するスタンス"),
+            "last_updated": topic.get("last_updated")
+        }
+        topic_stances.append(stance)
     
     # 結果を返す
     result = {
@@ -403,6 +400,11 @@ def follow_politician(
     db.add(follow)
     db.commit()
     
+    # ホームタイムラインへ最近の発言を取り込む
+    services.timeline.on_politician_followed(
+        db, user_id=current_user.id, politician_id=politician_id
+    )
+    
     # フォロワー数を取得
     followers_count = services.politician.get_followers_count(
         db, politician_id=politician_id
@@ -452,6 +454,11 @@ def unfollow_politician(
     db.delete(follow)
     db.commit()
     
+    # ホームタイムラインから発言を取り除く
+    services.timeline.on_politician_unfollowed(
+        db, user_id=current_user.id, politician_id=politician_id
+    )
+    
     # フォロワー数を取得
     followers_count = services.politician.get_followers_count(
         db, politician_id=politician_id
@@ -1,18 +1,18 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from app import services
 from app.api import deps
 from app.schemas.search import SearchResult
 from app.schemas.statement import StatementList
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 
 @router.get("/statements", response_model=StatementList)
-def search_statements(
-    db: Session = Depends(deps.get_db),
+async def search_statements(
+    db: AsyncSession = Depends(deps.get_async_db),
     q: str = Query(..., description="検索キーワード"),
     skip: int = Query(0, description="スキップ数"),
     limit: int = Query(20, description="取得上限"),
@@ -20,13 +20,13 @@ def search_statements(
     filter_topic: Optional[str] = Query(None, description="トピックIDでフィルタリング"),
     filter_date_start: Optional[str] = Query(None, description="開始日でフィルタリング（YYYY-MM-DD）"),
     filter_date_end: Optional[str] = Query(None, description="終了日でフィルタリング（YYYY-MM-DD）"),
-    current_user: Any = Depends(deps.get_current_user),
+    current_user: Any = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     発言を検索する
     """
-    result = services.search.search_statements(
-        db=db,
+    return await services.aio.search_statements(
+        db,
         query=q,
         skip=skip,
         limit=limit,
@@ -35,17 +35,11 @@ def search_statements(
         filter_date_start=filter_date_start,
         filter_date_end=filter_date_end
     )
-    
-    return {
-        "statements": result["statements"],
-        "total": result["total"],
-        "next_cursor": result["next_cursor"]
-    }
 
 
 @router.get("/all", response_model=SearchResult)
-def search_all(
-    db: Session = Depends(deps.get_db),
+async def search_all(
+    db: AsyncSession = Depends(deps.get_async_db),
     q: str = Query(..., description="検索キーワード"),
     skip: int = Query(0, description="スキップ数"),
     limit: int = Query(20, description="取得上限"),
@@ -53,20 +47,30 @@ def search_all(
     filter_topic: Optional[str] = Query(None, description="トピックIDでフィルタリング"),
     filter_date_start: Optional[str] = Query(None, description="開始日でフィルタリング（YYYY-MM-DD）"),
     filter_date_end: Optional[str] = Query(None, description="終了日でフィルタリング（YYYY-MM-DD）"),
-    current_user: Any = Depends(deps.get_current_user),
+    types: Optional[List[str]] = Query(
+        None, description="検索対象（statements, politicians, topics）。カンマ区切りまたは複数指定"
+    ),
+    current_user: Any = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     全てのエンティティを検索する
     """
-    result = services.search.search_all(
-        db=db,
+    try:
+        types = services.search.parse_search_types(types)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    return await services.aio.search_all(
+        db,
         query=q,
         skip=skip,
         limit=limit,
         filter_party=filter_party,
         filter_topic=filter_topic,
         filter_date_start=filter_date_start,
-        filter_date_end=filter_date_end
+        filter_date_end=filter_date_end,
+        types=types
     )
-    
-    return result
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 from app import services
 from app.api import deps
+from app.core.config import settings
 from app.models.statement import StatementReaction
 from app.models.user import User
 from app.schemas.statement import Statement as StatementSchema
@@ -11,66 +13,54 @@ from app.schemas.statement import (
     StatementList,
     StatementUpdate,
 )
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 router = APIRouter()
 
 
 @router.get("/", response_model=StatementList)
-def read_statements(
-    db: Session = Depends(deps.get_db),
+async def read_statements(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 20,
     sort: Optional[str] = Query("date_desc", description="ソート順（date_desc, date_asc, likes）"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回のnext_cursor）"),
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|cached|none)$",
+        description="総件数の取得方法（exact: 毎回集計, cached: キャッシュを使用, none: 返さない）",
+    ),
     filter_party: Optional[str] = Query(None, description="政党IDでフィルタリング"),
     filter_topic: Optional[str] = Query(None, description="トピックIDでフィルタリング"),
     filter_date_start: Optional[str] = Query(None, description="開始日（YYYY-MM-DD）"),
     filter_date_end: Optional[str] = Query(None, description="終了日（YYYY-MM-DD）"),
     search: Optional[str] = Query(None, description="キーワード検索"),
-    current_user: Any = Depends(deps.get_current_user),
+    current_user: Any = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     発言一覧を取得する
     """
-    statements = services.statement.get_statements(
-        db, 
-        skip=skip, 
-        limit=limit, 
-        sort=sort,
-        filter_party=filter_party,
-        filter_topic=filter_topic,
-        filter_date_start=filter_date_start,
-        filter_date_end=filter_date_end,
-        search=search
-    )
-    
-    total = services.statement.count_statements(
+    return await services.aio.list_statements(
         db,
+        user_id=current_user.id if current_user else None,
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        cursor=cursor,
+        count_mode=count_mode,
         filter_party=filter_party,
         filter_topic=filter_topic,
         filter_date_start=filter_date_start,
         filter_date_end=filter_date_end,
         search=search
     )
-    
-    # 次のページがあるかどうかを確認
-    next_cursor = None
-    if len(statements) == limit and total > skip + limit:
-        next_cursor = str(skip + limit)
-    
-    # ユーザーがいいねしているかどうかを確認
-    if current_user:
-        for statement in statements:
-            statement.is_liked = services.statement.is_statement_liked(
-                db, statement_id=statement.id, user_id=current_user.id
-            )
-    
-    return {
-        "total": total,
-        "statements": statements,
-        "next_cursor": next_cursor
-    }
 
 
 @router.get("/following", response_model=StatementList)
@@ -79,6 +69,12 @@ def read_following_statements(
     skip: int = 0,
     limit: int = 20,
     sort: Optional[str] = Query("date_desc", description="ソート順（date_desc, date_asc, likes）"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回のnext_cursor）"),
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|cached|none)$",
+        description="総件数の取得方法（exact: 毎回集計, cached: キャッシュを使用, none: 返さない）",
+    ),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -91,38 +87,57 @@ def read_following_statements(
     
     if not following_politician_ids:
         return {
-            "total": 0,
+            "total": 0 if count_mode != "none" else None,
             "statements": [],
-            "next_cursor": None
+            "next_cursor": None,
+            "has_more": False
         }
     
-    statements = services.statement.get_statements_by_politicians(
-        db, 
-        politician_ids=following_politician_ids,
-        skip=skip, 
-        limit=limit, 
-        sort=sort
-    )
-    
-    total = services.statement.count_statements_by_politicians(
-        db, politician_ids=following_politician_ids
-    )
+    # 新しい順であれば書き込み時に展開済みのタイムラインから取得
+    if settings.HOME_TIMELINE_ENABLED and sort in (None, "date_desc"):
+        statements = services.timeline.get_timeline(
+            db,
+            user_id=current_user.id,
+            politician_ids=following_politician_ids,
+            skip=skip,
+            limit=limit + 1,
+            cursor=cursor
+        )
+        statements, has_more = services.statement.split_page(statements, limit)
+        total = services.statement.resolve_total(
+            db, count_mode, services.timeline.count_timeline, user_id=current_user.id
+        )
+    else:
+        statements = services.statement.get_statements_by_politicians(
+            db, 
+            politician_ids=following_politician_ids,
+            skip=skip, 
+            limit=limit + 1, 
+            sort=sort,
+            cursor=cursor
+        )
+        statements, has_more = services.statement.split_page(statements, limit)
+        total = services.statement.resolve_total(
+            db, count_mode, services.statement.count_statements_by_politicians, politician_ids=following_politician_ids
+        )
     
-    # 次のページがあるかどうかを確認
+    # 次のページがある場合のみカーソルを返す
     next_cursor = None
-    if len(statements) == limit and total > skip + limit:
-        next_cursor = str(skip + limit)
-    
-    # ユーザーがいいねしているかどうかを確認
-    for statement in statements:
-        statement.is_liked = services.statement.is_statement_liked(
-            db, statement_id=statement.id, user_id=current_user.id
+    if has_more:
+        next_cursor = services.statement.get_next_cursor(
+            db, statements, limit, sort
         )
     
+    # ユーザーのリアクションをまとめて取得
+    services.statement.apply_user_reactions(
+        db, statements, user_id=current_user.id
+    )
+    
     return {
         "total": total,
         "statements": statements,
-        "next_cursor": next_cursor
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 
@@ -156,11 +171,13 @@ def read_statement(
         if statement.politician.current_party_id:
             result.party_id = statement.politician.current_party_id
     
-    # ユーザーがいいねしているかどうかを確認
+    # ユーザーのリアクションを取得
     if current_user:
-        result.is_liked = services.statement.is_statement_liked(
-            db, statement_id=statement_id, user_id=current_user.id
-        )
+        reactions = services.statement.get_user_reactions(
+            db, statement_ids=[statement_id], user_id=current_user.id
+        ).get(statement_id, [])
+        result.user_reactions = reactions
+        result.is_liked = "like" in reactions
     
     return result
 
@@ -197,6 +214,97 @@ def create_statement(
     return statement
 
 
+class _RequestStreamingResponse(StreamingResponse):
+    """
+    リクエスト本文を読みながら返すためのStreamingResponse
+    
+    StreamingResponseは切断を検知するためにreceiveを並行して呼ぶため、本文のメッセージを
+    横取りしてしまう。本文はジェネレーター側で読むので切断の監視は行わず、
+    切断は送信時の例外で検知する。
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+async def _read_ndjson(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    リクエスト本文を読みながら、空でない行を(行番号, 内容)で返す
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+def _parse_statement(line_no: int, line: bytes) -> Union[StatementCreate, Dict]:
+    """
+    1行を発言作成スキーマに変換する（失敗した場合はエラーの結果を返す）
+    """
+    try:
+        return StatementCreate.model_validate_json(line)
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(str(loc) for loc in error['loc']) or '行'}: {error['msg']}"
+            for error in e.errors()
+        )
+        return {"line": line_no, "status": "error", "error": errors}
+
+
+@router.post("/bulk", status_code=status.HTTP_200_OK)
+async def create_statements_bulk(
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    current_user: Any = Depends(deps.get_current_active_superuser),
+) -> StreamingResponse:
+    """
+    発言を一括作成する（管理者のみ）
+    
+    本文はNDJSON（1行に1件の発言作成データ）。本文を読みながら
+    STATEMENT_BULK_CHUNK_SIZE件ごとに1トランザクションで作成し、
+    1行に1件の結果（line, status, idまたはerror）をNDJSONで返す。
+    """
+    chunk_size = settings.STATEMENT_BULK_CHUNK_SIZE
+
+    async def results() -> AsyncIterator[str]:
+        pending: List[Tuple[int, Union[StatementCreate, Dict]]] = []
+
+        async def flush() -> AsyncIterator[str]:
+            items = [(n, item) for n, item in pending if not isinstance(item, dict)]
+            created = {}
+            if items:
+                for result in await run_in_threadpool(
+                    services.statement.create_statements_bulk, db, items
+                ):
+                    created[result["line"]] = result
+            for line_no, item in pending:
+                result = item if isinstance(item, dict) else created[line_no]
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+            pending.clear()
+
+        async for line_no, line in _read_ndjson(request):
+            pending.append((line_no, _parse_statement(line_no, line)))
+            if len(pending) >= chunk_size:
+                async for output in flush():
+                    yield output
+        async for output in flush():
+            yield output
+
+    return _RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.put("/{statement_id}", response_model=StatementSchema)
 def update_statement(
     *,
@@ -268,6 +376,12 @@ def read_politician_statements(
     skip: int = 0,
     limit: int = 20,
     sort: Optional[str] = Query("date_desc", description="ソート順（date_desc, date_asc, likes）"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回のnext_cursor）"),
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|cached|none)$",
+        description="総件数の取得方法（exact: 毎回集計, cached: キャッシュを使用, none: 返さない）",
+    ),
     current_user: Any = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -285,30 +399,35 @@ def read_politician_statements(
         db, 
         politician_id=politician_id,
         skip=skip, 
-        limit=limit, 
-        sort=sort
+        limit=limit + 1, 
+        sort=sort,
+        cursor=cursor
     )
     
-    total = services.statement.count_statements_by_politician(
-        db, politician_id=politician_id
+    statements, has_more = services.statement.split_page(statements, limit)
+    
+    total = services.statement.resolve_total(
+        db, count_mode, services.statement.count_statements_by_politician, politician_id=politician_id
     )
     
-    # 次のページがあるかどうかを確認
+    # 次のページがある場合のみカーソルを返す
     next_cursor = None
-    if len(statements) == limit and total > skip + limit:
-        next_cursor = str(skip + limit)
+    if has_more:
+        next_cursor = services.statement.get_next_cursor(
+            db, statements, limit, sort
+        )
     
-    # ユーザーがいいねしているかどうかを確認
+    # ユーザーのリアクションをまとめて取得
     if current_user:
-        for statement in statements:
-            statement.is_liked = services.statement.is_statement_liked(
-                db, statement_id=statement.id, user_id=current_user.id
-            )
+        services.statement.apply_user_reactions(
+            db, statements, user_id=current_user.id
+        )
     
     return {
         "total": total,
         "statements": statements,
-        "next_cursor": next_cursor
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 
@@ -320,6 +439,12 @@ def read_party_statements(
     skip: int = 0,
     limit: int = 20,
     sort: Optional[str] = Query("date_desc", description="ソート順（date_desc, date_asc, likes）"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回のnext_cursor）"),
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|cached|none)$",
+        description="総件数の取得方法（exact: 毎回集計, cached: キャッシュを使用, none: 返さない）",
+    ),
     current_user: Any = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -337,30 +462,35 @@ def read_party_statements(
         db, 
         party_id=party_id,
         skip=skip, 
-        limit=limit, 
-        sort=sort
+        limit=limit + 1, 
+        sort=sort,
+        cursor=cursor
     )
     
-    total = services.statement.count_statements_by_party(
-        db, party_id=party_id
+    statements, has_more = services.statement.split_page(statements, limit)
+    
+    total = services.statement.resolve_total(
+        db, count_mode, services.statement.count_statements_by_party, party_id=party_id
     )
     
-    # 次のページがあるかどうかを確認
+    # 次のページがある場合のみカーソルを返す
     next_cursor = None
-    if len(statements) == limit and total > skip + limit:
-        next_cursor = str(skip + limit)
+    if has_more:
+        next_cursor = services.statement.get_next_cursor(
+            db, statements, limit, sort
+        )
     
-    # ユーザーがいいねしているかどうかを確認
+    # ユーザーのリアクションをまとめて取得
     if current_user:
-        for statement in statements:
-            statement.is_liked = services.statement.is_statement_liked(
-                db, statement_id=statement.id, user_id=current_user.id
-            )
+        services.statement.apply_user_reactions(
+            db, statements, user_id=current_user.id
+        )
     
     return {
         "total": total,
         "statements": statements,
-        "next_cursor": next_cursor
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 
@@ -372,6 +502,12 @@ def read_topic_statements(
     skip: int = 0,
     limit: int = 20,
     sort: Optional[str] = Query("date_desc", description="ソート順（date_desc, date_asc, likes）"),
+    cursor: Optional[str] = Query(None, description="次ページ取得用カーソル（前回のnext_cursor）"),
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|cached|none)$",
+        description="総件数の取得方法（exact: 毎回集計, cached: キャッシュを使用, none: 返さない）",
+    ),
     current_user: Any = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -389,30 +525,35 @@ def read_topic_statements(
         db, 
         topic_id=topic_id,
         skip=skip, 
-        limit=limit, 
-        sort=sort
+        limit=limit + 1, 
+        sort=sort,
+        cursor=cursor
     )
     
-    total = services.statement.count_statements_by_topic(
-        db, topic_id=topic_id
+    statements, has_more = services.statement.split_page(statements, limit)
+    
+    total = services.statement.resolve_total(
+        db, count_mode, services.statement.count_statements_by_topic, topic_id=topic_id
     )
     
-    # 次のページがあるかどうかを確認
+    # 次のページがある場合のみカーソルを返す
     next_cursor = None
-    if len(statements) == limit and total > skip + limit:
-        next_cursor = str(skip + limit)
+    if has_more:
+        next_cursor = services.statement.get_next_cursor(
+            db, statements, limit, sort
+        )
     
-    # ユーザーがいいねしているかどうかを確認
+    # ユーザーのリアクションをまとめて取得
     if current_user:
-        for statement in statements:
-            statement.is_liked = services.statement.is_statement_liked(
-                db, statement_id=statement.id, user_id=current_user.id
-            )
+        services.statement.apply_user_reactions(
+            db, statements, user_id=current_user.id
+        )
     
     return {
         "total": total,
         "statements": statements,
-        "next_cursor": next_cursor
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 
@@ -434,6 +575,21 @@ def like_statement(
             detail="発言が見つかりません",
         )
     
+    # ライトビハインド有効時はバッファに積んで即座に返す
+    if services.reaction_buffer.get_reaction_buffer() is not None:
+        changed = services.reaction_buffer.buffer_reaction(
+            db, statement_id=statement_id, user_id=current_user.id, add=True
+        )
+        response = {
+            "success": True,
+            "likes_count": services.reaction_buffer.get_reaction_count(
+                db, statement_id=statement_id
+            )
+        }
+        if not changed:
+            response["message"] = "既にいいねしています"
+        return response
+    
     # 既にいいねしているか確認
     existing_like = db.query(StatementReaction).filter(
         StatementReaction.statement_id == statement_id,
@@ -451,17 +607,10 @@ def like_statement(
             )
         }
     
-    # いいねを作成
-    reaction = StatementReaction(
-        statement_id=statement_id,
-        user_id=current_user.id,
-        reaction_type="like"
+    # いいねを作成（いいね数も同じトランザクションで加算）
+    services.statement.add_statement_reaction(
+        db, statement_id=statement_id, user_id=current_user.id, reaction_type="like"
     )
-    db.add(reaction)
-    db.commit()
-    
-    # いいね数を更新
-    services.statement.update_statement_likes_count(db, statement_id=statement_id)
     
     # いいね数を取得
     likes_count = services.statement.get_statement_likes_count(
@@ -492,6 +641,21 @@ def unlike_statement(
             detail="発言が見つかりません",
         )
     
+    # ライトビハインド有効時はバッファに積んで即座に返す
+    if services.reaction_buffer.get_reaction_buffer() is not None:
+        changed = services.reaction_buffer.buffer_reaction(
+            db, statement_id=statement_id, user_id=current_user.id, add=False
+        )
+        response = {
+            "success": True,
+            "likes_count": services.reaction_buffer.get_reaction_count(
+                db, statement_id=statement_id
+            )
+        }
+        if not changed:
+            response["message"] = "いいねしていません"
+        return response
+    
     # いいねを取得
     like = db.query(StatementReaction).filter(
         StatementReaction.statement_id == statement_id,
@@ -509,12 +673,8 @@ def unlike_statement(
             )
         }
     
-    # いいねを削除
-    db.delete(like)
-    db.commit()
-    
-    # いいね数を更新
-    services.statement.update_statement_likes_count(db, statement_id=statement_id)
+    # いいねを削除（いいね数も同じトランザクションで減算）
+    services.statement.remove_statement_reaction(db, reaction=like)
     
     # いいね数を取得
     likes_count = services.statement.get_statement_likes_count(
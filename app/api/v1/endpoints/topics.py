@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Optional
 
 from app import services
 from app.api import deps
+from app.core.response_cache import purge_tags
 from app.models.follows import TopicFollow
 from app.models.user import User
 from app.schemas.topic import Topic as TopicSchema
@@ -175,6 +176,8 @@ def follow_topic(
     )
     db.add(follow)
     db.commit()
+    # フォロワー数を含むトピック詳細のキャッシュを破棄
+    purge_tags(f"topic:{topic_id}")
     
     # フォロワー数を取得
     followers_count = services.topic.get_followers_count(
@@ -224,6 +227,7 @@ def unfollow_topic(
     # フォロー関係を削除
     db.delete(follow)
     db.commit()
+    purge_tags(f"topic:{topic_id}")
     
     # フォロワー数を取得
     followers_count = services.topic.get_followers_count(
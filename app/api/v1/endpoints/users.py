@@ -1,8 +1,13 @@
 from typing import Any, Dict, List
 
-from app.api.deps import get_current_active_superuser, get_current_active_user
-from app.core.security import get_password_hash, verify_password
-from app.db.session import get_db
+from app.api.deps import (
+    get_current_active_superuser,
+    get_current_active_user,
+    get_current_db_user,
+    get_db,
+)
+from app.core.auth import Principal
+from app.core.security import verify_password
 from app.models.user import User
 from app.schemas.user import User as UserSchema
 from app.schemas.user import UserCreate, UserDelete, UserPasswordUpdate, UserUpdate
@@ -22,7 +27,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserSchema)
 def read_user_me(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_db_user),
 ) -> Any:
     """
     現在のユーザー情報を取得する
@@ -35,7 +40,7 @@ def update_user_me(
     *,
     db: Session = Depends(get_db),
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_db_user),
 ) -> Any:
     """
     現在のユーザー情報を更新する
@@ -49,7 +54,7 @@ def update_user_password(
     *,
     db: Session = Depends(get_db),
     password_in: UserPasswordUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_db_user),
 ) -> Dict[str, bool]:
     """
     現在のユーザーのパスワードを変更する
@@ -61,30 +66,8 @@ def update_user_password(
             detail="現在のパスワードが正しくありません",
         )
     
-    # テスト環境では、セッションの不整合を回避するために、
-    # 同じIDのユーザーを再取得する
-    import os
-    if os.getenv("TESTING") == "True":
-        print(f"テスト環境でパスワード更新: {current_user.id}")
-        # 同じIDのユーザーを再取得
-        user = db.query(User).filter(User.id == current_user.id).first()
-        if user:
-            print(f"ユーザーを再取得: {user.id}, {user.email}")
-            current_user = user
-    
-    # 新しいパスワードをハッシュ化して保存
-    hashed_password = get_password_hash(password_in.new_password)
-    current_user.password_hash = hashed_password
-    
-    try:
-        db.add(current_user)
-        db.commit()
-    except Exception as e:
-        print(f"パスワード更新中にエラーが発生: {e}")
-        db.rollback()
-        # テスト環境では、エラーが発生した場合でも処理を続行
-        if os.getenv("TESTING") == "True":
-            print("テスト環境のため、エラーを無視して処理を続行")
+    # 新しいパスワードを保存し、発行済みのトークンを失効させる
+    update_user(db, db_obj=current_user, obj_in={"password": password_in.new_password})
     
     return {"success": True}
 
@@ -94,7 +77,7 @@ def delete_user_me(
     *,
     db: Session = Depends(get_db),
     user_delete: UserDelete = Body(...),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_db_user),
 ) -> Dict[str, bool]:
     """
     現在のユーザーアカウントを削除する
@@ -117,7 +100,7 @@ def read_users(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     ユーザー一覧を取得する（管理者のみ）
@@ -131,7 +114,7 @@ def create_user_admin(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     新規ユーザーを作成する（管理者のみ）
@@ -149,14 +132,14 @@ def create_user_admin(
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user_by_id(
     user_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
     特定のユーザー情報を取得する
     """
     user = get_user(db, id=user_id)
-    if user == current_user:
+    if user and user.id == current_user.id:
         return user
     if not current_user.is_superuser:
         raise HTTPException(
@@ -172,7 +155,7 @@ def update_user_admin(
     db: Session = Depends(get_db),
     user_id: str,
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     ユーザー情報を更新する（管理者のみ）
@@ -192,7 +175,7 @@ def delete_user_admin(
     *,
     db: Session = Depends(get_db),
     user_id: str,
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Dict[str, bool]:
     """
     ユーザーを削除する（管理者のみ）
@@ -0,0 +1,208 @@
+"""
+アクセストークンから組み立てる認証済みの利用者（Principal）とトークンの失効管理
+
+アクセストークンにはユーザーID・ロール・状態・トークンバージョンを含め、
+通常のリクエストではDBを参照せずに利用者を組み立てる。
+パスワード変更・無効化・ロール変更・削除の際はユーザーのトークンバージョンを上げ、
+それより古いバージョンのトークンを失効させる。失効情報はアクセストークンの
+有効期限の間だけ保持すれば十分なため、TTL付きのキャッシュ（Redisで共有可能）に置く。
+プロセス内のみ（memory）の場合は他のプロセスでの失効や再起動前の失効が届かないため、
+キャッシュにないユーザーはDBのトークンバージョンを確認する。
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 失効情報の共有先（memory: プロセス内のみ / redis: Redisで共有 / auto: ステートレス認証ではredis）
+REVOCATION_BACKENDS = ("auto", "memory", "redis")
+
+# 失効していないことを確認済みであることを表す値
+_NOT_REVOKED = -1
+# ユーザーが削除済みで全てのトークンが失効していることを表す値
+_ALL_REVOKED = 2 ** 31
+
+
+class Principal:
+    """
+    認証済みの利用者
+
+    Userモデルと同じ名前の属性・プロパティを持つため、
+    IDとロールしか使わない処理ではUserの代わりに使える。
+    """
+
+    __slots__ = ("id", "role", "status", "token_version")
+
+    def __init__(self, id: str, role: str, status: str, token_version: int = 0):
+        self.id = id
+        self.role = role
+        self.status = status
+        self.token_version = token_version
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        """
+        Userモデルから組み立てる
+        """
+        return cls(
+            id=user.id,
+            role=user.role,
+            status=user.status,
+            token_version=user.token_version or 0,
+        )
+
+    @property
+    def is_active(self) -> bool:
+        """ユーザーがアクティブかどうか"""
+        return self.status == "active"
+
+    @property
+    def is_superuser(self) -> bool:
+        """ユーザーが管理者かどうか"""
+        return self.role == "admin"
+
+    @property
+    def is_moderator(self) -> bool:
+        """ユーザーがモデレーターかどうか"""
+        return self.role in ["admin", "moderator"]
+
+    def __eq__(self, other: Any) -> bool:
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"<Principal {self.id} {self.role}/{self.status}>"
+
+
+def principal_claims(user: Any) -> Dict[str, Any]:
+    """
+    アクセストークンに含めるクレームを返す
+
+    Args:
+        user: ユーザーオブジェクト
+
+    Returns:
+        ロール・状態・トークンバージョンのクレーム
+    """
+    return {
+        "role": user.role,
+        "status": user.status,
+        "ver": user.token_version or 0,
+    }
+
+
+# ユーザーIDと有効な最小のトークンバージョン（_NOT_REVOKEDは失効なし）
+_revoked = TTLCache(maxsize=100000, ttl=settings.AUTH_REVOCATION_LOCAL_TTL)
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def _revocation_ttl() -> int:
+    """
+    失効情報を保持する秒数（それより前に発行したアクセストークンは期限切れになっている）
+    """
+    return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+def revocation_backend() -> str:
+    """
+    失効情報の共有先を返す（autoの場合、ステートレス認証ではredis、それ以外はmemory）
+    """
+    backend = settings.AUTH_REVOCATION_BACKEND
+    if backend not in REVOCATION_BACKENDS:
+        raise ValueError(f"未対応の失効情報の共有先です: {backend}")
+    if backend == "auto":
+        return "redis" if settings.AUTH_MODE == "stateless" else "memory"
+    return backend
+
+
+def _get_redis():
+    """
+    Redisクライアントを返す（backend=redis以外ではNone）
+    """
+    global _redis_client
+    if revocation_backend() != "redis":
+        return None
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                import redis
+
+                _redis_client = redis.Redis.from_url(
+                    settings.REDIS_URL, decode_responses=True
+                )
+    return _redis_client
+
+
+def _redis_key(user_id: str) -> str:
+    return f"auth:revoked:{user_id}"
+
+
+def revoke_tokens(user_id: str, token_version: int) -> None:
+    """
+    token_versionより古いバージョンのトークンを失効させる
+
+    Args:
+        user_id: ユーザーID
+        token_version: 有効な最小のトークンバージョン（更新後のバージョン）
+    """
+    ttl = _revocation_ttl()
+    _revoked.set(user_id, token_version, ttl=ttl)
+    redis = _get_redis()
+    if redis is None:
+        return
+    try:
+        redis.set(_redis_key(user_id), token_version, ex=ttl)
+    except Exception as e:
+        logger.warning(f"トークンの失効情報（Redis）の書き込みに失敗しました: {e}")
+
+
+def is_revoked(
+    user_id: str,
+    token_version: int,
+    load_version: Optional[Callable[[], Optional[int]]] = None,
+) -> bool:
+    """
+    トークンが失効しているかどうか
+
+    Args:
+        user_id: ユーザーID
+        token_version: トークンに含まれるバージョン
+        load_version: DBからユーザーの現在のトークンバージョンを読む関数
+            （ユーザーが存在しない場合はNoneを返す）。memoryの場合、
+            自プロセスのキャッシュにないユーザーはこれで確認する
+
+    Returns:
+        失効している場合はTrue
+    """
+    min_version = _revoked.get(user_id)
+    if min_version is None:
+        min_version = _NOT_REVOKED
+        redis = _get_redis()
+        if redis is not None:
+            try:
+                raw = redis.get(_redis_key(user_id))
+            except Exception as e:
+                logger.warning(f"トークンの失効情報（Redis）の読み出しに失敗しました: {e}")
+                raw = None
+            if raw is not None:
+                min_version = int(raw)
+        elif load_version is not None:
+            current = load_version()
+            min_version = _ALL_REVOKED if current is None else current
+        # 確認した結果を短時間だけ保持する
+        _revoked.set(user_id, min_version)
+    return token_version < min_version
+
+
+def clear_revocations() -> None:
+    """
+    自プロセスの失効情報を全て破棄する
+    """
+    _revoked.clear()
@@ -15,6 +15,10 @@ class Settings(BaseSettings):
     # API設定
     API_V1_STR: str = "/api/v1"
     
+    # APIのワーカープロセス数（uvicorn/gunicornの--workersと同じ値にする）
+    # 2以上の場合、プロセス間で共有が必要なキャッシュなどの既定をRedisにする
+    WEB_CONCURRENCY: int = 1
+    
     # セキュリティ設定
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
@@ -57,9 +61,140 @@ class Settings(BaseSettings):
             path=f"/{os.getenv('MYSQL_DATABASE', 'political_feed_db')}",
         )
     
+    # コネクションプール設定
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # 接続を作り直すまでの秒数（MySQLのwait_timeoutより短くする）
+    DB_POOL_RECYCLE: int = 1800
+    # 空きの接続を待つ最大秒数
+    DB_POOL_TIMEOUT: int = 30
+    
+    # 非同期エンドポイント用のURL（省略時はDATABASE_URLのドライバをaiomysql/aiosqliteに置き換える）
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # 読み取り専用レプリカのURL（カンマ区切り、空の場合はGETもプライマリを使う）
+    DATABASE_REPLICA_URLS: List[str] = []
+    
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def assemble_replica_urls(
+        cls, v: Union[str, List[str]]
+    ) -> Union[List[str], str]:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        elif isinstance(v, (list, str)):
+            return v
+        raise ValueError(v)
+    
     # Redis設定
     REDIS_URL: str = "redis://redis:6379/0"
     
+    # フィード設定
+    # count_mode=cachedで使用する発言数キャッシュの有効期限（秒）と最大件数
+    STATEMENT_COUNT_CACHE_TTL: int = 60
+    STATEMENT_COUNT_CACHE_SIZE: int = 1024
+    # 発言の一括作成（POST /statements/bulk）で1トランザクションにまとめる件数
+    STATEMENT_BULK_CHUNK_SIZE: int = 500
+    
+    # 検索設定
+    # 検索バックエンド（auto, memory, mysql_fulltext, like）
+    SEARCH_BACKEND: str = "auto"
+    # インメモリ索引をデータベースから作り直す間隔（秒、0の場合は作り直さない）
+    SEARCH_INDEX_REFRESH_SECONDS: int = 300
+    # 検索でフィルタ条件を確かめる1回あたりの候補数（関連度順。ページが埋まるまで次の候補に広げる）
+    SEARCH_MAX_CANDIDATES: int = 1000
+    # /search/allでエンティティごとの検索を並列実行するスレッド数とタイムアウト（秒）
+    SEARCH_EXECUTOR_WORKERS: int = 12
+    SEARCH_TIMEOUT_SECONDS: float = 2.0
+    # スレッドプールで実行中・待機中の検索の上限（超えた分は実行せずタイムアウト扱い）
+    SEARCH_EXECUTOR_MAX_PENDING: int = 48
+    
+    # リアクションのライトビハインド設定
+    # none: 直接書き込む / memory: プロセス内バッファ / redis: Redisバッファ（Celeryで反映）
+    REACTION_BUFFER_BACKEND: str = "none"
+    REACTION_BUFFER_FLUSH_SECONDS: int = 5
+    REACTION_BUFFER_FLUSH_BATCH_SIZE: int = 1000
+    # 反映ロックの期限（秒、反映中の処理が落ちた場合に解放されるまでの時間）
+    REACTION_BUFFER_FLUSH_LOCK_SECONDS: int = 60
+    
+    # ホームタイムライン設定
+    # 読み出しにuser_timelineを使うかどうか（書き込み時の展開は常に行う。
+    # 既存データはrebuild_timelinesタスクで構築してから有効にする）
+    HOME_TIMELINE_ENABLED: bool = False
+    # フォロワー数がこの値以上の政治家は展開せず読み出し時に取得する
+    HOME_TIMELINE_CELEBRITY_FOLLOWERS: int = 10000
+    # フォロー開始時に取り込む最近の発言数
+    HOME_TIMELINE_BACKFILL_LIMIT: int = 200
+    
+    # エンティティキャッシュ設定（政治家・政党・トピック）
+    # none: 使わない / memory: プロセス内のみ / redis: プロセス内+Redis
+    ENTITY_CACHE_BACKEND: str = "memory"
+    ENTITY_CACHE_SIZE: int = 10000
+    # プロセス内キャッシュの有効期限（他プロセスでの更新が反映されるまでの最大秒数）
+    ENTITY_CACHE_LOCAL_TTL: int = 30
+    ENTITY_CACHE_REDIS_TTL: int = 600
+    
+    # 認証設定
+    # stateless: アクセストークンのクレームから利用者を組み立てる（DBを参照しない）
+    # database: リクエストごとにユーザーをDBから読み込む
+    AUTH_MODE: str = "stateless"
+    # 失効したトークンバージョンの共有先
+    # redis: Redisで共有 / auto: statelessではredis、databaseではmemory
+    # memory: プロセス内のみ（キャッシュにないユーザーはDBのtoken_versionを確認する）
+    AUTH_REVOCATION_BACKEND: str = "auto"
+    # Redis・DBで確認した失効情報をプロセス内に保持する秒数
+    # （他プロセスでの無効化が反映されるまでの最大秒数）
+    AUTH_REVOCATION_LOCAL_TTL: int = 5
+    
+    # パスワードハッシュ設定
+    # bcryptのコスト（変更するとログイン時に既存のハッシュを再計算する）
+    PASSWORD_HASH_ROUNDS: int = 12
+    # ハッシュ計算用のプロセス数（0の場合はリクエストを処理するスレッドで計算する）
+    PASSWORD_HASH_WORKERS: int = 2
+    # 計算中・待機中のハッシュ計算の上限（超えた場合は429を返す）
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # HTTPレスポンスキャッシュ設定
+    # none: 使わない / memory: プロセス内のみ / redis: Redisで共有
+    # auto: WEB_CONCURRENCYが2以上ならredis、それ以外はmemory
+    # memoryではpurge_tagsが自プロセスのキャッシュしか破棄しないため、他のワーカーや
+    # Celeryタスクでの書き込みはRESPONSE_CACHE_TTL秒まで古い内容が返る
+    RESPONSE_CACHE_BACKEND: str = "auto"
+    RESPONSE_CACHE_SIZE: int = 2048
+    RESPONSE_CACHE_TTL: int = 60
+    
+    # パーソナライズドフィード設定
+    # 候補として取得する発言の期間（日）とソースごとの最大件数
+    # （ページの末尾まで足りない場合は期間・件数を超えて古い発言へ広げる）
+    FEED_CANDIDATE_WINDOW_DAYS: int = 30
+    FEED_CANDIDATE_LIMIT: int = 2000
+    # 新しさのスコアが半分になるまでの時間（feed_preferenceで上書き可能）
+    FEED_RECENCY_HALF_LIFE_HOURS: float = 24.0
+    
+    # リクエストごとのクエリ計測設定
+    # Server-Timingに出し、/metricsでルートごとに集計する
+    QUERY_METRICS_ENABLED: bool = True
+    # リクエストごとに保持する遅いSQLの件数
+    QUERY_METRICS_SLOWEST: int = 3
+    # 遅いSQL（リテラルを伏せた文）をServer-Timingにも含めるかどうか（開発用）
+    QUERY_METRICS_EXPOSE_STATEMENTS: bool = False
+    # しきい値を超えたSQLをパラメータを伏せてapp.slow_queryロガーに出す
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    
+    # データ収集設定
+    # 実行時刻に達したソースを確認してサブタスクを投入する間隔（秒）
+    DATA_COLLECTION_DISPATCH_SECONDS: int = 60
+    # scheduleが空のソースの実行間隔（秒）
+    DATA_COLLECTION_DEFAULT_INTERVAL: int = 3600
+    # 1つのサブタスク内の同時接続数（全体とホストごと）
+    DATA_COLLECTION_MAX_CONNECTIONS: int = 20
+    DATA_COLLECTION_PER_HOST_LIMIT: int = 4
+    # 1リクエストのタイムアウト（秒）と、接続エラー・5xxの再試行回数
+    DATA_COLLECTION_TIMEOUT_SECONDS: float = 30.0
+    DATA_COLLECTION_RETRIES: int = 2
+    DATA_COLLECTION_USER_AGENT: str = "political-feed-collector/0.1"
+    
     # MinIO設定
     MINIO_ENDPOINT: str = "minio:9000"
     MINIO_ACCESS_KEY: str = "minioadmin"
@@ -0,0 +1,70 @@
+"""
+キーセット（カーソル）ページネーション用のユーティリティ
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """
+    カーソルの形式が不正な場合に送出される例外
+    """
+
+
+def encode_cursor(sort: str, key: Any, id: str) -> str:
+    """
+    ソートキーとIDから不透明なカーソル文字列を生成する
+
+    Args:
+        sort: ソート順（date_desc, date_asc, likes）
+        key: ソートキーの値（datetimeまたはint）
+        id: 最後に返した行のID
+
+    Returns:
+        URLセーフなBase64文字列
+    """
+    if isinstance(key, datetime):
+        key = {"dt": key.isoformat()}
+    payload = json.dumps({"s": sort, "k": key, "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    """
+    カーソル文字列をソートキーとIDに復元する
+
+    Args:
+        cursor: encode_cursorで生成したカーソル
+        sort: 現在のリクエストのソート順
+
+    Returns:
+        (ソートキー, ID)のタプル
+
+    Raises:
+        InvalidCursorError: カーソルが不正、またはソート順が一致しない場合
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key = payload["k"]
+        if isinstance(key, dict):
+            key = datetime.fromisoformat(key["dt"])
+        id = str(payload["i"])
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("カーソルが無効です") from e
+
+    if cursor_sort != sort:
+        raise InvalidCursorError("カーソルとソート順が一致しません")
+    return key, id
+
+
+def parse_cursor(cursor: Optional[str], sort: str) -> Optional[Tuple[Any, str]]:
+    """
+    カーソルが指定されていれば復元し、なければNoneを返す
+    """
+    if not cursor:
+        return None
+    return decode_cursor(cursor, sort)
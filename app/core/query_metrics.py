@@ -0,0 +1,292 @@
+"""
+リクエストごとのクエリ数・DB時間の計測
+
+SQLAlchemyのbefore_cursor_execute / after_cursor_executeで全てのエンジンのSQLを計測し、
+実行中のリクエストに集計する（N+1でクエリ数が膨らむエンドポイントを見つけるため）。
+- レスポンスのServer-Timingヘッダーにクエリ数・DB時間・処理時間を付ける
+- ルートごとのヒストグラムに集計し、/metricsでPrometheusのテキスト形式で返す
+- SLOW_QUERY_LOG_ENABLEDの場合、しきい値を超えたSQLをパラメータを伏せてログに出す
+"""
+
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+# ヒストグラムのバケット（秒 / クエリ数）
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# ルートに一致しなかったリクエストのラベル（パスをそのまま使うと系列が増え続けるため）
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestQueryStats:
+    """
+    1リクエストの間に実行されたSQLの集計
+    """
+
+    def __init__(self, keep_slowest: int = 3):
+        self.keep_slowest = keep_slowest
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        # /search/allのように別スレッドからも記録されるためロックする
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            if self.keep_slowest <= 0:
+                return
+            self.slowest.append((seconds, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.keep_slowest :]
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    """
+    実行中のリクエストの集計を返す（リクエスト外ではNone）
+    """
+    return _current.get()
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def redact_statement(statement: str) -> str:
+    """
+    SQLに直接埋め込まれたリテラルを?に置き換え、空白を詰める
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return " ".join(statement.split())
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    パラメータの値を型と長さだけに置き換える（個人情報・トークンをログに残さない）
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if parameters is None:
+        return None
+    if isinstance(parameters, (str, bytes)):
+        return f"<{type(parameters).__name__} len={len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if (
+        settings.SLOW_QUERY_LOG_ENABLED
+        and elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS
+    ):
+        slow_query_logger.warning(
+            "slow query %.1fms: %s params=%s",
+            elapsed * 1000,
+            redact_statement(statement),
+            redact_parameters(parameters),
+        )
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install() -> None:
+    """
+    全てのエンジン（同期・非同期・テスト用）のSQLを計測するイベントを登録する
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+class Histogram:
+    """
+    Prometheus形式のヒストグラム（累積バケット・合計・件数）
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteMetrics:
+    """
+    ルートごとの処理時間・DB時間・クエリ数のヒストグラム
+    """
+
+    METRICS = {
+        "http_request_duration_seconds": (
+            "リクエストの処理時間（秒）",
+            DURATION_BUCKETS,
+        ),
+        "http_request_db_seconds": (
+            "リクエスト中のSQLの実行時間の合計（秒）",
+            DURATION_BUCKETS,
+        ),
+        "http_request_db_queries": (
+            "リクエスト中に実行したSQLの数",
+            QUERY_COUNT_BUCKETS,
+        ),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+
+    def observe(
+        self, method: str, route: str, duration: float, stats: RequestQueryStats
+    ) -> None:
+        values = {
+            "http_request_duration_seconds": duration,
+            "http_request_db_seconds": stats.total_seconds,
+            "http_request_db_queries": stats.count,
+        }
+        with self._lock:
+            for name, value in values.items():
+                key = (name, method, route)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram(self.METRICS[name][1])
+                    self._histograms[key] = histogram
+                histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Prometheusのテキスト形式で出力する
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, (help_text, _) in self.METRICS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, method, route), histogram in sorted(
+                    self._histograms.items()
+                ):
+                    if metric != name:
+                        continue
+                    labels = f'method="{method}",route="{_escape_label(route)}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(
+                            f'{name}_bucket{{{labels},le="{bound:g}"}} {count}'
+                        )
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                    )
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+route_metrics = RouteMetrics()
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """
+    リクエストが一致したルートのテンプレート（例: /api/v1/politicians/{id}）を返す
+
+    include_routerで登録したルートのpathはプレフィックスを含まないため、
+    実際のパスのうちルートの正規表現に一致しない先頭部分をプレフィックスとして補う。
+    """
+    route = scope.get("route")
+    route_path = getattr(route, "path", None)
+    regex = getattr(route, "path_regex", None)
+    if route_path is None or regex is None:
+        return UNMATCHED_ROUTE
+    path = scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and regex.match(path[i:]):
+            return path[:i] + route_path
+    return route_path
+
+
+def server_timing(stats: RequestQueryStats, duration: float) -> str:
+    """
+    Server-Timingヘッダーの値を組み立てる
+    """
+    entries = [
+        f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"',
+        f"app;dur={duration * 1000:.1f}",
+    ]
+    if settings.QUERY_METRICS_EXPOSE_STATEMENTS:
+        for i, (seconds, statement) in enumerate(stats.slowest, start=1):
+            desc = redact_statement(statement)[:80].replace('"', "'")
+            entries.append(f'sql-{i};dur={seconds * 1000:.1f};desc="{desc}"')
+    return ", ".join(entries)
+
+
+class QueryMetricsMiddleware(BaseHTTPMiddleware):
+    """
+    リクエストごとのクエリ数・DB時間を集計し、Server-Timingとルート別の統計に反映する
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestQueryStats(keep_slowest=settings.QUERY_METRICS_SLOWEST)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - started
+
+        route_metrics.observe(
+            request.method, route_template(request.scope), duration, stats
+        )
+        response.headers["Server-Timing"] = server_timing(stats, duration)
+        return response
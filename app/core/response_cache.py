@@ -0,0 +1,337 @@
+"""
+HTTPレスポンスキャッシュ
+
+誰が呼んでもほぼ同じ内容を返すGETエンドポイントのレスポンスを、
+ルート・正規化したクエリパラメータ・（必要な場合は）ユーザーごとのキーで保存する。
+ETag / Last-Modifiedを付与し、If-None-Match / If-Modified-Sinceには304を返す。
+
+保存したレスポンスにはタグ（"topic:{id}"など）を付け、サービス層の書き込み処理から
+purge_tagsで破棄する。タグで破棄しきれない変化（発言数など）はTTLで反映される。
+プロセス内のキャッシュ（memory）では他のプロセスでの破棄が届かないため、
+複数ワーカー構成ではRedis（redis）で共有する。
+"""
+import base64
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRule:
+    """
+    キャッシュ対象のルート
+
+    Args:
+        path: パスのテンプレート（例: "/api/v1/topics/{id}"）
+        tags: 破棄に使うタグのテンプレート（パスパラメータで展開する）
+        ttl: 有効期限（秒、省略時はRESPONSE_CACHE_TTL）
+        vary_user: ログイン状態によって内容が変わる場合はTrue（Authorizationごとに保存）
+    """
+
+    def __init__(
+        self,
+        path: str,
+        tags: Sequence[str] = (),
+        ttl: Optional[int] = None,
+        vary_user: bool = False,
+    ):
+        self.path = path
+        self.tags = tuple(tags)
+        self.ttl = ttl
+        self.vary_user = vary_user
+        pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(path.rstrip("/")))
+        self._regex = re.compile(f"^{pattern}/?$")
+
+    def match(self, path: str) -> Optional[Dict[str, str]]:
+        """
+        パスが一致する場合はパスパラメータを返す
+        """
+        matched = self._regex.match(path)
+        return matched.groupdict() if matched else None
+
+
+class CachedResponse(NamedTuple):
+    """
+    保存したレスポンス
+    """
+    body: bytes
+    media_type: str
+    etag: str
+    last_modified: float
+
+
+class ResponseCacheStore:
+    """
+    レスポンスの保存先の基底クラス
+    """
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CachedResponse, ttl: int, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def purge(self, tags: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryResponseCache(ResponseCacheStore):
+    """
+    プロセス内のLRUに保存する（破棄は自プロセスのみ）
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self._entries = TTLCache(maxsize=maxsize, ttl=settings.RESPONSE_CACHE_TTL)
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CachedResponse, ttl: int, tags: Iterable[str]) -> None:
+        self._entries.set(key, entry, ttl=ttl)
+        with self._lock:
+            for tag in tags:
+                keys = self._tags.setdefault(tag, set())
+                keys.add(key)
+                # 期限切れ・追い出し済みのキーを間引く
+                if len(keys) > self._maxsize:
+                    keys.intersection_update(k for k in list(keys) if k in self._entries)
+
+    def purge(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.pop(tag, set())
+        for key in keys:
+            self._entries.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._tags.clear()
+
+
+class RedisResponseCache(ResponseCacheStore):
+    """
+    Redisに保存する（複数プロセスで共有し、破棄も全プロセスに反映される）
+    """
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "response_cache"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self._prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}:tag:{tag}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self._redis.get(f"{self._prefix}:{key}")
+        if raw is None:
+            return None
+        body, media_type, etag, last_modified = json.loads(raw)
+        return CachedResponse(base64.b64decode(body), media_type, etag, last_modified)
+
+    def set(self, key: str, entry: CachedResponse, ttl: int, tags: Iterable[str]) -> None:
+        raw = json.dumps([
+            base64.b64encode(entry.body).decode("ascii"),
+            entry.media_type, entry.etag, entry.last_modified
+        ])
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.set(f"{self._prefix}:{key}", raw, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            pipe.expire(self._tag_key(tag), ttl * 2)
+        pipe.execute()
+
+    def purge(self, tags: Iterable[str]) -> int:
+        keys = set()
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        for tag_key in tag_keys:
+            keys |= self._redis.smembers(tag_key)
+        if keys or tag_keys:
+            self._redis.delete(*[f"{self._prefix}:{key}" for key in keys], *tag_keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(f"{self._prefix}:*"):
+            self._redis.delete(key)
+
+
+_store: Optional[ResponseCacheStore] = None
+_store_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCacheStore]:
+    """
+    設定に応じたレスポンスキャッシュを返す（無効な場合はNone）
+    """
+    global _store
+    backend = settings.RESPONSE_CACHE_BACKEND
+    if backend == "auto":
+        backend = "redis" if settings.WEB_CONCURRENCY > 1 else "memory"
+    if backend == "none" and _store is None:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if backend == "memory":
+                    if settings.WEB_CONCURRENCY > 1:
+                        logger.warning(
+                            "レスポンスキャッシュがプロセス内のみのため、他のワーカーでの"
+                            f"更新は最大{settings.RESPONSE_CACHE_TTL}秒反映されません"
+                        )
+                    _store = InMemoryResponseCache(settings.RESPONSE_CACHE_SIZE)
+                elif backend == "redis":
+                    _store = RedisResponseCache()
+                else:
+                    raise ValueError(f"未対応のレスポンスキャッシュです: {backend}")
+    return _store
+
+
+def set_response_cache(store: Optional[ResponseCacheStore]) -> None:
+    """
+    レスポンスキャッシュを差し替える（Noneの場合は次回取得時に設定から作り直す）
+    """
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def purge_tags(*tags: str) -> None:
+    """
+    タグの付いたレスポンスを破棄する（書き込み処理から呼び出す）
+
+    キャッシュの障害で書き込み処理が失敗しないよう、エラーはログに残して無視する。
+    """
+    store = get_response_cache()
+    if store is None or not tags:
+        return
+    try:
+        store.purge(tags)
+    except Exception as e:
+        logger.warning(f"レスポンスキャッシュの破棄に失敗しました: {tags}: {e}")
+
+
+def _cache_key(request: Request, rule: CacheRule) -> str:
+    """
+    ルート・正規化したクエリパラメータ・ユーザーごとの区別からキーを作る
+    """
+    params = sorted(
+        (name, value) for name, value in parse_qsl(request.url.query) if value != ""
+    )
+    variant = ""
+    authorization = request.headers.get("authorization")
+    if rule.vary_user and authorization:
+        variant = hashlib.sha256(authorization.encode()).hexdigest()
+    raw = f"{request.url.path.rstrip('/')}?{urlencode(params)}|{variant}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    """
+    条件付きGETの条件に一致する（304を返せる）かどうか
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or entry.etag in candidates or f"W/{entry.etag}" in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.last_modified) <= since
+    return False
+
+
+def _headers(entry: CachedResponse, rule: CacheRule, private: bool, ttl: int) -> Dict[str, str]:
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": f"{'private' if private else 'public'}, max-age={ttl}",
+    }
+    if rule.vary_user:
+        headers["Vary"] = "Authorization"
+    return headers
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    ルールに一致するGETリクエストのレスポンスをキャッシュするミドルウェア
+    """
+
+    def __init__(self, app, rules: List[CacheRule]):
+        super().__init__(app)
+        self.rules = rules
+
+    def _match(self, path: str) -> Tuple[Optional[CacheRule], Dict[str, str]]:
+        for rule in self.rules:
+            params = rule.match(path)
+            if params is not None:
+                return rule, params
+        return None, {}
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method not in ("GET", "HEAD"):
+            return await call_next(request)
+        rule, params = self._match(request.url.path)
+        store = get_response_cache() if rule else None
+        if store is None:
+            return await call_next(request)
+
+        key = _cache_key(request, rule)
+        ttl = rule.ttl or settings.RESPONSE_CACHE_TTL
+        private = rule.vary_user and "authorization" in request.headers
+
+        try:
+            entry = store.get(key)
+        except Exception as e:
+            logger.warning(f"レスポンスキャッシュの読み出しに失敗しました: {e}")
+            entry = None
+
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = CachedResponse(
+                body=body,
+                media_type=response.headers.get("content-type", "application/json"),
+                etag=f'"{hashlib.sha1(body).hexdigest()}"',
+                last_modified=time.time(),
+            )
+            tags = [tag.format(**params) for tag in rule.tags]
+            try:
+                store.set(key, entry, ttl, tags)
+            except Exception as e:
+                logger.warning(f"レスポンスキャッシュへの書き込みに失敗しました: {e}")
+            cache_status = "MISS"
+        else:
+            cache_status = "HIT"
+
+        headers = _headers(entry, rule, private, ttl)
+        headers["X-Cache"] = cache_status
+        if _not_modified(request, entry):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
@@ -1,15 +1,46 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 from app.core.config import settings
 from jose import jwt
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+
+def _crypt_context(rounds: int) -> CryptContext:
+    """
+    指定したコストのbcryptを使うCryptContextを作る
+
+    コストの上限・下限も同じ値にし、異なるコストのハッシュはneeds_updateで検出する。
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+pwd_context = _crypt_context(settings.PASSWORD_HASH_ROUNDS)
+
+
+class PasswordHashingBusyError(Exception):
+    """
+    ハッシュ計算の待ちが上限に達している（429として返す）
+    """
 
 
 def create_access_token(
-    subject: Union[str, Any] = None, expires_delta: Optional[timedelta] = None, data: dict = None
+    subject: Union[str, Any] = None,
+    expires_delta: Optional[timedelta] = None,
+    data: dict = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     アクセストークンを生成する
@@ -18,6 +49,7 @@ def create_access_token(
         subject: トークンのサブジェクト（通常はユーザーID）
         expires_delta: トークンの有効期限
         data: トークンに含めるデータ（下位互換性のため）
+        claims: 追加のクレーム（ロール・トークンバージョンなど）
         
     Returns:
         生成されたJWTトークン
@@ -34,6 +66,8 @@ def create_access_token(
         subject = data["sub"]
     
     to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -41,7 +75,10 @@ def create_access_token(
 
 
 def create_refresh_token(
-    subject: Union[str, Any] = None, expires_delta: Optional[timedelta] = None, data: dict = None
+    subject: Union[str, Any] = None,
+    expires_delta: Optional[timedelta] = None,
+    data: dict = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     リフレッシュトークンを生成する
@@ -50,6 +87,7 @@ def create_refresh_token(
         subject: トークンのサブジェクト（通常はユーザーID）
         expires_delta: トークンの有効期限
         data: トークンに含めるデータ（下位互換性のため）
+        claims: 追加のクレーム（ロール・トークンバージョンなど）
         
     Returns:
         生成されたJWTトークン
@@ -66,15 +104,68 @@ def create_refresh_token(
         subject = data["sub"]
         
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
+# ハッシュ計算用のプロセスプール（最初の利用時に作成する）
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(max(settings.PASSWORD_HASH_MAX_PENDING, 1))
+
+
+def _hash_in_worker(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+
+def _verify_in_worker(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    プロセスプールを返す（PASSWORD_HASH_WORKERSが0の場合はNone）
+    """
+    global _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # スレッドを持つ親プロセスをforkしないようspawnで起動する
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _run(func: Callable, *args: Any) -> Any:
+    """
+    ハッシュ計算をプロセスプールで実行し、結果を待つ
+
+    Raises:
+        PasswordHashingBusyError: 計算中・待機中の件数が上限に達している場合
+    """
+    if not _pending.acquire(blocking=False):
+        raise PasswordHashingBusyError("ただいま混み合っています。しばらくしてから再度お試しください")
+    try:
+        pool = _get_pool()
+        if pool is None:
+            return func(*args)
+        future: Future = pool.submit(func, *args)
+        return future.result()
+    finally:
+        _pending.release()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    平文パスワードとハッシュ化されたパスワードを検証する
+    平文パスワードとハッシュ化されたパスワードを検証する（プロセスプールで計算する）
     
     Args:
         plain_password: 平文パスワード
@@ -82,18 +173,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         
     Returns:
         パスワードが一致する場合はTrue、それ以外はFalse
+        
+    Raises:
+        PasswordHashingBusyError: ハッシュ計算が混み合っている場合
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run(_verify_in_worker, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
-    パスワードをハッシュ化する
+    パスワードをハッシュ化する（プロセスプールで計算する）
     
     Args:
         password: 平文パスワード
         
     Returns:
         ハッシュ化されたパスワード
+        
+    Raises:
+        PasswordHashingBusyError: ハッシュ計算が混み合っている場合
+    """
+    return _run(_hash_in_worker, password, settings.PASSWORD_HASH_ROUNDS)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    ハッシュのコストが現在の設定と異なり、再計算が必要かどうか
+    
+    Args:
+        hashed_password: ハッシュ化されたパスワード
+        
+    Returns:
+        再計算が必要な場合はTrue
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    try:
+        return pwd_context.needs_update(hashed_password)
+    except ValueError:
+        return False
@@ -0,0 +1,98 @@
+"""
+非同期エンドポイント用のデータベースセッション
+
+読み出しの多いエンドポイントはasync defで実装し、AsyncSession（aiomysql / aiosqlite）で
+イベントループ上からクエリを発行する。スレッドプールの上限に縛られずに同時リクエストを捌ける。
+同期エンジンと同じく接続の取り出しを計測し（/health/db・/metricsに"async_primary"などの
+名前で出る）、読み取り専用のセッションはSELECTをレプリカに振り分ける。
+"""
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, instrument_engine
+from app.db.session import RoutingSession, pool_engines, pool_metrics
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+# 同期ドライバと非同期ドライバの対応
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    同期ドライバのURLを非同期ドライバのURLに変換する
+
+    Args:
+        url: データベースURL（例: mysql+pymysql://...）
+
+    Returns:
+        非同期ドライバのURL（例: mysql+aiomysql://...）
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def create_async_db_engine(url: str, **overrides: Any) -> AsyncEngine:
+    """
+    プールの設定を適用した非同期エンジンを作成する
+
+    Args:
+        url: 非同期ドライバのデータベースURL
+        overrides: 設定値を上書きするcreate_async_engineの引数
+
+    Returns:
+        非同期エンジン
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+
+# 非同期エンジンの作成
+async_engine = create_async_db_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(str(settings.DATABASE_URL))
+)
+
+# 読み取り専用レプリカの非同期エンジン
+async_replica_engines: List[AsyncEngine] = [
+    create_async_db_engine(async_database_url(url))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+# プールの計測値を同期エンジンと同じ一覧に登録する
+for _name, _engine in [("async_primary", async_engine)] + [
+    (f"async_replica{i}", replica) for i, replica in enumerate(async_replica_engines)
+]:
+    pool_engines[_name] = _engine.sync_engine
+    pool_metrics[_name] = instrument_engine(_engine.sync_engine, _name)
+
+
+class AsyncRoutingSession(RoutingSession):
+    """
+    AsyncSessionの内部で使う、SELECTを非同期エンジンのレプリカに振り分けるセッション
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        kwargs.setdefault(
+            "replicas", [replica.sync_engine for replica in async_replica_engines]
+        )
+        super().__init__(*args, **kwargs)
+
+
+# セッションファクトリの作成（コミット後もレスポンスの組み立てに使えるよう期限切れにしない）
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=AsyncRoutingSession,
+)
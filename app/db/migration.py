@@ -0,0 +1,81 @@
+"""
+Alembicのマイグレーションから使う補助関数
+
+既存のデータベースはcreate_all（init_db）で作られていることがあるため、
+マイグレーションは「まだ無いものだけを作る」ように書く。
+MySQLではインデックスをオンライン（ALGORITHM=INPLACE, LOCK=NONE）で作成し、
+作成中も読み書きを止めない。
+"""
+
+from typing import Sequence
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+def has_table(table: str) -> bool:
+    """
+    テーブルが存在するかを返す
+    """
+    return inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    """
+    カラムが存在するかを返す
+    """
+    return any(c["name"] == column for c in inspect(op.get_bind()).get_columns(table))
+
+
+def has_index(table: str, name: str) -> bool:
+    """
+    インデックスが存在するかを返す
+    """
+    return any(i["name"] == name for i in inspect(op.get_bind()).get_indexes(table))
+
+
+def is_mysql() -> bool:
+    return op.get_bind().dialect.name == "mysql"
+
+
+def create_index_online(
+    name: str, table: str, columns: Sequence[str], unique: bool = False
+) -> None:
+    """
+    インデックスが無ければ作成する（MySQLではテーブルをロックしない）
+
+    Args:
+        name: インデックス名
+        table: テーブル名
+        columns: インデックスのカラム（先頭から順に）
+        unique: 一意インデックスにする場合はTrue
+    """
+    if has_index(table, name):
+        return
+    if is_mysql():
+        column_list = ", ".join(f"`{c}`" for c in columns)
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        op.execute(
+            f"ALTER TABLE `{table}` ADD {kind} `{name}` ({column_list}), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.create_index(name, table, list(columns), unique=unique)
+
+
+def drop_index_online(name: str, table: str) -> None:
+    """
+    インデックスが有れば削除する（MySQLではテーブルをロックしない）
+
+    Args:
+        name: インデックス名
+        table: テーブル名
+    """
+    if not has_index(table, name):
+        return
+    if is_mysql():
+        op.execute(
+            f"ALTER TABLE `{table}` DROP INDEX `{name}`, ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.drop_index(name, table_name=table)
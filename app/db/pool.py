@@ -0,0 +1,159 @@
+"""
+コネクションプールの計測
+
+空きの接続を待った時間・使用中の接続数・オーバーフロー・pre-pingの失敗を数え、
+/health/dbで確認できるようにする。待ち時間はプールのイベントでは測れないため、
+QueuePool（非同期エンジンではAsyncAdaptedQueuePool）のサブクラスで接続の取り出しを計測する。
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    1つのエンジンのプールの計測値
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_wait_total = 0.0
+            self.checkout_wait_max = 0.0
+            self.timeouts = 0
+            self.in_use = 0
+            self.in_use_max = 0
+            self.connects = 0
+            self.pre_ping_failures = 0
+            self.invalidations = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+
+    def add_in_use(self, n: int) -> None:
+        with self._lock:
+            self.in_use += n
+            self.in_use_max = max(self.in_use_max, self.in_use)
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            setattr(self, key, getattr(self, key) + 1)
+
+    def snapshot(self, pool: Any) -> Dict[str, Any]:
+        """
+        計測値とプールの現在の状態を返す
+        """
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checkout_wait_avg_ms": (
+                    round(self.checkout_wait_total / self.checkouts * 1000, 3)
+                    if self.checkouts else None
+                ),
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+                "checkout_timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "in_use_max": self.in_use_max,
+                "connects": self.connects,
+                "pre_ping_failures": self.pre_ping_failures,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return stats
+
+
+class _InstrumentedPool:
+    """
+    接続の取り出しにかかった時間を計測するプールのミックスイン
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """
+    接続の取り出しにかかった時間を計測するQueuePool
+    """
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """
+    接続の取り出しにかかった時間を計測するAsyncAdaptedQueuePool（非同期エンジン用）
+    """
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """
+    エンジンのプールに計測用のイベントを登録する
+
+    Args:
+        engine: エンジン（非同期エンジンの場合はsync_engine）
+        name: 計測値の名前（primary, replica0など）
+
+    Returns:
+        計測値
+    """
+    metrics = PoolMetrics(name)
+    if isinstance(engine.pool, _InstrumentedPool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.add_in_use(1)
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.add_in_use(-1)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        if context.is_pre_ping:
+            metrics.count("pre_ping_failures")
+
+    return metrics
@@ -0,0 +1,77 @@
+"""
+リクエストごとのデータベースセッションの払い出し
+
+環境（本番・テスト）による違いは起動時に選んだプロバイダーに閉じ込め、
+リクエストごとの処理はセッションの取り出しと後始末だけにする。
+"""
+import logging
+import threading
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+# 読み出しをレプリカに振り分けてよいHTTPメソッド
+READ_ONLY_METHODS = frozenset(("GET", "HEAD"))
+
+
+class SessionProvider:
+    """
+    セッションの払い出し方の基底クラス
+    """
+
+    def __call__(self, request: Request) -> Iterator[Session]:
+        raise NotImplementedError
+
+
+class PooledSessionProvider(SessionProvider):
+    """
+    リクエストごとにコネクションプールからセッションを作り、終了時にクローズする（本番用）
+    """
+
+    def __init__(self, factory: Callable[[], Session]):
+        self.factory = factory
+
+    def __call__(self, request: Request) -> Iterator[Session]:
+        db = self.factory()
+        db.info["read_only"] = request.method in READ_ONLY_METHODS
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+class SharedSessionProvider(SessionProvider):
+    """
+    全てのリクエストで1つのセッションを使い回す（テスト用、クローズしない）
+
+    テストのフィクスチャで作成・変更したデータを、コミット前でもAPIから参照できるようにする。
+    """
+
+    def __init__(self, factory: Callable[[], Session]):
+        self.factory = factory
+        self._session: Optional[Session] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, session: Session) -> "SharedSessionProvider":
+        """
+        作成済みのセッションを使い回すプロバイダーを作る
+        """
+        provider = cls(lambda: session)
+        provider._session = session
+        return provider
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.factory()
+                    logger.debug("共有セッションを作成しました: %r", self._session)
+        return self._session
+
+    def __call__(self, request: Request) -> Iterator[Session]:
+        yield self.session
@@ -1,29 +1,117 @@
+import random
+from typing import Any, Dict, List
+
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, PoolMetrics, instrument_engine
 from sqlalchemy import create_engine
+from starlette.requests import Request
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+
+
+def create_db_engine(url: str, **overrides: Any) -> Engine:
+    """
+    プールの設定を適用したエンジンを作成する
+
+    Args:
+        url: データベースURL
+        overrides: 設定値を上書きするcreate_engineの引数
+
+    Returns:
+        エンジン
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    options.update(overrides)
+    return create_engine(url, **options)
+
 
 # SQLAlchemyエンジンの作成
-engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True)
+engine = create_db_engine(str(settings.DATABASE_URL))
+
+# 読み取り専用レプリカのエンジン
+replica_engines: List[Engine] = [
+    create_db_engine(url) for url in settings.DATABASE_REPLICA_URLS
+]
+
+# 計測対象のエンジン（非同期エンジンはapp.db.async_sessionで登録する）
+pool_engines: Dict[str, Engine] = {"primary": engine}
+pool_engines.update({f"replica{i}": replica for i, replica in enumerate(replica_engines)})
+
+# エンジンごとのプールの計測値
+pool_metrics: Dict[str, PoolMetrics] = {
+    name: instrument_engine(target, name) for name, target in pool_engines.items()
+}
+
+
+class RoutingSession(Session):
+    """
+    読み取り専用のセッションではSELECTをレプリカに振り分けるセッション
+
+    info["read_only"]がTrueのセッションのみ対象とし、書き込み（flushやUPDATE/DELETE文）は
+    プライマリに送る。一度書き込んだセッションは以降の読み出しもプライマリを使う。
+    """
+
+    def __init__(self, *args: Any, replicas: List[Engine] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replicas = replica_engines if replicas is None else replicas
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif self.info.get("read_only") and self.replicas and not self.info.get("wrote"):
+            # 同じセッションの読み出しは同じレプリカに送る
+            if "replica" not in self.info:
+                self.info["replica"] = random.choice(self.replicas)
+            return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
 
 # セッションファクトリの作成
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine
+)
 
 # モデルのベースクラス
 Base = declarative_base()
 
 
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    エンジンごとのプールの計測値を返す
+    """
+    return {
+        name: pool_metrics[name].snapshot(target.pool)
+        for name, target in pool_engines.items()
+    }
+
+
 # 依存性注入用のセッション取得関数
-def get_db():
+def get_db(request: Request):
     """
     リクエストごとにデータベースセッションを取得し、リクエスト完了後にクローズする
     FastAPIの依存性注入システムで使用される
+    GET/HEADリクエストのセッションは読み出しをレプリカに振り分ける（レプリカがある場合）
     
+    Args:
+        request: リクエスト
+        
     Yields:
         SQLAlchemy DBセッション
     """
     db = SessionLocal()
+    db.info["read_only"] = request.method in ("GET", "HEAD")
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
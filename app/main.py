@@ -1,7 +1,13 @@
 from app.api.v1.api import api_router
 from app.core.config import settings
-from fastapi import FastAPI
+from app.core.pagination import InvalidCursorError
+from app.core.query_metrics import QueryMetricsMiddleware
+from app.core.query_metrics import install as install_query_metrics
+from app.core.response_cache import CacheRule, ResponseCacheMiddleware
+from app.core.security import PasswordHashingBusyError
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 
@@ -23,10 +29,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 誰が呼んでもほぼ同じ内容を返すエンドポイントのレスポンスキャッシュ
+# タグはサービス層の書き込み処理でpurge_tagsにより破棄する
+app.add_middleware(
+    ResponseCacheMiddleware,
+    rules=[
+        CacheRule(f"{settings.API_V1_STR}/topics/trending", tags=["topics"]),
+        CacheRule(
+            f"{settings.API_V1_STR}/topics/{{topic_id}}/parties",
+            tags=["topic:{topic_id}", "topic:{topic_id}:parties", "party_topic_stats"],
+        ),
+        CacheRule(
+            f"{settings.API_V1_STR}/topics/{{id}}",
+            tags=["topic:{id}"],
+            vary_user=True,
+        ),
+        CacheRule(f"{settings.API_V1_STR}/parties", tags=["parties"]),
+        CacheRule(f"{settings.API_V1_STR}/parties/{{id}}", tags=["party:{id}"]),
+        CacheRule(
+            f"{settings.API_V1_STR}/parties/{{party_id}}/topics",
+            tags=["party:{party_id}:topics", "party_topic_stats"],
+        ),
+        CacheRule(f"{settings.API_V1_STR}/politicians/{{id}}", tags=["politician:{id}"]),
+    ],
+)
+
+# リクエストごとのクエリ数・DB時間の計測（キャッシュのヒットも含めて測るため最も外側に置く）
+if settings.QUERY_METRICS_ENABLED:
+    install_query_metrics()
+    app.add_middleware(QueryMetricsMiddleware)
+
 # APIルーターの登録
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+# 不正なページネーションカーソルは400として返す
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)},
+    )
+
+
+# パスワードのハッシュ計算が混み合っている場合は429として返す
+@app.exception_handler(PasswordHashingBusyError)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 # カスタムOpenAPIドキュメントの設定
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
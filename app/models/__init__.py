@@ -7,9 +7,11 @@ from app.models.data_collection import (
 )
 from app.models.follows import PoliticianFollow, TopicFollow
 from app.models.party import Party, PartyDetail
+from app.models.party_topic_stat import PartyTopicStat
 from app.models.politician import Politician, PoliticianDetail, PoliticianParty
 from app.models.report import CommentReport
 from app.models.statement import Statement, StatementReaction, StatementTopic
+from app.models.timeline import UserTimeline
 from app.models.topic import Topic, TopicRelation
 from app.models.user import User
 from app.models.user_settings import UserSettings
@@ -22,9 +24,11 @@ __all__ = [
     "DataCollectionLog", "DataCollectionSource", "SystemLog",
     "PoliticianFollow", "TopicFollow",
     "Party", "PartyDetail",
+    "PartyTopicStat",
     "Politician", "PoliticianDetail", "PoliticianParty",
     "CommentReport",
     "Statement", "StatementReaction", "StatementTopic",
+    "UserTimeline",
     "Topic", "TopicRelation",
     "User",
     "UserSettings"
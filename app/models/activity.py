@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,13 @@ class UserActivity(Base):
     ユーザーアクティビティモデル
     """
     __tablename__ = "user_activities"
+    __table_args__ = (
+        # 閲覧履歴など、種別・対象ごとのアクティビティ一覧（新しい順）用
+        Index(
+            "ix_user_activities_user_type_target_created",
+            "user_id", "activity_type", "target_type", "created_at"
+        ),
+    )
 
     id = Column(
         CHAR(36),
@@ -55,6 +62,12 @@ class Notification(Base):
     通知モデル
     """
     __tablename__ = "notifications"
+    __table_args__ = (
+        # 既読/未読で絞り込んだ通知一覧（新しい順）用
+        Index(
+            "ix_notifications_user_read_created", "user_id", "is_read", "created_at"
+        ),
+    )
 
     id = Column(
         CHAR(36),
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,13 @@ class Comment(Base):
     コメントモデル
     """
     __tablename__ = "comments"
+    __table_args__ = (
+        # 発言ごとのコメント・返信一覧（投稿日時順）用
+        Index(
+            "ix_comments_statement_parent_status_created",
+            "statement_id", "parent_id", "status", "created_at"
+        ),
+    )
 
     id = Column(
         CHAR(36),
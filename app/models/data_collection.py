@@ -43,6 +43,10 @@ class DataCollectionSource(Base):
     is_active = Column(Boolean, default=True, nullable=False, index=True)
     last_run_at = Column(DateTime, nullable=True)
     next_run_at = Column(DateTime, nullable=True, index=True)
+    # 差分収集用：最後に取得した最新アイテムのIDと公開日時
+    # （これより古い未取得のアイテムは取り込まない）
+    last_item_id = Column(String(2083), nullable=True)
+    last_item_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
@@ -55,11 +59,74 @@ class DataCollectionSource(Base):
     logs = relationship(
         "DataCollectionLog", back_populates="source", cascade="all, delete-orphan"
     )
+    fetch_states = relationship(
+        "DataCollectionFetchState",
+        back_populates="source",
+        cascade="all, delete-orphan"
+    )
+    items = relationship(
+        "DataCollectionItem", back_populates="source", cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<DataCollectionSource {self.name}>"
 
 
+class DataCollectionFetchState(Base):
+    """
+    データ収集ソースのURLごとの取得状態（条件付きリクエスト用）
+    """
+    __tablename__ = "data_collection_fetch_states"
+
+    source_id = Column(
+        CHAR(36),
+        ForeignKey("data_collection_sources.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    url_hash = Column(CHAR(64), primary_key=True)  # URLのSHA-256
+    url = Column(String(2083), nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    # 本文のSHA-256（ETag・Last-Modifiedを返さないサーバーで変更の有無を判定する）
+    content_hash = Column(CHAR(64), nullable=True)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # リレーションシップ
+    source = relationship("DataCollectionSource", back_populates="fetch_states")
+
+    def __repr__(self) -> str:
+        return f"<DataCollectionFetchState {self.url}>"
+
+
+class DataCollectionItem(Base):
+    """
+    データ収集ソースで取得済みのアイテム（内容のハッシュで変更の有無を判定する）
+    """
+    __tablename__ = "data_collection_items"
+
+    source_id = Column(
+        CHAR(36),
+        ForeignKey("data_collection_sources.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    item_key = Column(CHAR(64), primary_key=True)  # アイテムのURLのSHA-256
+    content_hash = Column(CHAR(64), nullable=False)
+    statement_id = Column(
+        CHAR(36),
+        ForeignKey("statements.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+    first_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # リレーションシップ
+    source = relationship("DataCollectionSource", back_populates="items")
+
+    def __repr__(self) -> str:
+        return f"<DataCollectionItem {self.item_key}>"
+
+
 class DataCollectionLog(Base):
     """
     データ収集ログモデル
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from app.db.session import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.dialects.mysql import CHAR
+
+
+class PartyTopicStat(Base):
+    """
+    政党×トピックごとの発言集計（発言・所属の変更時に差分更新し、定期タスクで再構築）
+    """
+    __tablename__ = "party_topic_stats"
+    __table_args__ = (
+        # トピックの政党別スタンス一覧（発言数の多い順）用
+        Index("ix_party_topic_stats_topic_count", "topic_id", "statement_count"),
+    )
+
+    party_id = Column(
+        CHAR(36),
+        ForeignKey("parties.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    topic_id = Column(
+        CHAR(36),
+        ForeignKey("topics.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    statement_count = Column(Integer, default=0, nullable=False)
+    last_statement_date = Column(DateTime, nullable=True)
+    latest_statement_ids = Column(Text, nullable=True)  # JSON形式で保存（新しい順）
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<PartyTopicStat {self.party_id} - {self.topic_id}>"
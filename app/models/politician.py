@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,13 @@ class Politician(Base):
     政治家モデル
     """
     __tablename__ = "politicians"
+    __table_args__ = (
+        # 全文検索用（SEARCH_BACKEND=mysql_fulltext）。MySQLでのみ作成する
+        Index(
+            "ft_politicians_name_profile", "name", "name_kana", "profile_summary",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+        ).ddl_if(dialect="mysql"),
+    )
 
     id = Column(
         CHAR(36),
@@ -36,6 +43,9 @@ class Politician(Base):
     )
     image_url = Column(String(255), nullable=True)
     profile_summary = Column(Text, nullable=True)
+    # フォロワー数がHOME_TIMELINE_CELEBRITY_FOLLOWERS以上の政治家（発言をタイムラインへ展開せず
+    # 読み出し時に取得する）。フォロー・フォロー解除時に切り替え、全プロセスで共有する
+    fan_out_on_read = Column(Boolean, default=False, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
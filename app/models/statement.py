@@ -2,16 +2,43 @@ import uuid
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
 
+# リアクション種別と、発言テーブル上の件数カラムの対応
+REACTION_COUNT_COLUMNS = {
+    "like": "likes_count",
+    "dislike": "dislikes_count",
+    "agree": "agrees_count",
+    "disagree": "disagrees_count",
+    "important": "important_count",
+    "fake": "fake_count",
+}
+
+
 class Statement(Base):
     """
     政治家発言モデル
     """
     __tablename__ = "statements"
+    __table_args__ = (
+        # 全文検索用（SEARCH_BACKEND=mysql_fulltext）。MySQLでのみ作成する
+        Index(
+            "ft_statements_title_content", "title", "content",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+        ).ddl_if(dialect="mysql"),
+        # いいね順ソート（キーセットページネーション）用
+        Index("ix_statements_likes_count_id", "likes_count", "id"),
+        # 公開中の発言一覧（日付順・キーセット）用
+        Index("ix_statements_status_date_id", "status", "statement_date", "id"),
+        # 政治家ごとの発言一覧（日付順・キーセット）用
+        Index(
+            "ix_statements_politician_status_date_id",
+            "politician_id", "status", "statement_date", "id"
+        ),
+    )
 
     id = Column(
         CHAR(36),
@@ -40,6 +67,14 @@ class Statement(Base):
     importance = Column(
         Integer, default=0, nullable=False, index=True
     )  # 重要度（0-100）
+    # 非正規化した件数（リアクション・コメントの追加/削除時に加算し、定期タスクで補正する）
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    dislikes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    agrees_count = Column(Integer, default=0, server_default="0", nullable=False)
+    disagrees_count = Column(Integer, default=0, server_default="0", nullable=False)
+    important_count = Column(Integer, default=0, server_default="0", nullable=False)
+    fake_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comments_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
@@ -93,6 +128,19 @@ class StatementReaction(Base):
     発言へのリアクションモデル
     """
     __tablename__ = "statement_reactions"
+    __table_args__ = (
+        # ユーザーがリアクションした発言一覧（新しい順）用
+        Index(
+            "ix_statement_reactions_user_type_created",
+            "user_id", "reaction_type", "created_at"
+        ),
+        # 同じユーザーの同じ種別のリアクションは1件のみ
+        Index(
+            "uq_statement_reactions_statement_user_type",
+            "statement_id", "user_id", "reaction_type",
+            unique=True
+        ),
+    )
 
     id = Column(
         CHAR(36),
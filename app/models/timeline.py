@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from app.db.session import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.mysql import CHAR
+
+
+class UserTimeline(Base):
+    """
+    ユーザーごとのホームタイムライン（フォロー中の政治家の発言を書き込み時に展開）
+    """
+    __tablename__ = "user_timeline"
+    __table_args__ = (
+        # タイムラインの読み出し（新しい順・キーセット）用
+        Index(
+            "ix_user_timeline_user_date", "user_id", "statement_date", "statement_id"
+        ),
+        # フォロー解除時の削除用
+        Index("ix_user_timeline_user_politician", "user_id", "politician_id"),
+    )
+
+    user_id = Column(
+        CHAR(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    statement_id = Column(
+        CHAR(36),
+        ForeignKey("statements.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True
+    )
+    politician_id = Column(
+        CHAR(36),
+        ForeignKey("politicians.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # 並び替えのために発言日時を複製して持つ
+    statement_date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserTimeline {self.user_id} <- {self.statement_id}>"
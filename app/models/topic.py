@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,13 @@ class Topic(Base):
     政策トピックモデル
     """
     __tablename__ = "topics"
+    __table_args__ = (
+        # 全文検索用（SEARCH_BACKEND=mysql_fulltext）。MySQLでのみ作成する
+        Index(
+            "ft_topics_name_description", "name", "description",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+        ).ddl_if(dialect="mysql"),
+    )
 
     id = Column(
         CHAR(36),
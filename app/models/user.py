@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Boolean, Column, DateTime, Enum, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String
 from sqlalchemy.dialects.mysql import CHAR
 
 
@@ -42,6 +42,8 @@ class User(Base):
         nullable=False
     )
     last_login_at = Column(DateTime, nullable=True)
+    # パスワード変更・無効化などで上げ、発行済みのトークンを失効させる
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # プロパティ
     @property
@@ -3,7 +3,7 @@ from typing import List, Optional
 from app.schemas.politician import Politician
 from app.schemas.statement import Statement
 from app.schemas.topic import Topic
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SearchResult(BaseModel):
@@ -13,8 +13,16 @@ class SearchResult(BaseModel):
     statements: List[Statement] = []
     politicians: List[Politician] = []
     topics: List[Topic] = []
-    total_statements: int = 0
-    total_politicians: int = 0
-    total_topics: int = 0
+    total_statements: Optional[int] = Field(
+        None, description="発言の総件数（検索対象外またはタイムアウトの場合はnull）"
+    )
+    total_politicians: Optional[int] = Field(
+        None, description="政治家の総件数（検索対象外またはタイムアウトの場合はnull）"
+    )
+    total_topics: Optional[int] = Field(
+        None, description="トピックの総件数（検索対象外またはタイムアウトの場合はnull）"
+    )
     query: str
+    types: List[str] = Field([], description="検索したエンティティ")
+    timed_out: List[str] = Field([], description="タイムアウトしたエンティティ")
     next_cursor: Optional[str] = None
\ No newline at end of file
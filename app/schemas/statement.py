@@ -75,6 +75,9 @@ class Statement(StatementBase):
     created_at: datetime
     updated_at: datetime
     is_liked: Optional[bool] = False
+    user_reactions: List[str] = Field(
+        [], description="ログインユーザーがこの発言に付けたリアクション種別"
+    )
     
     class Config:
         from_attributes = True
@@ -93,6 +96,11 @@ class StatementList(BaseModel):
     """
     発言一覧のレスポンススキーマ
     """
-    total: int
+    total: Optional[int] = Field(
+        None, description="総件数（count_mode=noneの場合はnull、cachedの場合は概算）"
+    )
     statements: List[Statement]
-    next_cursor: Optional[str] = None
\ No newline at end of file
+    next_cursor: Optional[str] = Field(
+        None, description="次ページ取得用の不透明なカーソル（cursorパラメータに渡す）"
+    )
+    has_more: bool = Field(False, description="次のページが存在するかどうか")
\ No newline at end of file
@@ -24,4 +24,9 @@ class TokenPayload(BaseModel):
     トークンペイロードスキーマ
     """
     sub: Optional[str] = None
-    exp: Optional[int] = None
\ No newline at end of file
+    exp: Optional[int] = None
+    type: Optional[str] = None
+    # 以下はステートレス認証用のクレーム（古いトークンには含まれない）
+    role: Optional[str] = None
+    status: Optional[str] = None
+    ver: Optional[int] = None
\ No newline at end of file
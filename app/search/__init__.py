@@ -0,0 +1,87 @@
+"""
+全文検索バックエンド
+
+SEARCH_BACKEND設定で切り替える。
+- memory: プロセス内の転置索引（日本語bigram + BM25）
+- mysql_fulltext: MySQLのFULLTEXT索引（ngramパーサ）
+- like: ILIKEによる部分一致（索引なし）
+- auto: MySQLならmysql_fulltext、それ以外はmemory
+"""
+import threading
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.search.base import SearchBackend
+from app.search.like import LikeSearchBackend
+from app.search.memory import InvertedIndex, MemorySearchBackend
+from app.search.mysql_fulltext import MySQLFulltextSearchBackend
+from app.search.tokenizer import tokenize
+
+BACKENDS = {
+    "like": LikeSearchBackend,
+    "memory": MemorySearchBackend,
+    "mysql_fulltext": MySQLFulltextSearchBackend,
+}
+
+_backend: Optional[SearchBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _resolve_backend_name(name: str) -> str:
+    if name != "auto":
+        return name
+    if str(settings.DATABASE_URL).startswith("mysql"):
+        return "mysql_fulltext"
+    return "memory"
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    設定に応じた検索バックエンドを返す（プロセス内で共有）
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = _resolve_backend_name(settings.SEARCH_BACKEND)
+                if name not in BACKENDS:
+                    raise ValueError(f"未対応の検索バックエンドです: {name}")
+                _backend = BACKENDS[name]()
+    return _backend
+
+
+def set_search_backend(backend: Optional[SearchBackend]) -> None:
+    """
+    検索バックエンドを差し替える（Noneの場合は次回取得時に設定から作り直す）
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def index_document(entity: str, obj: Any) -> None:
+    """
+    作成・更新されたレコードを検索索引に反映する
+    """
+    get_search_backend().index_document(entity, obj)
+
+
+def remove_document(entity: str, id: str) -> None:
+    """
+    削除されたレコードを検索索引から取り除く
+    """
+    get_search_backend().remove_document(entity, id)
+
+
+__all__ = [
+    "InvertedIndex",
+    "LikeSearchBackend",
+    "MemorySearchBackend",
+    "MySQLFulltextSearchBackend",
+    "SearchBackend",
+    "get_search_backend",
+    "index_document",
+    "remove_document",
+    "set_search_backend",
+    "tokenize",
+]
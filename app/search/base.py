@@ -0,0 +1,140 @@
+"""
+検索バックエンドの共通インターフェース
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.politician import Politician
+from app.models.statement import Statement
+from app.models.topic import Topic
+from sqlalchemy.orm import Query, Session
+
+# エンティティごとの検索対象カラムと重み（インメモリ索引のBM25で使用）
+SEARCH_FIELDS: Dict[str, Tuple[Any, Dict[str, float]]] = {
+    "statement": (Statement, {"title": 2.0, "content": 1.0}),
+    "politician": (
+        Politician, {"name": 3.0, "name_kana": 3.0, "profile_summary": 1.0}
+    ),
+    "topic": (Topic, {"name": 3.0, "description": 1.0}),
+}
+
+# 前処理の結果を保持するSession.infoのキー
+PREPARED_INFO_KEY = "search_prepared"
+
+
+def get_model(entity: str):
+    """
+    エンティティ名に対応するモデルクラスを返す
+    """
+    return SEARCH_FIELDS[entity][0]
+
+
+def get_columns(entity: str) -> List[Any]:
+    """
+    エンティティの検索対象カラムを返す
+    """
+    model, weights = SEARCH_FIELDS[entity]
+    return [getattr(model, field) for field in weights]
+
+
+def store_prepared(info: Dict[str, Any], prepared: Dict[Tuple[str, str, str], List[str]]) -> None:
+    """
+    前処理の結果をセッションのinfoに保持する
+    """
+    if prepared:
+        info.setdefault(PREPARED_INFO_KEY, {}).update(prepared)
+
+
+def get_prepared(db: Session, kind: str, entity: str, text: str) -> Optional[List[str]]:
+    """
+    セッションに保持された前処理の結果を返す（前処理していない場合はNone）
+
+    Args:
+        db: データベースセッション
+        kind: 結果の種類（ranked: 関連度順のID、matched: 一致したID）
+        entity: エンティティ名
+        text: 検索キーワード
+    """
+    return db.info.get(PREPARED_INFO_KEY, {}).get((kind, entity, text))
+
+
+class SearchBackend:
+    """
+    検索バックエンドの基底クラス
+
+    search_idsは関連度順のIDと総件数を返し、criterionは既存のクエリに
+    組み合わせるための絞り込み条件を返す。
+    """
+
+    name = "base"
+    # データベースを使わない前処理（索引の検索・スコア計算）があるかどうか
+    has_prepare = False
+
+    def prepare(
+        self, db: Session, entity: str, text: str, ranked: bool = True
+    ) -> Dict[Tuple[str, str, str], List[str]]:
+        """
+        CPUを使う前処理（索引の検索・スコア計算）だけを先に実行する
+
+        非同期エンドポイントは、この処理をスレッドプールで実行して結果を
+        AsyncSessionのinfoに保持し（store_prepared）、データベースへの問い合わせだけを
+        run_syncで実行する。search_ids・criterionは保持された結果があればそれを使う。
+
+        Args:
+            db: データベースセッション（索引の構築が必要な場合のみ使う）
+            entity: エンティティ名（statement, politician, topic）
+            text: 検索キーワード
+            ranked: 関連度順の結果が必要かどうか（Falseの場合は一致した行だけを求める）
+
+        Returns:
+            infoに保持する前処理の結果
+        """
+        return {}
+
+    def criterion(self, db: Session, entity: str, text: str) -> Any:
+        """
+        キーワードに一致する行を絞り込むSQL条件を返す
+
+        Args:
+            db: データベースセッション
+            entity: エンティティ名（statement, politician, topic）
+            text: 検索キーワード
+
+        Returns:
+            filter()に渡せる条件式
+        """
+        raise NotImplementedError
+
+    def search_ids(
+        self,
+        db: Session,
+        entity: str,
+        text: str,
+        query: Query,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[str], int]:
+        """
+        キーワードに一致する行のIDを関連度順に取得する
+
+        Args:
+            db: データベースセッション
+            entity: エンティティ名（statement, politician, topic）
+            text: 検索キーワード
+            query: フィルタ条件を適用済みのベースクエリ
+            skip: スキップ数
+            limit: 取得上限
+
+        Returns:
+            (IDのリスト, 総件数)のタプル
+        """
+        raise NotImplementedError
+
+    def index_document(self, entity: str, obj: Any) -> None:
+        """
+        作成・更新されたレコードを索引に反映する（SQLバックエンドでは何もしない）
+        """
+
+    def remove_document(self, entity: str, id: str) -> None:
+        """
+        削除されたレコードを索引から取り除く（SQLバックエンドでは何もしない）
+        """
@@ -0,0 +1,36 @@
+"""
+LIKE検索によるバックエンド（索引を使わないフォールバック）
+"""
+from typing import Any, List, Tuple
+
+from app.search.base import SearchBackend, get_columns, get_model
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    部分一致（ILIKE）で検索するバックエンド
+
+    関連度は計算せず、ベースクエリの並び順をそのまま使う。
+    """
+
+    name = "like"
+
+    def criterion(self, db: Session, entity: str, text: str) -> Any:
+        return or_(*[column.ilike(f"%{text}%") for column in get_columns(entity)])
+
+    def search_ids(
+        self,
+        db: Session,
+        entity: str,
+        text: str,
+        query: Query,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[str], int]:
+        model = get_model(entity)
+        query = query.filter(self.criterion(db, entity, text))
+        total = query.count()
+        rows = query.with_entities(model.id).offset(skip).limit(limit).all()
+        return [row[0] for row in rows], total
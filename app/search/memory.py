@@ -0,0 +1,376 @@
+"""
+プロセス内の転置索引によるバックエンド
+
+日本語bigramで索引を作り、BM25で関連度を計算する。索引は初回検索時に
+データベースから構築し、以降はサービス層からの通知で差分更新する。
+"""
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.search.base import SEARCH_FIELDS, SearchBackend, get_model, get_prepared
+from app.search.tokenizer import tokenize
+from sqlalchemy import bindparam, distinct, false, func
+from sqlalchemy.orm import Query, Session
+
+logger = logging.getLogger(__name__)
+
+# 同点の場合はIDで並びを固定する
+_SCORE_ORDER = itemgetter(1, 0)
+
+
+def _id_in(model: Any, ids: List[str]) -> Any:
+    """
+    IDがリストに含まれる条件（件数が多くても1つの文で済むよう値をSQLに埋め込む）
+
+    バインド変数の数の上限（SQLiteなど）に掛からないため、候補を分割して
+    何度も問い合わせる必要がない。
+    """
+    return model.id.in_(
+        bindparam("search_candidate_ids", ids, expanding=True, literal_execute=True)
+    )
+
+
+def weighted_terms(values: Dict[str, Optional[str]], weights: Dict[str, float]) -> Dict[str, float]:
+    """
+    フィールドごとの重みを掛けた語の出現頻度を計算する
+
+    Args:
+        values: フィールド名とテキストの辞書
+        weights: フィールド名と重みの辞書
+
+    Returns:
+        語と重み付き出現頻度の辞書
+    """
+    terms: Dict[str, float] = defaultdict(float)
+    for field, weight in weights.items():
+        for token, count in Counter(tokenize(values.get(field))).items():
+            terms[token] += count * weight
+    return dict(terms)
+
+
+class InvertedIndex:
+    """
+    BM25でスコアリングする転置索引（スレッドセーフ）
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._total_len = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, doc_id: str, terms: Dict[str, float]) -> None:
+        """
+        文書を追加する（既に存在する場合は置き換える）
+        """
+        with self._lock:
+            self.remove(doc_id)
+            if not terms:
+                return
+            for token, tf in terms.items():
+                self._postings[token][doc_id] = tf
+            length = sum(terms.values())
+            self._doc_terms[doc_id] = terms
+            self._doc_len[doc_id] = length
+            self._total_len += length
+
+    def remove(self, doc_id: str) -> None:
+        """
+        文書を削除する
+        """
+        with self._lock:
+            terms = self._doc_terms.pop(doc_id, None)
+            if terms is None:
+                return
+            for token in terms:
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+            self._total_len -= self._doc_len.pop(doc_id)
+
+    def _match(self, text: str) -> Tuple[List[Dict[str, float]], Set[str]]:
+        """
+        クエリの全ての語を含む文書を求める（ロックを取得してから呼び出す）
+
+        Returns:
+            (語ごとのポスティング（出現文書の少ない順）, 文書IDの集合)のタプル
+        """
+        tokens = list(dict.fromkeys(tokenize(text, for_query=True)))
+        postings = [self._postings.get(token) for token in tokens]
+        if not postings or not all(postings):
+            return [], set()
+
+        # 出現文書の少ない語から積集合を取る
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return postings, candidates
+
+    def matching_ids(self, text: str) -> Set[str]:
+        """
+        クエリの全ての語を含む文書のIDを返す（スコアは計算しない）
+        """
+        with self._lock:
+            return self._match(text)[1]
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        クエリの全ての語を含む文書をBM25スコアの高い順に返す
+
+        Args:
+            text: 検索クエリ
+            limit: 返す件数の上限（Noneの場合は全件）
+
+        Returns:
+            (文書ID, スコア)のリスト
+        """
+        with self._lock:
+            postings, candidates = self._match(text)
+            if not candidates:
+                return []
+
+            n_docs = len(self._doc_len)
+            avg_len = self._total_len / n_docs if n_docs else 0.0
+            idfs = [
+                math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for posting in postings
+            ]
+            scores = []
+            for doc_id in candidates:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                score = 0.0
+                for posting, idf in zip(postings, idfs):
+                    tf = posting[doc_id]
+                    score += idf * tf * (self.k1 + 1) / (tf + norm)
+                scores.append((doc_id, score))
+
+        if limit is None:
+            return sorted(scores, key=_SCORE_ORDER, reverse=True)
+        return heapq.nlargest(limit, scores, key=_SCORE_ORDER)
+
+
+class MemorySearchBackend(SearchBackend):
+    """
+    インメモリ転置索引で検索するバックエンド
+
+    複数プロセス構成では他プロセスでの更新が届かないため、
+    SEARCH_INDEX_REFRESH_SECONDSごとにデータベースから索引を作り直す。
+    作り直しはバックグラウンドのスレッドで行い、その間の検索には現在の索引を使う。
+    作り直し中に通知された更新は記録しておき、新しい索引に反映してから差し替える。
+    """
+
+    name = "memory"
+    has_prepare = True
+
+    def __init__(
+        self,
+        refresh_seconds: Optional[int] = None,
+        max_candidates: Optional[int] = None,
+    ):
+        self.refresh_seconds = (
+            settings.SEARCH_INDEX_REFRESH_SECONDS
+            if refresh_seconds is None else refresh_seconds
+        )
+        self.max_candidates = (
+            settings.SEARCH_MAX_CANDIDATES
+            if max_candidates is None else max_candidates
+        )
+        self._indexes: Dict[str, InvertedIndex] = {}
+        self._built_at: Dict[str, float] = {}
+        # 初回の構築を1回にまとめるためのロック
+        self._build_lock = threading.Lock()
+        # 索引の差し替えと、構築中に通知された更新（("add"|"remove", ID, 語)）の記録を守るロック
+        self._lock = threading.Lock()
+        self._pending: Dict[
+            str, List[Tuple[str, str, Optional[Dict[str, float]]]]
+        ] = {}
+
+    def _documents(self, db: Session, entity: str) -> Iterable[Tuple[str, Dict[str, float]]]:
+        model, weights = SEARCH_FIELDS[entity]
+        columns = [getattr(model, field) for field in weights]
+        rows = db.query(model.id, *columns).yield_per(1000)
+        for row in rows:
+            values = dict(zip(weights, row[1:]))
+            yield row[0], weighted_terms(values, weights)
+
+    def build(self, db: Session, entity: str) -> InvertedIndex:
+        """
+        データベースから索引を作り直す
+
+        構築中に通知された更新は、読み出した内容より新しい可能性があるため
+        新しい索引に反映してから差し替える。
+        """
+        with self._lock:
+            self._pending.setdefault(entity, [])
+        try:
+            index = InvertedIndex()
+            for doc_id, terms in self._documents(db, entity):
+                index.add(doc_id, terms)
+        except Exception:
+            with self._lock:
+                self._pending.pop(entity, None)
+            raise
+        with self._lock:
+            for action, doc_id, terms in self._pending.pop(entity, []):
+                if action == "add":
+                    index.add(doc_id, terms)
+                else:
+                    index.remove(doc_id)
+            self._indexes[entity] = index
+            self._built_at[entity] = time.monotonic()
+        return index
+
+    def get_index(self, db: Session, entity: str) -> InvertedIndex:
+        """
+        索引を取得する
+
+        未構築の場合はこの呼び出しの中で構築する。期限切れの場合は現在の索引を返し、
+        バックグラウンドで作り直す。
+        """
+        index = self._indexes.get(entity)
+        if index is None:
+            with self._build_lock:
+                index = self._indexes.get(entity)
+                if index is None:
+                    index = self.build(db, entity)
+            return index
+        if self._is_stale(entity):
+            self._start_rebuild(db, entity)
+        return index
+
+    def _start_rebuild(self, db: Session, entity: str) -> None:
+        """
+        バックグラウンドでの作り直しを開始する（作り直し中の場合は何もしない）
+        """
+        with self._lock:
+            if entity in self._pending:
+                return
+            self._pending[entity] = []
+        threading.Thread(
+            target=self._rebuild,
+            args=(db.get_bind(), entity),
+            name=f"search-index-{entity}",
+            daemon=True,
+        ).start()
+
+    def _rebuild(self, bind: Any, entity: str) -> None:
+        try:
+            with Session(bind=bind) as db:
+                self.build(db, entity)
+        except Exception:
+            logger.exception("検索索引の作り直しに失敗しました: %s", entity)
+            # 次の作り直しはSEARCH_INDEX_REFRESH_SECONDS後に行う
+            self._built_at[entity] = time.monotonic()
+
+    def wait_for_rebuild(self, entity: str, timeout: float = 10.0) -> bool:
+        """
+        作り直しが終わるまで待つ（テスト・運用スクリプト用）
+
+        Returns:
+            時間内に終わった場合はTrue
+        """
+        deadline = time.monotonic() + timeout
+        while entity in self._pending:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _is_stale(self, entity: str) -> bool:
+        if self.refresh_seconds <= 0:
+            return False
+        return time.monotonic() - self._built_at.get(entity, 0.0) > self.refresh_seconds
+
+    def prepare(
+        self, db: Session, entity: str, text: str, ranked: bool = True
+    ) -> Dict[Tuple[str, str, str], List[str]]:
+        index = self.get_index(db, entity)
+        if ranked:
+            return {("ranked", entity, text): [doc_id for doc_id, _ in index.search(text)]}
+        return {("matched", entity, text): sorted(index.matching_ids(text))}
+
+    def criterion(self, db: Session, entity: str, text: str) -> Any:
+        # 並び順は呼び出し元のクエリで決まるため、関連度は計算せず一致した全件で絞り込む
+        # （search_idsと同じ結果の集合になる）
+        ids = get_prepared(db, "matched", entity, text)
+        if ids is None:
+            ids = sorted(self.get_index(db, entity).matching_ids(text))
+        if not ids:
+            return false()
+        return _id_in(get_model(entity), ids)
+
+    def search_ids(
+        self,
+        db: Session,
+        entity: str,
+        text: str,
+        query: Query,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[str], int]:
+        ids = get_prepared(db, "ranked", entity, text)
+        if ids is None:
+            ids = [doc_id for doc_id, _ in self.get_index(db, entity).search(text)]
+        if not ids:
+            return [], 0
+
+        # ベースクエリのフィルタ条件を満たす候補を、関連度の高い方から
+        # SEARCH_MAX_CANDIDATES件ずつ確かめ、ページが埋まるまで広げる
+        model = get_model(entity)
+        matched: List[str] = []
+        checked = 0
+        while checked < len(ids) and len(matched) < skip + limit:
+            window = ids[checked:checked + self.max_candidates]
+            allowed = {
+                row[0]
+                for row in query.with_entities(model.id).filter(_id_in(model, window))
+            }
+            matched.extend(doc_id for doc_id in window if doc_id in allowed)
+            checked += len(window)
+
+        # 残りの候補は1回のCOUNTで件数だけを数える
+        total = len(matched)
+        if checked < len(ids):
+            total += query.order_by(None).with_entities(
+                func.count(distinct(model.id))
+            ).filter(_id_in(model, ids[checked:])).scalar()
+        return matched[skip:skip + limit], total
+
+    def index_document(self, entity: str, obj: Any) -> None:
+        weights = SEARCH_FIELDS[entity][1]
+        values = {field: getattr(obj, field, None) for field in weights}
+        terms = weighted_terms(values, weights)
+        with self._lock:
+            # 未構築の場合は初回検索時にデータベースから構築される
+            index = self._indexes.get(entity)
+            if index is not None:
+                index.add(obj.id, terms)
+            if entity in self._pending:
+                self._pending[entity].append(("add", obj.id, terms))
+
+    def remove_document(self, entity: str, id: str) -> None:
+        with self._lock:
+            index = self._indexes.get(entity)
+            if index is not None:
+                index.remove(id)
+            if entity in self._pending:
+                self._pending[entity].append(("remove", id, None))
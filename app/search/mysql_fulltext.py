@@ -0,0 +1,64 @@
+"""
+MySQLのFULLTEXT索引（ngramパーサ）を使うバックエンド
+"""
+from typing import Any, List, Tuple
+
+from app.search.base import SearchBackend, get_columns, get_model
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+
+
+def _boolean_query(text: str) -> str:
+    """
+    空白区切りの各語をフレーズ必須条件にしたBOOLEAN MODEのクエリを組み立てる
+
+    ngramパーサではフレーズ指定により語内のbigramが連続して出現する行だけに一致するため、
+    LIKE検索と同じ「部分文字列を含む」意味になる。
+    """
+    terms = [term.replace('"', "") for term in text.split()]
+    return " ".join(f'+"{term}"' for term in terms if term)
+
+
+class MySQLFulltextSearchBackend(SearchBackend):
+    """
+    MATCH ... AGAINSTで検索するバックエンド
+
+    各モデルに定義したFULLTEXT索引（WITH PARSER ngram）と同じカラムの組み合わせで
+    MATCHを発行する必要がある。
+    """
+
+    name = "mysql_fulltext"
+
+    def _match(self, entity: str, text: str):
+        return match(
+            *get_columns(entity), against=_boolean_query(text)
+        ).in_boolean_mode()
+
+    def criterion(self, db: Session, entity: str, text: str) -> Any:
+        return self._match(entity, text)
+
+    def search_ids(
+        self,
+        db: Session,
+        entity: str,
+        text: str,
+        query: Query,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[str], int]:
+        if not _boolean_query(text):
+            return [], 0
+
+        model = get_model(entity)
+        score = self._match(entity, text)
+        query = query.filter(score)
+        total = query.count()
+        rows = (
+            query.with_entities(model.id)
+            .order_by(None)
+            .order_by(score.desc(), model.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [row[0] for row in rows], total
@@ -0,0 +1,58 @@
+"""
+全文検索用のトークナイザ
+
+日本語は形態素解析を使わず、文字n-gram（bigram）で分割する。
+英数字は単語単位で扱う。
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+# 英数字の単語 / 日本語（かな・カナ・漢字）の連続 / その他の単語文字
+_TOKEN_RE = re.compile(
+    r"([0-9a-z]+)"
+    r"|([぀-ヿ㐀-䶿一-鿿豈-﫿々〆ー]+)"
+    r"|([^\W_]+)"
+)
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    全角・半角や大文字・小文字の揺れを吸収する
+    """
+    if not text:
+        return ""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _ngrams(run: str, n: int) -> List[str]:
+    return [run[i:i + n] for i in range(len(run) - n + 1)]
+
+
+def tokenize(text: Optional[str], for_query: bool = False) -> List[str]:
+    """
+    テキストをトークン列に分割する
+
+    日本語の連続部分は文字bigramに分割する。1文字だけのクエリにも一致させるため、
+    索引側では1文字のトークン（unigram）も併せて出力する。
+
+    Args:
+        text: 対象テキスト
+        for_query: 検索クエリとして分割する場合はTrue
+
+    Returns:
+        トークンのリスト（重複あり）
+    """
+    tokens: List[str] = []
+    for match in _TOKEN_RE.finditer(normalize(text)):
+        word, japanese, other = match.groups()
+        if japanese is None:
+            tokens.append(word or other)
+            continue
+        if len(japanese) == 1:
+            tokens.append(japanese)
+            continue
+        tokens.extend(_ngrams(japanese, 2))
+        if not for_query:
+            tokens.extend(japanese)
+    return tokens
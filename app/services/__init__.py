@@ -1,11 +1,17 @@
 from . import (
     activity,
+    aio,
     comment,
+    entity_cache,
     follows,
     party,
+    party_topic_stats,
     politician,
+    ranking,
+    reaction_buffer,
     search,
     statement,
+    timeline,
     topic,
     user,
 )
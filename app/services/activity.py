@@ -134,6 +134,9 @@ def get_user_liked_statements(
                 statement.politician_name = statement.politician.name
                 if statement.politician.current_party_id:
                     statement.party_id = statement.politician.current_party_id
+        
+        # いいね以外のリアクションもまとめて設定
+        services.statement.apply_user_reactions(db, statements, user_id=user_id)
     
     # 総数を取得
     total = db.query(func.count(StatementReaction.id)).filter(
@@ -415,6 +418,9 @@ def get_personalized_feed(
     """
     パーソナライズドフィードを取得する
     
+    フォロー中の政治家・トピックの最近の発言を、ユーザーのfeed_preferenceの
+    重みでスコアリングした順に返す。
+    
     Args:
         db: データベースセッション
         user_id: ユーザーID
@@ -422,27 +428,38 @@ def get_personalized_feed(
         limit: 取得上限
         
     Returns:
-        パーソナライズドフィード
+        パーソナライズドフィード（totalはフィードの対象になる発言の総数）
     """
-    # フォローしている政治家IDを取得
-    politician_ids = services.follows.get_user_following_politicians_ids(
-        db, user_id=user_id
+    statements, total = services.ranking.rank_feed(
+        db, user_id=user_id, skip=skip, limit=limit
     )
+    return build_feed_page(db, statements, total, user_id=user_id)
+
+
+def build_feed_page(
+    db: Session, statements: List[Statement], total: int, *, user_id: str
+) -> Dict:
+    """
+    並べた発言に政治家名とユーザーのリアクションを設定し、フィードの形式にする
     
-    # フォローしている政治家の発言を取得
-    statements = []
-    total = 0
-    
-    if politician_ids:
-        statements = services.statement.get_statements_by_politicians(
-            db, politician_ids=politician_ids, skip=skip, limit=limit
-        )
+    Args:
+        db: データベースセッション
+        statements: スコア順の発言オブジェクトのリスト
+        total: フィードの対象になる発言の総数
+        user_id: ユーザーID
         
-        total = services.statement.count_statements_by_politicians(
-            db, politician_ids=politician_ids
-        )
+    Returns:
+        パーソナライズドフィード
+    """
+    # politician_nameフィールドを設定
+    for statement in statements:
+        if statement.politician:
+            statement.politician_name = statement.politician.name
+    
+    # ログインユーザーのリアクションをまとめて設定
+    services.statement.apply_user_reactions(db, statements, user_id=user_id)
     
     return {
         "statements": statements,
         "total": total
-    }
\ No newline at end of file
+    }
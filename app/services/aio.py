@@ -0,0 +1,265 @@
+"""
+非同期エンドポイント用の発言一覧・検索・フィードのサービス
+
+クエリの組み立ては同期版のサービスと共有し、データベースへの問い合わせは全て
+AsyncSession.run_syncで非同期ドライバの接続上から実行する（I/O待ちの間はイベントループを手放す）。
+イベントループを止めるCPUを使う処理（インメモリ索引の検索・BM25のスコア計算・
+NumPyでのフィードのスコアリング）と、同期クライアントでのRedisへのアクセス
+（保留中のリアクションの重ね合わせ）だけをスレッドプールで実行する。
+レスポンスのスキーマへの変換はrun_syncの中で行い、イベントループ上で遅延読み込みが発生しないようにする。
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.db.session import SessionLocal
+from app.schemas.search import SearchResult
+from app.schemas.statement import StatementList
+from app.search import get_search_backend
+from app.search.base import store_prepared
+from app.services import activity, ranking, reaction_buffer, search, statement
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+# 実行中のsearch_allのエンティティごとの検索の数
+# （タイムアウトした検索もデータベースで中断されるまで接続を使うため、同時実行数を制限する）
+_search_slots = threading.BoundedSemaphore(settings.SEARCH_EXECUTOR_MAX_PENDING)
+
+
+def _statement_page(
+    db: Session, func: Callable[..., Dict], **kwargs: Any
+) -> StatementList:
+    """
+    同期版のサービスを実行し、発言一覧のスキーマに変換する
+    """
+    return StatementList.model_validate(func(db, **kwargs))
+
+
+async def _prepare_search(
+    db: AsyncSession, entity: str, text: str, ranked: bool = True
+) -> None:
+    """
+    検索バックエンドの前処理（インメモリ索引の検索・スコア計算）をスレッドプールで実行する
+
+    結果はdbのinfoに保持し、run_syncで実行する検索のクエリから使う。
+    索引が未構築の場合の構築は、スレッドプール側の同期セッションで行う。
+
+    Args:
+        db: 非同期データベースセッション
+        entity: エンティティ名（statement, politician, topic）
+        text: 検索キーワード
+        ranked: 関連度順の結果が必要かどうか
+    """
+    backend = get_search_backend()
+    if not backend.has_prepare:
+        return
+    read_only = db.info.get("read_only", False)
+
+    def run() -> Dict:
+        # セッションは索引の構築が必要な場合にだけ接続する
+        with SessionLocal() as session:
+            session.info["read_only"] = read_only
+            return backend.prepare(session, entity, text, ranked=ranked)
+
+    store_prepared(db.info, await run_in_threadpool(run))
+
+
+async def _overlay_pending_reactions(page: StatementList, user_id: str) -> None:
+    """
+    保留中のリアクションをスレッドプールで発言一覧に重ね合わせる（バッファが無効な場合は何もしない）
+    """
+    if reaction_buffer.get_reaction_buffer() is None or not page.statements:
+        return
+    await run_in_threadpool(
+        reaction_buffer.overlay_pending_reactions, page.statements, user_id
+    )
+
+
+async def _page_with_reactions(
+    db: AsyncSession, func: Callable[..., Dict], user_id: Optional[str], **kwargs: Any
+) -> StatementList:
+    """
+    同期版のサービスをrun_syncで実行し、保留中のリアクションの重ね合わせだけを後から行う
+    """
+    if not user_id:
+        return await db.run_sync(_statement_page, func, **kwargs)
+    db.info["defer_reaction_overlay"] = True
+    try:
+        page = await db.run_sync(_statement_page, func, user_id=user_id, **kwargs)
+    finally:
+        db.info.pop("defer_reaction_overlay", None)
+    await _overlay_pending_reactions(page, user_id)
+    return page
+
+
+async def list_statements(
+    db: AsyncSession, *, user_id: Optional[str] = None, **kwargs: Any
+) -> StatementList:
+    """
+    発言一覧のページを取得する（引数はstatement.list_statementsと同じ）
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID（リアクションを設定する場合）
+
+    Returns:
+        発言一覧
+    """
+    if kwargs.get("search"):
+        # 並び順は一覧のソート順のため、一致した行だけを求める
+        await _prepare_search(db, "statement", kwargs["search"], ranked=False)
+    return await _page_with_reactions(db, statement.list_statements, user_id, **kwargs)
+
+
+async def search_statements(db: AsyncSession, **kwargs: Any) -> StatementList:
+    """
+    発言を検索する（引数はsearch.search_statementsと同じ）
+
+    Args:
+        db: 非同期データベースセッション
+
+    Returns:
+        検索結果の発言一覧
+    """
+    await _prepare_search(db, "statement", kwargs["query"])
+    return await db.run_sync(_statement_page, search.search_statements, **kwargs)
+
+
+def _feed_page(
+    db: Session, feed: ranking.FeedInput, ids: List[str], *, user_id: str
+) -> StatementList:
+    """
+    スコア順に選んだ発言を読み込み、フィードのスキーマに変換する
+    """
+    statements, total = ranking.load_feed_page(db, feed, ids)
+    return StatementList.model_validate(
+        activity.build_feed_page(db, statements, total, user_id=user_id)
+    )
+
+
+async def get_personalized_feed(
+    db: AsyncSession, *, user_id: str, skip: int = 0, limit: int = 20
+) -> StatementList:
+    """
+    パーソナライズドフィードを取得する（引数はactivity.get_personalized_feedと同じ）
+
+    候補と重みの取得・発言の読み込みはrun_syncで、スコアリングはスレッドプールで実行する。
+
+    Args:
+        db: 非同期データベースセッション
+        user_id: ユーザーID
+        skip: スキップ数
+        limit: 取得上限
+
+    Returns:
+        フィードの発言一覧
+    """
+    feed = await db.run_sync(
+        ranking.fetch_feed_input, user_id=user_id, min_count=skip + limit
+    )
+    if feed is None:
+        return StatementList(statements=[], total=0)
+    ids = await run_in_threadpool(ranking.select_feed_ids, feed, skip=skip, limit=limit)
+
+    db.info["defer_reaction_overlay"] = True
+    try:
+        page = await db.run_sync(_feed_page, feed, ids, user_id=user_id)
+    finally:
+        db.info.pop("defer_reaction_overlay", None)
+    await _overlay_pending_reactions(page, user_id)
+    return page
+
+
+def _release_search_slot(task: "asyncio.Future") -> None:
+    _search_slots.release()
+    if not task.cancelled():
+        # 期限後に終わった検索の例外（中断など）を取り出しておく
+        task.exception()
+
+
+async def search_all(
+    db: AsyncSession,
+    *,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    filter_party: Optional[str] = None,
+    filter_topic: Optional[str] = None,
+    filter_date_start: Optional[str] = None,
+    filter_date_end: Optional[str] = None,
+    types: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = None,
+) -> SearchResult:
+    """
+    全てのエンティティを検索する（引数はsearch.search_allと同じ）
+
+    エンティティごとの検索はそれぞれ専用のAsyncSessionで並行に実行する。
+    タイムアウトしたエンティティは空の結果とし、timed_outに名前を入れて返す。
+    期限を過ぎたクエリはデータベース側の実行時間の制限で中断させる。
+    実行中の検索がSEARCH_EXECUTOR_MAX_PENDINGに達している場合は開始せずタイムアウト扱いにする。
+
+    Args:
+        db: 非同期データベースセッション（読み取り専用かどうかの引き継ぎにのみ使用）
+        query: 検索クエリ
+        types: 検索対象（statements, politicians, topics）。Noneの場合は全て
+        timeout: エンティティごとのタイムアウト秒数（Noneの場合は設定値）
+
+    Returns:
+        検索結果
+    """
+    types = search.parse_search_types(types)
+    if timeout is None:
+        timeout = settings.SEARCH_TIMEOUT_SECONDS
+    tasks = search.search_tasks(
+        filter_party=filter_party,
+        filter_topic=filter_topic,
+        filter_date_start=filter_date_start,
+        filter_date_end=filter_date_end,
+    )
+    read_only = db.info.get("read_only", False)
+    deadline = time.monotonic() + timeout
+
+    async def run(entity: str, fn: Callable[..., Dict], filters: Dict[str, Any]) -> Dict:
+        async with AsyncSessionLocal() as session:
+            session.info["read_only"] = read_only
+            await _prepare_search(session, entity, query)
+            return await session.run_sync(
+                search.run_with_deadline, fn, deadline,
+                query=query, skip=skip, limit=limit, **filters
+            )
+
+    futures = {}
+    timed_out = []
+    for name in types:
+        if not _search_slots.acquire(blocking=False):
+            timed_out.append(name)
+            continue
+        future = asyncio.ensure_future(run(*tasks[name]))
+        future.add_done_callback(_release_search_slot)
+        futures[name] = future
+    if futures:
+        # 期限内に終わらなかった検索は待たない（実行中のクエリはデータベース側で中断される）
+        await asyncio.wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            timed_out.append(name)
+            continue
+        error = future.exception()
+        if isinstance(error, OperationalError) and search.is_interrupted(error):
+            timed_out.append(name)
+        elif error is not None:
+            raise error
+        elif future.result():
+            results[name] = future.result()
+        else:
+            timed_out.append(name)
+    return SearchResult.model_validate(search.build_search_all_result(
+        results, timed_out, query=query, skip=skip, limit=limit, types=types
+    ))
@@ -1,12 +1,16 @@
+import logging
 from typing import Dict, List, Optional, Union
 
 from app.models.comment import Comment, CommentReaction
 from app.models.report import CommentReport
 from app.models.user import User
 from app.schemas.comment import CommentCreate, CommentUpdate
+from app.services.statement import adjust_statement_counter
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
+logger = logging.getLogger(__name__)
+
 
 def get_comment(db: Session, id: str) -> Optional[Comment]:
     """
@@ -42,7 +46,7 @@ def get_comment(db: Session, id: str) -> Optional[Comment]:
         return comment
     except Exception as e:
         # エラーが発生した場合はNoneを返す
-        print(f"コメント取得中にエラーが発生: {e}")
+        logger.warning("コメント取得中にエラーが発生: %s", e)
         return None
 
 
@@ -130,7 +134,7 @@ def get_statement_comments(
         return comments
     except Exception as e:
         # エラーが発生した場合は、空のリストを返す
-        print(f"コメント取得中にエラーが発生: {e}")
+        logger.warning("コメント取得中にエラーが発生: %s", e)
         return []
 
 
@@ -240,7 +244,7 @@ def get_comment_replies(
         return comments
     except Exception as e:
         # エラーが発生した場合は、空のリストを返す
-        print(f"返信コメント取得中にエラーが発生: {e}")
+        logger.warning("返信コメント取得中にエラーが発生: %s", e)
         return []
 
 
@@ -295,6 +299,10 @@ def create_comment(
             reports_count=0
         )
         db.add(db_obj)
+        # 発言のコメント数を同じトランザクションで加算
+        adjust_statement_counter(
+            db, statement_id=statement_id, column="comments_count", delta=1
+        )
         db.commit()
         db.refresh(db_obj)
         
@@ -310,7 +318,7 @@ def create_comment(
         return db_obj
     except Exception as e:
         db.rollback()
-        print(f"コメント作成中にエラーが発生: {e}")
+        logger.warning("コメント作成中にエラーが発生: %s", e)
         raise
 
 
@@ -390,8 +398,12 @@ def delete_comment(db: Session, *, id: str, current_user_id: str) -> None:
         # 親コメントIDを取得
         parent_id = comment.parent_id
         
-        # コメントを削除
+        # コメントを削除（公開中のコメントであれば発言のコメント数を減算）
         db.delete(comment)
+        if comment.status == "published":
+            adjust_statement_counter(
+                db, statement_id=comment.statement_id, column="comments_count", delta=-1
+            )
         db.commit()
         
         # 親コメントがある場合は返信数を更新
@@ -0,0 +1,301 @@
+"""
+参照系エンティティ（政治家・政党・トピック）の読み出しキャッシュ
+
+1段目はプロセス内のLRU（TTL付き）、2段目はRedis（settings.REDIS_URL）。
+どちらにもない場合はデータベースからまとめて取得し、両方に書き戻す。
+キャッシュにはカラムの値のみを保存し、取得時にセッションへ関連付けたオブジェクトを
+組み立てるため、リレーションの遅延読み込みは通常どおり動作する。
+
+更新・削除時は自プロセスのLRUとRedisから破棄し、エンティティを含むHTTPレスポンスの
+キャッシュもタグで破棄する。他プロセスのLRUはENTITY_CACHE_LOCAL_TTL秒以内に期限切れとなる。
+"""
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import purge_tags
+from app.models.party import Party
+from app.models.politician import Politician
+from app.models.topic import Topic
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+logger = logging.getLogger(__name__)
+
+# キャッシュの種類（none: 使わない / memory: プロセス内のみ / redis: プロセス内+Redis）
+CACHE_BACKENDS = ("none", "memory", "redis")
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def _get_redis():
+    """
+    Redisクライアントを返す（backend=redis以外ではNone）
+    """
+    global _redis_client
+    if settings.ENTITY_CACHE_BACKEND != "redis":
+        return None
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                import redis
+
+                _redis_client = redis.Redis.from_url(
+                    settings.REDIS_URL, decode_responses=True
+                )
+    return _redis_client
+
+
+class EntityCache:
+    """
+    1種類のモデルに対する2段のキャッシュ
+    """
+
+    def __init__(self, model: Any, name: str, response_tags: Sequence[str] = ()):
+        self.model = model
+        self.name = name
+        # 破棄時に併せて破棄するレスポンスキャッシュのタグ（{id}はエンティティIDで展開）
+        self.response_tags = tuple(response_tags)
+        self._local = TTLCache(
+            maxsize=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_LOCAL_TTL
+        )
+        # 別名（スラッグなど）からIDへの対応
+        self._aliases = TTLCache(
+            maxsize=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_LOCAL_TTL
+        )
+        self._columns = [attr.key for attr in inspect(model).column_attrs]
+        self._datetime_columns = {
+            attr.key for attr in inspect(model).column_attrs
+            if isinstance(attr.columns[0].type, DateTime)
+        }
+        self._stats = dict.fromkeys(("local_hits", "redis_hits", "misses", "errors"), 0)
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        if n:
+            with self._stats_lock:
+                self._stats[key] += n
+
+    def _redis_key(self, id: str) -> str:
+        return f"entity:{self.name}:{id}"
+
+    def _snapshot(self, obj: Any) -> Dict[str, Any]:
+        return {column: getattr(obj, column) for column in self._columns}
+
+    def _encode(self, values: Dict[str, Any]) -> str:
+        return json.dumps({
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in values.items()
+        }, ensure_ascii=False)
+
+    def _decode(self, raw: str) -> Dict[str, Any]:
+        values = json.loads(raw)
+        for key in self._datetime_columns:
+            if values.get(key):
+                values[key] = datetime.fromisoformat(values[key])
+        return values
+
+    def _attach(self, db: Session, values: Dict[str, Any]) -> Any:
+        """
+        キャッシュした値からセッションに関連付いたオブジェクトを組み立てる（クエリは発行しない）
+        """
+        obj = self.model(**values)
+        make_transient_to_detached(obj)
+        return db.merge(obj, load=False)
+
+    def _from_session(self, db: Session, id: str) -> Optional[Any]:
+        """
+        既にセッションに読み込まれている場合はそれを使う
+        """
+        obj = db.identity_map.get(inspect(self.model).identity_key_from_primary_key((id,)))
+        if obj is not None and not inspect(obj).expired_attributes:
+            return obj
+        return None
+
+    def get(self, db: Session, id: str) -> Optional[Any]:
+        """
+        IDでエンティティを取得する
+
+        Args:
+            db: データベースセッション
+            id: ID
+
+        Returns:
+            エンティティ、存在しない場合はNone
+        """
+        return self.get_many(db, [id]).get(id)
+
+    def get_many(self, db: Session, ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        複数のエンティティをまとめて取得する（キャッシュにないものは1回のクエリで取得）
+
+        Args:
+            db: データベースセッション
+            ids: IDのリスト
+
+        Returns:
+            IDとエンティティの辞書（存在しないIDは含まない）
+        """
+        ids = [id for id in dict.fromkeys(ids) if id]
+        if settings.ENTITY_CACHE_BACKEND == "none":
+            if not ids:
+                return {}
+            rows = db.query(self.model).filter(self.model.id.in_(ids)).all()
+            return {row.id: row for row in rows}
+
+        result: Dict[str, Any] = {}
+        missing: List[str] = []
+        for id in ids:
+            obj = self._from_session(db, id)
+            if obj is not None:
+                result[id] = obj
+                continue
+            values = self._local.get(id)
+            if values is None:
+                missing.append(id)
+            else:
+                result[id] = self._attach(db, values)
+        self._count("local_hits", len(ids) - len(missing))
+
+        redis = _get_redis() if missing else None
+        if redis is not None:
+            try:
+                raws = redis.mget([self._redis_key(id) for id in missing])
+            except Exception as e:
+                logger.warning(f"エンティティキャッシュ（Redis）の読み出しに失敗しました: {e}")
+                self._count("errors")
+                raws = [None] * len(missing)
+            still_missing = []
+            for id, raw in zip(missing, raws):
+                if raw is None:
+                    still_missing.append(id)
+                    continue
+                values = self._decode(raw)
+                self._local.set(id, values)
+                result[id] = self._attach(db, values)
+            self._count("redis_hits", len(missing) - len(still_missing))
+            missing = still_missing
+
+        if missing:
+            self._count("misses", len(missing))
+            rows = db.query(self.model).filter(self.model.id.in_(missing)).all()
+            snapshots = {}
+            for row in rows:
+                snapshots[row.id] = self._snapshot(row)
+                self._local.set(row.id, snapshots[row.id])
+                result[row.id] = row
+            self._store_redis(snapshots)
+
+        return result
+
+    def _store_redis(self, snapshots: Dict[str, Dict[str, Any]]) -> None:
+        redis = _get_redis()
+        if redis is None or not snapshots:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for id, values in snapshots.items():
+                pipe.set(
+                    self._redis_key(id), self._encode(values),
+                    ex=settings.ENTITY_CACHE_REDIS_TTL
+                )
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"エンティティキャッシュ（Redis）への書き込みに失敗しました: {e}")
+            self._count("errors")
+
+    def get_by(self, db: Session, column: str, value: Any) -> Optional[Any]:
+        """
+        一意なカラム（スラッグなど）でエンティティを取得する
+
+        Args:
+            db: データベースセッション
+            column: カラム名
+            value: 値
+
+        Returns:
+            エンティティ、存在しない場合はNone
+        """
+        if settings.ENTITY_CACHE_BACKEND != "none":
+            id = self._aliases.get((column, value))
+            if id is not None:
+                obj = self.get(db, id)
+                # 値が変更されていた場合は対応を捨てて検索し直す
+                if obj is not None and getattr(obj, column) == value:
+                    return obj
+                self._aliases.delete((column, value))
+
+        id = db.query(self.model.id).filter(
+            getattr(self.model, column) == value
+        ).scalar()
+        if id is None:
+            return None
+        if settings.ENTITY_CACHE_BACKEND != "none":
+            self._aliases.set((column, value), id)
+        return self.get(db, id)
+
+    def invalidate(self, *ids: str) -> None:
+        """
+        エンティティをキャッシュから破棄する（作成・更新・削除時に呼び出す）
+        """
+        for id in ids:
+            self._local.delete(id)
+        purge_tags(*{tag.format(id=id) for tag in self.response_tags for id in ids})
+        redis = _get_redis()
+        if redis is not None and ids:
+            try:
+                redis.delete(*[self._redis_key(id) for id in ids])
+            except Exception as e:
+                logger.warning(f"エンティティキャッシュ（Redis）の破棄に失敗しました: {e}")
+                self._count("errors")
+
+    def clear(self) -> None:
+        """
+        自プロセスのキャッシュを全て破棄する
+        """
+        self._local.clear()
+        self._aliases.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        ヒット・ミスの件数とヒット率を返す
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["size"] = len(self._local)
+        stats["hit_ratio"] = (
+            round((stats["local_hits"] + stats["redis_hits"]) / lookups, 4)
+            if lookups else None
+        )
+        return stats
+
+
+politicians = EntityCache(Politician, "politician", ["politician:{id}"])
+parties = EntityCache(Party, "party", ["party:{id}", "parties", "party_topic_stats"])
+topics = EntityCache(Topic, "topic", ["topic:{id}", "topics"])
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    全エンティティキャッシュの統計情報を返す
+    """
+    return {
+        "backend": settings.ENTITY_CACHE_BACKEND,
+        "politician": politicians.stats(),
+        "party": parties.stats(),
+        "topic": topics.stats(),
+    }
+
+
+def clear_all() -> None:
+    """
+    自プロセスの全エンティティキャッシュを破棄する
+    """
+    for cache in (politicians, parties, topics):
+        cache.clear()
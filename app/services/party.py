@@ -3,6 +3,7 @@ from typing import Dict, List, Optional, Union
 from app.models.party import Party, PartyDetail
 from app.models.politician import Politician
 from app.schemas.party import PartyCreate, PartyUpdate
+from app.services.entity_cache import parties as party_cache
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -18,7 +19,21 @@ def get_party(db: Session, id: str) -> Optional[Party]:
     Returns:
         政党オブジェクト、存在しない場合はNone
     """
-    return db.query(Party).filter(Party.id == id).first()
+    return party_cache.get(db, id)
+
+
+def get_parties_by_ids(db: Session, ids: List[str]) -> Dict[str, Party]:
+    """
+    複数の政党をIDでまとめて取得する
+    
+    Args:
+        db: データベースセッション
+        ids: 政党IDのリスト
+        
+    Returns:
+        政党IDと政党オブジェクトの辞書（存在しないIDは含まない）
+    """
+    return party_cache.get_many(db, ids)
 
 
 def get_party_by_name(db: Session, name: str) -> Optional[Party]:
@@ -95,6 +110,7 @@ def create_party(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    party_cache.invalidate(db_obj.id)
     return db_obj
 
 
@@ -127,6 +143,7 @@ def update_party(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    party_cache.invalidate(db_obj.id)
     return db_obj
 
 
@@ -144,6 +161,7 @@ def delete_party(db: Session, *, id: str) -> Party:
     obj = db.query(Party).get(id)
     db.delete(obj)
     db.commit()
+    party_cache.invalidate(id)
     return obj
 
 
@@ -0,0 +1,261 @@
+"""
+政党×トピックの発言集計（party_topic_stats）
+
+トピックの政党別スタンス・政党のトピック別スタンスは、この集計表から1回の読み出しで返す。
+発言の作成・更新・削除と政治家の所属変更で影響する範囲だけを再集計し、
+取りこぼしは定期タスク（rebuild_party_topic_stats）で再構築して補正する。
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from app.core.response_cache import purge_tags
+from app.models.party import Party
+from app.models.party_topic_stat import PartyTopicStat
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementTopic
+from app.models.topic import Topic
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+# 政党×トピックごとに保持する最新の発言数
+LATEST_STATEMENT_LIMIT = 5
+
+
+def _scope(query, party_ids: Optional[List[str]], topic_ids: Optional[List[str]]):
+    """
+    集計対象を政党・トピックで絞り込む
+    """
+    if party_ids is not None:
+        query = query.filter(Politician.current_party_id.in_(party_ids))
+    if topic_ids is not None:
+        query = query.filter(StatementTopic.topic_id.in_(topic_ids))
+    return query
+
+
+def _aggregate(
+    db: Session, party_ids: Optional[List[str]], topic_ids: Optional[List[str]]
+) -> List[Dict]:
+    """
+    発言テーブルから政党×トピックの集計行を作る
+    """
+    base = db.query(
+        Politician.current_party_id.label("party_id"),
+        StatementTopic.topic_id.label("topic_id"),
+        Statement.id.label("statement_id"),
+        Statement.statement_date.label("statement_date"),
+    ).join(
+        Politician, Politician.id == Statement.politician_id
+    ).join(
+        StatementTopic, StatementTopic.statement_id == Statement.id
+    ).filter(
+        Statement.status == "published",
+        Politician.status == "active",
+        Politician.current_party_id.isnot(None)
+    )
+    base = _scope(base, party_ids, topic_ids).subquery()
+
+    counts = db.query(
+        base.c.party_id,
+        base.c.topic_id,
+        func.count(base.c.statement_id),
+        func.max(base.c.statement_date)
+    ).group_by(base.c.party_id, base.c.topic_id).all()
+    if not counts:
+        return []
+
+    row_number = func.row_number().over(
+        partition_by=(base.c.party_id, base.c.topic_id),
+        order_by=(base.c.statement_date.desc(), base.c.statement_id.desc())
+    ).label("row_number")
+    ranked = db.query(
+        base.c.party_id, base.c.topic_id, base.c.statement_id, row_number
+    ).subquery()
+    latest_rows = db.query(
+        ranked.c.party_id, ranked.c.topic_id, ranked.c.statement_id
+    ).filter(
+        ranked.c.row_number <= LATEST_STATEMENT_LIMIT
+    ).order_by(ranked.c.party_id, ranked.c.topic_id, ranked.c.row_number).all()
+
+    latest: Dict[tuple, List[str]] = {}
+    for party_id, topic_id, statement_id in latest_rows:
+        latest.setdefault((party_id, topic_id), []).append(statement_id)
+
+    now = datetime.utcnow()
+    return [
+        {
+            "party_id": party_id,
+            "topic_id": topic_id,
+            "statement_count": count,
+            "last_statement_date": last_date,
+            "latest_statement_ids": json.dumps(latest.get((party_id, topic_id), [])),
+            "updated_at": now,
+        }
+        for party_id, topic_id, count, last_date in counts
+    ]
+
+
+def refresh_party_topic_stats(
+    db: Session,
+    *,
+    party_ids: Optional[Iterable[Optional[str]]] = None,
+    topic_ids: Optional[Iterable[str]] = None
+) -> int:
+    """
+    指定した政党・トピックの範囲の集計を作り直す
+
+    どちらも省略した場合は全体を作り直す。空の範囲を指定した場合は何もしない。
+
+    Args:
+        db: データベースセッション
+        party_ids: 対象の政党ID（Noneの要素は無視する）
+        topic_ids: 対象のトピックID
+
+    Returns:
+        書き込んだ行数
+    """
+    if party_ids is not None:
+        party_ids = sorted({party_id for party_id in party_ids if party_id})
+        if not party_ids:
+            return 0
+    if topic_ids is not None:
+        topic_ids = sorted(set(topic_ids))
+        if not topic_ids:
+            return 0
+
+    stale = db.query(PartyTopicStat)
+    if party_ids is not None:
+        stale = stale.filter(PartyTopicStat.party_id.in_(party_ids))
+    if topic_ids is not None:
+        stale = stale.filter(PartyTopicStat.topic_id.in_(topic_ids))
+    stale.delete(synchronize_session=False)
+
+    rows = _aggregate(db, party_ids, topic_ids)
+    if rows:
+        db.execute(insert(PartyTopicStat), rows)
+    db.commit()
+    
+    # 集計を使うレスポンスのキャッシュを破棄
+    if topic_ids is None:
+        purge_tags("party_topic_stats")
+    else:
+        purge_tags(*[f"topic:{topic_id}:parties" for topic_id in topic_ids])
+    if party_ids is not None:
+        purge_tags(*[f"party:{party_id}:topics" for party_id in party_ids])
+    return len(rows)
+
+
+def refresh_for_statement(
+    db: Session, *, politician_id: str, topic_ids: Iterable[str]
+) -> int:
+    """
+    発言の変更で影響する政党×トピックの集計を作り直す
+
+    Args:
+        db: データベースセッション
+        politician_id: 発言者の政治家ID
+        topic_ids: 変更前後の発言のトピックID
+
+    Returns:
+        書き込んだ行数
+    """
+    party_id = db.query(Politician.current_party_id).filter(
+        Politician.id == politician_id
+    ).scalar()
+    return refresh_party_topic_stats(db, party_ids=[party_id], topic_ids=topic_ids)
+
+
+def rebuild_party_topic_stats(db: Session) -> int:
+    """
+    全政党の集計を作り直す（トランザクションを小さくするため政党ごとに処理する）
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        書き込んだ行数
+    """
+    # 削除済みの政党・トピックの行は外部キーのCASCADEで消える
+    party_ids = [row[0] for row in db.query(Party.id).order_by(Party.id)]
+    return sum(
+        refresh_party_topic_stats(db, party_ids=[party_id]) for party_id in party_ids
+    )
+
+
+def _stance(stat: PartyTopicStat, summary: str) -> Dict:
+    """
+    集計行からスタンス情報を組み立てる（スタンスの分析は簡易版）
+    """
+    return {
+        "stance": "neutral",
+        "confidence": 50,
+        "summary": summary,
+        "manifesto_url": None,
+        "count": stat.statement_count,
+        "last_updated": (
+            stat.last_statement_date.isoformat() if stat.last_statement_date else None
+        ),
+        "latest_statement_ids": json.loads(stat.latest_statement_ids or "[]"),
+    }
+
+
+def get_topic_party_stats(db: Session, *, topic_id: str) -> List[Dict]:
+    """
+    トピックに関する政党別の集計を取得する
+
+    Args:
+        db: データベースセッション
+        topic_id: トピックID
+
+    Returns:
+        政党スタンス情報のリスト（発言数の多い順）
+    """
+    rows = db.query(PartyTopicStat, Party.name, Topic.name).join(
+        Party, Party.id == PartyTopicStat.party_id
+    ).join(
+        Topic, Topic.id == PartyTopicStat.topic_id
+    ).filter(
+        PartyTopicStat.topic_id == topic_id,
+        Party.status == "active"
+    ).order_by(
+        PartyTopicStat.statement_count.desc(), Party.name
+    ).all()
+
+    return [
+        {
+            "party_id": stat.party_id,
+            "party_name": party_name,
+            **_stance(stat, f"{party_name}の{topic_name}に関する発言が{stat.statement_count}件あります。"),
+        }
+        for stat, party_name, topic_name in rows
+    ]
+
+
+def get_party_topic_stats(db: Session, *, party_id: str) -> List[Dict]:
+    """
+    政党のトピック別の集計を取得する
+
+    Args:
+        db: データベースセッション
+        party_id: 政党ID
+
+    Returns:
+        トピック情報のリスト（発言数の多い順）
+    """
+    rows = db.query(PartyTopicStat, Topic.name, Topic.slug).join(
+        Topic, Topic.id == PartyTopicStat.topic_id
+    ).filter(
+        PartyTopicStat.party_id == party_id
+    ).order_by(
+        PartyTopicStat.statement_count.desc(), Topic.name
+    ).all()
+
+    return [
+        {
+            "topic_id": stat.topic_id,
+            "topic_name": topic_name,
+            "topic_slug": topic_slug,
+            **_stance(stat, f"{topic_name}に関する発言が{stat.statement_count}件あります。"),
+        }
+        for stat, topic_name, topic_slug in rows
+    ]
@@ -1,3 +1,5 @@
+import logging
+import os
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
@@ -11,9 +13,26 @@ from app.schemas.politician import (
     PoliticianPartyUpdate,
     PoliticianUpdate,
 )
+from app.core.response_cache import purge_tags
+from app.search import index_document, remove_document
+from app.services.entity_cache import politicians as politician_cache
+from app.services.party_topic_stats import refresh_party_topic_stats
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
+# テスト環境かどうか（起動時に一度だけ判定する）
+TESTING = os.getenv("TESTING") == "True"
+
+
+def _on_membership_changed(db: Session, *party_ids: Optional[str]) -> None:
+    """
+    所属の変更を政党×トピックの集計と政党ページのキャッシュに反映する
+    """
+    refresh_party_topic_stats(db, party_ids=party_ids)
+    purge_tags(*[f"party:{party_id}" for party_id in party_ids if party_id])
+
 
 def get_politician(db: Session, id: str) -> Optional[Politician]:
     """
@@ -26,25 +45,37 @@ def get_politician(db: Session, id: str) -> Optional[Politician]:
     Returns:
         政治家オブジェクト、存在しない場合はNone
     """
-    import os
-
-    # 通常の検索
-    politician = db.query(Politician).filter(Politician.id == id).first()
+    # 通常の検索（キャッシュ経由）
+    politician = politician_cache.get(db, id)
     
     # テスト環境で政治家が見つからない場合、テスト用の政治家を検索
-    if politician is None and os.getenv("TESTING") == "True":
+    if politician is None and TESTING:
         # テスト用の政治家を検索（名前が「テスト太郎」の政治家）
         test_politician = db.query(Politician).filter(
             Politician.name == "テスト太郎"
         ).first()
         
         if test_politician:
-            print(f"テスト用の政治家を返します: {test_politician.id}, {test_politician.name}")
+            logger.debug("テスト用の政治家を返します: %s, %s", test_politician.id, test_politician.name)
             return test_politician
     
     return politician
 
 
+def get_politicians_by_ids(db: Session, ids: List[str]) -> Dict[str, Politician]:
+    """
+    複数の政治家をIDでまとめて取得する
+    
+    Args:
+        db: データベースセッション
+        ids: 政治家IDのリスト
+        
+    Returns:
+        政治家IDと政治家オブジェクトの辞書（存在しないIDは含まない）
+    """
+    return politician_cache.get_many(db, ids)
+
+
 def get_politicians(
     db: Session,
     skip: int = 0,
@@ -67,11 +98,6 @@ def get_politicians(
     Returns:
         政治家オブジェクトのリスト
     """
-    import os
-
-    # テスト環境かどうかを確認
-    is_testing = os.getenv("TESTING") == "True"
-    
     query = db.query(Politician)
     
     if status:
@@ -90,7 +116,7 @@ def get_politicians(
     politicians = query.offset(skip).limit(limit).all()
     
     # テスト環境の場合、テスト用の政治家を追加
-    if is_testing:
+    if TESTING:
         # テスト用の政治家IDのリスト
         test_politician_ids = []
         
@@ -98,7 +124,7 @@ def get_politicians(
         test_politicians = db.query(Politician).all()
         for politician in test_politicians:
             if politician.id not in [p.id for p in politicians]:
-                print(f"テスト用の政治家を追加します: {politician.id}, {politician.name}")
+                logger.debug("テスト用の政治家を追加します: %s, %s", politician.id, politician.name)
                 politicians.append(politician)
     
     return politicians
@@ -160,6 +186,11 @@ def create_politician(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    
+    # 検索索引とキャッシュに反映
+    index_document("politician", db_obj)
+    politician_cache.invalidate(db_obj.id)
+    
     return db_obj
 
 
@@ -185,6 +216,8 @@ def update_politician(
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
+    old_party_id = db_obj.current_party_id
+    
     for field in update_data:
         if field in update_data:
             setattr(db_obj, field, update_data[field])
@@ -192,6 +225,15 @@ def update_politician(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    
+    # 検索索引とキャッシュに反映
+    index_document("politician", db_obj)
+    politician_cache.invalidate(db_obj.id)
+    
+    # 所属政党や状態が変わった場合は政党×トピックの集計を作り直す
+    if "current_party_id" in update_data or "status" in update_data:
+        _on_membership_changed(db, old_party_id, db_obj.current_party_id)
+    
     return db_obj
 
 
@@ -207,8 +249,17 @@ def delete_politician(db: Session, *, id: str) -> Politician:
         削除された政治家オブジェクト
     """
     obj = db.query(Politician).get(id)
+    party_id = obj.current_party_id
     db.delete(obj)
     db.commit()
+    
+    # 検索索引とキャッシュから取り除く
+    remove_document("politician", id)
+    politician_cache.invalidate(id)
+    
+    # 所属していた政党の集計を作り直す
+    _on_membership_changed(db, party_id)
+    
     return obj
 
 
@@ -260,6 +311,7 @@ def create_politician_detail(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    purge_tags(f"politician:{politician_id}")
     return db_obj
 
 
@@ -292,6 +344,7 @@ def update_politician_detail(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    purge_tags(f"politician:{db_obj.politician_id}")
     return db_obj
 
 
@@ -372,9 +425,14 @@ def create_politician_party(
     if obj_in.is_current:
         politician = db.query(Politician).get(obj_in.politician_id)
         if politician:
+            old_party_id = politician.current_party_id
             politician.current_party_id = obj_in.party_id
             db.add(politician)
             db.commit()
+            politician_cache.invalidate(politician.id)
+            
+            # 移籍前後の政党の集計を作り直す
+            _on_membership_changed(db, old_party_id, obj_in.party_id)
     
     return db_obj
 
@@ -424,9 +482,14 @@ def update_politician_party(
     if db_obj.is_current:
         politician = db.query(Politician).get(db_obj.politician_id)
         if politician:
+            old_party_id = politician.current_party_id
             politician.current_party_id = db_obj.party_id
             db.add(politician)
             db.commit()
+            politician_cache.invalidate(politician.id)
+            
+            # 移籍前後の政党の集計を作り直す
+            _on_membership_changed(db, old_party_id, db_obj.party_id)
     
     return db_obj
 
@@ -445,14 +508,21 @@ def delete_politician_party(db: Session, *, id: str) -> PoliticianParty:
     obj = db.query(PoliticianParty).get(id)
     
     # 現在の所属政党の場合は、政治家のcurrent_party_idをNullに更新
+    old_party_id = None
     if obj and obj.is_current:
         politician = db.query(Politician).get(obj.politician_id)
         if politician:
+            old_party_id = politician.current_party_id
             politician.current_party_id = None
             db.add(politician)
     
     db.delete(obj)
     db.commit()
+    if obj:
+        politician_cache.invalidate(obj.politician_id)
+    
+    # 離党した政党の集計を作り直す
+    _on_membership_changed(db, old_party_id)
     return obj
 
 
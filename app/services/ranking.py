@@ -0,0 +1,496 @@
+"""
+パーソナライズドフィードのランキング
+
+1. 候補生成: フォロー中の政治家・トピックの最近の発言を、件数上限付きのクエリで取得する
+   （表示する件数に足りない場合は、期間を区切らずに古い発言へキーセットで広げる）
+2. スコアリング: 新しさ・重要度・トピック関連度・反応数をNumPyでまとめて計算する
+3. 上位k件の選択: argpartitionで必要な件数だけを並べ替える
+
+1はfetch_feed_input、2・3はselect_feed_ids（データベースを使わない）、
+発言の読み込みと総数はload_feed_pageで行う（非同期版は2・3だけをスレッドプールで実行する）。
+
+重みはUserSettings.feed_preference（JSON）でユーザーごとに上書きできる。
+例: {"recency": 2.0, "engagement": 0, "recency_half_life_hours": 48}
+"""
+import json
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from app.core.config import settings
+from app.models.follows import PoliticianFollow, TopicFollow
+from app.models.statement import Statement, StatementTopic
+from app.models.user_settings import UserSettings
+from sqlalchemy import and_, distinct, func, or_
+from sqlalchemy.orm import Query, Session, joinedload
+
+logger = logging.getLogger(__name__)
+
+# スコアの重み（feed_preferenceで上書き可能なキー）
+DEFAULT_FEED_WEIGHTS: Dict[str, float] = {
+    "recency": 1.0,  # 新しさ（半減期で減衰）
+    "importance": 0.6,  # 発言の重要度（0-100）
+    "relevance": 0.4,  # フォロー中トピックとの関連度（0-100）
+    "engagement": 0.3,  # いいね・賛成・重要・コメント数（対数）
+    "politician": 0.5,  # フォロー中の政治家の発言であること
+}
+
+# 反応数の正規化に使う上限（この件数以上は同じ評価とする）
+_ENGAGEMENT_SATURATION = 1000
+
+# 候補の取得に使うカラム
+_CANDIDATE_COLUMNS = (
+    Statement.id,
+    Statement.statement_date,
+    Statement.importance,
+    (
+        Statement.likes_count + Statement.agrees_count
+        + Statement.important_count + Statement.comments_count
+    ).label("engagement"),
+)
+
+
+class FeedWeights(NamedTuple):
+    """
+    スコアの重みと新しさの半減期
+    """
+    recency: float
+    importance: float
+    relevance: float
+    engagement: float
+    politician: float
+    recency_half_life_hours: float
+
+
+class FeedCandidates(NamedTuple):
+    """
+    スコアリング対象の候補（各配列は同じ長さ・同じ順序）
+
+    exhaustedは対象の発言を全て取得し終えたかどうか（Trueならidsの件数が総数）。
+    """
+    ids: List[str]
+    age_hours: np.ndarray
+    importance: np.ndarray
+    relevance: np.ndarray
+    engagement: np.ndarray
+    from_politician: np.ndarray
+    exhausted: bool = False
+
+
+def parse_feed_preference(raw: Optional[str]) -> FeedWeights:
+    """
+    feed_preferenceのJSONから重みを組み立てる
+
+    不正なJSONや数値でない値は無視し、既定値を使う。
+
+    Args:
+        raw: UserSettings.feed_preferenceの値
+
+    Returns:
+        重み
+    """
+    weights = dict(DEFAULT_FEED_WEIGHTS)
+    half_life = float(settings.FEED_RECENCY_HALF_LIFE_HOURS)
+
+    preference = {}
+    if raw:
+        try:
+            preference = json.loads(raw)
+        except ValueError:
+            logger.warning("feed_preferenceのJSONを解析できませんでした")
+    if not isinstance(preference, dict):
+        preference = {}
+
+    for key, value in preference.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if not math.isfinite(value):
+            continue
+        if key in weights:
+            weights[key] = float(value)
+        elif key == "recency_half_life_hours" and value > 0:
+            half_life = float(value)
+
+    return FeedWeights(recency_half_life_hours=half_life, **weights)
+
+
+def get_feed_weights(db: Session, *, user_id: str) -> FeedWeights:
+    """
+    ユーザーのフィードの重みを取得する
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        重み
+    """
+    raw = db.query(UserSettings.feed_preference).filter(
+        UserSettings.user_id == user_id
+    ).scalar()
+    return parse_feed_preference(raw)
+
+
+def _politician_candidates(db: Session, politician_ids: List[str]) -> Query:
+    """
+    フォロー中の政治家の公開中の発言を候補として取得するクエリ
+    """
+    return db.query(*_CANDIDATE_COLUMNS).filter(
+        Statement.politician_id.in_(politician_ids),
+        Statement.status == "published"
+    )
+
+
+def _topic_candidates(db: Session, topic_ids: List[str]) -> Query:
+    """
+    フォロー中のトピックの公開中の発言を、最大の関連度とともに取得するクエリ
+    """
+    return db.query(
+        *_CANDIDATE_COLUMNS, func.max(StatementTopic.relevance)
+    ).join(
+        StatementTopic, StatementTopic.statement_id == Statement.id
+    ).filter(
+        StatementTopic.topic_id.in_(topic_ids),
+        Statement.status == "published"
+    ).group_by(
+        Statement.id
+    )
+
+
+def _fetch_newest(
+    query: Query, *, since: Optional[datetime], before: Optional[tuple], limit: int
+) -> list:
+    """
+    新しい順（同時刻は発言IDの降順）に取得する
+
+    Args:
+        query: 候補のクエリ
+        since: この日時以降に限る（Noneの場合は区切らない）
+        before: (日時, 発言ID)より古いものに限る（キーセット）。
+            発言IDがNoneの場合は日時より前のもの
+        limit: 取得上限
+    """
+    if since is not None:
+        query = query.filter(Statement.statement_date >= since)
+    if before is not None:
+        date, id = before
+        if id is None:
+            query = query.filter(Statement.statement_date < date)
+        else:
+            query = query.filter(or_(
+                Statement.statement_date < date,
+                and_(Statement.statement_date == date, Statement.id < id)
+            ))
+    return query.order_by(
+        Statement.statement_date.desc(), Statement.id.desc()
+    ).limit(limit).all()
+
+
+def generate_candidates(
+    db: Session,
+    *,
+    politician_ids: List[str],
+    topic_ids: List[str],
+    now: Optional[datetime] = None,
+    min_count: int = 0,
+) -> FeedCandidates:
+    """
+    フォロー中の政治家・トピックの最近の発言を候補として取得する
+
+    ソースごとにFEED_CANDIDATE_WINDOW_DAYS以内・FEED_CANDIDATE_LIMIT件までの
+    新しい順のクエリで取得し、発言IDで統合する。候補がmin_count件に満たない場合は、
+    ソースごとに最後に取得した発言より古いものを期間を区切らずに追加で取得する。
+
+    Args:
+        db: データベースセッション
+        politician_ids: フォロー中の政治家ID
+        topic_ids: フォロー中のトピックID
+        now: 基準時刻（省略時は現在時刻）
+        min_count: 取得する候補の最小件数（表示するページの末尾までの件数）
+
+    Returns:
+        候補
+    """
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=settings.FEED_CANDIDATE_WINDOW_DAYS)
+    limit = settings.FEED_CANDIDATE_LIMIT
+
+    # 発言ID -> [日時, 重要度, 関連度, 反応数, 政治家由来]
+    rows: Dict[str, list] = {}
+
+    def merge_politician_rows(politician_rows: list) -> None:
+        for id, statement_date, importance, engagement in politician_rows:
+            if id in rows:
+                rows[id][4] = 1
+            else:
+                rows[id] = [statement_date, importance, 0, engagement, 1]
+
+    def merge_topic_rows(topic_rows: list) -> None:
+        for id, statement_date, importance, engagement, relevance in topic_rows:
+            if id in rows:
+                rows[id][2] = relevance
+            else:
+                rows[id] = [statement_date, importance, relevance, engagement, 0]
+
+    # ソースごとのクエリ・結果の反映先・キーセットの位置・取得し終えたかどうか
+    sources = []
+    if politician_ids:
+        sources.append([_politician_candidates(db, politician_ids), merge_politician_rows])
+    if topic_ids:
+        sources.append([_topic_candidates(db, topic_ids), merge_topic_rows])
+    for source in sources:
+        query, merge = source
+        fetched = _fetch_newest(query, since=since, before=None, limit=limit)
+        merge(fetched)
+        before = (fetched[-1][1], fetched[-1][0]) if fetched else (since, None)
+        # 期間内に上限未満しかなければ、期間内の発言は全て取得済み
+        source += [before, False]
+
+    # 期間内の候補で足りない場合は、期間を区切らずに古い方へ広げる
+    while len(rows) < min_count and not all(source[3] for source in sources):
+        needed = min_count - len(rows)
+        for source in sources:
+            query, merge, before, exhausted = source
+            if exhausted:
+                continue
+            fetched = _fetch_newest(query, since=None, before=before, limit=needed)
+            merge(fetched)
+            if fetched:
+                source[2] = (fetched[-1][1], fetched[-1][0])
+            source[3] = len(fetched) < needed
+
+    # 期間外まで広げて全て取得し終えた場合のみ、候補数が総数になる
+    exhausted = all(source[3] for source in sources)
+
+    ids = list(rows)
+    values = list(rows.values())
+    age_hours = np.fromiter(
+        ((now - value[0]).total_seconds() / 3600 for value in values),
+        dtype=np.float64, count=len(values)
+    )
+    columns = np.array([value[1:] for value in values], dtype=np.float64).reshape(-1, 4)
+    return FeedCandidates(
+        ids=ids,
+        age_hours=age_hours,
+        importance=columns[:, 0],
+        relevance=columns[:, 1],
+        engagement=columns[:, 2],
+        from_politician=columns[:, 3],
+        exhausted=exhausted,
+    )
+
+
+def count_feed_statements(
+    db: Session, *, politician_ids: List[str], topic_ids: List[str]
+) -> int:
+    """
+    フィードの対象になる公開中の発言の総数を数える
+
+    Args:
+        db: データベースセッション
+        politician_ids: フォロー中の政治家ID
+        topic_ids: フォロー中のトピックID
+
+    Returns:
+        発言数
+    """
+    conditions = []
+    if politician_ids:
+        conditions.append(Statement.politician_id.in_(politician_ids))
+    if topic_ids:
+        conditions.append(Statement.id.in_(
+            db.query(StatementTopic.statement_id).filter(
+                StatementTopic.topic_id.in_(topic_ids)
+            )
+        ))
+    if not conditions:
+        return 0
+    return db.query(func.count(distinct(Statement.id))).filter(
+        Statement.status == "published",
+        or_(*conditions)
+    ).scalar()
+
+
+def score_candidates(candidates: FeedCandidates, weights: FeedWeights) -> np.ndarray:
+    """
+    候補のスコアをまとめて計算する
+
+    各要素を0-1に正規化し、重み付きで合計する。
+
+    Args:
+        candidates: 候補
+        weights: 重み
+
+    Returns:
+        候補と同じ順序のスコア
+    """
+    age = np.maximum(candidates.age_hours, 0.0)
+    recency = np.exp2(-age / weights.recency_half_life_hours)
+    importance = np.clip(candidates.importance, 0, 100) / 100.0
+    relevance = np.clip(candidates.relevance, 0, 100) / 100.0
+    engagement = np.minimum(
+        np.log1p(np.maximum(candidates.engagement, 0)) / math.log1p(_ENGAGEMENT_SATURATION),
+        1.0
+    )
+    return (
+        weights.recency * recency
+        + weights.importance * importance
+        + weights.relevance * relevance
+        + weights.engagement * engagement
+        + weights.politician * candidates.from_politician
+    )
+
+
+def top_k(scores: np.ndarray, age_hours: np.ndarray, k: int) -> np.ndarray:
+    """
+    スコアの高い上位k件の位置を返す（同点の場合は新しい順）
+
+    Args:
+        scores: スコア
+        age_hours: 経過時間（同点時の並び順に使用）
+        k: 件数
+
+    Returns:
+        スコアの高い順の位置
+    """
+    if k <= 0 or not len(scores):
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        selected = np.argpartition(-scores, k - 1)[:k]
+    else:
+        selected = np.arange(len(scores))
+    order = np.lexsort((age_hours[selected], -scores[selected]))
+    return selected[order]
+
+
+class FeedInput(NamedTuple):
+    """
+    フィードのスコアリングに必要な、データベースから取得した値
+    """
+    politician_ids: List[str]
+    topic_ids: List[str]
+    candidates: FeedCandidates
+    weights: FeedWeights
+
+
+def fetch_feed_input(
+    db: Session,
+    *,
+    user_id: str,
+    min_count: int,
+    now: Optional[datetime] = None,
+) -> Optional[FeedInput]:
+    """
+    フォロー関係・候補・重みを取得する
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        min_count: 取得する候補の最小件数（表示するページの末尾までの件数）
+        now: 基準時刻（省略時は現在時刻）
+
+    Returns:
+        スコアリングの入力（何もフォローしていない場合はNone）
+    """
+    politician_ids = [
+        row[0] for row in db.query(PoliticianFollow.politician_id).filter(
+            PoliticianFollow.user_id == user_id
+        )
+    ]
+    topic_ids = [
+        row[0] for row in db.query(TopicFollow.topic_id).filter(
+            TopicFollow.user_id == user_id
+        )
+    ]
+    if not politician_ids and not topic_ids:
+        return None
+
+    candidates = generate_candidates(
+        db, politician_ids=politician_ids, topic_ids=topic_ids, now=now,
+        min_count=min_count
+    )
+    return FeedInput(
+        politician_ids=politician_ids,
+        topic_ids=topic_ids,
+        candidates=candidates,
+        weights=get_feed_weights(db, user_id=user_id),
+    )
+
+
+def select_feed_ids(feed: FeedInput, *, skip: int = 0, limit: int = 20) -> List[str]:
+    """
+    候補のスコアを計算し、ページに表示する発言IDをスコア順に選ぶ（データベースは使わない）
+
+    Args:
+        feed: スコアリングの入力
+        skip: スキップ数
+        limit: 取得上限
+
+    Returns:
+        スコア順の発言ID
+    """
+    candidates = feed.candidates
+    scores = score_candidates(candidates, feed.weights)
+    positions = top_k(scores, candidates.age_hours, skip + limit)[skip:]
+    return [candidates.ids[position] for position in positions]
+
+
+def load_feed_page(
+    db: Session, feed: FeedInput, ids: List[str]
+) -> Tuple[List[Statement], int]:
+    """
+    選んだ発言とフィードの対象になる発言の総数を取得する
+
+    Args:
+        db: データベースセッション
+        feed: スコアリングの入力
+        ids: スコア順の発言ID
+
+    Returns:
+        スコア順の発言オブジェクトのリストと対象の発言の総数
+    """
+    statements = {}
+    if ids:
+        statements = {
+            statement.id: statement
+            for statement in db.query(Statement).options(
+                joinedload(Statement.politician)
+            ).filter(Statement.id.in_(ids))
+        }
+    if feed.candidates.exhausted:
+        total = len(feed.candidates.ids)
+    else:
+        total = count_feed_statements(
+            db, politician_ids=feed.politician_ids, topic_ids=feed.topic_ids
+        )
+    return [statements[id] for id in ids if id in statements], total
+
+
+def rank_feed(
+    db: Session,
+    *,
+    user_id: str,
+    skip: int = 0,
+    limit: int = 20,
+    now: Optional[datetime] = None,
+) -> Tuple[List[Statement], int]:
+    """
+    ユーザーのフォロー関係と重みに基づいてフィードを並べる
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        skip: スキップ数
+        limit: 取得上限
+        now: 基準時刻（省略時は現在時刻）
+
+    Returns:
+        スコア順の発言オブジェクトのリストと対象の発言の総数
+    """
+    feed = fetch_feed_input(db, user_id=user_id, min_count=skip + limit, now=now)
+    if feed is None:
+        return [], 0
+    ids = select_feed_ids(feed, skip=skip, limit=limit)
+    return load_feed_page(db, feed, ids)
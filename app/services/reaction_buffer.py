@@ -0,0 +1,694 @@
+"""
+発言リアクションのライトビハインドバッファ
+
+REACTION_BUFFER_BACKENDがnone以外の場合、いいね等のリアクションは
+statement_reactionsへ直接書き込まずバッファに積み、定期的にまとめて反映する。
+バッファには (発言ID, ユーザーID, リアクション種別) ごとの最終状態のみを保持するため、
+同じ操作を繰り返しても結果は変わらない（冪等）。
+
+バッファのエントリは (操作, 元の状態) の組で、操作が元の状態と異なる場合のみ保持する。
+未反映分の件数差分は発言・種別ごとに集計しておき、永続化済みのカウンタに加えて返す。
+
+反映（取り出し→コミット→完了）は反映ロックを持つ1つの処理だけが行う。
+ロックの期限切れなどで同じエントリが再び反映されても、statement_reactionsの
+一意制約と重複を無視するINSERTにより行とカウンタは二重に更新されない。
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.models.statement import REACTION_COUNT_COLUMNS, Statement, StatementReaction
+from app.services.statement import adjust_statement_counter
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert
+
+logger = logging.getLogger(__name__)
+
+
+class PendingReaction(NamedTuple):
+    """
+    未反映のリアクション操作
+    """
+    statement_id: str
+    user_id: str
+    reaction_type: str
+    add: bool
+    # バッファに積んだ時点でのstatement_reactions上の状態
+    persisted: bool
+
+    @property
+    def contribution(self) -> int:
+        """
+        件数への寄与（追加なら+1、削除なら-1）
+        """
+        return 1 if self.add else -1
+
+
+class ReactionBuffer:
+    """
+    リアクションバッファの基底クラス
+    """
+
+    def record(
+        self,
+        statement_id: str,
+        user_id: str,
+        reaction_type: str,
+        add: bool,
+        persisted: bool,
+    ) -> bool:
+        """
+        リアクションの追加・削除を記録する
+
+        Args:
+            statement_id: 発言ID
+            user_id: ユーザーID
+            reaction_type: リアクション種別
+            add: 追加の場合はTrue、削除の場合はFalse
+            persisted: statement_reactionsに既に存在するかどうか
+
+        Returns:
+            状態が変わった場合はTrue（既に同じ状態の場合はFalse）
+        """
+        raise NotImplementedError
+
+    def pending_deltas(self, statement_ids: Iterable[str], reaction_type: str) -> Dict[str, int]:
+        """
+        未反映分の件数差分を発言ごとに返す
+        """
+        raise NotImplementedError
+
+    def pending_states(
+        self, statement_ids: Iterable[str], user_id: str
+    ) -> Dict[Tuple[str, str], bool]:
+        """
+        ユーザーの未反映のリアクション状態を (発言ID, 種別) ごとに返す
+        """
+        raise NotImplementedError
+
+    def drain(self) -> List[PendingReaction]:
+        """
+        反映対象のエントリを取り出す
+
+        前回の反映が失敗して残っているエントリがあればそれを、なければ
+        現在のエントリを全て反映中に移して返す。
+        """
+        raise NotImplementedError
+
+    def complete(self, entries: List[PendingReaction]) -> None:
+        """
+        反映が完了したエントリを反映中から取り除き、件数差分を戻す
+        """
+        raise NotImplementedError
+
+    def acquire_flush_lock(self, ttl: int) -> Optional[str]:
+        """
+        反映ロックを取得する（取り出しから完了までを1つの処理に限る）
+
+        Args:
+            ttl: ロックの期限（秒）。反映中の処理が落ちた場合はこの時間で解放される
+
+        Returns:
+            ロックの所有者を表すトークン（他の処理が反映中の場合はNone）
+        """
+        raise NotImplementedError
+
+    def extend_flush_lock(self, token: str, ttl: int) -> bool:
+        """
+        反映ロックの期限を延ばす
+
+        Returns:
+            まだロックを持っている場合はTrue
+        """
+        raise NotImplementedError
+
+    def release_flush_lock(self, token: str) -> None:
+        """
+        反映ロックを解放する（所有者が変わっている場合は何もしない）
+        """
+        raise NotImplementedError
+
+
+class InMemoryReactionBuffer(ReactionBuffer):
+    """
+    プロセス内のバッファ（単一プロセス構成・開発用）
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str, str], PendingReaction] = {}
+        self._inflight: Dict[Tuple[str, str, str], PendingReaction] = {}
+        self._deltas: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_token: Optional[str] = None
+
+    def record(
+        self,
+        statement_id: str,
+        user_id: str,
+        reaction_type: str,
+        add: bool,
+        persisted: bool,
+    ) -> bool:
+        key = (statement_id, user_id, reaction_type)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                base, old = entry.persisted, entry.contribution
+                current = entry.add
+            else:
+                inflight = self._inflight.get(key)
+                base = inflight.add if inflight is not None else persisted
+                old = 0
+                current = base
+            if current == add:
+                return False
+
+            new = 0
+            if add == base:
+                # 元の状態に戻った場合はエントリ自体を取り消す
+                del self._pending[key]
+            else:
+                entry = PendingReaction(statement_id, user_id, reaction_type, add, base)
+                self._pending[key] = entry
+                new = entry.contribution
+            self._deltas[(statement_id, reaction_type)] += new - old
+            return True
+
+    def pending_deltas(self, statement_ids: Iterable[str], reaction_type: str) -> Dict[str, int]:
+        with self._lock:
+            return {
+                statement_id: self._deltas.get((statement_id, reaction_type), 0)
+                for statement_id in statement_ids
+            }
+
+    def pending_states(
+        self, statement_ids: Iterable[str], user_id: str
+    ) -> Dict[Tuple[str, str], bool]:
+        states = {}
+        with self._lock:
+            for statement_id in statement_ids:
+                for reaction_type in REACTION_COUNT_COLUMNS:
+                    key = (statement_id, user_id, reaction_type)
+                    entry = self._pending.get(key) or self._inflight.get(key)
+                    if entry is not None:
+                        states[(statement_id, reaction_type)] = entry.add
+        return states
+
+    def drain(self) -> List[PendingReaction]:
+        with self._lock:
+            if not self._inflight:
+                self._inflight, self._pending = self._pending, {}
+            return list(self._inflight.values())
+
+    def complete(self, entries: List[PendingReaction]) -> None:
+        with self._lock:
+            for entry in entries:
+                key = (entry.statement_id, entry.user_id, entry.reaction_type)
+                if self._inflight.pop(key, None) is None:
+                    continue
+                delta_key = (entry.statement_id, entry.reaction_type)
+                self._deltas[delta_key] -= entry.contribution
+                if not self._deltas[delta_key]:
+                    del self._deltas[delta_key]
+
+    def acquire_flush_lock(self, ttl: int) -> Optional[str]:
+        # プロセス内では処理が落ちてもロックが残らないため期限は使わない
+        if not self._flush_lock.acquire(blocking=False):
+            return None
+        self._flush_token = str(uuid.uuid4())
+        return self._flush_token
+
+    def extend_flush_lock(self, token: str, ttl: int) -> bool:
+        return self._flush_token == token
+
+    def release_flush_lock(self, token: str) -> None:
+        if self._flush_token == token:
+            self._flush_token = None
+            self._flush_lock.release()
+
+
+# KEYS: pending, inflight, deltas / ARGV: field, add, persisted, delta_field
+_RECORD_SCRIPT = """
+local entry = redis.call('HGET', KEYS[1], ARGV[1])
+local base
+local current
+local old = 0
+if entry then
+  base = string.sub(entry, -1)
+  current = (string.sub(entry, 1, 1) == '1') and '1' or '0'
+  old = (current == '1') and 1 or -1
+else
+  local inflight = redis.call('HGET', KEYS[2], ARGV[1])
+  if inflight then
+    base = string.sub(inflight, 1, 1)
+  else
+    base = ARGV[3]
+  end
+  current = base
+end
+if current == ARGV[2] then
+  return 0
+end
+local new = 0
+if ARGV[2] == base then
+  redis.call('HDEL', KEYS[1], ARGV[1])
+else
+  redis.call('HSET', KEYS[1], ARGV[1], ARGV[2] .. '|' .. base)
+  new = (ARGV[2] == '1') and 1 or -1
+end
+redis.call('HINCRBY', KEYS[3], ARGV[4], new - old)
+return 1
+"""
+
+# KEYS: lock / ARGV: token, ttl(ms)
+_EXTEND_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# KEYS: lock / ARGV: token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# KEYS: pending, inflight
+_DRAIN_SCRIPT = """
+if redis.call('HLEN', KEYS[2]) == 0 and redis.call('EXISTS', KEYS[1]) == 1 then
+  redis.call('RENAME', KEYS[1], KEYS[2])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+
+class RedisReactionBuffer(ReactionBuffer):
+    """
+    Redisのハッシュを使うバッファ（複数プロセス・複数ホストで共有）
+
+    状態の確認と更新はLuaスクリプトで原子的に行う。
+    エントリの値は「操作|元の状態」（1が追加、0が削除）。
+    """
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "reaction_buffer"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self._pending_key = f"{prefix}:pending"
+        self._inflight_key = f"{prefix}:inflight"
+        self._deltas_key = f"{prefix}:deltas"
+        self._lock_key = f"{prefix}:flush_lock"
+        self._record = self._redis.register_script(_RECORD_SCRIPT)
+        self._drain = self._redis.register_script(_DRAIN_SCRIPT)
+        self._extend_lock = self._redis.register_script(_EXTEND_LOCK_SCRIPT)
+        self._release_lock = self._redis.register_script(_RELEASE_LOCK_SCRIPT)
+
+    @staticmethod
+    def _field(statement_id: str, user_id: str, reaction_type: str) -> str:
+        return f"{statement_id}|{user_id}|{reaction_type}"
+
+    @staticmethod
+    def _delta_field(statement_id: str, reaction_type: str) -> str:
+        return f"{statement_id}|{reaction_type}"
+
+    def record(
+        self,
+        statement_id: str,
+        user_id: str,
+        reaction_type: str,
+        add: bool,
+        persisted: bool,
+    ) -> bool:
+        changed = self._record(
+            keys=[self._pending_key, self._inflight_key, self._deltas_key],
+            args=[
+                self._field(statement_id, user_id, reaction_type),
+                "1" if add else "0",
+                "1" if persisted else "0",
+                self._delta_field(statement_id, reaction_type),
+            ],
+        )
+        return bool(changed)
+
+    def pending_deltas(self, statement_ids: Iterable[str], reaction_type: str) -> Dict[str, int]:
+        statement_ids = list(statement_ids)
+        if not statement_ids:
+            return {}
+        values = self._redis.hmget(
+            self._deltas_key,
+            [self._delta_field(statement_id, reaction_type) for statement_id in statement_ids],
+        )
+        return {
+            statement_id: int(value or 0)
+            for statement_id, value in zip(statement_ids, values)
+        }
+
+    def pending_states(
+        self, statement_ids: Iterable[str], user_id: str
+    ) -> Dict[Tuple[str, str], bool]:
+        keys = [
+            (statement_id, reaction_type)
+            for statement_id in statement_ids
+            for reaction_type in REACTION_COUNT_COLUMNS
+        ]
+        if not keys:
+            return {}
+        fields = [self._field(statement_id, user_id, reaction_type) for statement_id, reaction_type in keys]
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hmget(self._pending_key, fields)
+        pipe.hmget(self._inflight_key, fields)
+        pending, inflight = pipe.execute()
+
+        states = {}
+        for key, pending_value, inflight_value in zip(keys, pending, inflight):
+            value = pending_value or inflight_value
+            if value:
+                states[key] = value[0] == "1"
+        return states
+
+    def drain(self) -> List[PendingReaction]:
+        flat = self._drain(keys=[self._pending_key, self._inflight_key])
+        entries = []
+        for field, value in zip(flat[::2], flat[1::2]):
+            statement_id, user_id, reaction_type = field.split("|")
+            entries.append(PendingReaction(
+                statement_id, user_id, reaction_type,
+                add=value[0] == "1", persisted=value[-1] == "1",
+            ))
+        return entries
+
+    def complete(self, entries: List[PendingReaction]) -> None:
+        if not entries:
+            return
+        deltas: Dict[str, int] = defaultdict(int)
+        for entry in entries:
+            deltas[self._delta_field(entry.statement_id, entry.reaction_type)] -= entry.contribution
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hdel(self._inflight_key, *[
+            self._field(entry.statement_id, entry.user_id, entry.reaction_type)
+            for entry in entries
+        ])
+        for field, delta in deltas.items():
+            pipe.hincrby(self._deltas_key, field, delta)
+        pipe.execute()
+
+    def acquire_flush_lock(self, ttl: int) -> Optional[str]:
+        token = str(uuid.uuid4())
+        if self._redis.set(self._lock_key, token, nx=True, px=ttl * 1000):
+            return token
+        return None
+
+    def extend_flush_lock(self, token: str, ttl: int) -> bool:
+        return bool(self._extend_lock(keys=[self._lock_key], args=[token, ttl * 1000]))
+
+    def release_flush_lock(self, token: str) -> None:
+        self._release_lock(keys=[self._lock_key], args=[token])
+
+
+_buffer: Optional[ReactionBuffer] = None
+_buffer_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+
+def get_reaction_buffer() -> Optional[ReactionBuffer]:
+    """
+    設定に応じたリアクションバッファを返す（無効な場合はNone）
+    """
+    global _buffer
+    backend = settings.REACTION_BUFFER_BACKEND
+    if backend == "none" and _buffer is None:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                if backend == "memory":
+                    _buffer = InMemoryReactionBuffer()
+                elif backend == "redis":
+                    _buffer = RedisReactionBuffer()
+                else:
+                    raise ValueError(f"未対応のリアクションバッファです: {backend}")
+    return _buffer
+
+
+def set_reaction_buffer(buffer: Optional[ReactionBuffer]) -> None:
+    """
+    リアクションバッファを差し替える（Noneの場合は次回取得時に設定から作り直す）
+    """
+    global _buffer
+    with _buffer_lock:
+        _buffer = buffer
+
+
+def _ensure_flusher() -> None:
+    """
+    プロセス内バッファの場合、定期的に反映するスレッドを起動する
+    """
+    global _flusher
+    if not isinstance(_buffer, InMemoryReactionBuffer) or _flusher is not None:
+        return
+    with _buffer_lock:
+        if _flusher is not None:
+            return
+
+        def run() -> None:
+            from app.db.session import SessionLocal
+
+            while True:
+                time.sleep(settings.REACTION_BUFFER_FLUSH_SECONDS)
+                db = SessionLocal()
+                try:
+                    flush_reaction_buffer(db)
+                except Exception:
+                    logger.exception("リアクションバッファの反映に失敗しました")
+                finally:
+                    db.close()
+
+        _flusher = threading.Thread(target=run, name="reaction-buffer-flusher", daemon=True)
+        _flusher.start()
+
+
+def buffer_reaction(
+    db: Session,
+    *,
+    statement_id: str,
+    user_id: str,
+    reaction_type: str = "like",
+    add: bool = True
+) -> bool:
+    """
+    リアクションの追加・削除をバッファに記録する
+
+    Args:
+        db: データベースセッション
+        statement_id: 発言ID
+        user_id: ユーザーID
+        reaction_type: リアクション種別
+        add: 追加の場合はTrue、削除の場合はFalse
+
+    Returns:
+        状態が変わった場合はTrue（既に同じ状態の場合はFalse）
+    """
+    buffer = get_reaction_buffer()
+    persisted = db.query(StatementReaction.id).filter(
+        StatementReaction.statement_id == statement_id,
+        StatementReaction.user_id == user_id,
+        StatementReaction.reaction_type == reaction_type
+    ).first() is not None
+    changed = buffer.record(statement_id, user_id, reaction_type, add, persisted)
+    _ensure_flusher()
+    return changed
+
+
+def get_reaction_count(
+    db: Session, *, statement_id: str, reaction_type: str = "like"
+) -> int:
+    """
+    永続化済みのカウンタに未反映分を加えたリアクション数を取得する
+
+    Args:
+        db: データベースセッション
+        statement_id: 発言ID
+        reaction_type: リアクション種別
+
+    Returns:
+        リアクション数
+    """
+    column = getattr(Statement, REACTION_COUNT_COLUMNS[reaction_type])
+    count = db.query(column).filter(Statement.id == statement_id).scalar() or 0
+    buffer = get_reaction_buffer()
+    if buffer is not None:
+        count += buffer.pending_deltas([statement_id], reaction_type)[statement_id]
+    return max(count, 0)
+
+
+def overlay_pending_reactions(statements: List[Statement], user_id: str) -> None:
+    """
+    発言一覧のuser_reactions/is_likedに未反映のリアクションを反映する
+
+    Args:
+        statements: apply_user_reactions済みの発言オブジェクトのリスト
+        user_id: ユーザーID
+    """
+    buffer = get_reaction_buffer()
+    if buffer is None or not statements:
+        return
+    states = buffer.pending_states([statement.id for statement in statements], user_id)
+    if not states:
+        return
+    for statement in statements:
+        reactions = set(statement.user_reactions)
+        for reaction_type in REACTION_COUNT_COLUMNS:
+            state = states.get((statement.id, reaction_type))
+            if state is True:
+                reactions.add(reaction_type)
+            elif state is False:
+                reactions.discard(reaction_type)
+        statement.user_reactions = sorted(reactions)
+        statement.is_liked = "like" in reactions
+
+
+def _insert_ignore(db: Session) -> Insert:
+    """
+    一意制約に反する行を無視するstatement_reactionsへのINSERT文を返す
+    """
+    dialect = db.get_bind().dialect.name
+    statement = insert(StatementReaction)
+    if dialect == "mysql":
+        return statement.prefix_with("IGNORE")
+    if dialect == "sqlite":
+        return statement.prefix_with("OR IGNORE")
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        return pg_insert(StatementReaction).on_conflict_do_nothing()
+    return statement
+
+
+def _flush_chunk(db: Session, entries: List[PendingReaction]) -> Dict[str, int]:
+    """
+    エントリの一部をstatement_reactionsとカウンタに反映する（1トランザクション）
+
+    既存の行はロックして読み、INSERTは重複を無視するため、同じエントリを
+    反映し直しても行とカウンタは変わらない。
+    """
+    statement_ids = {entry.statement_id for entry in entries}
+    user_ids = {entry.user_id for entry in entries}
+    existing = {
+        (row.statement_id, row.user_id, row.reaction_type): row.id
+        for row in db.query(
+            StatementReaction.id,
+            StatementReaction.statement_id,
+            StatementReaction.user_id,
+            StatementReaction.reaction_type
+        ).filter(
+            StatementReaction.statement_id.in_(statement_ids),
+            StatementReaction.user_id.in_(user_ids)
+        ).with_for_update()
+    }
+
+    now = datetime.utcnow()
+    inserts = []
+    delete_ids = []
+    deltas: Dict[Tuple[str, str], int] = defaultdict(int)
+    for entry in entries:
+        key = (entry.statement_id, entry.user_id, entry.reaction_type)
+        if entry.add and key not in existing:
+            inserts.append({
+                "id": str(uuid.uuid4()),
+                "statement_id": entry.statement_id,
+                "user_id": entry.user_id,
+                "reaction_type": entry.reaction_type,
+                "created_at": now,
+                "updated_at": now,
+            })
+        elif not entry.add and key in existing:
+            delete_ids.append(existing[key])
+            deltas[(entry.statement_id, entry.reaction_type)] -= 1
+
+    inserted = 0
+    if inserts:
+        db.execute(_insert_ignore(db), inserts)
+        # 他の処理が先に挿入していた行は無視されるため、実際に挿入できた行だけを数える
+        inserted_ids = {
+            row[0] for row in db.query(StatementReaction.id).filter(
+                StatementReaction.id.in_([row["id"] for row in inserts])
+            )
+        }
+        for row in inserts:
+            if row["id"] in inserted_ids:
+                deltas[(row["statement_id"], row["reaction_type"])] += 1
+                inserted += 1
+    if delete_ids:
+        db.query(StatementReaction).filter(
+            StatementReaction.id.in_(delete_ids)
+        ).delete(synchronize_session=False)
+    for (statement_id, reaction_type), delta in deltas.items():
+        if delta:
+            adjust_statement_counter(
+                db,
+                statement_id=statement_id,
+                column=REACTION_COUNT_COLUMNS[reaction_type],
+                delta=delta
+            )
+    return {"inserted": inserted, "deleted": len(delete_ids)}
+
+
+def flush_reaction_buffer(db: Session, *, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    バッファの内容をstatement_reactionsとカウンタにまとめて反映する
+
+    batch_size件ごとに1トランザクションで反映し、コミット後にバッファから取り除く。
+    途中で失敗した場合、残りのエントリは次回の反映で再処理される。
+    他の処理が反映中（反映ロックを取得できない）の場合は何もしない。
+
+    Args:
+        db: データベースセッション
+        batch_size: 1トランザクションで反映する件数（Noneの場合は設定値）
+
+    Returns:
+        反映結果の統計情報
+    """
+    stats = {"entries": 0, "inserted": 0, "deleted": 0}
+    buffer = get_reaction_buffer()
+    if buffer is None:
+        return stats
+    batch_size = batch_size or settings.REACTION_BUFFER_FLUSH_BATCH_SIZE
+    ttl = settings.REACTION_BUFFER_FLUSH_LOCK_SECONDS
+
+    token = buffer.acquire_flush_lock(ttl)
+    if token is None:
+        logger.debug("他の処理がリアクションバッファを反映中のためスキップします")
+        return stats
+    try:
+        entries = buffer.drain()
+        for i in range(0, len(entries), batch_size):
+            chunk = entries[i:i + batch_size]
+            try:
+                result = _flush_chunk(db, chunk)
+                # 期限切れで他の処理にロックが移った場合はコミットしない
+                if not buffer.extend_flush_lock(token, ttl):
+                    db.rollback()
+                    logger.warning("反映ロックの期限が切れたため反映を中断します")
+                    break
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            buffer.complete(chunk)
+            stats["entries"] += len(chunk)
+            stats["inserted"] += result["inserted"]
+            stats["deleted"] += result["deleted"]
+    finally:
+        buffer.release_flush_lock(token)
+    return stats
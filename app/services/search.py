@@ -1,11 +1,157 @@
-from typing import Dict, List, Optional
+import contextvars
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from app import services
+from app.core.config import settings
 from app.models.politician import Politician
 from app.models.statement import Statement
 from app.models.topic import Topic
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from app.search import get_search_backend
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query, Session, joinedload
+from sqlalchemy.util import await_only
+
+# search_allで検索できるエンティティ
+SEARCH_TYPES = ("statements", "politicians", "topics")
+
+# エンティティごとの検索を並列実行するスレッドプール
+_executor = ThreadPoolExecutor(
+    max_workers=settings.SEARCH_EXECUTOR_WORKERS,
+    thread_name_prefix="search",
+)
+
+# スレッドプールに投入できる検索の数
+# （タイムアウトした検索もデータベースで中断されるまでスレッドを使うため、待ち行列を制限する）
+_slots = threading.BoundedSemaphore(settings.SEARCH_EXECUTOR_MAX_PENDING)
+
+
+def parse_search_types(values: Optional[Iterable[str]]) -> List[str]:
+    """
+    typesパラメータを検索対象のリストに変換する
+    
+    Args:
+        values: 検索対象（カンマ区切りの文字列を含んでもよい）。Noneの場合は全て
+        
+    Returns:
+        SEARCH_TYPESの順に並べた検索対象のリスト
+        
+    Raises:
+        ValueError: 未対応の検索対象が含まれる場合
+    """
+    if not values:
+        return list(SEARCH_TYPES)
+    requested = {
+        value.strip() for item in values for value in item.split(",") if value.strip()
+    }
+    unknown = requested - set(SEARCH_TYPES)
+    if unknown:
+        raise ValueError(f"未対応の検索対象です: {', '.join(sorted(unknown))}")
+    return [name for name in SEARCH_TYPES if name in requested]
+
+
+def _limit_execution_time(session: Session, deadline: float) -> Callable[[], None]:
+    """
+    セッションの接続で実行するクエリの時間をデータベース側で制限する
+
+    MySQLはmax_execution_time（SELECTのみ）、SQLiteはプログレスハンドラで、
+    期限を過ぎたクエリを中断させる（OperationalErrorになる）。
+
+    Args:
+        session: 検索に使うセッション
+        deadline: 期限（time.monotonic()の値）
+
+    Returns:
+        制限を解除する関数（接続をプールに戻す前に呼ぶ）
+    """
+    connection = session.connection()
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+        connection.execute(text(f"SET SESSION max_execution_time = {remaining_ms}"))
+        return lambda: connection.execute(text("SET SESSION max_execution_time = 0"))
+    if dialect == "sqlite":
+        driver_connection = connection.connection.driver_connection
+
+        def set_progress_handler(handler: Optional[Callable[[], int]], n: int) -> None:
+            result = driver_connection.set_progress_handler(handler, n)
+            # aiosqliteでは非同期メソッドのため完了を待つ（run_sync内から呼ばれる）
+            if inspect.isawaitable(result):
+                await_only(result)
+
+        # 0以外を返すと実行中のクエリが中断される
+        set_progress_handler(lambda: int(time.monotonic() > deadline), 1000)
+        return lambda: set_progress_handler(None, 0)
+    return lambda: None
+
+
+def run_with_deadline(
+    session: Session, fn: Callable[..., Dict], deadline: float, **kwargs
+) -> Dict:
+    """
+    実行時間をデータベース側で制限して検索関数を実行する
+
+    非同期版のsearch_allはAsyncSession.run_syncから呼ぶ。
+
+    Args:
+        session: 検索に使うセッション
+        fn: 検索関数
+        deadline: 期限（time.monotonic()の値）
+
+    Returns:
+        検索結果（呼び出し時に期限を過ぎていた場合は空）
+    """
+    if time.monotonic() >= deadline:
+        # 待機中に期限を過ぎた場合は実行しない
+        return {}
+    reset = _limit_execution_time(session, deadline)
+    try:
+        return fn(db=session, **kwargs)
+    finally:
+        reset()
+
+
+def _run_in_session(
+    bind: Any, fn: Callable[..., Dict], deadline: float, **kwargs
+) -> Dict:
+    """
+    専用のセッションで検索関数を実行する（スレッドプール内で呼ばれる）
+
+    期限を過ぎたクエリはデータベース側で中断する。
+    """
+    with Session(bind=bind, autoflush=False) as session:
+        return run_with_deadline(session, fn, deadline, **kwargs)
+
+
+def is_interrupted(error: OperationalError) -> bool:
+    """
+    実行時間の制限でクエリが中断されたエラーかどうか
+    """
+    # SQLite: "interrupted"、MySQL(3024): "Query execution was interrupted, ..."
+    return "interrupted" in str(error.orig).lower()
+
+
+def _load_in_order(query: Query, model: Any, ids: List[str]) -> List[Any]:
+    """
+    IDのリストに対応するレコードを、リストと同じ順序で取得する
+    
+    Args:
+        query: 取得に使うクエリ（ロードオプションなどを指定済み）
+        model: モデルクラス
+        ids: 関連度順のIDリスト
+        
+    Returns:
+        レコードのリスト
+    """
+    if not ids:
+        return []
+    rows = {row.id: row for row in query.filter(model.id.in_(ids)).all()}
+    return [rows[id] for id in ids if id in rows]
 
 
 def search_statements(
@@ -34,28 +180,31 @@ def search_statements(
     Returns:
         検索結果
     """
-    # 発言を検索
-    statements = services.statement.get_statements(
-        db=db,
-        skip=skip,
-        limit=limit,
-        sort="date_desc",
+    # フィルタ条件を適用したベースクエリ（キーワードは検索バックエンドで扱う）
+    base_query = services.statement.apply_statement_filters(
+        db,
+        db.query(Statement).filter(Statement.status == "published"),
         filter_party=filter_party,
         filter_topic=filter_topic,
         filter_date_start=filter_date_start,
-        filter_date_end=filter_date_end,
-        search=query
-    )
+        filter_date_end=filter_date_end
+    ).order_by(Statement.statement_date.desc(), Statement.id.desc())
     
-    # 発言数を取得
-    total = services.statement.count_statements(
-        db=db,
-        filter_party=filter_party,
-        filter_topic=filter_topic,
-        filter_date_start=filter_date_start,
-        filter_date_end=filter_date_end,
-        search=query
+    # 関連度順に発言IDを取得
+    ids, total = get_search_backend().search_ids(
+        db, "statement", query, base_query, skip=skip, limit=limit
     )
+    statements = _load_in_order(
+        db.query(Statement).options(joinedload(Statement.politician)),
+        Statement,
+        ids
+    )
+    
+    # politician_nameフィールドを設定
+    for statement in statements:
+        if statement.politician:
+            statement.politician_name = statement.politician.name
+            statement.party_id = statement.politician.current_party_id
     
     # 次のカーソルを計算
     next_cursor = None
@@ -89,24 +238,17 @@ def search_politicians(
     Returns:
         検索結果
     """
-    # 政治家を検索
-    query_obj = db.query(Politician).filter(
-        or_(
-            Politician.name.ilike(f"%{query}%"),
-            Politician.name_kana.ilike(f"%{query}%"),
-            Politician.profile_summary.ilike(f"%{query}%")
-        )
-    )
+    base_query = db.query(Politician)
     
     # 政党でフィルタリング
     if filter_party:
-        query_obj = query_obj.filter(Politician.current_party_id == filter_party)
+        base_query = base_query.filter(Politician.current_party_id == filter_party)
     
-    # 総数を取得
-    total = query_obj.count()
-    
-    # 結果を取得
-    politicians = query_obj.offset(skip).limit(limit).all()
+    # 関連度順に政治家IDを取得
+    ids, total = get_search_backend().search_ids(
+        db, "politician", query, base_query, skip=skip, limit=limit
+    )
+    politicians = _load_in_order(db.query(Politician), Politician, ids)
     
     # 次のカーソルを計算
     next_cursor = None
@@ -138,19 +280,13 @@ def search_topics(
     Returns:
         検索結果
     """
-    # トピックを検索
-    query_obj = db.query(Topic).filter(
-        or_(
-            Topic.name.ilike(f"%{query}%"),
-            Topic.description.ilike(f"%{query}%")
-        )
-    ).filter(Topic.status == "active")
-    
-    # 総数を取得
-    total = query_obj.count()
+    base_query = db.query(Topic).filter(Topic.status == "active")
     
-    # 結果を取得
-    topics = query_obj.offset(skip).limit(limit).all()
+    # 関連度順にトピックIDを取得
+    ids, total = get_search_backend().search_ids(
+        db, "topic", query, base_query, skip=skip, limit=limit
+    )
+    topics = _load_in_order(db.query(Topic), Topic, ids)
     
     # 次のカーソルを計算
     next_cursor = None
@@ -164,6 +300,75 @@ def search_topics(
     }
 
 
+def search_tasks(
+    filter_party: Optional[str] = None,
+    filter_topic: Optional[str] = None,
+    filter_date_start: Optional[str] = None,
+    filter_date_end: Optional[str] = None,
+) -> Dict[str, Tuple[str, Callable[..., Dict], Dict[str, Any]]]:
+    """
+    search_allで実行するエンティティごとの検索を返す
+
+    Returns:
+        検索対象の名前 -> (検索バックエンドのエンティティ名, 検索関数, フィルタ条件)
+    """
+    return {
+        "statements": ("statement", search_statements, {
+            "filter_party": filter_party,
+            "filter_topic": filter_topic,
+            "filter_date_start": filter_date_start,
+            "filter_date_end": filter_date_end,
+        }),
+        "politicians": ("politician", search_politicians, {"filter_party": filter_party}),
+        "topics": ("topic", search_topics, {}),
+    }
+
+
+def build_search_all_result(
+    results: Dict[str, Dict],
+    timed_out: List[str],
+    *,
+    query: str,
+    skip: int,
+    limit: int,
+    types: List[str],
+) -> Dict:
+    """
+    エンティティごとの検索結果をsearch_allの形式にまとめる
+
+    Args:
+        results: 検索対象の名前 -> 検索結果
+        timed_out: タイムアウトした検索対象
+        query: 検索クエリ
+        skip: スキップ数
+        limit: 取得上限
+        types: 検索対象
+
+    Returns:
+        検索結果
+    """
+    timed_out = sorted(timed_out, key=SEARCH_TYPES.index)
+    
+    # 次のカーソルを計算
+    next_cursor = None
+    if any(result["next_cursor"] for result in results.values()):
+        next_cursor = str(skip + limit)
+    
+    empty = {"total": None}
+    return {
+        "statements": results.get("statements", {}).get("statements", []),
+        "total_statements": results.get("statements", empty)["total"],
+        "politicians": results.get("politicians", {}).get("politicians", []),
+        "total_politicians": results.get("politicians", empty)["total"],
+        "topics": results.get("topics", {}).get("topics", []),
+        "total_topics": results.get("topics", empty)["total"],
+        "query": query,
+        "types": types,
+        "timed_out": timed_out,
+        "next_cursor": next_cursor
+    }
+
+
 def search_all(
     db: Session,
     query: str,
@@ -172,13 +377,21 @@ def search_all(
     filter_party: Optional[str] = None,
     filter_topic: Optional[str] = None,
     filter_date_start: Optional[str] = None,
-    filter_date_end: Optional[str] = None
+    filter_date_end: Optional[str] = None,
+    types: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = None
 ) -> Dict:
     """
     全てのエンティティを検索する
     
+    エンティティごとの検索はそれぞれ専用のセッションで並列に実行する。
+    タイムアウトしたエンティティは空の結果とし、timed_outに名前を入れて返す。
+    スレッドで実行中のクエリは止められないため、期限を過ぎたクエリは
+    データベース側の実行時間の制限で中断させる。実行待ちの検索が
+    SEARCH_EXECUTOR_MAX_PENDINGに達している場合は投入せずタイムアウト扱いにする。
+    
     Args:
-        db: データベースセッション
+        db: データベースセッション（接続先の取得にのみ使用）
         query: 検索クエリ
         skip: スキップ数
         limit: 取得上限
@@ -186,51 +399,60 @@ def search_all(
         filter_topic: トピックIDでフィルタリング
         filter_date_start: 開始日でフィルタリング
         filter_date_end: 終了日でフィルタリング
+        types: 検索対象（statements, politicians, topics）。Noneの場合は全て
+        timeout: エンティティごとのタイムアウト秒数（Noneの場合は設定値）
         
     Returns:
         検索結果
     """
-    # 各エンティティを検索
-    statements_result = search_statements(
-        db=db,
-        query=query,
-        skip=skip,
-        limit=limit,
+    types = parse_search_types(types)
+    if timeout is None:
+        timeout = settings.SEARCH_TIMEOUT_SECONDS
+    
+    tasks = search_tasks(
         filter_party=filter_party,
         filter_topic=filter_topic,
         filter_date_start=filter_date_start,
-        filter_date_end=filter_date_end
+        filter_date_end=filter_date_end,
     )
     
-    politicians_result = search_politicians(
-        db=db,
-        query=query,
-        skip=skip,
-        limit=limit,
-        filter_party=filter_party
-    )
+    # 各エンティティの検索を並列に開始
+    # （リクエストのクエリ計測に含めるため、コンテキストを引き継いで実行する）
+    bind = db.get_bind()
+    started_at = time.monotonic()
+    deadline = started_at + timeout
+    futures = {}
+    timed_out = []
+    for name in types:
+        if not _slots.acquire(blocking=False):
+            timed_out.append(name)
+            continue
+        future = _executor.submit(
+            contextvars.copy_context().run,
+            _run_in_session, bind, tasks[name][1], deadline,
+            query=query, skip=skip, limit=limit, **tasks[name][2]
+        )
+        future.add_done_callback(lambda _: _slots.release())
+        futures[name] = future
     
-    topics_result = search_topics(
-        db=db,
-        query=query,
-        skip=skip,
-        limit=limit
+    results = {}
+    for name, future in futures.items():
+        remaining = max(0.0, deadline - time.monotonic())
+        try:
+            result = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # 実行中のクエリは期限を過ぎるとデータベース側で中断される
+            timed_out.append(name)
+            continue
+        except OperationalError as e:
+            if not is_interrupted(e):
+                raise
+            timed_out.append(name)
+            continue
+        if result:
+            results[name] = result
+        else:
+            timed_out.append(name)
+    return build_search_all_result(
+        results, timed_out, query=query, skip=skip, limit=limit, types=types
     )
-    
-    # 次のカーソルを計算
-    next_cursor = None
-    if (statements_result["next_cursor"] or 
-        politicians_result["next_cursor"] or 
-        topics_result["next_cursor"]):
-        next_cursor = str(skip + limit)
-    
-    return {
-        "statements": statements_result["statements"],
-        "total_statements": statements_result["total"],
-        "politicians": politicians_result["politicians"],
-        "total_politicians": politicians_result["total"],
-        "topics": topics_result["topics"],
-        "total_topics": topics_result["total"],
-        "query": query,
-        "next_cursor": next_cursor
-    }
\ No newline at end of file
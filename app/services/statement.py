@@ -1,11 +1,225 @@
+import logging
+import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import encode_cursor, parse_cursor
 from app.models.politician import Politician
-from app.models.statement import Statement, StatementReaction, StatementTopic
+from app.models.statement import (
+    REACTION_COUNT_COLUMNS,
+    Statement,
+    StatementReaction,
+    StatementTopic,
+)
+from app.models.topic import Topic
 from app.schemas.statement import StatementCreate, StatementUpdate
-from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session, joinedload
+from app.search import get_search_backend, index_document, remove_document
+from app.services.party_topic_stats import (
+    get_party_topic_stats,
+    get_topic_party_stats,
+    refresh_for_statement,
+    refresh_party_topic_stats,
+)
+from app.services.timeline import (
+    fan_out_statement,
+    fan_out_statements,
+    remove_statement as remove_from_timelines,
+)
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Query, Session, joinedload
+
+logger = logging.getLogger(__name__)
+
+# サポートするソート順
+SORT_OPTIONS = ("date_desc", "date_asc", "likes")
+
+# 総件数の取得方法
+# exact: 毎回COUNTする / cached: フィルタ単位のキャッシュを使う / none: 総件数を返さない
+COUNT_MODES = ("exact", "cached", "none")
+
+# トピック別スタンスの集計で、トピックごとに取得する最新の発言数
+TOPIC_STANCE_LATEST_LIMIT = 5
+
+# フィルタ条件ごとの発言数キャッシュ（発言の作成・更新・削除で破棄）
+_count_cache = TTLCache(
+    maxsize=settings.STATEMENT_COUNT_CACHE_SIZE,
+    ttl=settings.STATEMENT_COUNT_CACHE_TTL,
+)
+
+
+def _normalize_sort(sort: Optional[str]) -> str:
+    """
+    未知のソート順はdate_descとして扱う
+    """
+    return sort if sort in SORT_OPTIONS else "date_desc"
+
+
+def _sort_key_column(sort: str):
+    """
+    ソート順に対応するソートキーの式を返す
+    """
+    if sort == "likes":
+        return Statement.likes_count
+    return Statement.statement_date
+
+
+def _apply_sort(query: Query, sort: Optional[str], cursor: Optional[str] = None) -> Query:
+    """
+    ソート順を適用する
+    
+    (ソートキー, ID) の複合順序で並べるため、同じ日時・同じいいね数の発言が
+    ページ境界で重複・欠落することはない。カーソルが指定されている場合は
+    「前ページの最後の行より後ろ」の条件を追加し、OFFSETを使わずに取得する。
+    
+    Args:
+        query: 発言クエリ
+        sort: ソート順
+        cursor: 前ページのnext_cursor
+        
+    Returns:
+        ソート済みのクエリ
+        
+    Raises:
+        InvalidCursorError: カーソルが不正な場合
+    """
+    sort = _normalize_sort(sort)
+    column = _sort_key_column(sort)
+    descending = sort != "date_asc"
+    
+    position = parse_cursor(cursor, sort)
+    if position is not None:
+        key, last_id = position
+        if descending:
+            query = query.filter(or_(
+                column < key,
+                and_(column == key, Statement.id < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                column > key,
+                and_(column == key, Statement.id > last_id)
+            ))
+    
+    if descending:
+        return query.order_by(column.desc(), Statement.id.desc())
+    return query.order_by(column.asc(), Statement.id.asc())
+
+
+def _paginate(
+    query: Query, skip: int, limit: int, cursor: Optional[str] = None
+) -> List[Statement]:
+    """
+    カーソル指定時はLIMITのみ、未指定時は従来通りOFFSET/LIMITで取得する
+    """
+    if cursor:
+        return query.limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+
+def split_page(
+    statements: List[Statement], limit: int
+) -> Tuple[List[Statement], bool]:
+    """
+    limit+1件で取得した結果をページ本体と次ページ有無に分割する
+    
+    Args:
+        statements: limit+1件を上限に取得した発言リスト
+        limit: 取得上限
+        
+    Returns:
+        (ページの発言リスト, 次ページがあるかどうか)
+    """
+    return statements[:limit], len(statements) > limit
+
+
+def resolve_total(
+    db: Session,
+    count_mode: str,
+    count_fn: Callable[..., int],
+    **filters
+) -> Optional[int]:
+    """
+    count_modeに従って総件数を取得する
+    
+    Args:
+        db: データベースセッション
+        count_mode: 総件数の取得方法（exact, cached, none）
+        count_fn: count_statements系の関数
+        filters: count_fnに渡すフィルタ条件
+        
+    Returns:
+        総件数、count_modeがnoneの場合はNone
+    """
+    if count_mode == "none":
+        return None
+    if count_mode == "cached":
+        return count_statements_cached(db, count_fn, **filters)
+    return count_fn(db, **filters)
+
+
+def count_statements_cached(
+    db: Session, count_fn: Callable[..., int], **filters
+) -> int:
+    """
+    フィルタ条件ごとにキャッシュされた発言数を取得する
+    
+    キャッシュはプロセス内に保持され、発言の作成・更新・削除時に破棄される。
+    他プロセスでの書き込みはSTATEMENT_COUNT_CACHE_TTL秒以内に反映される。
+    
+    Args:
+        db: データベースセッション
+        count_fn: count_statements系の関数
+        filters: count_fnに渡すフィルタ条件
+        
+    Returns:
+        発言数
+    """
+    key = (count_fn.__name__,) + tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(filters.items())
+    )
+    total = _count_cache.get(key)
+    if total is None:
+        total = count_fn(db, **filters)
+        _count_cache.set(key, total)
+    return total
+
+
+def invalidate_statement_counts() -> None:
+    """
+    発言数キャッシュを破棄する
+    """
+    _count_cache.clear()
+
+
+def get_next_cursor(
+    db: Session, statements: List[Statement], limit: int, sort: Optional[str]
+) -> Optional[str]:
+    """
+    次ページ取得用のカーソルを生成する
+    
+    Args:
+        db: データベースセッション
+        statements: 現在のページの発言リスト
+        limit: 取得上限
+        sort: ソート順
+        
+    Returns:
+        次ページのカーソル、次ページがない場合はNone
+    """
+    if not statements or len(statements) < limit:
+        return None
+    
+    sort = _normalize_sort(sort)
+    last = statements[-1]
+    if sort == "likes":
+        key = last.likes_count
+    else:
+        key = last.statement_date
+    return encode_cursor(sort, key, last.id)
 
 
 def get_statement(db: Session, id: str) -> Optional[Statement]:
@@ -24,38 +238,30 @@ def get_statement(db: Session, id: str) -> Optional[Statement]:
     ).filter(Statement.id == id).first()
 
 
-def get_statements(
+def apply_statement_filters(
     db: Session,
-    skip: int = 0,
-    limit: int = 20,
-    sort: str = "date_desc",
+    query: Query,
     filter_party: Optional[str] = None,
     filter_topic: Optional[str] = None,
     filter_date_start: Optional[str] = None,
     filter_date_end: Optional[str] = None,
     search: Optional[str] = None
-) -> List[Statement]:
+) -> Query:
     """
-    発言一覧を取得する
+    発言一覧・発言数・検索で共通のフィルタ条件を適用する
     
     Args:
         db: データベースセッション
-        skip: スキップ数
-        limit: 取得上限
-        sort: ソート順
+        query: Statementを対象とするクエリ
         filter_party: 政党IDでフィルタリング
         filter_topic: トピックIDでフィルタリング
         filter_date_start: 開始日でフィルタリング
         filter_date_end: 終了日でフィルタリング
-        search: キーワード検索
+        search: キーワード検索（設定された検索バックエンドで絞り込む）
         
     Returns:
-        発言オブジェクトのリスト
+        フィルタ適用後のクエリ
     """
-    query = db.query(Statement).options(
-        joinedload(Statement.politician)
-    ).filter(Statement.status == "published")
-    
     # 政党でフィルタリング
     if filter_party:
         query = query.join(Politician).filter(Politician.current_party_id == filter_party)
@@ -82,23 +288,60 @@ def get_statements(
     # キーワード検索
     if search:
         query = query.filter(
-            or_(
-                Statement.title.ilike(f"%{search}%"),
-                Statement.content.ilike(f"%{search}%")
-            )
+            get_search_backend().criterion(db, "statement", search)
         )
     
-    # ソート
-    if sort == "date_desc":
-        query = query.order_by(Statement.statement_date.desc())
-    elif sort == "date_asc":
-        query = query.order_by(Statement.statement_date.asc())
-    elif sort == "likes":
-        query = query.order_by(Statement.likes_count.desc())
-    else:
-        query = query.order_by(Statement.statement_date.desc())
+    return query
+
+
+def get_statements(
+    db: Session,
+    skip: int = 0,
+    limit: int = 20,
+    sort: str = "date_desc",
+    cursor: Optional[str] = None,
+    filter_party: Optional[str] = None,
+    filter_topic: Optional[str] = None,
+    filter_date_start: Optional[str] = None,
+    filter_date_end: Optional[str] = None,
+    search: Optional[str] = None
+) -> List[Statement]:
+    """
+    発言一覧を取得する
     
-    statements = query.offset(skip).limit(limit).all()
+    Args:
+        db: データベースセッション
+        skip: スキップ数
+        limit: 取得上限
+        sort: ソート順
+        cursor: 前ページのnext_cursor（指定時はskipを無視してキーセットで取得）
+        filter_party: 政党IDでフィルタリング
+        filter_topic: トピックIDでフィルタリング
+        filter_date_start: 開始日でフィルタリング
+        filter_date_end: 終了日でフィルタリング
+        search: キーワード検索
+        
+    Returns:
+        発言オブジェクトのリスト
+    """
+    query = db.query(Statement).options(
+        joinedload(Statement.politician)
+    ).filter(Statement.status == "published")
+    
+    query = apply_statement_filters(
+        db,
+        query,
+        filter_party=filter_party,
+        filter_topic=filter_topic,
+        filter_date_start=filter_date_start,
+        filter_date_end=filter_date_end,
+        search=search
+    )
+    
+    # ソート（カーソル指定時はキーセット条件も適用）
+    query = _apply_sort(query, sort, cursor)
+    
+    statements = _paginate(query, skip, limit, cursor)
     
     # politician_nameフィールドを設定
     for statement in statements:
@@ -138,47 +381,89 @@ def count_statements(
     """
     query = db.query(func.count(Statement.id)).filter(Statement.status == "published")
     
-    # 政党でフィルタリング
-    if filter_party:
-        query = query.join(Politician).filter(Politician.current_party_id == filter_party)
-    
-    # トピックでフィルタリング
-    if filter_topic:
-        query = query.join(StatementTopic).filter(StatementTopic.topic_id == filter_topic)
-    
-    # 日付でフィルタリング
-    if filter_date_start:
-        try:
-            start_date = datetime.strptime(filter_date_start, "%Y-%m-%d")
-            query = query.filter(Statement.statement_date >= start_date)
-        except ValueError:
-            pass
-    
-    if filter_date_end:
-        try:
-            end_date = datetime.strptime(filter_date_end, "%Y-%m-%d")
-            query = query.filter(Statement.statement_date <= end_date)
-        except ValueError:
-            pass
-    
-    # キーワード検索
-    if search:
-        query = query.filter(
-            or_(
-                Statement.title.ilike(f"%{search}%"),
-                Statement.content.ilike(f"%{search}%")
-            )
-        )
+    query = apply_statement_filters(
+        db,
+        query,
+        filter_party=filter_party,
+        filter_topic=filter_topic,
+        filter_date_start=filter_date_start,
+        filter_date_end=filter_date_end,
+        search=search
+    )
     
     return query.scalar() or 0
 
 
+def list_statements(
+    db: Session,
+    *,
+    user_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    sort: str = "date_desc",
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
+    filter_party: Optional[str] = None,
+    filter_topic: Optional[str] = None,
+    filter_date_start: Optional[str] = None,
+    filter_date_end: Optional[str] = None,
+    search: Optional[str] = None
+) -> Dict:
+    """
+    発言一覧のページ（総件数・次ページのカーソル・ユーザーのリアクションを含む）を取得する
+    
+    Args:
+        db: データベースセッション
+        user_id: ログインユーザーのID（リアクションを付ける場合）
+        skip: スキップ数
+        limit: 取得上限
+        sort: ソート順
+        cursor: 前ページのnext_cursor
+        count_mode: 総件数の取得方法（exact, cached, none）
+        filter_party: 政党IDでフィルタリング
+        filter_topic: トピックIDでフィルタリング
+        filter_date_start: 開始日でフィルタリング
+        filter_date_end: 終了日でフィルタリング
+        search: キーワード検索
+        
+    Returns:
+        StatementListの形式の辞書
+    """
+    filters = dict(
+        filter_party=filter_party,
+        filter_topic=filter_topic,
+        filter_date_start=filter_date_start,
+        filter_date_end=filter_date_end,
+        search=search,
+    )
+    statements = get_statements(
+        db, skip=skip, limit=limit + 1, sort=sort, cursor=cursor, **filters
+    )
+    statements, has_more = split_page(statements, limit)
+    total = resolve_total(db, count_mode, count_statements, **filters)
+    
+    # 次のページがある場合のみカーソルを返す
+    next_cursor = get_next_cursor(db, statements, limit, sort) if has_more else None
+    
+    # ユーザーのリアクションをまとめて取得
+    if user_id:
+        apply_user_reactions(db, statements, user_id=user_id)
+    
+    return {
+        "total": total,
+        "statements": statements,
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
+
+
 def get_statements_by_politician(
     db: Session, 
     politician_id: str,
     skip: int = 0, 
     limit: int = 20,
-    sort: str = "date_desc"
+    sort: str = "date_desc",
+    cursor: Optional[str] = None
 ) -> List[Statement]:
     """
     特定の政治家の発言一覧を取得する
@@ -189,6 +474,7 @@ def get_statements_by_politician(
         skip: スキップ数
         limit: 取得上限
         sort: ソート順
+        cursor: 前ページのnext_cursor（指定時はskipを無視してキーセットで取得）
         
     Returns:
         発言オブジェクトのリスト
@@ -200,17 +486,10 @@ def get_statements_by_politician(
         Statement.status == "published"
     )
     
-    # ソート
-    if sort == "date_desc":
-        query = query.order_by(Statement.statement_date.desc())
-    elif sort == "date_asc":
-        query = query.order_by(Statement.statement_date.asc())
-    elif sort == "likes":
-        query = query.order_by(Statement.likes_count.desc())
-    else:
-        query = query.order_by(Statement.statement_date.desc())
+    # ソート（カーソル指定時はキーセット条件も適用）
+    query = _apply_sort(query, sort, cursor)
     
-    return query.offset(skip).limit(limit).all()
+    return _paginate(query, skip, limit, cursor)
 
 
 def count_statements_by_politician(
@@ -238,7 +517,8 @@ def get_statements_by_politicians(
     politician_ids: List[str],
     skip: int = 0, 
     limit: int = 20,
-    sort: str = "date_desc"
+    sort: str = "date_desc",
+    cursor: Optional[str] = None
 ) -> List[Statement]:
     """
     複数の政治家の発言一覧を取得する
@@ -249,6 +529,7 @@ def get_statements_by_politicians(
         skip: スキップ数
         limit: 取得上限
         sort: ソート順
+        cursor: 前ページのnext_cursor（指定時はskipを無視してキーセットで取得）
         
     Returns:
         発言オブジェクトのリスト
@@ -260,17 +541,10 @@ def get_statements_by_politicians(
         Statement.status == "published"
     )
     
-    # ソート
-    if sort == "date_desc":
-        query = query.order_by(Statement.statement_date.desc())
-    elif sort == "date_asc":
-        query = query.order_by(Statement.statement_date.asc())
-    elif sort == "likes":
-        query = query.order_by(Statement.likes_count.desc())
-    else:
-        query = query.order_by(Statement.statement_date.desc())
+    # ソート（カーソル指定時はキーセット条件も適用）
+    query = _apply_sort(query, sort, cursor)
     
-    return query.offset(skip).limit(limit).all()
+    return _paginate(query, skip, limit, cursor)
 
 
 def count_statements_by_politicians(
@@ -298,7 +572,8 @@ def get_statements_by_party(
     party_id: str,
     skip: int = 0, 
     limit: int = 20,
-    sort: str = "date_desc"
+    sort: str = "date_desc",
+    cursor: Optional[str] = None
 ) -> List[Statement]:
     """
     特定の政党の発言一覧を取得する
@@ -309,6 +584,7 @@ def get_statements_by_party(
         skip: スキップ数
         limit: 取得上限
         sort: ソート順
+        cursor: 前ページのnext_cursor（指定時はskipを無視してキーセットで取得）
         
     Returns:
         発言オブジェクトのリスト
@@ -320,17 +596,10 @@ def get_statements_by_party(
         Statement.status == "published"
     )
     
-    # ソート
-    if sort == "date_desc":
-        query = query.order_by(Statement.statement_date.desc())
-    elif sort == "date_asc":
-        query = query.order_by(Statement.statement_date.asc())
-    elif sort == "likes":
-        query = query.order_by(Statement.likes_count.desc())
-    else:
-        query = query.order_by(Statement.statement_date.desc())
+    # ソート（カーソル指定時はキーセット条件も適用）
+    query = _apply_sort(query, sort, cursor)
     
-    return query.offset(skip).limit(limit).all()
+    return _paginate(query, skip, limit, cursor)
 
 
 def count_statements_by_party(
@@ -358,7 +627,8 @@ def get_statements_by_topic(
     topic_id: str,
     skip: int = 0, 
     limit: int = 20,
-    sort: str = "date_desc"
+    sort: str = "date_desc",
+    cursor: Optional[str] = None
 ) -> List[Statement]:
     """
     特定のトピックの発言一覧を取得する
@@ -369,6 +639,7 @@ def get_statements_by_topic(
         skip: スキップ数
         limit: 取得上限
         sort: ソート順
+        cursor: 前ページのnext_cursor（指定時はskipを無視してキーセットで取得）
         
     Returns:
         発言オブジェクトのリスト
@@ -380,17 +651,10 @@ def get_statements_by_topic(
         Statement.status == "published"
     )
     
-    # ソート
-    if sort == "date_desc":
-        query = query.order_by(Statement.statement_date.desc())
-    elif sort == "date_asc":
-        query = query.order_by(Statement.statement_date.asc())
-    elif sort == "likes":
-        query = query.order_by(Statement.likes_count.desc())
-    else:
-        query = query.order_by(Statement.statement_date.desc())
+    # ソート（カーソル指定時はキーセット条件も適用）
+    query = _apply_sort(query, sort, cursor)
     
-    return query.offset(skip).limit(limit).all()
+    return _paginate(query, skip, limit, cursor)
 
 
 def count_statements_by_topic(
@@ -454,10 +718,126 @@ def create_statement(
             )
             db.add(statement_topic)
         db.commit()
+        
+        # 政党×トピックの集計に反映
+        refresh_for_statement(
+            db, politician_id=db_obj.politician_id, topic_ids=obj_in.topic_ids
+        )
+    
+    # 検索索引に反映
+    index_document("statement", db_obj)
+    
+    # フォロワーのタイムラインへ展開
+    fan_out_statement(db, db_obj)
+    
+    # 発言数キャッシュを破棄
+    invalidate_statement_counts()
     
     return db_obj
 
 
+def create_statements_bulk(
+    db: Session, items: List[Tuple[int, StatementCreate]]
+) -> List[Dict]:
+    """
+    発言をまとめて作成する（1回の呼び出しを1トランザクションで処理する）
+    
+    政治家・トピックの存在は集合で1回ずつ確認し、存在しないIDを含む項目はエラーにする。
+    発言とトピックの関連付けはexecutemanyで挿入し、タイムラインへの展開もまとめて行う。
+    挿入に失敗した場合はロールバックし、対象の項目をすべてエラーにする。
+    
+    Args:
+        db: データベースセッション
+        items: (入力内の行番号, 発言作成スキーマ)のリスト
+        
+    Returns:
+        入力と同じ順の結果（line, status（created/error）, idまたはerror）
+    """
+    politician_ids = {item.politician_id for _, item in items}
+    topic_ids = {topic_id for _, item in items for topic_id in item.topic_ids or []}
+    parties = dict(
+        db.query(Politician.id, Politician.current_party_id).filter(
+            Politician.id.in_(politician_ids)
+        ).all()
+    ) if politician_ids else {}
+    known_topics = {
+        row[0] for row in db.query(Topic.id).filter(Topic.id.in_(topic_ids))
+    } if topic_ids else set()
+    
+    now = datetime.utcnow()
+    results = []
+    statements = []
+    links = []
+    for line, item in items:
+        if item.politician_id not in parties:
+            results.append({"line": line, "status": "error", "error": "政治家が見つかりません"})
+            continue
+        missing = [t for t in item.topic_ids or [] if t not in known_topics]
+        if missing:
+            results.append({
+                "line": line, "status": "error",
+                "error": f"トピックが見つかりません: {missing[0]}",
+            })
+            continue
+        statement_id = str(uuid.uuid4())
+        statements.append({
+            "id": statement_id,
+            "politician_id": item.politician_id,
+            "title": item.title,
+            "content": item.content,
+            "source": item.source,
+            "source_url": item.source_url,
+            "statement_date": item.statement_date,
+            "context": item.context,
+            "status": item.status or "published",
+            "importance": item.importance or 0,
+            "created_at": now,
+            "updated_at": now,
+        })
+        links.extend(
+            {"statement_id": statement_id, "topic_id": topic_id, "relevance": 50}
+            for topic_id in dict.fromkeys(item.topic_ids or [])
+        )
+        results.append({"line": line, "status": "created", "id": statement_id})
+    if not statements:
+        return results
+    
+    created_ids = [row["id"] for row in statements]
+    created_politicians = {row["politician_id"] for row in statements}
+    try:
+        db.execute(insert(Statement), statements)
+        if links:
+            db.execute(insert(StatementTopic), links)
+        fan_out_statements(db, created_ids, created_politicians)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("発言の一括作成に失敗しました（%d件）", len(statements))
+        created = set(created_ids)
+        return [
+            {"line": r["line"], "status": "error", "error": "発言を登録できませんでした"}
+            if r.get("id") in created else r
+            for r in results
+        ]
+    
+    # 政党×トピックの集計に反映
+    if links:
+        refresh_party_topic_stats(
+            db,
+            party_ids=[parties[politician_id] for politician_id in created_politicians],
+            topic_ids={link["topic_id"] for link in links},
+        )
+    
+    # 検索索引に反映（セッションに追加しないオブジェクトで属性だけを渡す）
+    for row in statements:
+        index_document("statement", Statement(**row))
+    
+    # 発言数キャッシュを破棄
+    invalidate_statement_counts()
+    
+    return results
+
+
 def update_statement(
     db: Session, 
     *, 
@@ -485,6 +865,19 @@ def update_statement(
     if "topic_ids" in update_data:
         topic_ids = update_data.pop("topic_ids", None)
     
+    # 政党×トピックの集計に影響する変更の場合は、変更前のトピックを控えておく
+    stats_changed = topic_ids is not None or any(
+        field in update_data for field in ("status", "statement_date", "politician_id")
+    )
+    old_politician_id = db_obj.politician_id
+    old_topic_ids = []
+    if stats_changed:
+        old_topic_ids = [
+            row[0] for row in db.query(StatementTopic.topic_id).filter(
+                StatementTopic.statement_id == db_obj.id
+            )
+        ]
+    
     # 基本情報を更新
     for field in update_data:
         if field in update_data:
@@ -512,6 +905,29 @@ def update_statement(
         
         db.commit()
     
+    # 政党×トピックの集計に反映（変更前後のトピック・政治家の両方）
+    if stats_changed:
+        affected_topic_ids = set(old_topic_ids) | set(topic_ids or [])
+        for politician_id in {old_politician_id, db_obj.politician_id}:
+            refresh_for_statement(
+                db, politician_id=politician_id, topic_ids=affected_topic_ids
+            )
+    
+    # 検索索引に反映
+    index_document("statement", db_obj)
+    
+    # 公開状態・発言日時・政治家が変わった場合はタイムラインへの展開をやり直す
+    # （変更前の政治家のフォロワーからは取り除かれる）
+    if (
+        "status" in update_data
+        or "statement_date" in update_data
+        or "politician_id" in update_data
+    ):
+        fan_out_statement(db, db_obj)
+    
+    # ステータスやトピックの変更で件数が変わるため、発言数キャッシュを破棄
+    invalidate_statement_counts()
+    
     return db_obj
 
 
@@ -527,8 +943,24 @@ def delete_statement(db: Session, *, id: str) -> Statement:
         削除された発言オブジェクト
     """
     obj = db.query(Statement).get(id)
+    topic_ids = [
+        row[0] for row in db.query(StatementTopic.topic_id).filter(
+            StatementTopic.statement_id == id
+        )
+    ]
     db.delete(obj)
     db.commit()
+    
+    # 検索索引とタイムラインから取り除く
+    remove_document("statement", id)
+    remove_from_timelines(db, id)
+    
+    # 政党×トピックの集計に反映
+    refresh_for_statement(db, politician_id=obj.politician_id, topic_ids=topic_ids)
+    
+    # 発言数キャッシュを破棄
+    invalidate_statement_counts()
+    
     return obj
 
 
@@ -547,16 +979,19 @@ def get_statement_topics(
     """
     # モデルとスキーマの名前が同じなので、モデルを明示的に指定
     from app.models.statement import StatementTopic as StatementTopicModel
-    from app.models.topic import Topic
     from app.schemas.statement import StatementTopic
+    from app.services.entity_cache import topics as topic_cache
     
     statement_topics = db.query(StatementTopicModel).filter(
         StatementTopicModel.statement_id == statement_id
     ).all()
     
+    # トピックをまとめて取得
+    topics = topic_cache.get_many(db, [st.topic_id for st in statement_topics])
+    
     result = []
     for st in statement_topics:
-        topic = db.query(Topic).get(st.topic_id)
+        topic = topics.get(st.topic_id)
         if topic:
             result.append(StatementTopic(
                 id=topic.id,
@@ -571,7 +1006,7 @@ def get_statement_topics(
 
 def get_statement_likes_count(db: Session, *, statement_id: str) -> int:
     """
-    発言のいいね数を取得する
+    発言のいいね数を取得する（非正規化したカウンタを参照）
     
     Args:
         db: データベースセッション
@@ -580,27 +1015,127 @@ def get_statement_likes_count(db: Session, *, statement_id: str) -> int:
     Returns:
         いいね数
     """
-    return db.query(func.count(StatementReaction.id)).filter(
-        StatementReaction.statement_id == statement_id,
-        StatementReaction.reaction_type == "like"
+    return db.query(Statement.likes_count).filter(
+        Statement.id == statement_id
     ).scalar() or 0
 
 
-def update_statement_likes_count(db: Session, *, statement_id: str) -> None:
+def adjust_statement_counter(
+    db: Session, *, statement_id: str, column: str, delta: int
+) -> None:
     """
-    発言のいいね数を更新する
+    発言のカウンタを UPDATE ... SET n = n + delta で原子的に増減する（コミットはしない）
+    
+    減算では0未満にならないよう、現在値がdelta以上の場合のみ更新する。
     
     Args:
         db: データベースセッション
         statement_id: 発言ID
+        column: カウンタのカラム名（likes_count, comments_countなど）
+        delta: 増減値
+    """
+    counter = getattr(Statement, column)
+    query = db.query(Statement).filter(Statement.id == statement_id)
+    if delta < 0:
+        query = query.filter(counter >= -delta)
+    query.update({counter: counter + delta}, synchronize_session=False)
+
+
+def add_statement_reaction(
+    db: Session, *, statement_id: str, user_id: str, reaction_type: str = "like"
+) -> StatementReaction:
     """
-    likes_count = get_statement_likes_count(db, statement_id=statement_id)
+    発言にリアクションを追加し、対応するカウンタを加算する
     
-    statement = db.query(Statement).get(statement_id)
-    if statement:
-        statement.likes_count = likes_count
-        db.add(statement)
+    Args:
+        db: データベースセッション
+        statement_id: 発言ID
+        user_id: ユーザーID
+        reaction_type: リアクション種別
+        
+    Returns:
+        作成されたリアクションオブジェクト（同時に作成された場合は既存のもの）
+    """
+    reaction = StatementReaction(
+        statement_id=statement_id,
+        user_id=user_id,
+        reaction_type=reaction_type
+    )
+    db.add(reaction)
+    try:
+        adjust_statement_counter(
+            db,
+            statement_id=statement_id,
+            column=REACTION_COUNT_COLUMNS[reaction_type],
+            delta=1
+        )
         db.commit()
+    except IntegrityError:
+        # 一意制約により重複したリアクションとカウンタの加算は取り消される
+        db.rollback()
+        return db.query(StatementReaction).filter(
+            StatementReaction.statement_id == statement_id,
+            StatementReaction.user_id == user_id,
+            StatementReaction.reaction_type == reaction_type
+        ).one()
+    return reaction
+
+
+def remove_statement_reaction(db: Session, *, reaction: StatementReaction) -> None:
+    """
+    発言のリアクションを削除し、対応するカウンタを減算する
+    
+    Args:
+        db: データベースセッション
+        reaction: 削除するリアクションオブジェクト
+    """
+    db.delete(reaction)
+    adjust_statement_counter(
+        db,
+        statement_id=reaction.statement_id,
+        column=REACTION_COUNT_COLUMNS[reaction.reaction_type],
+        delta=-1
+    )
+    db.commit()
+
+
+def _recount_values(columns: List[str]) -> Dict:
+    """
+    カウンタを実際の件数で置き換えるための相関サブクエリを返す
+    """
+    from app.models.comment import Comment
+    
+    values = {}
+    for reaction_type, column in REACTION_COUNT_COLUMNS.items():
+        if column in columns:
+            values[getattr(Statement, column)] = select(
+                func.count(StatementReaction.id)
+            ).where(
+                StatementReaction.statement_id == Statement.id,
+                StatementReaction.reaction_type == reaction_type
+            ).scalar_subquery()
+    if "comments_count" in columns:
+        values[Statement.comments_count] = select(
+            func.count(Comment.id)
+        ).where(
+            Comment.statement_id == Statement.id,
+            Comment.status == "published"
+        ).scalar_subquery()
+    return values
+
+
+def update_statement_likes_count(db: Session, *, statement_id: str) -> None:
+    """
+    発言のいいね数を実際の件数で数え直す
+    
+    Args:
+        db: データベースセッション
+        statement_id: 発言ID
+    """
+    db.query(Statement).filter(Statement.id == statement_id).update(
+        _recount_values(["likes_count"]), synchronize_session=False
+    )
+    db.commit()
 
 
 def is_statement_liked(db: Session, *, statement_id: str, user_id: str) -> bool:
@@ -623,6 +1158,67 @@ def is_statement_liked(db: Session, *, statement_id: str, user_id: str) -> bool:
     return reaction is not None
 
 
+def get_user_reactions(
+    db: Session, *, statement_ids: List[str], user_id: str
+) -> Dict[str, List[str]]:
+    """
+    複数の発言に対するユーザーのリアクションを1回のクエリで取得する
+    
+    Args:
+        db: データベースセッション
+        statement_ids: 発言IDのリスト
+        user_id: ユーザーID
+        
+    Returns:
+        発言IDとリアクション種別のリストの辞書（リアクションがない発言は含まない）
+    """
+    if not statement_ids:
+        return {}
+    
+    rows = db.query(
+        StatementReaction.statement_id, StatementReaction.reaction_type
+    ).filter(
+        StatementReaction.user_id == user_id,
+        StatementReaction.statement_id.in_(set(statement_ids))
+    ).all()
+    
+    reactions: Dict[str, List[str]] = {}
+    for statement_id, reaction_type in rows:
+        reactions.setdefault(statement_id, []).append(reaction_type)
+    for types in reactions.values():
+        types.sort()
+    return reactions
+
+
+def apply_user_reactions(
+    db: Session, statements: List[Statement], *, user_id: str
+) -> List[Statement]:
+    """
+    発言一覧にユーザーのリアクション（is_liked, user_reactions）を設定する
+    
+    Args:
+        db: データベースセッション
+        statements: 発言オブジェクトのリスト
+        user_id: ユーザーID
+        
+    Returns:
+        リアクションを設定した発言オブジェクトのリスト
+    """
+    reactions = get_user_reactions(
+        db, statement_ids=[statement.id for statement in statements], user_id=user_id
+    )
+    for statement in statements:
+        statement.user_reactions = reactions.get(statement.id, [])
+        statement.is_liked = "like" in statement.user_reactions
+    
+    # ライトビハインド有効時は未反映のリアクションも反映する
+    # （非同期エンドポイントはRedisへのアクセスをスレッドプールで行うため、呼び出し元で反映する）
+    if not db.info.get("defer_reaction_overlay"):
+        from app.services.reaction_buffer import overlay_pending_reactions
+        overlay_pending_reactions(statements, user_id)
+    return statements
+
+
 def get_statement_comments_count(db: Session, *, statement_id: str) -> int:
     """
     発言のコメント数を取得する
@@ -644,95 +1240,187 @@ def get_statement_comments_count(db: Session, *, statement_id: str) -> int:
 
 def update_statement_comments_count(db: Session, *, statement_id: str) -> None:
     """
-    発言のコメント数を更新する
+    発言のコメント数を実際の件数で数え直す
     
     Args:
         db: データベースセッション
         statement_id: 発言ID
     """
-    comments_count = get_statement_comments_count(db, statement_id=statement_id)
-    
-    statement = db.query(Statement).get(statement_id)
-    if statement:
-        statement.comments_count = comments_count
-        db.add(statement)
-        db.commit()
+    db.query(Statement).filter(Statement.id == statement_id).update(
+        _recount_values(["comments_count"]), synchronize_session=False
+    )
+    db.commit()
 
 
-def get_politician_statement_topics(db: Session, politician_id: str) -> List[Dict]:
+def reconcile_statement_counters(db: Session, *, batch_size: int = 500) -> int:
     """
-    政治家の発言から関連するトピック情報を集計する
+    非正規化したカウンタと実際の件数のずれを補正する
+    
+    発言をID順にバッチで走査し、リアクション・コメントをGROUP BYで集計して比較する。
+    ずれていた発言のみ、相関サブクエリで数え直す（集計と更新の間の増減も取りこぼさない）。
     
     Args:
         db: データベースセッション
-        politician_id: 政治家ID
+        batch_size: 1バッチで扱う発言数
         
     Returns:
-        トピック情報のリスト
+        補正した発言数
+    """
+    from app.models.comment import Comment
+    
+    columns = list(REACTION_COUNT_COLUMNS.values()) + ["comments_count"]
+    fixed = 0
+    last_id = None
+    while True:
+        query = db.query(
+            Statement.id, *[getattr(Statement, column) for column in columns]
+        ).order_by(Statement.id)
+        if last_id is not None:
+            query = query.filter(Statement.id > last_id)
+        rows = query.limit(batch_size).all()
+        if not rows:
+            break
+        
+        ids = [row[0] for row in rows]
+        last_id = ids[-1]
+        actual = {id: dict.fromkeys(columns, 0) for id in ids}
+        
+        # リアクション数を種別ごとに集計
+        reaction_counts = db.query(
+            StatementReaction.statement_id,
+            StatementReaction.reaction_type,
+            func.count(StatementReaction.id)
+        ).filter(
+            StatementReaction.statement_id.in_(ids)
+        ).group_by(
+            StatementReaction.statement_id, StatementReaction.reaction_type
+        ).all()
+        for statement_id, reaction_type, count in reaction_counts:
+            actual[statement_id][REACTION_COUNT_COLUMNS[reaction_type]] = count
+        
+        # 公開中のコメント数を集計
+        comment_counts = db.query(
+            Comment.statement_id, func.count(Comment.id)
+        ).filter(
+            Comment.statement_id.in_(ids),
+            Comment.status == "published"
+        ).group_by(Comment.statement_id).all()
+        for statement_id, count in comment_counts:
+            actual[statement_id]["comments_count"] = count
+        
+        drifted = [
+            row[0] for row in rows
+            if dict(zip(columns, row[1:])) != actual[row[0]]
+        ]
+        if drifted:
+            db.query(Statement).filter(Statement.id.in_(drifted)).update(
+                _recount_values(columns), synchronize_session=False
+            )
+            db.commit()
+            fixed += len(drifted)
+    
+    return fixed
+
+
+def _aggregate_statement_topics(db: Session, condition) -> List[Dict]:
+    """
+    条件に一致する発言をトピック別に集計する
+
+    トピック数に関わらず、件数・最新日時をトピック情報と合わせて取得する集計クエリと、
+    トピックごとの最新TOPIC_STANCE_LATEST_LIMIT件をウィンドウ関数で取得するクエリの
+    2回で済ませる。
+
+    Args:
+        db: データベースセッション
+        condition: 発言の絞り込み条件
+
+    Returns:
+        トピック情報のリスト（発言数の多い順）
     """
     from app.models.topic import Topic
 
-    # 政治家の発言に関連するトピックを集計
-    # SQLAlchemyでgroup byとcountを使用
+    # トピック別の発言数と最新の発言日時（トピック情報も結合して取得）
     topic_counts = db.query(
-        StatementTopic.topic_id,
-        func.count(StatementTopic.statement_id).label("count")
+        Topic.id,
+        Topic.name,
+        Topic.slug,
+        func.count(Statement.id).label("count"),
+        func.max(Statement.statement_date).label("last_date")
+    ).join(
+        StatementTopic, StatementTopic.topic_id == Topic.id
     ).join(
         Statement, Statement.id == StatementTopic.statement_id
     ).filter(
-        Statement.politician_id == politician_id,
+        condition,
         Statement.status == "published"
     ).group_by(
-        StatementTopic.topic_id
+        Topic.id, Topic.name, Topic.slug
+    ).order_by(
+        func.count(Statement.id).desc(), Topic.name
     ).all()
-    
-    # トピック情報を取得
+
+    if not topic_counts:
+        return []
+
+    # トピックごとの最新の発言（スタンス分析の対象）
+    row_number = func.row_number().over(
+        partition_by=StatementTopic.topic_id,
+        order_by=(Statement.statement_date.desc(), Statement.id.desc())
+    ).label("row_number")
+    ranked = db.query(
+        StatementTopic.topic_id.label("topic_id"),
+        Statement.id.label("statement_id"),
+        row_number
+    ).join(
+        Statement, Statement.id == StatementTopic.statement_id
+    ).filter(
+        condition,
+        Statement.status == "published"
+    ).subquery()
+    latest_rows = db.query(ranked.c.topic_id, ranked.c.statement_id).filter(
+        ranked.c.row_number <= TOPIC_STANCE_LATEST_LIMIT
+    ).order_by(ranked.c.topic_id, ranked.c.row_number).all()
+
+    latest: Dict[str, List[str]] = {}
+    for topic_id, statement_id in latest_rows:
+        latest.setdefault(topic_id, []).append(statement_id)
+
     result = []
-    for topic_id, count in topic_counts:
-        topic = db.query(Topic).get(topic_id)
-        if topic:
-            # 発言の内容からスタンスを分析（実際には自然言語処理などが必要）
-            # ここでは簡易的に実装
-            statements = db.query(Statement).join(
-                StatementTopic, StatementTopic.statement_id == Statement.id
-            ).filter(
-                Statement.politician_id == politician_id,
-                StatementTopic.topic_id == topic_id,
-                Statement.status == "published"
-            ).order_by(
-                Statement.statement_date.desc()
-            ).limit(5).all()
-            
-            # スタンスの分析（簡易版）
-            stance = "neutral"
-            confidence = 50
-            summary = f"{topic.name}に関する発言が{count}件あります。"
-            last_updated = None
-            
-            if statements:
-                # 最新の発言日時を取得
-                last_updated = statements[0].statement_date.isoformat()
-                
-                # 実際のアプリケーションでは、ここで発言の内容を分析して
-                # スタンスを判定するロジックが入ります
-                
-            result.append({
-                "topic_id": topic.id,
-                "topic_name": topic.name,
-                "topic_slug": topic.slug,
-                "stance": stance,
-                "confidence": confidence,
-                "summary": summary,
-                "count": count,
-                "last_updated": last_updated
-            })
-    
+    for topic_id, name, slug, count, last_date in topic_counts:
+        # 発言の内容からスタンスを分析（実際には自然言語処理などが必要）
+        # ここでは簡易的に実装し、分析対象の最新の発言IDのみを渡す
+        result.append({
+            "topic_id": topic_id,
+            "topic_name": name,
+            "topic_slug": slug,
+            "stance": "neutral",
+            "confidence": 50,
+            "summary": f"{name}に関する発言が{count}件あります。",
+            "count": count,
+            "last_updated": last_date.isoformat() if last_date else None,
+            "latest_statement_ids": latest.get(topic_id, [])
+        })
+
     return result
 
 
+def get_politician_statement_topics(db: Session, politician_id: str) -> List[Dict]:
+    """
+    政治家の発言から関連するトピック情報を集計する
+    
+    Args:
+        db: データベースセッション
+        politician_id: 政治家ID
+        
+    Returns:
+        トピック情報のリスト
+    """
+    return _aggregate_statement_topics(db, Statement.politician_id == politician_id)
+
+
 def get_party_statement_topics(db: Session, party_id: str) -> List[Dict]:
     """
-    政党の発言から関連するトピック情報を集計する
+    政党の発言から関連するトピック情報を集計する（集計表party_topic_statsから取得）
     
     Args:
         db: データベースセッション
@@ -741,80 +1429,12 @@ def get_party_statement_topics(db: Session, party_id: str) -> List[Dict]:
     Returns:
         トピック情報のリスト
     """
-    # 政党に所属する政治家のIDを取得
-    from app.models.politician import Politician
-    from app.models.topic import Topic
-    politician_ids = db.query(Politician.id).filter(
-        Politician.current_party_id == party_id,
-        Politician.status == "active"
-    ).all()
-    politician_ids = [p[0] for p in politician_ids]
-    
-    if not politician_ids:
-        return []
-    
-    # 政党の発言に関連するトピックを集計
-    topic_counts = db.query(
-        StatementTopic.topic_id,
-        func.count(StatementTopic.statement_id).label("count")
-    ).join(
-        Statement, Statement.id == StatementTopic.statement_id
-    ).filter(
-        Statement.politician_id.in_(politician_ids),
-        Statement.status == "published"
-    ).group_by(
-        StatementTopic.topic_id
-    ).all()
-    
-    # トピック情報を取得
-    result = []
-    for topic_id, count in topic_counts:
-        topic = db.query(Topic).get(topic_id)
-        if topic:
-            # 発言の内容からスタンスを分析（実際には自然言語処理などが必要）
-            # ここでは簡易的に実装
-            statements = db.query(Statement).join(
-                StatementTopic, StatementTopic.statement_id == Statement.id
-            ).filter(
-                Statement.politician_id.in_(politician_ids),
-                StatementTopic.topic_id == topic_id,
-                Statement.status == "published"
-            ).order_by(
-                Statement.statement_date.desc()
-            ).limit(5).all()
-            
-            # スタンスの分析（簡易版）
-            stance = "neutral"
-            confidence = 50
-            summary = f"{topic.name}に関する発言が{count}件あります。"
-            manifesto_url = None
-            last_updated = None
-            
-            if statements:
-                # 最新の発言日時を取得
-                last_updated = statements[0].statement_date.isoformat()
-                
-                # 実際のアプリケーションでは、ここで発言の内容を分析して
-                # スタンスを判定するロジックが入ります
-                
-            result.append({
-                "topic_id": topic.id,
-                "topic_name": topic.name,
-                "topic_slug": topic.slug,
-                "stance": stance,
-                "confidence": confidence,
-                "summary": summary,
-                "manifesto_url": manifesto_url,
-                "count": count,
-                "last_updated": last_updated
-            })
-    
-    return result
+    return get_party_topic_stats(db, party_id=party_id)
 
 
 def get_topic_party_stances(db: Session, topic_id: str) -> List[Dict]:
     """
-    トピックに関する政党のスタンス情報を集計する
+    トピックに関する政党のスタンス情報を集計する（集計表party_topic_statsから取得）
     
     Args:
         db: データベースセッション
@@ -823,68 +1443,4 @@ def get_topic_party_stances(db: Session, topic_id: str) -> List[Dict]:
     Returns:
         政党スタンス情報のリスト
     """
-    from app.models.party import Party
-
-    # トピックが存在するか確認
-    from app.models.topic import Topic
-    topic = db.query(Topic).get(topic_id)
-    if not topic:
-        return []
-    
-    # 政党一覧を取得
-    parties = db.query(Party).filter(Party.status == "active").all()
-    
-    result = []
-    for party in parties:
-        # 政党に所属する政治家のIDを取得
-        from app.models.politician import Politician
-        politician_ids = db.query(Politician.id).filter(
-            Politician.current_party_id == party.id,
-            Politician.status == "active"
-        ).all()
-        politician_ids = [p[0] for p in politician_ids]
-        
-        if not politician_ids:
-            continue
-        
-        # トピックに関する発言数を集計
-        count = db.query(func.count(Statement.id)).join(
-            StatementTopic, StatementTopic.statement_id == Statement.id
-        ).filter(
-            Statement.politician_id.in_(politician_ids),
-            StatementTopic.topic_id == topic_id,
-            Statement.status == "published"
-        ).scalar() or 0
-        
-        if count > 0:
-            # 発言の内容からスタンスを分析（実際には自然言語処理などが必要）
-            # ここでは簡易的に実装
-            statements = db.query(Statement).join(
-                StatementTopic, StatementTopic.statement_id == Statement.id
-            ).filter(
-                Statement.politician_id.in_(politician_ids),
-                StatementTopic.topic_id == topic_id,
-                Statement.status == "published"
-            ).order_by(
-                Statement.statement_date.desc()
-            ).limit(5).all()
-            
-            # スタンスの分析（簡易版）
-            stance = "neutral"
-            confidence = 50
-            summary = f"{party.name}の{topic.name}に関する発言が{count}件あります。"
-            manifesto_url = None
-            
-            # 実際のアプリケーションでは、ここで発言の内容を分析して
-            # スタンスを判定するロジックが入ります
-            
-            result.append({
-                "party_id": party.id,
-                "party_name": party.name,
-                "stance": stance,
-                "confidence": confidence,
-                "summary": summary,
-                "manifesto_url": manifesto_url
-            })
-    
-    return result
\ No newline at end of file
+    return get_topic_party_stats(db, topic_id=topic_id)
\ No newline at end of file
@@ -0,0 +1,419 @@
+"""
+ホームタイムライン（フォロー中の政治家の発言フィード）
+
+通常の政治家の発言は、公開時にフォロワー全員のuser_timelineへ展開する（fan-out-on-write）。
+フォロワー数がHOME_TIMELINE_CELEBRITY_FOLLOWERS以上の政治家は展開せず、読み出し時に
+発言テーブルから直接取得して（fan-out-on-read）タイムラインとマージする。
+有名政治家かどうかはpoliticians.fan_out_on_readに保持し、書き込み側と読み出し側で同じ値を使う。
+フォロー解除でしきい値を下回った場合は、展開しなかった最近の発言をフォロワー全員に取り込む。
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.pagination import parse_cursor
+from app.models.follows import PoliticianFollow
+from app.models.politician import Politician
+from app.models.statement import Statement
+from app.models.timeline import UserTimeline
+from app.services.follows import get_user_following_politicians_ids
+from sqlalchemy import DateTime, and_, exists, func, insert, literal, or_, select
+from sqlalchemy.dialects.mysql import CHAR
+from sqlalchemy.orm import Query, Session, joinedload
+
+# タイムラインに書き込むカラム
+_TIMELINE_COLUMNS = [
+    "user_id", "statement_id", "politician_id", "statement_date", "created_at"
+]
+
+
+def has_celebrity_followers(db: Session, politician_id: str) -> bool:
+    """
+    フォロワー数がHOME_TIMELINE_CELEBRITY_FOLLOWERS以上かどうかを判定する
+
+    しきい値の件数までしか数えないため、フォロワーの多い政治家でも読み出す行数は一定になる。
+    """
+    threshold = settings.HOME_TIMELINE_CELEBRITY_FOLLOWERS
+    followers = select(PoliticianFollow.user_id).where(
+        PoliticianFollow.politician_id == politician_id
+    ).limit(threshold).subquery()
+    return db.scalar(select(func.count()).select_from(followers)) >= threshold
+
+
+def get_celebrity_ids(db: Session, politician_ids: Iterable[str]) -> Set[str]:
+    """
+    タイムラインへ展開しない（読み出し時に取得する）政治家のIDを返す
+    """
+    politician_ids = list(set(politician_ids))
+    if not politician_ids:
+        return set()
+    rows = db.query(Politician.id).filter(
+        Politician.id.in_(politician_ids),
+        Politician.fan_out_on_read.is_(True)
+    ).all()
+    return {row[0] for row in rows}
+
+
+def is_celebrity(db: Session, politician_id: str) -> bool:
+    """
+    フォロワー数がしきい値以上の政治家かどうかを判定する
+    """
+    return politician_id in get_celebrity_ids(db, [politician_id])
+
+
+def fan_out_statement(db: Session, statement: Statement) -> int:
+    """
+    発言の公開状態に合わせてフォロワーのタイムラインを更新する
+
+    既存の展開を取り消した上で、公開中かつ有名政治家でない場合のみ
+    INSERT ... SELECTでフォロワー全員分を一括で書き込む。
+
+    Args:
+        db: データベースセッション
+        statement: 作成・更新された発言
+
+    Returns:
+        書き込んだ行数
+    """
+    db.query(UserTimeline).filter(
+        UserTimeline.statement_id == statement.id
+    ).delete(synchronize_session=False)
+
+    inserted = 0
+    if statement.status == "published" and not is_celebrity(db, statement.politician_id):
+        followers = select(
+            PoliticianFollow.user_id,
+            literal(statement.id, CHAR(36)),
+            literal(statement.politician_id, CHAR(36)),
+            literal(statement.statement_date, DateTime),
+            literal(datetime.utcnow(), DateTime),
+        ).where(PoliticianFollow.politician_id == statement.politician_id)
+        result = db.execute(
+            insert(UserTimeline).from_select(_TIMELINE_COLUMNS, followers)
+        )
+        inserted = result.rowcount
+
+    db.commit()
+    return inserted
+
+
+def fan_out_statements(
+    db: Session, statement_ids: List[str], politician_ids: Iterable[str]
+) -> int:
+    """
+    一括で作成した発言をまとめてフォロワーのタイムラインへ展開する
+
+    新規の発言が対象のため既存の展開は取り消さない。公開中かつ有名政治家でない発言を
+    1回のINSERT ... SELECTで書き込む。コミットは呼び出し元で行う。
+
+    Args:
+        db: データベースセッション
+        statement_ids: 作成した発言のID
+        politician_ids: 作成した発言の政治家ID
+
+    Returns:
+        書き込んだ行数
+    """
+    if not statement_ids:
+        return 0
+    followers = select(
+        PoliticianFollow.user_id,
+        Statement.id,
+        Statement.politician_id,
+        Statement.statement_date,
+        literal(datetime.utcnow(), DateTime),
+    ).join(
+        PoliticianFollow, PoliticianFollow.politician_id == Statement.politician_id
+    ).where(
+        Statement.id.in_(statement_ids),
+        Statement.status == "published",
+    )
+    celebrities = get_celebrity_ids(db, politician_ids)
+    if celebrities:
+        followers = followers.where(Statement.politician_id.notin_(celebrities))
+    result = db.execute(insert(UserTimeline).from_select(_TIMELINE_COLUMNS, followers))
+    return result.rowcount
+
+
+def remove_statement(db: Session, statement_id: str) -> None:
+    """
+    削除された発言をタイムラインから取り除く
+    """
+    db.query(UserTimeline).filter(
+        UserTimeline.statement_id == statement_id
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def _backfill(db: Session, user_id: str, politician_id: str) -> int:
+    """
+    政治家の最近の発言をユーザーのタイムラインに書き込む
+    """
+    recent = select(
+        literal(user_id, CHAR(36)),
+        Statement.id,
+        Statement.politician_id,
+        Statement.statement_date,
+        literal(datetime.utcnow(), DateTime),
+    ).where(
+        Statement.politician_id == politician_id,
+        Statement.status == "published"
+    ).order_by(
+        Statement.statement_date.desc()
+    ).limit(settings.HOME_TIMELINE_BACKFILL_LIMIT)
+    result = db.execute(insert(UserTimeline).from_select(_TIMELINE_COLUMNS, recent))
+    return result.rowcount
+
+
+def _backfill_followers(db: Session, politician_id: str) -> int:
+    """
+    政治家の最近の発言をフォロワー全員のタイムラインに書き込む（展開済みの行は除く）
+    """
+    recent = select(
+        Statement.id, Statement.politician_id, Statement.statement_date
+    ).where(
+        Statement.politician_id == politician_id,
+        Statement.status == "published"
+    ).order_by(
+        Statement.statement_date.desc()
+    ).limit(settings.HOME_TIMELINE_BACKFILL_LIMIT).subquery()
+    rows = select(
+        PoliticianFollow.user_id,
+        recent.c.id,
+        recent.c.politician_id,
+        recent.c.statement_date,
+        literal(datetime.utcnow(), DateTime),
+    ).join(
+        recent, recent.c.politician_id == PoliticianFollow.politician_id
+    ).where(
+        ~exists().where(
+            UserTimeline.user_id == PoliticianFollow.user_id,
+            UserTimeline.statement_id == recent.c.id,
+        )
+    )
+    result = db.execute(insert(UserTimeline).from_select(_TIMELINE_COLUMNS, rows))
+    return result.rowcount
+
+
+def update_celebrity_status(db: Session, politician_id: str) -> Optional[bool]:
+    """
+    フォロワー数に合わせて有名政治家かどうか（fan_out_on_read）を切り替える
+
+    しきい値を下回った場合は、有名政治家だった間に展開しなかった発言を含めて
+    最近の発言をフォロワー全員のタイムラインへ取り込む。切り替えと取り込みは
+    同じトランザクションで行う（コミットは呼び出し元で行う）。
+
+    Args:
+        db: データベースセッション
+        politician_id: 政治家ID
+
+    Returns:
+        切り替えた場合は新しい値、変わらなかった場合はNone
+    """
+    celebrity = has_celebrity_followers(db, politician_id)
+    # 条件付きのUPDATEで切り替え、同時に判定した場合も取り込みは1回だけにする
+    switched = db.query(Politician).filter(
+        Politician.id == politician_id,
+        Politician.fan_out_on_read == (not celebrity)
+    ).update({Politician.fan_out_on_read: celebrity}, synchronize_session=False)
+    if not switched:
+        return None
+    if not celebrity:
+        _backfill_followers(db, politician_id)
+    return celebrity
+
+
+def sync_celebrity_statuses(db: Session) -> int:
+    """
+    フォローされている全ての政治家の有名政治家かどうかを切り替え直す
+    （HOME_TIMELINE_CELEBRITY_FOLLOWERSを変更した後の補修用）
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        切り替えた政治家の数
+    """
+    followed = db.query(PoliticianFollow.politician_id).distinct()
+    politician_ids = [
+        row[0] for row in db.query(Politician.id).filter(or_(
+            Politician.fan_out_on_read.is_(True),
+            Politician.id.in_(followed)
+        ))
+    ]
+    switched = 0
+    for politician_id in politician_ids:
+        if update_celebrity_status(db, politician_id) is not None:
+            switched += 1
+        db.commit()
+    return switched
+
+
+def on_politician_followed(db: Session, *, user_id: str, politician_id: str) -> None:
+    """
+    フォロー開始時に、政治家の最近の発言をタイムラインへ取り込む
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        politician_id: 政治家ID
+    """
+    switched = update_celebrity_status(db, politician_id)
+    # 有名政治家でなくなった場合はフォロワー全員分を取り込み済み
+    if switched is None and not is_celebrity(db, politician_id):
+        _backfill(db, user_id, politician_id)
+    db.commit()
+
+
+def on_politician_unfollowed(db: Session, *, user_id: str, politician_id: str) -> None:
+    """
+    フォロー解除時に、政治家の発言をタイムラインから取り除く
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        politician_id: 政治家ID
+    """
+    db.query(UserTimeline).filter(
+        UserTimeline.user_id == user_id,
+        UserTimeline.politician_id == politician_id
+    ).delete(synchronize_session=False)
+    # しきい値を下回った場合は他のフォロワーへ発言を取り込む
+    update_celebrity_status(db, politician_id)
+    db.commit()
+
+
+def rebuild_user_timeline(db: Session, *, user_id: str) -> int:
+    """
+    ユーザーのタイムラインをフォロー関係から作り直す（導入時の初期構築・補修用）
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        書き込んだ行数
+    """
+    db.query(UserTimeline).filter(
+        UserTimeline.user_id == user_id
+    ).delete(synchronize_session=False)
+
+    politician_ids = get_user_following_politicians_ids(db, user_id=user_id)
+    celebrity_ids = get_celebrity_ids(db, politician_ids)
+    inserted = 0
+    for politician_id in politician_ids:
+        if politician_id not in celebrity_ids:
+            inserted += _backfill(db, user_id, politician_id)
+    db.commit()
+    return inserted
+
+
+def _apply_keyset(query: Query, date_column, id_column, cursor: Optional[str]) -> Query:
+    """
+    新しい順のキーセット条件と並び順を適用する
+    """
+    position = parse_cursor(cursor, "date_desc")
+    if position is not None:
+        key, last_id = position
+        query = query.filter(or_(
+            date_column < key,
+            and_(date_column == key, id_column < last_id)
+        ))
+    return query.order_by(date_column.desc(), id_column.desc())
+
+
+def get_timeline(
+    db: Session,
+    *,
+    user_id: str,
+    politician_ids: Optional[List[str]] = None,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> List[Statement]:
+    """
+    ホームタイムラインを新しい順に取得する
+
+    展開済みのuser_timelineと、有名政治家の発言を直接取得した結果をマージする。
+    カーソルの形式はsort=date_descの発言一覧と共通。
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        politician_ids: フォロー中の政治家ID（取得済みの場合に指定）
+        skip: スキップ数
+        limit: 取得上限
+        cursor: 前ページのnext_cursor（指定時はskipを無視してキーセットで取得）
+
+    Returns:
+        発言オブジェクトのリスト
+    """
+    if politician_ids is None:
+        politician_ids = get_user_following_politicians_ids(db, user_id=user_id)
+    celebrity_ids = get_celebrity_ids(db, politician_ids)
+    fetch = limit if cursor else skip + limit
+
+    # 書き込み時に展開済みの発言
+    materialized = db.query(Statement).options(
+        joinedload(Statement.politician)
+    ).join(
+        UserTimeline, UserTimeline.statement_id == Statement.id
+    ).filter(
+        UserTimeline.user_id == user_id,
+        Statement.status == "published"
+    )
+    materialized = _apply_keyset(
+        materialized, UserTimeline.statement_date, UserTimeline.statement_id, cursor
+    )
+    statements = materialized.limit(fetch).all()
+
+    # 有名政治家の発言は読み出し時に取得
+    if celebrity_ids:
+        pulled = db.query(Statement).options(
+            joinedload(Statement.politician)
+        ).filter(
+            Statement.politician_id.in_(celebrity_ids),
+            Statement.status == "published"
+        )
+        pulled = _apply_keyset(pulled, Statement.statement_date, Statement.id, cursor)
+        statements += pulled.limit(fetch).all()
+
+    # 有名政治家になる前に展開された発言は両方に含まれるため重複を除く
+    merged = {statement.id: statement for statement in statements}
+    ordered = sorted(
+        merged.values(),
+        key=lambda statement: (statement.statement_date, statement.id),
+        reverse=True
+    )
+    if not cursor:
+        ordered = ordered[skip:]
+    return ordered[:limit]
+
+
+def count_timeline(db: Session, *, user_id: str) -> int:
+    """
+    ホームタイムラインの発言数を取得する
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+
+    Returns:
+        発言数（展開済みと有名政治家の発言の重複は数え直さない概算）
+    """
+    materialized = db.query(func.count(UserTimeline.statement_id)).join(
+        Statement, UserTimeline.statement_id == Statement.id
+    ).filter(
+        UserTimeline.user_id == user_id,
+        Statement.status == "published"
+    ).scalar() or 0
+
+    politician_ids = get_user_following_politicians_ids(db, user_id=user_id)
+    celebrity_ids = get_celebrity_ids(db, politician_ids)
+    pulled = 0
+    if celebrity_ids:
+        pulled = db.query(func.count(Statement.id)).filter(
+            Statement.politician_id.in_(celebrity_ids),
+            Statement.status == "published"
+        ).scalar() or 0
+    return materialized + pulled
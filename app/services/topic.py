@@ -3,6 +3,8 @@ from typing import Dict, List, Optional, Union
 from app.models.follows import TopicFollow
 from app.models.topic import Topic, TopicRelation
 from app.schemas.topic import TopicCreate, TopicUpdate
+from app.search import index_document, remove_document
+from app.services.entity_cache import topics as topic_cache
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -18,7 +20,21 @@ def get_topic(db: Session, id: str) -> Optional[Topic]:
     Returns:
         トピックオブジェクト、存在しない場合はNone
     """
-    return db.query(Topic).filter(Topic.id == id).first()
+    return topic_cache.get(db, id)
+
+
+def get_topics_by_ids(db: Session, ids: List[str]) -> Dict[str, Topic]:
+    """
+    複数のトピックをIDでまとめて取得する
+    
+    Args:
+        db: データベースセッション
+        ids: トピックIDのリスト
+        
+    Returns:
+        トピックIDとトピックオブジェクトの辞書（存在しないIDは含まない）
+    """
+    return topic_cache.get_many(db, ids)
 
 
 def get_topic_by_slug(db: Session, slug: str) -> Optional[Topic]:
@@ -32,7 +48,7 @@ def get_topic_by_slug(db: Session, slug: str) -> Optional[Topic]:
     Returns:
         トピックオブジェクト、存在しない場合はNone
     """
-    return db.query(Topic).filter(Topic.slug == slug).first()
+    return topic_cache.get_by(db, "slug", slug)
 
 
 def get_topics(
@@ -103,6 +119,11 @@ def create_topic(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    
+    # 検索索引とキャッシュに反映
+    index_document("topic", db_obj)
+    topic_cache.invalidate(db_obj.id)
+    
     return db_obj
 
 
@@ -135,6 +156,11 @@ def update_topic(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    
+    # 検索索引とキャッシュに反映
+    index_document("topic", db_obj)
+    topic_cache.invalidate(db_obj.id)
+    
     return db_obj
 
 
@@ -152,6 +178,11 @@ def delete_topic(db: Session, *, id: str) -> Topic:
     obj = db.query(Topic).get(id)
     db.delete(obj)
     db.commit()
+    
+    # 検索索引とキャッシュから取り除く
+    remove_document("topic", id)
+    topic_cache.invalidate(id)
+    
     return obj
 
 
@@ -178,11 +209,18 @@ def get_related_topics(
         TopicRelation.parent_topic_id == topic_id
     ).all()
     
+    # 関連トピックをまとめて取得
+    topics = topic_cache.get_many(
+        db,
+        [relation.parent_topic_id for relation in parent_relations]
+        + [relation.child_topic_id for relation in child_relations]
+    )
+    
     result = []
     
     # 親トピックの情報を追加
     for relation in parent_relations:
-        parent_topic = db.query(Topic).get(relation.parent_topic_id)
+        parent_topic = topics.get(relation.parent_topic_id)
         if parent_topic:
             result.append({
                 "id": parent_topic.id,
@@ -194,7 +232,7 @@ def get_related_topics(
     
     # 子トピックの情報を追加
     for relation in child_relations:
-        child_topic = db.query(Topic).get(relation.child_topic_id)
+        child_topic = topics.get(relation.child_topic_id)
         if child_topic:
             result.append({
                 "id": child_topic.id,
@@ -1,11 +1,26 @@
+import logging
 import os
 from typing import Any, Dict, List, Optional, Union
 
-from app.core.security import get_password_hash, verify_password
+from app.core.auth import revoke_tokens
+from app.core.security import (
+    PasswordHashingBusyError,
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
+# テスト環境かどうか（起動時に一度だけ判定する）
+TESTING = os.getenv("TESTING") == "True"
+
+# 変更されると発行済みのトークンを失効させる項目
+TOKEN_CLAIM_FIELDS = ("password_hash", "role", "status")
+
 
 def get_user(db: Session, id: str) -> Optional[User]:
     """
@@ -18,21 +33,21 @@ def get_user(db: Session, id: str) -> Optional[User]:
     Returns:
         ユーザーオブジェクト、存在しない場合はNone
     """
-    print(f"get_user: id={id}")
+    logger.debug("get_user: id=%s", id)
     
     # IDでユーザーを検索する
     user = db.query(User).filter(User.id == id).first()
     if user:
-        print(f"ユーザーがIDで見つかりました: {user.id}, {user.email}")
+        logger.debug("ユーザーがIDで見つかりました: %s, %s", user.id, user.email)
         return user
     
     # テスト環境の場合、IDが存在しない場合は新しいユーザーを作成する
-    if os.getenv("TESTING") == "True":
+    if TESTING:
         import uuid
 
         from app.core.security import get_password_hash
         
-        print(f"テスト環境でユーザーが見つからないため、新しいユーザーを作成します: {id}")
+        logger.debug("テスト環境でユーザーが見つからないため、新しいユーザーを作成します: %s", id)
         
         # 一意のメールアドレスとユーザー名を生成
         unique_suffix = uuid.uuid4().hex[:8]
@@ -80,12 +95,29 @@ def get_user(db: Session, id: str) -> Optional[User]:
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
-        print(f"新しいテストユーザーを作成しました: {new_user.id}, {new_user.email}")
+        logger.debug("新しいテストユーザーを作成しました: %s, %s", new_user.id, new_user.email)
         return new_user
     
-    print(f"ユーザーが見つかりません: {id}")
+    logger.debug("ユーザーが見つかりません: %s", id)
     return None
 
+
+def get_token_version(db: Session, id: str) -> Optional[int]:
+    """
+    ユーザーの現在のトークンバージョンを取得する（トークンの失効確認用）
+    
+    Args:
+        db: データベースセッション
+        id: ユーザーID
+        
+    Returns:
+        トークンバージョン、ユーザーが存在しない場合はNone
+    """
+    row = db.query(User.token_version).filter(User.id == id).first()
+    if row is None:
+        return None
+    return row[0] or 0
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """
     メールアドレスでユーザーを取得する
@@ -97,21 +129,21 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     Returns:
         ユーザーオブジェクト、存在しない場合はNone
     """
-    print(f"get_user_by_email: email={email}")
+    logger.debug("get_user_by_email: email=%s", email)
     
     # メールアドレスでユーザーを検索する
     user = db.query(User).filter(User.email == email).first()
     if user:
-        print(f"ユーザーがメールアドレスで見つかりました: {user.id}, {user.email}")
+        logger.debug("ユーザーがメールアドレスで見つかりました: %s, %s", user.id, user.email)
         return user
     
     # テスト環境の場合、メールアドレスが存在しない場合は新しいユーザーを作成する
-    if os.getenv("TESTING") == "True" and email:
+    if TESTING and email:
         import uuid
 
         from app.core.security import get_password_hash
         
-        print(f"テスト環境でユーザーが見つからないため、新しいユーザーを作成します: {email}")
+        logger.debug("テスト環境でユーザーが見つからないため、新しいユーザーを作成します: %s", email)
         
         # 新しいユーザーを作成
         new_user = User(
@@ -127,10 +159,10 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
-        print(f"新しいテストユーザーを作成しました: {new_user.id}, {new_user.email}")
+        logger.debug("新しいテストユーザーを作成しました: %s, %s", new_user.id, new_user.email)
         return new_user
     
-    print(f"ユーザーが見つかりません: {email}")
+    logger.debug("ユーザーが見つかりません: %s", email)
     return None
     return db.query(User).filter(User.email == email).first()
 
@@ -205,12 +237,12 @@ def update_user(
     """
     # テスト環境では、セッションの不整合を回避するために、
     # 同じIDのユーザーを再取得する
-    if os.getenv("TESTING") == "True":
-        print(f"テスト環境でユーザー更新: {db_obj.id}")
+    if TESTING:
+        logger.debug("テスト環境でユーザー更新: %s", db_obj.id)
         # 同じIDのユーザーを再取得
         user = db.query(User).filter(User.id == db_obj.id).first()
         if user:
-            print(f"ユーザーを再取得: {user.id}, {user.email}")
+            logger.debug("ユーザーを再取得: %s, %s", user.id, user.email)
             db_obj = user
     
     if isinstance(obj_in, dict):
@@ -223,20 +255,30 @@ def update_user(
         del update_data["password"]
         update_data["password_hash"] = hashed_password
     
+    # トークンに含まれる項目が変わる場合は発行済みのトークンを失効させる
+    revoke = any(
+        field in update_data and update_data[field] != getattr(db_obj, field)
+        for field in TOKEN_CLAIM_FIELDS
+    )
+    
     for field in update_data:
         if field in update_data:
             setattr(db_obj, field, update_data[field])
+    if revoke:
+        db_obj.token_version = (db_obj.token_version or 0) + 1
     
     try:
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        if revoke:
+            revoke_tokens(db_obj.id, db_obj.token_version)
     except Exception as e:
-        print(f"ユーザー更新中にエラーが発生: {e}")
+        logger.warning("ユーザー更新中にエラーが発生: %s", e)
         db.rollback()
         # テスト環境では、エラーが発生した場合でも処理を続行
-        if os.getenv("TESTING") == "True":
-            print("テスト環境のため、エラーを無視して処理を続行")
+        if TESTING:
+            logger.warning("テスト環境のため、エラーを無視して処理を続行")
             # 更新されたユーザーを返す
             return db_obj
         raise
@@ -259,22 +301,31 @@ def authenticate_user(
         認証成功時はユーザーオブジェクト、失敗時はNone
     """
     # デバッグ出力
-    print(f"Authenticating user with email: {email}")
+    logger.debug("Authenticating user with email: %s", email)
     
     user = get_user_by_email(db, email=email)
     if not user:
-        print(f"User with email {email} not found")
+        logger.debug("User with email %s not found", email)
         return None
     
     # パスワード検証
     is_valid = verify_password(password, user.password_hash)
-    print(f"Password verification result: {is_valid}")
-    print(f"User password_hash: {user.password_hash}")
+    logger.debug("Password verification result: %s", is_valid)
     
     if not is_valid:
         return None
     
-    print(f"Authentication successful for user: {user.username}")
+    # コストの設定が変わっている場合は、平文のパスワードがある今のうちに再計算する
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = get_password_hash(password)
+            db.add(user)
+            db.commit()
+        except PasswordHashingBusyError:
+            # 混み合っている場合は次回のログインに回す
+            pass
+    
+    logger.debug("Authentication successful for user: %s", user.username)
     return user
 
 
@@ -288,5 +339,7 @@ def delete_user(db: Session, *, id: str) -> None:
     """
     user = db.query(User).filter(User.id == id).first()
     if user:
+        token_version = (user.token_version or 0) + 1
         db.delete(user)
-        db.commit()
\ No newline at end of file
+        db.commit()
+        revoke_tokens(id, token_version)
\ No newline at end of file
@@ -1,3 +1,7 @@
-from app.tasks.data_collection.collect import collect_data
+from app.tasks.data_collection.collect import (
+    collect_data,
+    collect_source,
+    summarize_collection,
+)
 
-__all__ = ["collect_data"]
+__all__ = ["collect_data", "collect_source", "summarize_collection"]
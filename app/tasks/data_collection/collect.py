@@ -1,15 +1,42 @@
+import json
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from app import services
 from app.db.session import SessionLocal
-from app.models.data_collection import DataCollectionLog, DataCollectionSource
+from app.models.data_collection import (
+    DataCollectionItem,
+    DataCollectionLog,
+    DataCollectionSource,
+)
+from app.models.statement import Statement
+from app.schemas.statement import StatementCreate
 from app.tasks.base import BaseTask
+from app.tasks.data_collection.fetcher import fetch_urls
+from app.tasks.data_collection.incremental import (
+    conditional_headers,
+    get_fetch_states,
+    get_seen_items,
+    item_hash,
+    item_key,
+    save_fetch_state,
+    sha256,
+)
+from app.tasks.data_collection.parsers import parse_items
+from app.tasks.data_collection.schedule import next_run_time
 from app.tasks.worker import celery_app
+from celery import chord
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# 発言のtitle・source・source_urlの最大長
+MAX_TITLE_LENGTH = 255
+MAX_URL_LENGTH = 255
+
 
 class DataCollectionTask(BaseTask):
     """
@@ -27,139 +54,467 @@ class DataCollectionTask(BaseTask):
 def collect_data(self) -> Dict[str, int]:
     """
     データ収集のメインタスク
-    
+
+    実行時刻（next_run_at）に達したソースを確保し、ソースごとのサブタスク
+    （collect_source）をまとめて投入する。サブタスクは複数のワーカーで並行に動くため、
+    ソースが増えても1回の実行時間は延びない。すべて終わるとsummarize_collectionが
+    結果を集計する。
+
+    Returns:
+        投入結果の統計情報
+    """
+    db = SessionLocal()
+    try:
+        source_ids = claim_due_sources(db)
+    finally:
+        db.close()
+
+    if source_ids:
+        chord(collect_source.s(source_id) for source_id in source_ids)(
+            summarize_collection.s()
+        )
+
+    logger.info(f"データ収集のサブタスクを投入しました: {len(source_ids)}件")
+    return {"dispatched_sources": len(source_ids)}
+
+
+@celery_app.task(
+    bind=True,
+    base=DataCollectionTask,
+    name="app.tasks.data_collection.collect_source",
+    queue="low_priority",
+)
+def collect_source(self, source_id: str) -> Dict[str, Any]:
+    """
+    1つのソースからデータを収集するサブタスク
+
+    取得・解析に失敗した場合も例外は送出せず、収集ログに記録して結果を返す
+    （chordの集計を止めないため）。
+
+    Args:
+        source_id: データ収集ソースID
+
+    Returns:
+        処理結果の統計情報（source_idとstatusを含む）
+    """
+    started_at = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        source = db.get(DataCollectionSource, source_id)
+        if source is None or not source.is_active:
+            return {"source_id": source_id, "status": "skipped"}
+
+        try:
+            stats = process_source(db, source)
+        except Exception as e:
+            db.rollback()
+            logger.error(
+                f"ソース '{source.name}' からのデータ収集中にエラーが発生しました: {e}",
+                exc_info=True
+            )
+            log_collection_result(
+                db, source_id, "failed", 0, 0, str(e), None, started_at=started_at
+            )
+            return {"source_id": source_id, "status": "failed", "error": str(e)}
+
+        status = (
+            "partial"
+            if stats["failed_urls"] or stats["failed_items"] or stats["invalid_items"]
+            else "success"
+        )
+        log_collection_result(
+            db,
+            source_id,
+            status,
+            stats["total_items"],
+            stats["processed_items"],
+            "; ".join(stats["errors"]) or None,
+            stats,
+            started_at=started_at,
+        )
+        return {"source_id": source_id, "status": status, **stats}
+    finally:
+        db.close()
+
+
+@celery_app.task(
+    bind=True,
+    base=DataCollectionTask,
+    name="app.tasks.data_collection.summarize_collection",
+    queue="low_priority",
+)
+def summarize_collection(self, results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    サブタスクの結果を集計する（chordのコールバック）
+
+    Args:
+        results: collect_sourceの結果のリスト
+
     Returns:
         収集結果の統計情報
     """
-    logger.info("データ収集タスクを開始します")
-    start_time = datetime.utcnow()
-    
-    # 収集結果の統計情報
     stats = {
-        "total_sources": 0,
+        "total_sources": len(results),
         "processed_sources": 0,
+        "failed_sources": 0,
         "total_items": 0,
         "new_items": 0,
         "updated_items": 0,
-        "failed_sources": 0,
     }
-    
-    try:
-        # データベースセッションの作成
-        db = SessionLocal()
-        try:
-            # アクティブなデータソースを取得
-            sources = get_active_sources(db)
-            stats["total_sources"] = len(sources)
-            
-            # 各ソースからデータを収集
-            for source in sources:
-                try:
-                    source_stats = process_source(db, source)
-                    stats["processed_sources"] += 1
-                    stats["total_items"] += source_stats.get("total_items", 0)
-                    stats["new_items"] += source_stats.get("new_items", 0)
-                    stats["updated_items"] += source_stats.get(
-                        "updated_items", 0)
-                    
-                    # 収集ログの記録
-                    log_collection_result(
-                        db, 
-                        source.id, 
-                        "success", 
-                        source_stats.get("total_items", 0),
-                        source_stats.get("processed_items", 0),
-                        None,
-                        source_stats
-                    )
-                    
-                except Exception as e:
-                    logger.error(
-                        f"ソース '{source.name}' からのデータ収集中にエラーが発生しました: {e}",
-                        exc_info=True
-                    )
-                    stats["failed_sources"] += 1
-                    
-                    # エラーログの記録
-                    log_collection_result(
-                        db, 
-                        source.id, 
-                        "failed", 
-                        0, 
-                        0, 
-                        str(e),
-                        None
-                    )
-        finally:
-            db.close()
-        
-        # 処理時間の計算
-        end_time = datetime.utcnow()
-        duration = (end_time - start_time).total_seconds()
-        logger.info(
-            f"データ収集タスクが完了しました（所要時間: {duration:.2f}秒）"
-            f" - 処理ソース数: "
-            f"{stats['processed_sources']}/{stats['total_sources']},"
-            f" 新規アイテム: {stats['new_items']},"
-            f" 更新アイテム: {stats['updated_items']}"
-        )
-        
-        return stats
-    
-    except Exception as e:
-        logger.error(f"データ収集中にエラーが発生しました: {e}", exc_info=True)
-        stats["failed_sources"] += 1
-        raise
+    for result in results:
+        if result["status"] == "failed":
+            stats["failed_sources"] += 1
+        elif result["status"] != "skipped":
+            stats["processed_sources"] += 1
+        for key in ("total_items", "new_items", "updated_items"):
+            stats[key] += result.get(key, 0)
+
+    logger.info(
+        f"データ収集が完了しました - 処理ソース数: "
+        f"{stats['processed_sources']}/{stats['total_sources']},"
+        f" 失敗: {stats['failed_sources']},"
+        f" 新規アイテム: {stats['new_items']},"
+        f" 更新アイテム: {stats['updated_items']}"
+    )
+    return stats
 
 
-def get_active_sources(db: Session) -> List[DataCollectionSource]:
+def get_due_sources(
+    db: Session, now: Optional[datetime] = None
+) -> List[DataCollectionSource]:
     """
-    アクティブなデータ収集ソースを取得
-    
+    実行時刻に達したアクティブなデータ収集ソースを取得
+
     Args:
         db: データベースセッション
-        
+        now: 基準の日時（省略時は現在時刻）
+
     Returns:
-        アクティブなデータ収集ソースのリスト
+        next_run_atが未設定か現在時刻以前のソースのリスト
     """
+    now = now or datetime.utcnow()
     return db.query(DataCollectionSource).filter(
-        DataCollectionSource.is_active == True  # noqa: E712
-    ).all()
+        DataCollectionSource.is_active == True,  # noqa: E712
+        or_(
+            DataCollectionSource.next_run_at.is_(None),
+            DataCollectionSource.next_run_at <= now,
+        ),
+    ).order_by(DataCollectionSource.next_run_at).all()
+
+
+def claim_due_sources(db: Session, now: Optional[datetime] = None) -> List[str]:
+    """
+    実行時刻に達したソースのnext_run_atを次回の実行日時に進め、そのIDを返す
+
+    next_run_atが読み出した時のままの場合だけ更新するため、投入タスクが重なって
+    動いても同じソースを二重に投入しない。
+
+    Args:
+        db: データベースセッション
+        now: 基準の日時（省略時は現在時刻）
+
+    Returns:
+        今回収集するソースのIDのリスト
+    """
+    now = now or datetime.utcnow()
+    claimed = []
+    for source in get_due_sources(db, now):
+        try:
+            next_run_at = next_run_time(source.schedule, now)
+        except ValueError as e:
+            logger.warning(
+                f"ソース '{source.name}' のスケジュールが正しくないため"
+                f"既定の間隔を使います: {e}"
+            )
+            next_run_at = next_run_time(None, now)
+
+        table = DataCollectionSource.__table__
+        condition = (
+            table.c.next_run_at.is_(None)
+            if source.next_run_at is None
+            else table.c.next_run_at == source.next_run_at
+        )
+        result = db.execute(
+            update(table)
+            .where(table.c.id == source.id, condition)
+            .values(next_run_at=next_run_at)
+        )
+        if result.rowcount == 1:
+            claimed.append(source.id)
+    db.commit()
+    return claimed
+
+
+def load_source_config(source: DataCollectionSource) -> Dict[str, Any]:
+    """
+    ソースの設定（JSON）を読み込む
+
+    Raises:
+        ValueError: JSONのオブジェクトでない場合
+    """
+    if not source.config:
+        return {}
+    config = json.loads(source.config)
+    if not isinstance(config, dict):
+        raise ValueError("ソースの設定はJSONのオブジェクトで指定してください")
+    return config
+
+
+def get_source_urls(source: DataCollectionSource, config: Dict[str, Any]) -> List[str]:
+    """
+    ソースの取得対象のURL（source.urlとconfig["urls"]、重複を除く）
+    """
+    urls = [source.url] + list(config.get("urls") or [])
+    return list(dict.fromkeys(url for url in urls if url))
 
 
 def process_source(
     db: Session,
     source: DataCollectionSource
-) -> Dict[str, int]:
+) -> Dict[str, Any]:
     """
     特定のソースからデータを収集して処理
-    
+
+    ソースのURLを条件付きリクエストで並行に取得し、変わった本文だけを解析して、
+    新しいアイテムを発言として登録し、内容が変わったアイテムの発言を更新する。
+
     Args:
         db: データベースセッション
         source: データ収集ソース
-        
+
     Returns:
-        処理結果の統計情報
+        処理結果の統計情報（通信量とスキップした件数を含む）
     """
     logger.info(f"ソース '{source.name}' からデータ収集を開始します")
-    
-    # 現在は実装されていないため、ダミーの結果を返す
-    # 実際の実装では、ソースタイプに応じた収集処理を行う
-    result = {
-        "total_items": 0,
-        "processed_items": 0,
-        "new_items": 0,
-        "updated_items": 0,
-    }
-    
+    config = load_source_config(source)
+    urls = get_source_urls(source, config)
+    states = get_fetch_states(db, source)
+
+    started = time.perf_counter()
+    responses = fetch_urls(
+        urls, headers={url: conditional_headers(states.get(url)) for url in urls}
+    ) if urls else []
+    fetch_seconds = time.perf_counter() - started
+
+    items = []
+    errors = []
+    # 取得状態を保存する(応答, 本文のハッシュ)
+    fetched = []
+    not_modified_urls = 0
+    unchanged_urls = 0
+    for response in responses:
+        if not response.ok:
+            errors.append(f"{response.url}: {response.error}")
+            continue
+        if response.not_modified:
+            not_modified_urls += 1
+            continue
+        content_hash = sha256(response.content)
+        state = states.get(response.url)
+        if state is not None and state.content_hash == content_hash:
+            unchanged_urls += 1
+            fetched.append((response, content_hash))
+            continue
+        try:
+            items.extend(
+                parse_items(source.source_type, response.content, config, response.url)
+            )
+        except ValueError as e:
+            errors.append(f"{response.url}: {e}")
+            continue
+        fetched.append((response, content_hash))
+
+    result = store_items(db, source, items, config)
+    # 登録に失敗したアイテムを次回も取り込み直すため、その場合は取得状態を進めない
+    # （入力が不正なアイテムは取り込み直しても登録できないため、取得状態を進める）
+    if not result["failed_items"]:
+        for response, content_hash in fetched:
+            save_fetch_state(
+                db, source, states.get(response.url), response, content_hash
+            )
+    result.update({
+        "urls": len(urls),
+        "failed_urls": len(errors),
+        "not_modified_urls": not_modified_urls,
+        "unchanged_urls": unchanged_urls,
+        "bytes_downloaded": sum(r.bytes_downloaded for r in responses),
+        "skipped_items": result["unchanged_items"] + result["old_items"],
+        "fetch_seconds": round(fetch_seconds, 3),
+        "errors": errors,
+    })
+
     # ソースの最終実行時間を更新
     source.last_run_at = datetime.utcnow()
     db.commit()
-    
-    logger.info(f"ソース '{source.name}' からのデータ収集が完了しました")
+
+    logger.info(f"ソース '{source.name}' からのデータ収集が完了しました: {result}")
     return result
 
 
+def store_items(
+    db: Session,
+    source: DataCollectionSource,
+    items: List[Dict[str, Any]],
+    config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    収集アイテムを取得済みのアイテムと突き合わせて発言に反映する
+
+    - 取得済みで内容のハッシュが同じアイテムは何もしない
+    - 取得済みで内容が変わったアイテムは登録した発言のタイトル・本文を更新する
+    - 未取得でソースの最新アイテムより古いアイテムは取り込まない
+    - それ以外は発言として登録する（source_urlが同じ発言が既にあれば、それと対応付ける）
+
+    URL・タイトル・発言者が無いアイテムは何度取り込んでも登録できないためinvalid_itemsに、
+    発言の登録に失敗したアイテムは次回取り込み直すためfailed_itemsに数える。
+    ソースの最新アイテムは反映できたアイテムの公開日時までしか進めず、
+    登録に失敗したアイテムがあればその公開日時を越えない（次回古いアイテムとして除かれないように）。
+
+    発言者はアイテムのpolitician_id、無ければソースのconfig["politician_id"]とし、
+    config["topic_ids"]のトピックを関連付ける。
+
+    Args:
+        db: データベースセッション
+        source: データ収集ソース
+        items: 収集アイテム
+        config: ソースの設定
+
+    Returns:
+        アイテム数の統計情報
+    """
+    now = datetime.utcnow()
+    stats = {
+        "total_items": len(items),
+        "processed_items": 0,
+        "new_items": 0,
+        "updated_items": 0,
+        "unchanged_items": 0,
+        "old_items": 0,
+        "existing_items": 0,
+        "invalid_items": 0,
+        "failed_items": 0,
+    }
+    candidates = {}
+    for item in items:
+        url = item.get("url")
+        politician_id = item.get("politician_id") or config.get("politician_id")
+        if not url or len(url) > MAX_URL_LENGTH or not item.get("title"):
+            stats["invalid_items"] += 1
+            continue
+        if not politician_id:
+            stats["invalid_items"] += 1
+            continue
+        candidates.setdefault(url, (item, politician_id))
+    # 複数のURLに同じアイテムが載っていた分
+    stats["existing_items"] = len(items) - stats["invalid_items"] - len(candidates)
+    # 反映できたアイテムと登録に失敗したアイテム（ソースの最新アイテムの更新に使う）
+    stored = []
+    failed = []
+
+    keys = {url: item_key(item) for url, (item, _) in candidates.items()}
+    seen = get_seen_items(db, source, keys.values())
+    cutoff = source.last_item_at
+    new_items = {}
+    changed = []
+    for url, (item, politician_id) in candidates.items():
+        content_hash = item_hash(item)
+        record = seen.get(keys[url])
+        if record is not None:
+            record.last_seen_at = now
+            if record.content_hash == content_hash:
+                stats["unchanged_items"] += 1
+                stored.append(item)
+            else:
+                changed.append((record, item, content_hash))
+            continue
+        published_at = item.get("published_at")
+        if cutoff and published_at and published_at < cutoff:
+            stats["old_items"] += 1
+            continue
+        new_items[url] = (item, politician_id, content_hash)
+
+    if new_items:
+        existing = dict(
+            db.query(Statement.source_url, Statement.id).filter(
+                Statement.source_url.in_(list(new_items))
+            ).all()
+        )
+        creates = []
+        for url, (item, politician_id, content_hash) in new_items.items():
+            if url in existing:
+                stats["existing_items"] += 1
+                stored.append(item)
+                db.add(DataCollectionItem(
+                    source_id=source.id,
+                    item_key=keys[url],
+                    content_hash=content_hash,
+                    statement_id=existing[url],
+                    first_seen_at=now,
+                    last_seen_at=now,
+                ))
+                continue
+            creates.append((item, url, content_hash, StatementCreate(
+                politician_id=politician_id,
+                title=item["title"][:MAX_TITLE_LENGTH],
+                content=item.get("content") or item["title"],
+                source=source.name,
+                source_url=url,
+                statement_date=item.get("published_at") or now,
+                topic_ids=config.get("topic_ids"),
+            )))
+        if creates:
+            results = services.statement.create_statements_bulk(
+                db, [(line, create) for line, (*_, create) in enumerate(creates, 1)]
+            )
+            for (item, url, content_hash, _), result in zip(creates, results):
+                if result["status"] != "created":
+                    stats["failed_items"] += 1
+                    failed.append(item)
+                    continue
+                stats["new_items"] += 1
+                stored.append(item)
+                db.add(DataCollectionItem(
+                    source_id=source.id,
+                    item_key=keys[url],
+                    content_hash=content_hash,
+                    statement_id=result["id"],
+                    first_seen_at=now,
+                    last_seen_at=now,
+                ))
+
+    for record, item, content_hash in changed:
+        record.content_hash = content_hash
+        stored.append(item)
+        statement = (
+            db.get(Statement, record.statement_id) if record.statement_id else None
+        )
+        if statement is None:
+            # 登録した発言が削除されている場合は作り直さない
+            stats["existing_items"] += 1
+            continue
+        services.statement.update_statement(db, db_obj=statement, obj_in={
+            "title": item["title"][:MAX_TITLE_LENGTH],
+            "content": item.get("content") or item["title"],
+        })
+        stats["updated_items"] += 1
+
+    # 次回はこれより古い未取得のアイテムを取り込まない
+    dated = [item for item in stored if item.get("published_at")]
+    failed_dates = [item["published_at"] for item in failed if item.get("published_at")]
+    if failed_dates:
+        dated = [item for item in dated if item["published_at"] <= min(failed_dates)]
+    if dated:
+        latest = max(dated, key=lambda item: item["published_at"])
+        if cutoff is None or latest["published_at"] > cutoff:
+            source.last_item_id = latest["url"]
+            source.last_item_at = latest["published_at"]
+
+    stats["processed_items"] = (
+        stats["total_items"] - stats["invalid_items"] - stats["failed_items"]
+    )
+    return stats
+
+
 def log_collection_result(
     db: Session,
     source_id: str,
@@ -167,11 +522,12 @@ def log_collection_result(
     items_found: int,
     items_processed: int,
     error_message: Optional[str] = None,
-    details: Optional[Dict] = None
+    details: Optional[Dict] = None,
+    started_at: Optional[datetime] = None,
 ) -> None:
     """
     データ収集結果をログに記録
-    
+
     Args:
         db: データベースセッション
         source_id: データ収集ソースID
@@ -180,19 +536,22 @@ def log_collection_result(
         items_processed: 処理アイテム数
         error_message: エラーメッセージ
         details: 詳細情報
+        started_at: 収集の開始日時（省略時は記録する時刻）
     """
-    started_at = datetime.utcnow()
-    
+    completed_at = datetime.utcnow()
+    started_at = started_at or completed_at
+
     log = DataCollectionLog(
         source_id=source_id,
         status=status,
         items_found=items_found,
         items_processed=items_processed,
         error_message=error_message,
-        details=str(details) if details else None,
+        details=json.dumps(details, ensure_ascii=False) if details else None,
+        duration_ms=int((completed_at - started_at).total_seconds() * 1000),
         started_at=started_at,
-        completed_at=datetime.utcnow()
+        completed_at=completed_at
     )
-    
+
     db.add(log)
-    db.commit()
\ No newline at end of file
+    db.commit()
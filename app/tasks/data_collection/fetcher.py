@@ -0,0 +1,198 @@
+"""
+データ収集用の非同期HTTPフェッチャー
+
+1つのサブタスク内で1つのhttpx.AsyncClientを使い回し（keep-aliveで接続を再利用する）、
+URLをまとめて並行に取得する。同時接続数は全体（max_connections）とホストごと
+（per_host_limit）の両方で制限し、同じサイトへ一度に負荷をかけないようにする。
+"""
+
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+from app.core.config import settings
+
+# 再試行するステータスコード
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchResult(NamedTuple):
+    """
+    1URL分の取得結果
+
+    Args:
+        url: 取得したURL
+        status_code: ステータスコード（接続できなかった場合はNone）
+        content: 本文
+        headers: レスポンスヘッダー
+        error: エラーの内容（成功した場合はNone）
+        elapsed: 再試行を含めた所要秒数
+        bytes_downloaded: 受信した本文のバイト数（圧縮されている場合は圧縮後、再試行分を含む）
+    """
+
+    url: str
+    status_code: Optional[int]
+    content: bytes
+    headers: Dict[str, str]
+    error: Optional[str]
+    elapsed: float
+    bytes_downloaded: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def not_modified(self) -> bool:
+        """
+        条件付きリクエストに304が返ったかどうか
+        """
+        return self.status_code == 304
+
+
+class Fetcher:
+    """
+    ホストごとの同時接続数を制限して並行に取得するフェッチャー
+
+    async withで使用し、ブロックを抜けると接続を閉じる。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        retry_backoff: float = 0.5,
+        user_agent: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections = (
+            max_connections or settings.DATA_COLLECTION_MAX_CONNECTIONS
+        )
+        self.per_host_limit = per_host_limit or settings.DATA_COLLECTION_PER_HOST_LIMIT
+        self.timeout = timeout or settings.DATA_COLLECTION_TIMEOUT_SECONDS
+        self.retries = settings.DATA_COLLECTION_RETRIES if retries is None else retries
+        self.retry_backoff = retry_backoff
+        self.user_agent = user_agent or settings.DATA_COLLECTION_USER_AGENT
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "Fetcher":
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            headers={"User-Agent": self.user_agent},
+            follow_redirects=True,
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def fetch(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> FetchResult:
+        """
+        1つのURLを取得する（接続エラー・タイムアウト・5xxなどは再試行する）
+
+        Args:
+            url: 取得するURL
+            headers: 追加のリクエストヘッダー
+
+        Returns:
+            取得結果（失敗した場合もerrorを設定して返す）
+        """
+        started = time.perf_counter()
+        error = None
+        downloaded = 0
+        async with self._host_limit(url):
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                try:
+                    response = await self._client.get(url, headers=headers)
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                    continue
+                downloaded += response.num_bytes_downloaded
+                if (
+                    response.status_code in RETRY_STATUS_CODES
+                    and attempt < self.retries
+                ):
+                    continue
+                return FetchResult(
+                    url,
+                    response.status_code,
+                    response.content,
+                    dict(response.headers),
+                    (
+                        f"HTTP {response.status_code}"
+                        if response.status_code >= 400
+                        else None
+                    ),
+                    time.perf_counter() - started,
+                    downloaded,
+                )
+        return FetchResult(
+            url, None, b"", {}, error, time.perf_counter() - started, downloaded
+        )
+
+    async def fetch_all(
+        self,
+        urls: Sequence[str],
+        headers: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> List[FetchResult]:
+        """
+        URLをまとめて並行に取得する
+
+        Args:
+            urls: 取得するURL
+            headers: URLごとの追加のリクエストヘッダー（条件付きリクエストなど）
+
+        Returns:
+            urlsと同じ順の取得結果
+        """
+        headers = headers or {}
+        return list(
+            await asyncio.gather(*(self.fetch(url, headers.get(url)) for url in urls))
+        )
+
+
+def fetch_urls(
+    urls: Sequence[str],
+    headers: Optional[Dict[str, Dict[str, str]]] = None,
+    **options,
+) -> List[FetchResult]:
+    """
+    同期コード（Celeryのタスク）からURLをまとめて取得する
+
+    Args:
+        urls: 取得するURL
+        headers: URLごとの追加のリクエストヘッダー
+        options: Fetcherの引数
+
+    Returns:
+        urlsと同じ順の取得結果
+    """
+
+    async def run() -> List[FetchResult]:
+        async with Fetcher(**options) as fetcher:
+            return await fetcher.fetch_all(urls, headers)
+
+    return asyncio.run(run())
@@ -0,0 +1,121 @@
+"""
+データ収集の差分取得
+
+前回の取得結果をソースごとに保持し、変わっていないものをデータベースに届く前に除く。
+- URLごと: ETag・Last-Modifiedで条件付きリクエストを送り、304なら解析しない。
+  検証子を返さないサーバーでは本文のハッシュが前回と同じなら解析しない
+- アイテムごと: URLのハッシュをキーに内容のハッシュを保持し、同じなら登録・更新しない
+- ソースごと: 最新アイテムの公開日時より古い未取得のアイテムは取り込まない
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from app.models.data_collection import (
+    DataCollectionFetchState,
+    DataCollectionItem,
+    DataCollectionSource,
+)
+from app.tasks.data_collection.fetcher import FetchResult
+from sqlalchemy.orm import Session
+
+
+def sha256(value: Any) -> str:
+    """
+    文字列またはバイト列のSHA-256（16進数）
+    """
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """
+    アイテムを識別するキー（URLのハッシュ）
+    """
+    return sha256(item["url"])
+
+
+def item_hash(item: Dict[str, Any]) -> str:
+    """
+    アイテムの内容のハッシュ（タイトル・本文・公開日時が変わると変わる）
+    """
+    published_at = item.get("published_at")
+    return sha256(json.dumps(
+        [
+            item.get("title"),
+            item.get("content"),
+            published_at.isoformat() if published_at else None,
+        ],
+        ensure_ascii=False,
+    ))
+
+
+def get_fetch_states(
+    db: Session, source: DataCollectionSource
+) -> Dict[str, DataCollectionFetchState]:
+    """
+    ソースのURLごとの取得状態を返す
+
+    Returns:
+        URLをキーとする取得状態
+    """
+    states = db.query(DataCollectionFetchState).filter(
+        DataCollectionFetchState.source_id == source.id
+    ).all()
+    return {state.url: state for state in states}
+
+
+def conditional_headers(state: Optional[DataCollectionFetchState]) -> Dict[str, str]:
+    """
+    前回の取得状態から条件付きリクエストのヘッダーを作る
+    """
+    headers = {}
+    if state is not None and state.etag:
+        headers["If-None-Match"] = state.etag
+    if state is not None and state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def save_fetch_state(
+    db: Session,
+    source: DataCollectionSource,
+    state: Optional[DataCollectionFetchState],
+    response: FetchResult,
+    content_hash: str,
+) -> None:
+    """
+    取得した本文の検証子とハッシュを保存する（コミットは呼び出し元で行う）
+    """
+    if state is None:
+        state = DataCollectionFetchState(
+            source_id=source.id, url_hash=sha256(response.url), url=response.url
+        )
+        db.add(state)
+    headers = {name.lower(): value for name, value in response.headers.items()}
+    state.etag = headers.get("etag")
+    state.last_modified = headers.get("last-modified")
+    state.content_hash = content_hash
+    state.fetched_at = datetime.utcnow()
+
+
+def get_seen_items(
+    db: Session, source: DataCollectionSource, keys: Iterable[str]
+) -> Dict[str, DataCollectionItem]:
+    """
+    取得済みのアイテムをキーでまとめて取得する
+
+    Returns:
+        キーをキーとする取得済みアイテム
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    items = db.query(DataCollectionItem).filter(
+        DataCollectionItem.source_id == source.id,
+        DataCollectionItem.item_key.in_(keys),
+    ).all()
+    return {item.item_key: item for item in items}
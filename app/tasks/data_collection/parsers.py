@@ -0,0 +1,208 @@
+"""
+取得した本文を収集アイテムに変換するパーサー
+
+アイテムは次のキーを持つ辞書で表す（値が無いキーはNone）。
+- url: 元記事のURL（発言のsource_urlになり、重複の判定に使う）
+- title, content: タイトルと本文
+- published_at: 公開日時（UTC、タイムゾーンなし）
+- politician_id: 発言者の政治家ID（ソースのconfigで指定する場合はNone）
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional
+from xml.etree import ElementTree
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+# JSONのフィールド名の既定値（ソースのconfig["fields"]で上書きする）
+DEFAULT_JSON_FIELDS = {
+    "url": "url",
+    "title": "title",
+    "content": "content",
+    "published_at": "published_at",
+    "politician_id": "politician_id",
+}
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+
+
+def _text(value: Any) -> Optional[str]:
+    """
+    HTMLタグと連続する空白を取り除く
+    """
+    if value is None:
+        return None
+    text = _SPACES.sub(" ", _TAG.sub(" ", str(value))).strip()
+    return text or None
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    RFC 822（RSS）またはISO 8601（Atom・JSON）の日時をUTCのタイムゾーンなしに変換する
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_feed(content: bytes, config: Dict) -> List[Dict]:
+    """
+    RSS 2.0またはAtomのフィードを解析する
+
+    Raises:
+        ValueError: XMLとして解析できない場合
+    """
+    try:
+        root = ElementTree.fromstring(content)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"フィードを解析できません: {e}") from e
+
+    items = []
+    for entry in root.iter("item"):
+        items.append({
+            "url": entry.findtext("link") or entry.findtext("guid"),
+            "title": _text(entry.findtext("title")),
+            "content": _text(entry.findtext("description")),
+            "published_at": parse_datetime(entry.findtext("pubDate")),
+            "politician_id": None,
+        })
+    for entry in root.iter(f"{ATOM_NS}entry"):
+        link = entry.find(f"{ATOM_NS}link[@rel='alternate']")
+        if link is None:
+            link = entry.find(f"{ATOM_NS}link")
+        items.append({
+            "url": link.get("href") if link is not None else entry.findtext(
+                f"{ATOM_NS}id"
+            ),
+            "title": _text(entry.findtext(f"{ATOM_NS}title")),
+            "content": _text(
+                entry.findtext(f"{ATOM_NS}content")
+                or entry.findtext(f"{ATOM_NS}summary")
+            ),
+            "published_at": parse_datetime(
+                entry.findtext(f"{ATOM_NS}published")
+                or entry.findtext(f"{ATOM_NS}updated")
+            ),
+            "politician_id": None,
+        })
+    return items
+
+
+def parse_json(content: bytes, config: Dict) -> List[Dict]:
+    """
+    JSONのAPIレスポンスを解析する
+
+    config["items_path"]（"data.items"のようなドット区切り）でアイテムの配列の位置を、
+    config["fields"]でアイテムのフィールド名を指定する。
+
+    Raises:
+        ValueError: JSONとして解析できない場合やアイテムの配列が無い場合
+    """
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"JSONを解析できません: {e}") from e
+    for key in filter(None, (config.get("items_path") or "").split(".")):
+        data = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(data, list):
+        raise ValueError("アイテムの配列がありません")
+
+    fields = {**DEFAULT_JSON_FIELDS, **(config.get("fields") or {})}
+    items = []
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        items.append({
+            "url": entry.get(fields["url"]),
+            "title": _text(entry.get(fields["title"])),
+            "content": _text(entry.get(fields["content"])),
+            "published_at": parse_datetime(entry.get(fields["published_at"])),
+            "politician_id": entry.get(fields["politician_id"]),
+        })
+    return items
+
+
+class _PageParser(HTMLParser):
+    """
+    ページのタイトルと本文のテキストを取り出す
+    """
+
+    _SKIP = {"script", "style", "noscript", "head"}
+
+    def __init__(self):
+        super().__init__()
+        self.title: List[str] = []
+        self.text: List[str] = []
+        self._stack: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._stack:
+            del self._stack[self._stack.index(tag):]
+
+    def handle_data(self, data):
+        if "title" in self._stack:
+            self.title.append(data)
+        elif not self._SKIP.intersection(self._stack):
+            self.text.append(data)
+
+
+def parse_page(content: bytes, config: Dict, url: str) -> List[Dict]:
+    """
+    Webページを1件のアイテムとして解析する
+    """
+    parser = _PageParser()
+    parser.feed(content.decode("utf-8", errors="replace"))
+    return [{
+        "url": url,
+        "title": _text(" ".join(parser.title)),
+        "content": _text(" ".join(parser.text)),
+        "published_at": None,
+        "politician_id": None,
+    }]
+
+
+PARSERS: Dict[str, Callable[[bytes, Dict], List[Dict]]] = {
+    "rss": parse_feed,
+    "api": parse_json,
+    "social_media": parse_json,
+}
+
+
+def parse_items(source_type: str, content: bytes, config: Dict, url: str) -> List[Dict]:
+    """
+    ソースの種類に応じて本文を解析する
+
+    Args:
+        source_type: ソースの種類（rss, api, social_media, website）
+        content: 取得した本文
+        config: ソースの設定
+        url: 取得したURL
+
+    Returns:
+        収集アイテムのリスト
+
+    Raises:
+        ValueError: 解析できない場合
+    """
+    if source_type == "website":
+        return parse_page(content, config, url)
+    if source_type not in PARSERS:
+        raise ValueError(f"収集できないソースの種類です: {source_type}")
+    return PARSERS[source_type](content, config)
@@ -0,0 +1,79 @@
+"""
+データ収集ソースの実行スケジュール
+
+DataCollectionSource.scheduleは次のいずれかで指定する。
+- cron形式（"分 時 日 月 曜日"、Celeryのタイムゾーンで解釈する）
+- 実行間隔の秒数（"900"など）
+- "@hourly" などの別名
+- 空の場合はDATA_COLLECTION_DEFAULT_INTERVAL秒ごと
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.tasks.worker import celery_app
+from celery.schedules import crontab
+
+# cron形式の別名
+SCHEDULE_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+
+def parse_schedule(schedule: str) -> crontab:
+    """
+    cron形式の文字列をCeleryのcrontabに変換する
+
+    Args:
+        schedule: cron形式の文字列または別名
+
+    Returns:
+        crontab
+
+    Raises:
+        ValueError: 形式が正しくない場合
+    """
+    fields = SCHEDULE_ALIASES.get(schedule, schedule).split()
+    if len(fields) != 5:
+        raise ValueError(f"cron形式のスケジュールではありません: {schedule}")
+    minute, hour, day_of_month, month_of_year, day_of_week = fields
+    return crontab(
+        minute=minute,
+        hour=hour,
+        day_of_week=day_of_week,
+        day_of_month=day_of_month,
+        month_of_year=month_of_year,
+        app=celery_app,
+    )
+
+
+def next_run_time(schedule: str, after: datetime) -> datetime:
+    """
+    afterより後の次回実行日時を求める
+
+    Args:
+        schedule: ソースのスケジュール（Noneまたは空の場合は既定の間隔）
+        after: 基準の日時（UTC、タイムゾーンなし）
+
+    Returns:
+        次回実行日時（UTC、タイムゾーンなし）
+
+    Raises:
+        ValueError: スケジュールの形式が正しくない場合
+    """
+    schedule = (schedule or "").strip()
+    if not schedule:
+        return after + timedelta(seconds=settings.DATA_COLLECTION_DEFAULT_INTERVAL)
+    if schedule.isdigit():
+        if int(schedule) <= 0:
+            raise ValueError(f"実行間隔は1秒以上を指定してください: {schedule}")
+        return after + timedelta(seconds=int(schedule))
+
+    # 日時はCeleryのタイムゾーン（Asia/Tokyo）に変換してから評価する
+    local = after.replace(tzinfo=timezone.utc).astimezone(celery_app.timezone)
+    last_run_at, delta, _ = parse_schedule(schedule).remaining_delta(local)
+    return (last_run_at + delta).astimezone(timezone.utc).replace(tzinfo=None)
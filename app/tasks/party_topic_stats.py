@@ -0,0 +1,35 @@
+import logging
+from typing import Dict
+
+from app import services
+from app.db.session import SessionLocal
+from app.tasks.base import BaseTask
+from app.tasks.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    base=BaseTask,
+    name="app.tasks.party_topic_stats.rebuild_party_topic_stats",
+    queue="low_priority",
+)
+def rebuild_party_topic_stats(self) -> Dict[str, int]:
+    """
+    政党×トピックの発言集計を全て作り直すタスク
+    
+    差分更新の取りこぼし（直接のデータ投入など）を補正する。
+    
+    Returns:
+        書き込んだ集計行数
+    """
+    logger.info("政党×トピックの集計の再構築を開始します")
+    db = SessionLocal()
+    try:
+        rows = services.party_topic_stats.rebuild_party_topic_stats(db)
+    finally:
+        db.close()
+    
+    logger.info(f"政党×トピックの集計の再構築が完了しました: {rows}行")
+    return {"rows": rows}
@@ -0,0 +1,33 @@
+import logging
+from typing import Dict
+
+from app import services
+from app.db.session import SessionLocal
+from app.tasks.base import BaseTask
+from app.tasks.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    base=BaseTask,
+    name="app.tasks.reaction_buffer.flush_reaction_buffer",
+    queue="high_priority",
+)
+def flush_reaction_buffer(self) -> Dict[str, int]:
+    """
+    リアクションバッファの内容をstatement_reactionsに反映するタスク
+    
+    Returns:
+        反映結果の統計情報
+    """
+    db = SessionLocal()
+    try:
+        stats = services.reaction_buffer.flush_reaction_buffer(db)
+    finally:
+        db.close()
+    
+    if stats["entries"]:
+        logger.info(f"リアクションバッファを反映しました: {stats}")
+    return stats
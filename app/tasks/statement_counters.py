@@ -0,0 +1,38 @@
+import logging
+from typing import Dict
+
+from app import services
+from app.db.session import SessionLocal
+from app.tasks.base import BaseTask
+from app.tasks.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    base=BaseTask,
+    name="app.tasks.statement_counters.reconcile_statement_counters",
+    queue="low_priority",
+)
+def reconcile_statement_counters(self, batch_size: int = 500) -> Dict[str, int]:
+    """
+    発言のリアクション数・コメント数のずれを補正するタスク
+    
+    Args:
+        batch_size: 1バッチで扱う発言数
+        
+    Returns:
+        補正した発言数
+    """
+    logger.info("発言カウンタの補正を開始します")
+    db = SessionLocal()
+    try:
+        fixed = services.statement.reconcile_statement_counters(
+            db, batch_size=batch_size
+        )
+    finally:
+        db.close()
+    
+    logger.info(f"発言カウンタの補正が完了しました: {fixed}件")
+    return {"fixed_statements": fixed}
@@ -0,0 +1,50 @@
+import logging
+from typing import Dict, List, Optional
+
+from app import services
+from app.db.session import SessionLocal
+from app.models.follows import PoliticianFollow
+from app.tasks.base import BaseTask
+from app.tasks.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    base=BaseTask,
+    name="app.tasks.timeline.rebuild_timelines",
+    queue="low_priority",
+)
+def rebuild_timelines(self, user_ids: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    ユーザーのホームタイムラインをフォロー関係から作り直すタスク
+    
+    HOME_TIMELINE_ENABLEDを有効にする前の初期構築や、補修に使用する。
+    全ユーザーが対象の場合は、先に有名政治家の判定を現在のしきい値に合わせて切り替え直す。
+    
+    Args:
+        user_ids: 対象のユーザーID（Noneの場合は政治家をフォローしている全ユーザー）
+        
+    Returns:
+        処理結果の統計情報
+    """
+    db = SessionLocal()
+    stats = {"users": 0, "entries": 0, "celebrity_changes": 0}
+    try:
+        if user_ids is None:
+            # しきい値の変更後でも展開する政治家の判定が揃うようにする
+            stats["celebrity_changes"] = services.timeline.sync_celebrity_statuses(db)
+            user_ids = [
+                row[0] for row in db.query(PoliticianFollow.user_id).distinct()
+            ]
+        for user_id in user_ids:
+            stats["entries"] += services.timeline.rebuild_user_timeline(
+                db, user_id=user_id
+            )
+            stats["users"] += 1
+    finally:
+        db.close()
+    
+    logger.info(f"ホームタイムラインを再構築しました: {stats}")
+    return stats
@@ -1,6 +1,7 @@
 
 from app.core.config import settings
 from celery import Celery
+from celery.schedules import crontab
 
 # Celeryインスタンスの作成
 celery_app = Celery("political_feed")
@@ -11,6 +12,13 @@ celery_app.conf.result_backend = settings.REDIS_URL
 
 # タスクの自動検出
 celery_app.autodiscover_tasks(["app.tasks"])
+celery_app.conf.imports = (
+    "app.tasks.data_collection",
+    "app.tasks.party_topic_stats",
+    "app.tasks.reaction_buffer",
+    "app.tasks.statement_counters",
+    "app.tasks.timeline",
+)
 
 # タスクの実行時間制限
 celery_app.conf.task_time_limit = 30 * 60  # 30分
@@ -49,9 +57,25 @@ celery_app.conf.task_queues = {
 
 # 定期タスクの設定
 celery_app.conf.beat_schedule = {
-    "data-collection-every-hour": {
-        "task": "app.tasks.data_collection.collect.collect_data",
-        "schedule": 60 * 60,  # 1時間ごと
+    # 実行時刻に達したソースだけを収集する（ソースごとの実行時刻はscheduleで決まる）
+    "dispatch-data-collection": {
+        "task": "app.tasks.data_collection.collect_data",
+        "schedule": settings.DATA_COLLECTION_DISPATCH_SECONDS,
+        "options": {"queue": "low_priority"},
+    },
+    "flush-reaction-buffer": {
+        "task": "app.tasks.reaction_buffer.flush_reaction_buffer",
+        "schedule": settings.REACTION_BUFFER_FLUSH_SECONDS,
+        "options": {"queue": "high_priority"},
+    },
+    "reconcile-statement-counters-daily": {
+        "task": "app.tasks.statement_counters.reconcile_statement_counters",
+        "schedule": crontab(hour=4, minute=0),  # 毎日4時
+        "options": {"queue": "low_priority"},
+    },
+    "rebuild-party-topic-stats-hourly": {
+        "task": "app.tasks.party_topic_stats.rebuild_party_topic_stats",
+        "schedule": crontab(minute=30),  # 毎時30分
         "options": {"queue": "low_priority"},
     },
 }
\ No newline at end of file
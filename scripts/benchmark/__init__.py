@@ -0,0 +1,3 @@
+"""
+フィードAPIのベンチマーク（合成データの作成・負荷の実行・結果の比較）
+"""
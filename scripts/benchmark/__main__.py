@@ -0,0 +1,175 @@
+"""
+フィードAPIのベンチマーク
+
+使い方（リポジトリのルートで実行）:
+    # データの作成（DATABASE_URLのデータベースに作成する。空のデータベースを推奨）
+    python -m scripts.benchmark seed --politicians 200 --statements 20000 --users 1000
+
+    # 大規模なデータは複数プロセスで投入する（MySQLでは--method infileも使える）
+    python -m scripts.benchmark seed --statements 1000000 --users 100000 --shards 8
+
+    # 負荷の実行（--base-urlを省略するとプロセス内のアプリに送る）
+    python -m scripts.benchmark run --concurrency 20 --duration 30 --output results.json
+
+    # コミット間の比較（回帰があれば終了コード1）
+    python -m scripts.benchmark compare base.json head.json --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from scripts.benchmark.compare import compare_results, format_rows  # noqa: E402
+from scripts.benchmark.dataset import DatasetSpec, benchmark_users  # noqa: E402
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _users(args: argparse.Namespace) -> List[Tuple[str, str]]:
+    if args.user:
+        return [tuple(user.split(":", 1)) for user in args.user]
+    return benchmark_users(DatasetSpec(prefix=args.prefix), args.users)
+
+
+def seed(args: argparse.Namespace) -> None:
+    from app.core.config import settings
+    from scripts.benchmark.bulk_load import bulk_load
+
+    spec = DatasetSpec(
+        politicians=args.politicians,
+        statements=args.statements,
+        users=args.users,
+        follows_per_user=args.follows_per_user,
+        reactions_per_user=args.reactions_per_user,
+        comments_per_statement=args.comments_per_statement,
+        seed=args.seed,
+        prefix=args.prefix,
+    )
+    report = bulk_load(
+        str(settings.DATABASE_URL),
+        spec,
+        shards=args.shards,
+        method=args.method,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps({"spec": spec._asdict(), **report}, ensure_ascii=False))
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    from scripts.benchmark.driver import load_context, make_client, run_load
+
+    async with make_client(args.base_url) as client:
+        context = await load_context(client, _users(args))
+        result = await run_load(
+            client,
+            context,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            requests=args.requests,
+            warmup=args.warmup,
+            seed=args.seed,
+        )
+    result["meta"] = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "in-process",
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "requests": args.requests,
+        "python": platform.python_version(),
+    }
+    return result
+
+
+def run(args: argparse.Namespace) -> None:
+    result = asyncio.run(_run(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+def compare(args: argparse.Namespace) -> None:
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+    rows, regressions = compare_results(base, head, threshold=args.threshold)
+    print(format_rows(rows))
+    if regressions:
+        print(f"\n{len(regressions)}件の回帰があります")
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m scripts.benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("seed", help="合成データを作成する")
+    p.add_argument("--politicians", type=int, default=200)
+    p.add_argument("--statements", type=int, default=20000)
+    p.add_argument("--users", type=int, default=1000)
+    p.add_argument("--follows-per-user", type=float, default=8.0)
+    p.add_argument("--reactions-per-user", type=float, default=30.0)
+    p.add_argument("--comments-per-statement", type=float, default=1.5)
+    p.add_argument("--batch-size", type=int, default=1000, help="1文で挿入する行数")
+    p.add_argument("--shards", type=int, default=1, help="並行して投入するプロセス数")
+    p.add_argument(
+        "--method",
+        choices=["insert", "infile"],
+        default="insert",
+        help="infileはMySQLのLOAD DATA LOCAL INFILEを使う",
+    )
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--prefix", default="bench", help="ユーザー名の接頭辞")
+    p.set_defaults(func=seed)
+
+    p = subparsers.add_parser("run", help="負荷を実行して結果を出力する")
+    p.add_argument("--base-url", help="起動済みのサーバーのURL（省略時はプロセス内）")
+    p.add_argument("--concurrency", type=int, default=10)
+    p.add_argument("--duration", type=float, default=30.0, help="計測する秒数")
+    p.add_argument("--requests", type=int, help="計測するリクエスト数")
+    p.add_argument("--warmup", type=float, default=3.0, help="計測前に捨てる秒数")
+    p.add_argument("--users", type=int, default=20, help="ログインするユーザー数")
+    p.add_argument("--prefix", default="bench", help="seedで指定した接頭辞")
+    p.add_argument(
+        "--user", action="append", help="ログインするユーザー（email:password）"
+    )
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", help="結果のJSONを書き出すファイル")
+    p.set_defaults(func=run)
+
+    p = subparsers.add_parser("compare", help="2つの結果を比較する")
+    p.add_argument("base")
+    p.add_argument("head")
+    p.add_argument(
+        "--threshold", type=float, default=0.1, help="回帰とみなす悪化の割合"
+    )
+    p.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
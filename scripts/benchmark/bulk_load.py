@@ -0,0 +1,377 @@
+"""
+合成データの一括投入
+
+DatasetGeneratorが作成した行を、ORMのユニットオブワーク（オブジェクトの生成・autoflush・
+identity map）を通さずにテーブルへ直接流し込む。
+- batch_size行ずつ INSERT ... VALUES (...), (...) で挿入する。MySQLでは
+  LOAD DATA LOCAL INFILE も選べる（サーバーのlocal_infileを有効にする必要がある）
+- パスワードハッシュは親プロセスで1回だけ計算して全シャードに渡す
+- 投入中は外部キーの検査（MySQLでは一意制約の検査も）を無効にする。
+  シャードは他のシャードが挿入した政治家・ユーザー・発言を参照するため、必須である
+- シャードごとに別プロセス・別接続で並行して投入し、テーブルごとの行数/秒を出力する
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.models.comment import Comment
+from sqlalchemy import Table, bindparam, create_engine, insert, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from scripts.benchmark.dataset import (
+    BENCHMARK_PASSWORD,
+    TABLES,
+    DatasetGenerator,
+    DatasetSpec,
+    prepare_reference_data,
+)
+
+METHODS = ("insert", "infile")
+
+
+class LoadStats(NamedTuple):
+    """
+    1テーブル分の投入結果
+    """
+
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _batches(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    batch: List[Dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _create_engine(database_url: str, method: str) -> Engine:
+    """
+    投入用のエンジンを作成する（プロセスごとに1接続だけ使う）
+    """
+    connect_args: Dict[str, Any] = {}
+    if database_url.startswith("sqlite"):
+        # 複数のシャードが同じファイルに書き込むため、ロックの解放を待つ
+        connect_args["timeout"] = 60
+    elif method == "infile":
+        connect_args["local_infile"] = True
+    return create_engine(database_url, connect_args=connect_args)
+
+
+@contextmanager
+def relaxed_checks(conn: Connection) -> Iterator[None]:
+    """
+    投入中だけ外部キーなどの検査を無効にする
+    """
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
+        conn.execute(text("SET UNIQUE_CHECKS=0"))
+    elif dialect == "sqlite":
+        conn.execute(text("PRAGMA foreign_keys=OFF"))
+        conn.execute(text("PRAGMA synchronous=OFF"))
+    try:
+        yield
+    finally:
+        if dialect == "mysql":
+            conn.execute(text("SET UNIQUE_CHECKS=1"))
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
+        elif dialect == "sqlite":
+            conn.execute(text("PRAGMA synchronous=FULL"))
+
+
+def analyze_tables(conn: Connection) -> None:
+    """
+    投入したテーブルの統計情報を更新する
+
+    統計情報が無いままだと、件数の数え直しなどでオプティマイザが選択性の低い
+    インデックス（comments.statusなど）を選ぶことがある。
+    """
+    names = [model.__table__.name for _, model in TABLES]
+    if conn.dialect.name == "mysql":
+        quote = conn.dialect.identifier_preparer.quote
+        conn.execute(text(f"ANALYZE TABLE {', '.join(quote(n) for n in names)}"))
+    elif conn.dialect.name == "sqlite":
+        conn.execute(text("ANALYZE"))
+    conn.commit()
+
+
+def _insert_values(conn: Connection, table: Table, rows: List[Dict]) -> None:
+    """
+    複数行のVALUESを持つINSERT文で挿入する
+
+    insert(table).values(rows)は行数ごとに文をコンパイルし直すため、executemanyで渡して
+    SQLAlchemyに複数行のVALUESを組み立てさせる（コンパイル済みの文が再利用される）。
+    """
+    conn.execute(insert(table), rows)
+
+
+def _tsv_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _load_infile(conn: Connection, table: Table, rows: List[Dict]) -> None:
+    """
+    一時ファイルにTSVで書き出し、LOAD DATA LOCAL INFILEで読み込ませる
+
+    LOAD DATAではPython側の既定値が使われないため、行に無いカラムはここで埋める。
+    """
+    defaults = [
+        column
+        for column in table.columns
+        if column.default is not None and column.name not in rows[0]
+    ]
+    columns = list(rows[0]) + [column.name for column in defaults]
+    fd, path = tempfile.mkstemp(suffix=".tsv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            for row in rows:
+                values = [row[name] for name in rows[0]]
+                values += [
+                    c.default.arg(None) if c.default.is_callable else c.default.arg
+                    for c in defaults
+                ]
+                f.write("\t".join(_tsv_value(v) for v in values) + "\n")
+        quote = conn.dialect.identifier_preparer.quote
+        conn.execute(
+            text(
+                f"LOAD DATA LOCAL INFILE :path INTO TABLE {quote(table.name)} "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                "LINES TERMINATED BY '\\n' "
+                f"({', '.join(quote(name) for name in columns)})"
+            ),
+            {"path": path},
+        )
+    finally:
+        os.remove(path)
+
+
+def load_tables(
+    conn: Connection,
+    generator: DatasetGenerator,
+    *,
+    method: str = "insert",
+    batch_size: int = 1000,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, LoadStats]:
+    """
+    ジェネレーターの行をテーブルの順に挿入する（バッチごとにコミットする）
+
+    Args:
+        conn: 投入に使う接続
+        generator: 行を作成するジェネレーター
+        method: "insert"（複数行のINSERT）または"infile"（MySQLのLOAD DATA）
+        batch_size: 1回の文で挿入する行数
+        log: 進捗の出力先
+
+    Returns:
+        テーブルごとの投入結果
+    """
+    if method not in METHODS:
+        raise ValueError(f"不明な投入方法です: {method}")
+    if method == "infile" and conn.dialect.name != "mysql":
+        raise ValueError("LOAD DATA LOCAL INFILEはMySQLでのみ使用できます")
+    load = _load_infile if method == "infile" else _insert_values
+    prefix = f"[{generator.shard + 1}/{generator.shards}] "
+
+    stats: Dict[str, LoadStats] = {}
+    with relaxed_checks(conn):
+        conn.commit()
+        for name, model in TABLES:
+            started = time.perf_counter()
+            rows = 0
+            for batch in _batches(getattr(generator, name)(), batch_size):
+                load(conn, model.__table__, batch)
+                conn.commit()
+                rows += len(batch)
+            stats[name] = LoadStats(rows, time.perf_counter() - started)
+            if log:
+                log(
+                    f"{prefix}{name}: {rows}件 "
+                    f"({stats[name].rows_per_second:,.0f}行/秒)"
+                )
+
+        # 返信数は担当のコメントの中で完結するため、シャードごとに反映する
+        replies = [
+            {"comment_id": comment_id, "replies": n}
+            for comment_id, n in generator.reply_counts.items()
+        ]
+        table = Comment.__table__
+        for batch in _batches(iter(replies), batch_size):
+            conn.execute(
+                update(table)
+                .where(table.c.id == bindparam("comment_id"))
+                .values(replies_count=bindparam("replies")),
+                batch,
+            )
+        conn.commit()
+    return stats
+
+
+def _load_shard(
+    database_url: str,
+    spec: DatasetSpec,
+    shard: int,
+    shards: int,
+    party_ids: List[str],
+    topic_ids: List[str],
+    password_hash: str,
+    now: datetime,
+    method: str,
+    batch_size: int,
+    verbose: bool,
+) -> Dict[str, LoadStats]:
+    """
+    1シャード分を投入する（子プロセスで実行する）
+    """
+    generator = DatasetGenerator(
+        spec,
+        party_ids,
+        topic_ids,
+        shard=shard,
+        shards=shards,
+        password_hash=password_hash,
+        now=now,
+    )
+    engine = _create_engine(database_url, method)
+    try:
+        with engine.connect() as conn:
+            return load_tables(
+                conn,
+                generator,
+                method=method,
+                batch_size=batch_size,
+                log=print if verbose else None,
+            )
+    finally:
+        engine.dispose()
+
+
+def bulk_load(
+    database_url: str,
+    spec: DatasetSpec,
+    *,
+    shards: int = 1,
+    method: str = "insert",
+    batch_size: int = 1000,
+    log: Optional[Callable[[str], None]] = print,
+) -> Dict[str, Any]:
+    """
+    合成データを一括投入し、統計情報の更新後に発言の件数カラムと政党別集計を作り直す
+
+    Args:
+        database_url: 投入先のデータベースURL
+        spec: データの規模と分布
+        shards: 並行して投入するプロセス数
+        method: "insert"または"infile"（MySQLのみ）
+        batch_size: 1回の文で挿入する行数
+        log: 進捗と結果の出力先
+
+    Returns:
+        テーブルごとと全体の行数・秒数・行数/秒
+    """
+    if shards < 1:
+        raise ValueError("shardsは1以上を指定してください")
+    started = time.perf_counter()
+    engine = _create_engine(database_url, method)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with Session(engine, autoflush=False) as db:
+            party_ids, topic_ids = prepare_reference_data(db)
+            db.commit()
+    finally:
+        engine.dispose()
+
+    args = (
+        party_ids,
+        topic_ids,
+        get_password_hash(BENCHMARK_PASSWORD),
+        datetime.utcnow(),
+        method,
+        batch_size,
+        log is not None,
+    )
+    if shards == 1:
+        results = [_load_shard(database_url, spec, 0, 1, *args)]
+    else:
+        # 親の接続やスレッドを引き継がないようにspawnで起動する
+        with ProcessPoolExecutor(
+            max_workers=shards, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = [
+                pool.submit(_load_shard, database_url, spec, shard, shards, *args)
+                for shard in range(shards)
+            ]
+            results = [future.result() for future in futures]
+    loaded = time.perf_counter() - started
+
+    from app.services import party_topic_stats, statement
+
+    engine = _create_engine(database_url, method)
+    try:
+        with engine.connect() as conn:
+            analyze_tables(conn)
+        with Session(engine, autoflush=False) as db:
+            statement.reconcile_statement_counters(db)
+            party_topic_stats.rebuild_party_topic_stats(db)
+            db.commit()
+    finally:
+        engine.dispose()
+    elapsed = time.perf_counter() - started
+
+    tables = {}
+    for name, _ in TABLES:
+        # シャードは並行して動くため、テーブルの所要時間は最も遅いシャードの値とする
+        rows = sum(result[name].rows for result in results)
+        seconds = max(result[name].seconds for result in results)
+        tables[name] = {
+            "rows": rows,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else 0.0,
+        }
+    total = sum(table["rows"] for table in tables.values())
+    report = {
+        "shards": shards,
+        "method": method,
+        "tables": tables,
+        "rows": total,
+        "load_seconds": round(loaded, 3),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(total / loaded, 1) if loaded > 0 else 0.0,
+    }
+    if log:
+        log(
+            f"合計: {total}件 {loaded:.1f}秒 ({report['rows_per_second']:,.0f}行/秒)、"
+            f"集計の作り直しを含めて{elapsed:.1f}秒"
+        )
+    return report
@@ -0,0 +1,84 @@
+"""
+ベンチマーク結果（JSON）の比較
+
+基準の結果と新しい結果をシナリオごとに並べ、しきい値を超えて悪化した項目を回帰として返す。
+"""
+
+from typing import Any, Dict, List, Tuple
+
+# (項目のパス, 大きいほど良いかどうか)
+METRICS: Tuple[Tuple[Tuple[str, ...], bool], ...] = (
+    (("throughput_rps",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("queries_per_request", "mean"), False),
+    (("errors",), False),
+)
+
+
+def _get(summary: Dict[str, Any], path: Tuple[str, ...]):
+    value: Any = summary
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_results(
+    base: Dict[str, Any], head: Dict[str, Any], threshold: float = 0.1
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    2つの結果を比較する
+
+    Args:
+        base: 基準の結果
+        head: 新しい結果
+        threshold: 回帰とみなす悪化の割合（0.1 = 10%）
+
+    Returns:
+        (全ての比較行, 回帰した行)
+    """
+    rows = []
+    sections = {"overall": (base.get("overall", {}), head.get("overall", {}))}
+    for name, summary in head.get("scenarios", {}).items():
+        sections[name] = (base.get("scenarios", {}).get(name, {}), summary)
+
+    for section, (before, after) in sections.items():
+        for path, higher_is_better in METRICS:
+            old, new = _get(before, path), _get(after, path)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            worse = -change if higher_is_better else change
+            # エラーは1件でも増えれば回帰とする
+            regressed = new > old if path == ("errors",) else worse > threshold
+            rows.append(
+                {
+                    "section": section,
+                    "metric": ".".join(path),
+                    "base": old,
+                    "head": new,
+                    "change": change,
+                    "regressed": regressed,
+                }
+            )
+    return rows, [row for row in rows if row["regressed"]]
+
+
+def format_rows(rows: List[Dict[str, Any]]) -> str:
+    """
+    比較結果を表形式の文字列にする
+    """
+    lines = [f"{'section':<22} {'metric':<26} {'base':>10} {'head':>10} {'change':>9}"]
+    for row in rows:
+        change = (
+            "inf" if row["change"] == float("inf") else f"{row['change'] * 100:+.1f}%"
+        )
+        mark = "  <-- regression" if row["regressed"] else ""
+        lines.append(
+            f"{row['section']:<22} {row['metric']:<26} "
+            f"{row['base']:>10} {row['head']:>10} {change:>9}{mark}"
+        )
+    return "\n".join(lines)
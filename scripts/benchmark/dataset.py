@@ -0,0 +1,393 @@
+"""
+ベンチマーク用の合成データの作成
+
+政党・トピックはscripts/test_dataのデータを使い、政治家・発言・ユーザー・フォロー・
+リアクション・コメントを指定した規模で作成する。件数の偏りは実際のサービスに近づける。
+- 政治家の人気はZipf分布（一部の政治家にフォロー・リアクションが集中する）
+- 発言は人気のある政治家ほど多く、日付は最近に偏る
+- ユーザーごとのリアクション数・コメント数は対数正規分布（一部のヘビーユーザー）
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from app.core.security import get_password_hash
+from app.models.comment import Comment
+from app.models.follows import PoliticianFollow
+from app.models.party import Party
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementReaction, StatementTopic
+from app.models.topic import Topic
+from app.models.user import User
+from sqlalchemy.orm import Session
+
+from scripts.test_data.comments import generate_comment_content
+from scripts.test_data.parties import create_test_parties
+from scripts.test_data.statements import generate_statement_content
+from scripts.test_data.topics import create_test_topics
+
+# ベンチマーク用ユーザーの共通パスワード
+BENCHMARK_PASSWORD = "benchmark123"
+
+# リアクション種別の出現比率
+REACTION_WEIGHTS = {
+    "like": 0.60,
+    "dislike": 0.10,
+    "agree": 0.12,
+    "disagree": 0.08,
+    "important": 0.08,
+    "fake": 0.02,
+}
+
+FAMILY_NAMES = [
+    "佐藤",
+    "鈴木",
+    "高橋",
+    "田中",
+    "伊藤",
+    "渡辺",
+    "山本",
+    "中村",
+    "小林",
+    "加藤",
+]
+GIVEN_NAMES = [
+    "太郎",
+    "花子",
+    "一郎",
+    "美咲",
+    "健太",
+    "由美",
+    "大輔",
+    "直子",
+    "翔",
+    "愛",
+]
+
+
+class DatasetSpec(NamedTuple):
+    """
+    作成するデータの規模と分布
+
+    Args:
+        politicians: 政治家数
+        statements: 発言数
+        users: ユーザー数
+        follows_per_user: ユーザーあたりの平均フォロー数
+        reactions_per_user: ユーザーあたりの平均リアクション数
+        comments_per_statement: 発言あたりの平均コメント数
+        popularity_skew: 政治家の人気のZipf指数（大きいほど偏る）
+        days: 発言日時の範囲（日）
+        seed: 乱数のシード（同じ値なら同じデータになる）
+        prefix: ユーザー名・メールアドレスの接頭辞
+    """
+
+    politicians: int = 200
+    statements: int = 20000
+    users: int = 1000
+    follows_per_user: float = 8.0
+    reactions_per_user: float = 30.0
+    comments_per_statement: float = 1.5
+    popularity_skew: float = 1.1
+    days: int = 365
+    seed: int = 42
+    prefix: str = "bench"
+
+
+def benchmark_users(spec: DatasetSpec, count: int) -> List[Tuple[str, str]]:
+    """
+    ログインに使うベンチマーク用ユーザーの(メールアドレス, パスワード)を返す
+    """
+    return [
+        (f"{spec.prefix}{i}@example.com", BENCHMARK_PASSWORD)
+        for i in range(min(count, spec.users))
+    ]
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+# コメントの対象・投稿者を決める乱数系列（全シャードで共通）
+_COMMENTS_STREAM = 1
+
+
+class DatasetGenerator:
+    """
+    仕様に従って各テーブルの行（辞書）を順に作成する
+
+    行は参照先より先に作成されるため、テーブルの順に挿入すれば外部キーを満たす。
+
+    政治家・ユーザー・発言のIDと、人気・活発さ・発言の投稿者と日時はシードだけで決まり、
+    全シャードで同じになる。シャードは政治家・ユーザー・発言をインデックスの範囲で分担し、
+    フォロー・リアクションは担当のユーザー分、コメントは担当の発言に付く分だけを作成する。
+    そのため各シャードは他のシャードの結果を待たずに作成・挿入できる。
+    """
+
+    def __init__(
+        self,
+        spec: DatasetSpec,
+        party_ids: List[str],
+        topic_ids: List[str],
+        *,
+        shard: int = 0,
+        shards: int = 1,
+        password_hash: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ):
+        if not 0 <= shard < shards:
+            raise ValueError(f"シャード番号が範囲外です: {shard}/{shards}")
+        self.spec = spec
+        self.party_ids = party_ids
+        self.topic_ids = topic_ids
+        self.shard = shard
+        self.shards = shards
+        self.password_hash = password_hash
+        self.now = now or datetime.utcnow()
+        self.namespace = uuid.uuid5(
+            uuid.NAMESPACE_URL, f"benchmark:{spec.prefix}:{spec.seed}"
+        )
+        # シャード内だけで使う乱数（内容・フォロー・リアクション）
+        self.rng = np.random.default_rng([spec.seed, shards, shard])
+        random.seed(f"{spec.seed}:{shards}:{shard}")
+        # コメントIDごとの返信数（コメントの挿入後に反映する）
+        self.reply_counts: Dict[str, int] = {}
+
+        # ここから下は全シャードで同じ値になる
+        shared = np.random.default_rng(spec.seed)
+        names = random.Random(spec.seed)
+        self.politician_ids = [
+            self._stable_id("politician", i) for i in range(spec.politicians)
+        ]
+        self.politician_names = [
+            f"{names.choice(FAMILY_NAMES)}{names.choice(GIVEN_NAMES)}{i}"
+            for i in range(spec.politicians)
+        ]
+        self.user_ids = [self._stable_id("user", i) for i in range(spec.users)]
+
+        # 政治家の人気（Zipf）。順位と並び順が一致しないようにシャッフルする
+        ranks = np.arange(1, spec.politicians + 1, dtype=float)
+        popularity = 1.0 / ranks**spec.popularity_skew
+        shared.shuffle(popularity)
+        self.popularity = popularity / popularity.sum()
+
+        # ユーザーの活発さ（対数正規）
+        activity = shared.lognormal(mean=0.0, sigma=1.0, size=spec.users)
+        self.activity = activity / activity.sum()
+
+        # 人気のある政治家ほど発言が多い（人気ほどは偏らない）
+        weights = np.sqrt(self.popularity)
+        self.statement_politician = shared.choice(
+            spec.politicians, size=spec.statements, p=weights / weights.sum()
+        )
+        # 発言日時は最近に偏る（平均は期間の1/4）
+        self.statement_ages = np.minimum(
+            shared.exponential(spec.days / 4, size=spec.statements), spec.days
+        )
+        self.statement_importance = shared.integers(30, 96, size=spec.statements)
+
+    def _stable_id(self, kind: str, index: int) -> str:
+        """
+        シードと種類・インデックスから決まるID（シャードをまたいで参照できる）
+        """
+        return str(uuid.uuid5(self.namespace, f"{kind}:{index}"))
+
+    def _own(self, total: int) -> range:
+        """
+        このシャードが担当するインデックスの範囲
+        """
+        return range(
+            self.shard * total // self.shards, (self.shard + 1) * total // self.shards
+        )
+
+    def statement_id(self, index: int) -> str:
+        return self._stable_id("statement", index)
+
+    def statement_date(self, index: int) -> datetime:
+        return self.now - timedelta(days=float(self.statement_ages[index]))
+
+    def politicians(self) -> Iterator[Dict]:
+        for i in self._own(self.spec.politicians):
+            name = self.politician_names[i]
+            yield {
+                "id": self.politician_ids[i],
+                "name": name,
+                "current_party_id": (
+                    random.choice(self.party_ids) if self.party_ids else None
+                ),
+                "role": "議員",
+                "status": "active",
+                "profile_summary": f"{name}のプロフィール",
+            }
+
+    def users(self) -> Iterator[Dict]:
+        # ハッシュ計算は重いため全員で同じハッシュを使う
+        password_hash = self.password_hash or get_password_hash(BENCHMARK_PASSWORD)
+        for i in self._own(self.spec.users):
+            yield {
+                "id": self.user_ids[i],
+                "username": f"{self.spec.prefix}{i}",
+                "email": f"{self.spec.prefix}{i}@example.com",
+                "password_hash": password_hash,
+                "role": "user",
+                "status": "active",
+                "email_verified": True,
+            }
+
+    def statements(self) -> Iterator[Dict]:
+        for j in self._own(self.spec.statements):
+            author = int(self.statement_politician[j])
+            content = generate_statement_content(self.politician_names[author])
+            yield {
+                "id": self.statement_id(j),
+                "politician_id": self.politician_ids[author],
+                "title": content[:30],
+                "content": content,
+                "source": random.choice(["記者会見", "国会答弁", "党大会"]),
+                "statement_date": self.statement_date(j),
+                "status": "published",
+                "importance": int(self.statement_importance[j]),
+            }
+
+    def statement_topics(self) -> Iterator[Dict]:
+        if not self.topic_ids:
+            return
+        for j in self._own(self.spec.statements):
+            count = min(random.randint(1, 2), len(self.topic_ids))
+            for topic_id in random.sample(self.topic_ids, count):
+                yield {
+                    "statement_id": self.statement_id(j),
+                    "topic_id": topic_id,
+                    "relevance": random.randint(50, 90),
+                }
+
+    def follows(self) -> Iterator[Dict]:
+        spec = self.spec
+        own = self._own(spec.users)
+        counts = np.minimum(
+            1 + self.rng.poisson(max(spec.follows_per_user - 1, 0), size=len(own)),
+            spec.politicians,
+        )
+        for i, count in zip(own, counts):
+            chosen = self.rng.choice(
+                spec.politicians, size=int(count), replace=False, p=self.popularity
+            )
+            for politician in chosen:
+                yield {
+                    "politician_id": self.politician_ids[politician],
+                    "user_id": self.user_ids[i],
+                }
+
+    def _engagement_weights(self) -> np.ndarray:
+        """
+        発言ごとの反応されやすさ（政治家の人気×新しさ）
+        """
+        weights = self.popularity[self.statement_politician] * np.exp(
+            -self.statement_ages / 30
+        )
+        return weights / weights.sum()
+
+    def reactions(self) -> Iterator[Dict]:
+        spec = self.spec
+        if not spec.statements:
+            return
+        weights = self._engagement_weights()
+        types = list(REACTION_WEIGHTS)
+        type_p = np.array(list(REACTION_WEIGHTS.values()))
+        own = self._own(spec.users)
+        # 平均がreactions_per_userになる対数正規分布
+        sigma = 1.0
+        mu = np.log(max(spec.reactions_per_user, 1e-9)) - sigma**2 / 2
+        counts = np.maximum(self.rng.lognormal(mu, sigma, size=len(own)), 0)
+        counts = counts.astype(int)
+        # 対象は累積分布の二分探索でまとめて引く（ユーザーごとに全発言を走査しない）
+        total = int(counts.sum())
+        targets = np.searchsorted(
+            np.cumsum(weights), self.rng.random(total) * weights.sum()
+        )
+        targets = np.minimum(targets, spec.statements - 1)
+        kinds = self.rng.choice(len(types), size=total, p=type_p)
+        offset = 0
+        for i, count in zip(own, counts):
+            seen = set()
+            for target, kind in zip(
+                targets[offset : offset + count], kinds[offset : offset + count]
+            ):
+                key = (int(target), int(kind))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {
+                    "id": _new_id(),
+                    "statement_id": self.statement_id(int(target)),
+                    "user_id": self.user_ids[i],
+                    "reaction_type": types[kind],
+                }
+            offset += count
+
+    def comments(self) -> Iterator[Dict]:
+        spec = self.spec
+        if not spec.statements:
+            return
+        # 対象と投稿者は全シャードで同じ系列から引き、担当の発言に付く分だけ作成する
+        stream = np.random.default_rng([spec.seed, _COMMENTS_STREAM])
+        total = int(spec.statements * spec.comments_per_statement)
+        targets = stream.choice(
+            spec.statements, size=total, p=self._engagement_weights()
+        )
+        authors = stream.choice(spec.users, size=total, p=self.activity)
+        own = self._own(spec.statements)
+        mask = (targets >= own.start) & (targets < own.stop)
+        # 発言ごとの最初のコメントID（2件目以降の一部はその返信にする）
+        threads: Dict[int, str] = {}
+        for target, author in zip(targets[mask], authors[mask]):
+            target = int(target)
+            created_at = min(
+                self.statement_date(target) + timedelta(hours=random.randint(0, 72)),
+                self.now,
+            )
+            parent_id = threads.get(target)
+            row = {
+                "id": _new_id(),
+                "user_id": self.user_ids[author],
+                "statement_id": self.statement_id(target),
+                "parent_id": None,
+                "content": generate_comment_content(),
+                "status": "published",
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            if parent_id is None:
+                threads[target] = row["id"]
+            elif random.random() < 0.3:
+                row["parent_id"] = parent_id
+                self.reply_counts[parent_id] = self.reply_counts.get(parent_id, 0) + 1
+            yield row
+
+
+# 挿入するテーブルの順序（参照先が先）
+TABLES = (
+    ("politicians", Politician),
+    ("users", User),
+    ("statements", Statement),
+    ("statement_topics", StatementTopic),
+    ("follows", PoliticianFollow),
+    ("reactions", StatementReaction),
+    ("comments", Comment),
+)
+
+
+def prepare_reference_data(db: Session) -> Tuple[List[str], List[str]]:
+    """
+    政党・トピックが無ければscripts/test_dataのデータを作成し、IDを返す
+    """
+    if not db.query(Party.id).first():
+        create_test_parties(db)
+    if not db.query(Topic.id).first():
+        create_test_topics(db)
+    party_ids = [row[0] for row in db.query(Party.id).order_by(Party.id)]
+    topic_ids = [row[0] for row in db.query(Topic.id).order_by(Topic.id)]
+    return party_ids, topic_ids
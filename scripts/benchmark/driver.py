@@ -0,0 +1,286 @@
+"""
+フィードAPIの負荷ドライバー
+
+発言一覧・フォロー中の発言・横断検索・コメント一覧・いいねを重み付きで混ぜたリクエストを、
+指定した同時接続数で送り続ける。アプリはプロセス内（ASGI）でも、起動済みのuvicornでもよい。
+シナリオごとにスループット・レイテンシのパーセンタイル・リクエストあたりのクエリ数
+（Server-Timingのdb）を集計する。
+"""
+
+import asyncio
+import random
+import re
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+API_V1_STR = "/api/v1"
+
+# 横断検索で使う語（scripts/test_dataの発言テンプレートに含まれる語）
+SEARCH_TERMS = [
+    "経済",
+    "社会保障",
+    "教育改革",
+    "少子化対策",
+    "外交政策",
+    "記者会見",
+    "国民の生活",
+]
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class Context:
+    """
+    シナリオがリクエストを組み立てるのに使うデータ
+    """
+
+    def __init__(self, tokens: List[str], statement_ids: List[str]):
+        self.tokens = tokens
+        self.statement_ids = statement_ids
+
+
+class Scenario(NamedTuple):
+    """
+    リクエストの種類
+
+    Args:
+        name: シナリオ名（結果のキー）
+        weight: 選ばれる比率
+        method: HTTPメソッド
+        build: (Context, Random) -> (パス, クエリパラメータ)
+    """
+
+    name: str
+    weight: float
+    method: str
+    build: Callable[[Context, random.Random], Tuple[str, Dict[str, Any]]]
+
+
+DEFAULT_MIX: Sequence[Scenario] = (
+    Scenario(
+        "statements",
+        35,
+        "GET",
+        lambda ctx, rnd: (f"{API_V1_STR}/statements/", {"limit": 20}),
+    ),
+    Scenario(
+        "statements_following",
+        20,
+        "GET",
+        lambda ctx, rnd: (f"{API_V1_STR}/statements/following", {"limit": 20}),
+    ),
+    Scenario(
+        "search_all",
+        15,
+        "GET",
+        lambda ctx, rnd: (f"{API_V1_STR}/search/all", {"q": rnd.choice(SEARCH_TERMS)}),
+    ),
+    Scenario(
+        "comments",
+        20,
+        "GET",
+        lambda ctx, rnd: (
+            f"{API_V1_STR}/comments/statements/{rnd.choice(ctx.statement_ids)}",
+            {},
+        ),
+    ),
+    Scenario(
+        "like",
+        10,
+        "POST",
+        lambda ctx, rnd: (
+            f"{API_V1_STR}/statements/{rnd.choice(ctx.statement_ids)}/like",
+            {},
+        ),
+    ),
+)
+
+
+class Sample(NamedTuple):
+    """
+    1リクエストの計測値
+    """
+
+    scenario: str
+    status: int
+    seconds: float
+    queries: Optional[int]
+
+
+def _summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    """
+    計測値をスループット・パーセンタイルに集計する
+    """
+    if not samples:
+        return {"requests": 0, "errors": 0, "throughput_rps": 0.0}
+    ms = np.array([s.seconds for s in samples]) * 1000
+    queries = np.array([s.queries for s in samples if s.queries is not None])
+    summary = {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.status >= 400),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(float(ms.mean()), 2),
+            "p50": round(float(np.percentile(ms, 50)), 2),
+            "p90": round(float(np.percentile(ms, 90)), 2),
+            "p95": round(float(np.percentile(ms, 95)), 2),
+            "p99": round(float(np.percentile(ms, 99)), 2),
+            "max": round(float(ms.max()), 2),
+        },
+    }
+    if queries.size:
+        summary["queries_per_request"] = {
+            "mean": round(float(queries.mean()), 2),
+            "p95": round(float(np.percentile(queries, 95)), 2),
+            "max": int(queries.max()),
+        }
+    return summary
+
+
+async def login(
+    client: httpx.AsyncClient, users: Sequence[Tuple[str, str]]
+) -> List[str]:
+    """
+    ユーザーごとにログインしてアクセストークンを取得する
+    """
+    tokens = []
+    for email, password in users:
+        response = await client.post(
+            f"{API_V1_STR}/auth/login", data={"username": email, "password": password}
+        )
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    if not tokens:
+        raise ValueError("ログインできるユーザーがありません")
+    return tokens
+
+
+async def load_context(
+    client: httpx.AsyncClient, users: Sequence[Tuple[str, str]]
+) -> Context:
+    """
+    トークンと、コメント一覧・いいねの対象にする発言IDを取得する
+    """
+    tokens = await login(client, users)
+    response = await client.get(
+        f"{API_V1_STR}/statements/",
+        params={"limit": 100, "count_mode": "none"},
+        headers={"Authorization": f"Bearer {tokens[0]}"},
+    )
+    response.raise_for_status()
+    statement_ids = [s["id"] for s in response.json()["statements"]]
+    if not statement_ids:
+        raise ValueError("発言がありません。先にseedでデータを作成してください")
+    return Context(tokens, statement_ids)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    context: Context,
+    *,
+    mix: Sequence[Scenario] = DEFAULT_MIX,
+    concurrency: int = 10,
+    duration: Optional[float] = 30.0,
+    requests: Optional[int] = None,
+    warmup: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    重み付きのシナリオを同時接続数だけ並行して送り、結果を集計する
+
+    Args:
+        client: 送信に使うHTTPクライアント
+        context: トークンと発言ID
+        mix: シナリオと比率
+        concurrency: 同時接続数
+        duration: 計測する秒数（requestsと両方指定した場合は先に達した方で終了）
+        requests: 計測するリクエスト数
+        warmup: 計測前に捨てる秒数
+        seed: シナリオ選択の乱数シード
+
+    Returns:
+        全体とシナリオごとの集計
+    """
+    if duration is None and requests is None:
+        raise ValueError("durationかrequestsのどちらかを指定してください")
+    rnd = random.Random(seed)
+    weights = [s.weight for s in mix]
+    samples: List[Sample] = []
+    measuring = warmup <= 0
+    started = time.perf_counter()
+    measure_started = started
+    issued = 0
+
+    def should_stop() -> bool:
+        if not measuring:
+            return False
+        if requests is not None and issued >= requests:
+            return True
+        return (
+            duration is not None and time.perf_counter() - measure_started >= duration
+        )
+
+    async def worker(index: int) -> None:
+        nonlocal issued, measuring, measure_started
+        token = context.tokens[index % len(context.tokens)]
+        headers = {"Authorization": f"Bearer {token}"}
+        while not should_stop():
+            if not measuring and time.perf_counter() - started >= warmup:
+                measuring = True
+                measure_started = time.perf_counter()
+            scenario = rnd.choices(mix, weights=weights)[0]
+            path, params = scenario.build(context, rnd)
+            if measuring:
+                issued += 1
+            request_started = time.perf_counter()
+            response = await client.request(
+                scenario.method, path, params=params, headers=headers
+            )
+            seconds = time.perf_counter() - request_started
+            if not measuring:
+                continue
+            matched = _SERVER_TIMING_DB.search(
+                response.headers.get("server-timing", "")
+            )
+            samples.append(
+                Sample(
+                    scenario.name,
+                    response.status_code,
+                    seconds,
+                    int(matched.group(1)) if matched else None,
+                )
+            )
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - measure_started
+
+    return {
+        "overall": _summarize(samples, elapsed),
+        "scenarios": {
+            scenario.name: _summarize(
+                [s for s in samples if s.scenario == scenario.name], elapsed
+            )
+            for scenario in mix
+        },
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+
+def make_client(
+    base_url: Optional[str] = None, timeout: float = 30.0
+) -> httpx.AsyncClient:
+    """
+    起動済みのサーバー（base_url）か、プロセス内のアプリに送るクライアントを作成する
+    """
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout)
+    from app.main import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark",
+        timeout=timeout,
+    )
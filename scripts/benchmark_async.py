@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+発言一覧・検索・フィードの同期版（def + Session）と非同期版（async def + AsyncSession）を比較するベンチマーク
+
+同じデータベースに対して、エンドポイントと同時接続数ごとに両方の版へリクエストを送り、
+スループット（req/s）とレイテンシ（p50 / p95）を表示する。
+フィードは--user-id（省略時は政治家をフォローしているユーザー）のフィードを取得する。
+
+使い方:
+    DATABASE_URL=mysql+pymysql://... python scripts/benchmark_async.py --requests 500
+    DATABASE_URL=mysql+pymysql://... python scripts/benchmark_async.py \
+        --endpoints search feed --query 予算 --user-id <ユーザーID>
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import services
+from app.db.async_session import AsyncSessionLocal
+from app.db.session import SessionLocal
+from app.models.follows import PoliticianFollow
+
+# 計測するエンドポイント（/sync/<名前>と/async/<名前>）
+ENDPOINTS = ("statements", "search", "feed")
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def build_app(query: str, user_id: Optional[str]) -> FastAPI:
+    """
+    比較用のエンドポイントだけを持つアプリケーションを作成する
+    """
+    app = FastAPI()
+
+    @app.get("/sync/statements")
+    def sync_statements(limit: int = 20, db=Depends(get_db)):
+        return services.statement.list_statements(db, limit=limit, count_mode="none")
+
+    @app.get("/async/statements")
+    async def async_statements(limit: int = 20, db=Depends(get_async_db)):
+        return await services.aio.list_statements(db, limit=limit, count_mode="none")
+
+    @app.get("/sync/search")
+    def sync_search(limit: int = 20, db=Depends(get_db)):
+        return services.search.search_statements(db, query=query, limit=limit)
+
+    @app.get("/async/search")
+    async def async_search(limit: int = 20, db=Depends(get_async_db)):
+        return await services.aio.search_statements(db, query=query, limit=limit)
+
+    @app.get("/sync/feed")
+    def sync_feed(limit: int = 20, db=Depends(get_db)):
+        return services.activity.get_personalized_feed(db, user_id=user_id, limit=limit)
+
+    @app.get("/async/feed")
+    async def async_feed(limit: int = 20, db=Depends(get_async_db)):
+        return await services.aio.get_personalized_feed(db, user_id=user_id, limit=limit)
+
+    return app
+
+
+def find_feed_user() -> Optional[str]:
+    """
+    政治家をフォローしているユーザーを1人選ぶ（フィードの計測に使う）
+    """
+    with SessionLocal() as db:
+        return db.query(PoliticianFollow.user_id).limit(1).scalar()
+
+
+async def run(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> Dict:
+    """
+    指定した同時接続数でリクエストを送り、計測結果を返す
+    """
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000
+    return {
+        "rps": total / elapsed,
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    endpoints = list(args.endpoints)
+    user_id = args.user_id
+    if "feed" in endpoints and user_id is None:
+        user_id = find_feed_user()
+        if user_id is None:
+            print("政治家をフォローしているユーザーがいないため、フィードは計測しません")
+            endpoints.remove("feed")
+
+    transport = httpx.ASGITransport(app=build_app(args.query, user_id))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 接続の確立やクエリのコンパイル、検索索引の構築を計測から外すためのウォームアップ
+        for endpoint in endpoints:
+            for mode in ("sync", "async"):
+                await run(client, f"/{mode}/{endpoint}", 10, 1)
+
+        print(
+            f"{'endpoint':<11} {'mode':<6} {'conc':>5} {'req/s':>9} "
+            f"{'p50(ms)':>9} {'p95(ms)':>9}"
+        )
+        for endpoint in endpoints:
+            for concurrency in args.concurrency:
+                for mode in ("sync", "async"):
+                    result = await run(
+                        client, f"/{mode}/{endpoint}", args.requests, concurrency
+                    )
+                    print(
+                        f"{endpoint:<11} {mode:<6} {concurrency:>5} {result['rps']:>9.1f} "
+                        f"{result['p50']:>9.1f} {result['p95']:>9.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="同時接続数ごとのリクエスト数")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 10, 50, 100], help="同時接続数"
+    )
+    parser.add_argument(
+        "--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS),
+        help="計測するエンドポイント"
+    )
+    parser.add_argument("--query", default="予算", help="検索で使うキーワード")
+    parser.add_argument(
+        "--user-id", default=None, help="フィードを取得するユーザーID（省略時は自動で選ぶ）"
+    )
+    asyncio.run(main(parser.parse_args()))
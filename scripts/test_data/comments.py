@@ -10,6 +10,19 @@ from app.models.user import User
 from sqlalchemy.orm import Session
 
 
+def generate_comment_content() -> str:
+    """
+    コメント内容をテンプレートからランダムに作成
+    """
+    templates = [
+        f"この発言には{random.choice(['賛成です', '反対です'])}。{random.choice(['もっと具体的な政策を示してほしい', '国民の声を聞いてほしい'])}と思います。",
+        f"{random.choice(['興味深い発言です', '重要な指摘だと思います'])}。{random.choice(['今後の展開に期待します', '具体的な行動が伴うことを願います'])}。",
+        f"{random.choice(['この点については', 'この発言に関しては'])}、{random.choice(['もっと議論が必要だと思います', '賛同します', '疑問が残ります'])}。",
+        f"{random.choice(['なるほど', '確かに'])}、{random.choice(['その通りだと思います', '一理あると思います'])}。{random.choice(['ただ', 'しかし'])}、{random.choice(['課題も多いのでは', '実現は難しいのでは'])}？",
+    ]
+    return random.choice(templates)
+
+
 def create_test_comments(db: Session, statements=None):
     """
     テスト用のコメントデータを作成
@@ -37,15 +50,8 @@ def create_test_comments(db: Session, statements=None):
             # コメント投稿者をランダムに選択
             user = random.choice(users)
             
-            # コメント内容のテンプレート
-            templates = [
-                f"この発言には{random.choice(['賛成です', '反対です'])}。{random.choice(['もっと具体的な政策を示してほしい', '国民の声を聞いてほしい'])}と思います。",
-                f"{random.choice(['興味深い発言です', '重要な指摘だと思います'])}。{random.choice(['今後の展開に期待します', '具体的な行動が伴うことを願います'])}。",
-                f"{random.choice(['この点については', 'この発言に関しては'])}、{random.choice(['もっと議論が必要だと思います', '賛同します', '疑問が残ります'])}。",
-                f"{random.choice(['なるほど', '確かに'])}、{random.choice(['その通りだと思います', '一理あると思います'])}。{random.choice(['ただ', 'しかし'])}、{random.choice(['課題も多いのでは', '実現は難しいのでは'])}？",
-            ]
-            
-            comment_content = random.choice(templates)
+            # コメント内容
+            comment_content = generate_comment_content()
             
             # コメント投稿日時をランダムに設定（発言日時以降）
             days_after = random.randint(0, 10)
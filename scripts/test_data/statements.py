@@ -10,6 +10,18 @@ from app.models.topic import Topic
 from sqlalchemy.orm import Session
 
 
+def generate_statement_content(politician_name: str) -> str:
+    """
+    発言内容をテンプレートからランダムに作成
+    """
+    templates = [
+        f"{politician_name}は、「{random.choice(['経済成長', '社会保障', '教育改革'])}について、{random.choice(['積極的に取り組む', '慎重に検討する'])}必要がある」と述べた。",
+        f"{politician_name}は記者会見で、「{random.choice(['国民の生活', '日本の安全'])}を{random.choice(['守るため', '実現するため'])}に、{random.choice(['新たな政策', '具体的な施策'])}を{random.choice(['検討している', '提案する'])}」と発言した。",
+        f"{politician_name}は{random.choice(['党大会', '記者会見', '国会質疑'])}で、「{random.choice(['少子化対策', '経済対策', '外交政策'])}は{random.choice(['最重要課題', '優先課題'])}である」と強調した。",
+    ]
+    return random.choice(templates)
+
+
 def create_test_statements(db: Session, politicians=None, topics=None):
     """
     テスト用の発言データを作成
@@ -39,14 +51,8 @@ def create_test_statements(db: Session, politicians=None, topics=None):
             days_ago = random.randint(1, 365)
             statement_date = datetime.now() - timedelta(days=days_ago)
             
-            # 発言内容のテンプレート
-            templates = [
-                f"{politician.name}は、「{random.choice(['経済成長', '社会保障', '教育改革'])}について、{random.choice(['積極的に取り組む', '慎重に検討する'])}必要がある」と述べた。",
-                f"{politician.name}は記者会見で、「{random.choice(['国民の生活', '日本の安全'])}を{random.choice(['守るため', '実現するため'])}に、{random.choice(['新たな政策', '具体的な施策'])}を{random.choice(['検討している', '提案する'])}」と発言した。",
-                f"{politician.name}は{random.choice(['党大会', '記者会見', '国会質疑'])}で、「{random.choice(['少子化対策', '経済対策', '外交政策'])}は{random.choice(['最重要課題', '優先課題'])}である」と強調した。",
-            ]
-            
-            statement_content = random.choice(templates)
+            # 発言内容
+            statement_content = generate_statement_content(politician.name)
             
             # 発言のタイトル
             title = statement_content[:30] + "..." if len(statement_content) > 30 else statement_content
@@ -1,3 +1,8 @@
 """
 テストパッケージ
-"""
\ No newline at end of file
+"""
+import os
+
+# テストではRedisを使わず、トークンの失効情報はプロセス内に持つ（DBのトークンバージョンで確認する）
+# conftestがアプリの設定を読み込む前に指定する
+os.environ.setdefault("AUTH_REVOCATION_BACKEND", "memory")
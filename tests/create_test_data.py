@@ -110,13 +110,31 @@ def create_test_users(db):
         profile_image="https://randomuser.me/api/portraits/men/12.jpg",
     )
     
+    # APIテストでログインに使うユーザー（パスワードはpassword123）
+    api_users = [
+        User(
+            username=username,
+            email=email,
+            password_hash=get_password_hash("password123"),
+            role="user",
+            status=status,
+            email_verified=True,
+        )
+        for username, email, status in [
+            ("testuser", "test@example.com", "active"),
+            ("testuser2", "test2@example.com", "active"),
+            ("inactiveuser", "inactive@example.com", "inactive"),
+            ("currentuser", "current@example.com", "active"),
+        ]
+    ]
+    
     db.add(admin_user)
     db.add(moderator)
-    for user in users:
+    for user in users + api_users:
         db.add(user)
     
     db.commit()
-    print(f"ユーザーデータを作成しました: {len(users) + 2}件")
+    print(f"ユーザーデータを作成しました: {len(users) + len(api_users) + 2}件")
 
 
 def create_test_parties(db):
@@ -5,12 +5,12 @@ import os
 import sys
 from typing import Any, List, Union
 
+from app.core.config import Settings
 from pydantic import AnyHttpUrl, Field, field_validator
-from pydantic_settings import BaseSettings
 
 
-class TestSettings(BaseSettings):
-    """テスト用の設定クラス"""
+class TestSettings(Settings):
+    """テスト用の設定クラス（アプリの設定を継承し、テスト用の値だけを上書きする）"""
     # プロジェクト情報
     PROJECT_NAME: str = "政治家フィードAPI (テスト環境)"
     PROJECT_DESCRIPTION: str = "政治家の発言をキュレーションし、有権者に分かりやすい形で提供するAPIサービス"
@@ -0,0 +1,287 @@
+"""
+非同期エンドポイント（AsyncSession）のテスト
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db.async_session import async_database_url
+from app.db.session import get_pool_stats
+from app.models.follows import PoliticianFollow
+from app.models.politician import Politician
+from app.models.statement import Statement
+from app.models.user import User
+from app.search import LikeSearchBackend, MemorySearchBackend, set_search_backend
+from app.services import ranking, reaction_buffer, search
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+
+@pytest.fixture
+def reader(client: TestClient, db: Session):
+    """
+    ログイン済みのユーザーと、検索できる発言を作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"async_{suffix}@example.com",
+        username=f"async_{suffix}",
+        password_hash=get_password_hash("password123"),
+        role="user",
+        status="active",
+        email_verified=True,
+    )
+    politician = Politician(name=f"非同期太郎_{suffix}", status="active")
+    db.add_all([user, politician])
+    db.commit()
+    statements = [
+        Statement(
+            politician_id=politician.id,
+            title=f"非同期{suffix}の発言{i}",
+            content=f"asyncmarker{suffix} の内容",
+            statement_date=datetime(2024, 6, 1 + i),
+            status="published",
+        )
+        for i in range(3)
+    ]
+    db.add_all(statements)
+    db.commit()
+
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": user.email, "password": "password123"},
+    )
+    assert response.status_code == 200
+    return {
+        "user": user,
+        "politician": politician,
+        "statements": statements,
+        "suffix": suffix,
+        "headers": {"Authorization": f"Bearer {response.json()['access_token']}"},
+    }
+
+
+def test_async_database_url():
+    """
+    同期ドライバのURLが非同期ドライバのURLに変換されること
+    """
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert (
+        async_database_url("mysql+pymysql://u:p@db:3306/feed")
+        == "mysql+aiomysql://u:p@db:3306/feed"
+    )
+
+
+def test_list_statements_pages_with_cursor(client: TestClient, reader):
+    """
+    発言一覧が非同期セッションで取得でき、カーソルで次のページに進めること
+    """
+    url = f"{settings.API_V1_STR}/statements/"
+    first = client.get(url, params={"limit": 2}, headers=reader["headers"])
+    assert first.status_code == 200
+    data = first.json()
+    assert len(data["statements"]) == 2
+    assert data["has_more"] is True
+    assert data["total"] >= 3
+
+    second = client.get(
+        url,
+        params={"limit": 2, "cursor": data["next_cursor"], "count_mode": "none"},
+        headers=reader["headers"],
+    )
+    assert second.status_code == 200
+    assert second.json()["total"] is None
+    first_ids = {s["id"] for s in data["statements"]}
+    assert first_ids.isdisjoint(s["id"] for s in second.json()["statements"])
+
+
+def test_search_and_feed_use_async_session(client: TestClient, reader):
+    """
+    検索とフィードが非同期セッションで取得できること
+    """
+    set_search_backend(LikeSearchBackend())
+    try:
+        response = client.get(
+            f"{settings.API_V1_STR}/search/statements",
+            params={"q": f"asyncmarker{reader['suffix']}"},
+            headers=reader["headers"],
+        )
+    finally:
+        set_search_backend(None)
+    assert response.status_code == 200
+    assert response.json()["total"] == 3
+
+    response = client.get(f"{settings.API_V1_STR}/users/me/feed", headers=reader["headers"])
+    assert response.status_code == 200
+    assert "statements" in response.json()
+
+
+def test_legacy_token_is_resolved_through_async_session(client: TestClient, reader):
+    """
+    クレームを含まないトークンでも非同期エンドポイントで認証できること
+    """
+    token = create_access_token(subject=reader["user"].id)
+    response = client.get(
+        f"{settings.API_V1_STR}/statements/",
+        params={"limit": 1},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/statements/",
+        headers={"Authorization": "Bearer invalid"},
+    )
+    assert response.status_code == 401
+
+
+def test_search_and_feed_offload_only_cpu_stages(
+    client: TestClient, db: Session, reader, monkeypatch
+):
+    """
+    検索とフィードのクエリは非同期セッションで実行し、索引の検索とスコアリング、
+    保留中のリアクションの重ね合わせだけをスレッドプールで実行すること
+    """
+    calls = {}
+
+    def record(name, func):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop = True
+            except RuntimeError:
+                on_loop = False
+            session = args[0]
+            if isinstance(session, Session):
+                assert session.info["read_only"] is True
+                calls[name] = (on_loop, session.get_bind().dialect.is_async)
+            else:
+                calls[name] = (on_loop, None)
+            return func(*args, **kwargs)
+        return wrapper
+
+    backend = MemorySearchBackend(refresh_seconds=0)
+    monkeypatch.setattr(backend, "prepare", record("prepare", backend.prepare))
+    monkeypatch.setattr(search, "search_statements", record("search", search.search_statements))
+    for name in ("fetch_feed_input", "select_feed_ids", "load_feed_page"):
+        monkeypatch.setattr(ranking, name, record(name, getattr(ranking, name)))
+    monkeypatch.setattr(
+        reaction_buffer, "overlay_pending_reactions",
+        record("overlay", reaction_buffer.overlay_pending_reactions),
+    )
+    db.add(PoliticianFollow(politician_id=reader["politician"].id, user_id=reader["user"].id))
+    db.commit()
+    buffer = reaction_buffer.InMemoryReactionBuffer()
+    reaction_buffer.set_reaction_buffer(buffer)
+    set_search_backend(backend)
+    try:
+        response = client.get(
+            f"{settings.API_V1_STR}/search/statements",
+            params={"q": f"asyncmarker{reader['suffix']}"},
+            headers=reader["headers"],
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == 3
+
+        liked_id = reader["statements"][0].id
+        assert reaction_buffer.buffer_reaction(
+            db, statement_id=liked_id, user_id=reader["user"].id
+        )
+        response = client.get(f"{settings.API_V1_STR}/users/me/feed", headers=reader["headers"])
+    finally:
+        set_search_backend(None)
+        reaction_buffer.set_reaction_buffer(None)
+    assert response.status_code == 200
+    feed = {s["id"]: s for s in response.json()["statements"]}
+    assert len(feed) == 3
+    assert feed[liked_id]["is_liked"] is True
+
+    # CPUを使う処理（索引の検索・スコアリング・Redisへのアクセス）はイベントループの外
+    assert calls["prepare"] == (False, False)
+    assert calls["select_feed_ids"] == (False, None)
+    assert calls["overlay"] == (False, None)
+    # クエリはイベントループ上から非同期ドライバで実行する
+    for name in ("search", "fetch_feed_input", "load_feed_page"):
+        assert calls[name] == (True, True)
+
+
+def test_search_all_runs_on_async_sessions(client: TestClient, reader):
+    """
+    全エンティティの検索が非同期エンドポイントで実行され、検索対象を指定できること
+    """
+    set_search_backend(MemorySearchBackend(refresh_seconds=0))
+    try:
+        response = client.get(
+            f"{settings.API_V1_STR}/search/all",
+            params={"q": f"asyncmarker{reader['suffix']}", "types": "statements,topics"},
+            headers=reader["headers"],
+        )
+        invalid = client.get(
+            f"{settings.API_V1_STR}/search/all",
+            params={"q": "x", "types": "users"},
+            headers=reader["headers"],
+        )
+    finally:
+        set_search_backend(None)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["types"] == ["statements", "topics"]
+    assert data["total_statements"] == 3
+    assert data["total_politicians"] is None
+    assert data["timed_out"] == []
+    assert invalid.status_code == 400
+
+
+def test_search_query_interrupted_on_async_session():
+    """
+    非同期ドライバ（aiosqlite）の接続でも期限を過ぎたクエリが中断されること
+    """
+    def slow_query(db, **kwargs):
+        db.execute(text(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+            "WHERE x < 1000000000) SELECT count(*) FROM c"
+        )).scalar()
+        return {"total": 0}
+
+    engine = create_async_engine(
+        async_database_url(str(settings.DATABASE_URL)), poolclass=NullPool
+    )
+
+    async def run():
+        try:
+            async with AsyncSession(engine) as session:
+                await session.run_sync(
+                    search.run_with_deadline, slow_query, time.monotonic() + 0.1
+                )
+        finally:
+            await engine.dispose()
+
+    started = time.monotonic()
+    with pytest.raises(OperationalError) as exc_info:
+        asyncio.run(run())
+    assert search.is_interrupted(exc_info.value)
+    assert time.monotonic() - started < 2
+
+
+def test_async_pool_is_reported(client: TestClient, reader):
+    """
+    非同期エンジンのプールの計測値が/health/dbに含まれること
+    """
+    before = get_pool_stats()["async_primary"]["checkouts"]
+    response = client.get(
+        f"{settings.API_V1_STR}/statements/", params={"limit": 1}, headers=reader["headers"]
+    )
+    assert response.status_code == 200
+    assert get_pool_stats()["async_primary"]["checkouts"] > before
+
+    response = client.get(f"{settings.API_V1_STR}/health/db")
+    assert response.status_code == 200
+    assert "async_primary" in response.json()
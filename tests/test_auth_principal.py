@@ -0,0 +1,170 @@
+"""
+ステートレス認証（トークンのクレームから組み立てる利用者）のテスト
+"""
+import uuid
+
+import pytest
+from app import services
+from app.core import auth
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.models.user import User
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from tests.db_session import engine
+
+LOGOUT_URL = f"{settings.API_V1_STR}/auth/logout"
+
+
+@pytest.fixture
+def user(db: Session):
+    """
+    ログイン可能なユーザーを作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"principal_{suffix}@example.com",
+        username=f"principal_{suffix}",
+        password_hash=get_password_hash("password123"),
+        role="user",
+        status="active",
+        email_verified=True,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    yield user
+    auth.clear_revocations()
+
+
+def _login(client: TestClient, email: str, password: str = "password123") -> str:
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": email, "password": password},
+    )
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def _user_queries(func):
+    """
+    関数の実行中に発行されたusersテーブルへのクエリを返す
+    """
+    queries = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", collect)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", collect)
+    return queries, result
+
+
+def test_access_token_is_verified_without_user_query(client: TestClient, user):
+    """
+    クレームを含むトークンではユーザーをDBから読み込まないこと
+    （失効情報をプロセス内にしか持たない場合はトークンバージョンのみを確認する）
+    """
+    token = _login(client, user.email)
+    claims = jwt.get_unverified_claims(token)
+    assert (claims["role"], claims["status"], claims["ver"]) == ("user", "active", 0)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    queries, response = _user_queries(lambda: client.post(LOGOUT_URL, headers=headers))
+    assert response.status_code == 200
+    assert len(queries) == 1
+    assert queries[0].startswith("SELECT users.token_version AS users_token_version \nFROM")
+
+    queries, response = _user_queries(lambda: client.post(LOGOUT_URL, headers=headers))
+    assert response.status_code == 200
+    assert queries == []
+
+
+def test_legacy_token_falls_back_to_database(client: TestClient, user):
+    """
+    クレームを含まない古いトークンはDBのユーザーで検証すること
+    """
+    token = create_access_token(subject=user.id)
+    queries, response = _user_queries(
+        lambda: client.post(LOGOUT_URL, headers={"Authorization": f"Bearer {token}"})
+    )
+    assert response.status_code == 200
+    assert len(queries) == 1
+
+
+@pytest.mark.parametrize("change", [
+    {"password": "new-password456"},
+    {"status": "suspended"},
+    {"role": "admin"},
+])
+def test_changes_revoke_issued_tokens(client: TestClient, db: Session, user, change):
+    """
+    パスワード・状態・ロールの変更で発行済みのトークンが使えなくなること
+    """
+    token = _login(client, user.email)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.post(LOGOUT_URL, headers=headers).status_code == 200
+
+    services.user.update_user(db, db_obj=user, obj_in=change)
+    assert user.token_version == 1
+
+    response = client.post(LOGOUT_URL, headers=headers)
+    assert response.status_code == 401
+
+    if "password" in change:
+        token = _login(client, user.email, change["password"])
+        response = client.post(LOGOUT_URL, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+
+
+def test_unrelated_update_keeps_tokens(client: TestClient, db: Session, user):
+    """
+    トークンに含まれない項目の変更ではトークンを失効させないこと
+    """
+    token = _login(client, user.email)
+    services.user.update_user(db, db_obj=user, obj_in={"profile_image": "https://example.com/a.png"})
+    assert user.token_version == 0
+    response = client.post(LOGOUT_URL, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+
+def test_revocation_from_other_process_is_checked_in_database(
+    client: TestClient, db: Session, user
+):
+    """
+    失効情報をプロセス内にしか持たない場合でも、他のプロセスでの失効や
+    再起動前の失効がDBのトークンバージョンで確認されること
+    """
+    token = _login(client, user.email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 他のプロセスでトークンバージョンが上がった（自プロセスのキャッシュには無い）
+    db.query(User).filter(User.id == user.id).update({"token_version": 1})
+    db.commit()
+    auth.clear_revocations()
+
+    queries, response = _user_queries(lambda: client.post(LOGOUT_URL, headers=headers))
+    assert response.status_code == 401
+    assert len(queries) == 1 and "token_version" in queries[0]
+
+    # 確認した結果は短時間保持され、続くリクエストではDBを参照しない
+    queries, response = _user_queries(lambda: client.post(LOGOUT_URL, headers=headers))
+    assert response.status_code == 401
+    assert queries == []
+
+
+@pytest.mark.parametrize("mode, expected", [("stateless", "redis"), ("database", "memory")])
+def test_auto_revocation_backend_follows_auth_mode(monkeypatch, mode, expected):
+    """
+    autoの場合、ステートレス認証では失効情報をRedisで共有すること
+    """
+    monkeypatch.setattr(auth.settings, "AUTH_REVOCATION_BACKEND", "auto")
+    monkeypatch.setattr(auth.settings, "AUTH_MODE", mode)
+    assert auth.revocation_backend() == expected
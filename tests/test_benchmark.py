@@ -0,0 +1,175 @@
+"""
+ベンチマーク（合成データ・負荷ドライバー・結果の比較）のテスト
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from app.core.security import get_password_hash
+from app.models.politician import Politician
+from app.models.statement import Statement
+from app.models.user import User
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from scripts.benchmark.bulk_load import bulk_load
+from scripts.benchmark.compare import compare_results
+from scripts.benchmark.dataset import DatasetGenerator, DatasetSpec
+from scripts.benchmark.driver import load_context, make_client, run_load
+
+
+def test_dataset_generator_rows_reference_earlier_rows():
+    """
+    作成した行が先に作成した行だけを参照し、フォローが人気の政治家に偏ること
+    """
+    spec = DatasetSpec(politicians=30, statements=300, users=100, seed=1)
+    generator = DatasetGenerator(
+        spec, party_ids=["p1", "p2"], topic_ids=["t1", "t2", "t3"]
+    )
+
+    politicians = list(generator.politicians())
+    users = list(generator.users())
+    statements = list(generator.statements())
+    links = list(generator.statement_topics())
+    follows = list(generator.follows())
+    reactions = list(generator.reactions())
+    comments = list(generator.comments())
+
+    assert len(politicians) == 30 and len(users) == 100 and len(statements) == 300
+    # パスワードハッシュは全員で共有する
+    assert len({u["password_hash"] for u in users}) == 1
+
+    politician_ids = {p["id"] for p in politicians}
+    user_ids = {u["id"] for u in users}
+    statement_ids = {s["id"] for s in statements}
+    assert {s["politician_id"] for s in statements} <= politician_ids
+    assert {link["statement_id"] for link in links} <= statement_ids
+    assert {f["politician_id"] for f in follows} <= politician_ids
+    assert {r["statement_id"] for r in reactions} <= statement_ids
+    assert {r["user_id"] for r in reactions} <= user_ids
+    assert len(
+        {(r["user_id"], r["statement_id"], r["reaction_type"]) for r in reactions}
+    ) == len(reactions)
+
+    comment_ids = {c["id"] for c in comments}
+    parents = Counter(c["parent_id"] for c in comments if c["parent_id"])
+    assert set(parents) <= comment_ids
+    assert dict(parents) == generator.reply_counts
+
+    followers = sorted(
+        Counter(f["politician_id"] for f in follows).values(), reverse=True
+    )
+    assert followers[0] > followers[len(followers) // 2] * 2
+
+
+def test_shards_partition_the_dataset():
+    """
+    シャードごとの行を合わせると、政治家・ユーザー・発言が重複も欠けもなく揃うこと
+    """
+    spec = DatasetSpec(politicians=10, statements=90, users=40, seed=3)
+    generators = [
+        DatasetGenerator(spec, ["p1"], ["t1"], shard=shard, shards=3, password_hash="x")
+        for shard in range(3)
+    ]
+    single = DatasetGenerator(spec, ["p1"], ["t1"], password_hash="x")
+    for name in ("politicians", "users", "statements"):
+        sharded = [row["id"] for g in generators for row in getattr(g, name)()]
+        assert sorted(sharded) == sorted(row["id"] for row in getattr(single, name)())
+
+    statement_ids = {row["id"] for row in single.statements()}
+    for g in generators:
+        assert {row["statement_id"] for row in g.comments()} <= statement_ids
+
+
+def test_bulk_load_sharded(tmp_path):
+    """
+    複数プロセスで投入した結果が外部キーを満たし、件数カラムが実際の件数と一致すること
+    """
+    url = f"sqlite:///{tmp_path / 'bulk.db'}"
+    spec = DatasetSpec(politicians=10, statements=200, users=30, seed=5)
+    report = bulk_load(url, spec, shards=2, batch_size=50, log=None)
+
+    assert report["tables"]["statements"]["rows"] == 200
+    assert report["rows"] == sum(t["rows"] for t in report["tables"].values())
+    assert report["rows_per_second"] > 0
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_key_check")).fetchall() == []
+        assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 30
+        likes, actual = conn.execute(
+            text(
+                "SELECT sum(likes_count), (SELECT count(*) FROM statement_reactions "
+                "WHERE reaction_type = 'like') FROM statements"
+            )
+        ).one()
+        assert likes == actual
+    engine.dispose()
+
+
+def test_driver_reports_throughput_latency_and_queries(client, db: Session):
+    """
+    プロセス内のアプリに負荷をかけ、シナリオごとの集計が得られること
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"bench_{suffix}@example.com",
+        username=f"bench_{suffix}",
+        password_hash=get_password_hash("password123"),
+        role="user",
+        status="active",
+        email_verified=True,
+    )
+    politician = Politician(name=f"計測太郎_{suffix}", status="active")
+    db.add_all([user, politician])
+    db.commit()
+    db.add_all(
+        Statement(
+            politician_id=politician.id,
+            title=f"計測{suffix}の発言{i}",
+            content="経済政策について",
+            statement_date=datetime(2024, 7, 1 + i),
+            status="published",
+        )
+        for i in range(3)
+    )
+    db.commit()
+
+    async def scenario():
+        async with make_client() as http:
+            context = await load_context(http, [(user.email, "password123")])
+            # テストではアプリが1つのセッションを共有するため直列に送る
+            return await run_load(
+                http, context, concurrency=1, duration=None, requests=20
+            )
+
+    result = asyncio.run(scenario())
+    overall = result["overall"]
+    assert overall["requests"] == 20
+    assert overall["errors"] == 0
+    assert overall["throughput_rps"] > 0
+    assert {"p50", "p95", "p99"} <= set(overall["latency_ms"])
+    assert overall["queries_per_request"]["mean"] > 0
+    assert set(result["scenarios"]) == {
+        "statements",
+        "statements_following",
+        "search_all",
+        "comments",
+        "like",
+    }
+
+
+def test_compare_flags_regressions():
+    """
+    しきい値を超えた悪化とエラーの増加を回帰として返すこと
+    """
+    base = {
+        "overall": {"throughput_rps": 100.0, "latency_ms": {"p95": 50.0}, "errors": 0}
+    }
+    head = {
+        "overall": {"throughput_rps": 95.0, "latency_ms": {"p95": 70.0}, "errors": 1}
+    }
+    _, regressions = compare_results(base, head, threshold=0.1)
+    assert {row["metric"] for row in regressions} == {"latency_ms.p95", "errors"}
@@ -0,0 +1,370 @@
+"""
+データ収集（スケジュール・フェッチャー・ソースごとのサブタスク）のテスト
+"""
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.models.data_collection import DataCollectionLog, DataCollectionSource
+from app.models.politician import Politician
+from app.models.statement import Statement
+from app.tasks.data_collection import collect_source
+from app.tasks.data_collection.collect import claim_due_sources
+from app.tasks.data_collection.fetcher import fetch_urls
+from app.tasks.data_collection.schedule import next_run_time
+from sqlalchemy.orm import Session
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>議事録</title>
+<item><title>予算委員会での答弁</title><link>{base}/items/1</link>
+<description>&lt;p&gt;経済政策について答弁した&lt;/p&gt;</description>
+<pubDate>Thu, 01 Aug 2024 10:00:00 +0900</pubDate></item>
+<item><title>記者会見</title><link>{base}/items/2</link>
+<description>外交政策について述べた</description></item>
+</channel></rss>"""
+
+
+class StubServer:
+    """
+    パスごとに決まった応答を返すローカルのHTTPサーバー
+
+    応答は(ステータス, Content-Type, 本文[, ヘッダー])で指定する。ヘッダーにETagがあれば
+    If-None-Matchが一致するリクエストに304を返す。
+    同時に処理中のリクエスト数の最大値と、接続元のポート（接続の数）を記録する。
+    """
+
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ports = set()
+        self.requests = []
+        self.request_headers = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.client_ports.add(self.client_address[1])
+                    stub.requests.append(self.path)
+                    stub.request_headers.append(dict(self.headers))
+                try:
+                    time.sleep(stub.delay)
+                    status, content_type, body, *rest = stub.routes.get(
+                        self.path, (404, "text/plain", "not found")
+                    )
+                    headers = rest[0] if rest else {}
+                    body = body.format(base=stub.base_url).encode("utf-8")
+                    if "ETag" in headers and (
+                        self.headers.get("If-None-Match") == headers["ETag"]
+                    ):
+                        status, body = 304, b""
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_next_run_time_follows_schedule():
+    """
+    cron形式はCeleryのタイムゾーン（Asia/Tokyo）で、秒数と空の場合は間隔として扱うこと
+    """
+    after = datetime(2026, 10, 17, 0, 0)  # 日本時間 9:00（土曜日）
+    assert next_run_time("0 9 * * *", after) == datetime(2026, 10, 18, 0, 0)
+    assert next_run_time("0 9 * * 1", after) == datetime(2026, 10, 19, 0, 0)
+    assert next_run_time("*/15 * * * *", after) == datetime(2026, 10, 17, 0, 15)
+    assert next_run_time("@hourly", after) == datetime(2026, 10, 17, 1, 0)
+    assert next_run_time("900", after) == datetime(2026, 10, 17, 0, 15)
+    assert next_run_time(None, after) == datetime(2026, 10, 17, 1, 0)
+    with pytest.raises(ValueError):
+        next_run_time("every hour", after)
+
+
+def test_claim_due_sources_once(db: Session):
+    """
+    実行時刻に達したアクティブなソースだけを確保し、次回の実行日時に進めること
+    """
+    now = datetime(2026, 10, 17, 0, 0)
+    suffix = uuid.uuid4().hex[:8]
+    due = DataCollectionSource(
+        name=f"due_{suffix}", source_type="rss", schedule="*/30 * * * *",
+        next_run_at=now - timedelta(minutes=1),
+    )
+    new = DataCollectionSource(name=f"new_{suffix}", source_type="rss")
+    later = DataCollectionSource(
+        name=f"later_{suffix}", source_type="rss", next_run_at=now + timedelta(hours=1)
+    )
+    inactive = DataCollectionSource(
+        name=f"inactive_{suffix}", source_type="rss", is_active=False
+    )
+    db.query(DataCollectionSource).delete()
+    db.add_all([due, new, later, inactive])
+    db.commit()
+
+    assert sorted(claim_due_sources(db, now)) == sorted([due.id, new.id])
+    db.expire_all()
+    assert due.next_run_at == datetime(2026, 10, 17, 0, 30)
+    assert new.next_run_at == datetime(2026, 10, 17, 1, 0)
+    # 同じ時刻にもう一度実行しても二重に確保しない
+    assert claim_due_sources(db, now) == []
+
+
+def test_fetcher_limits_concurrency_per_host_and_reuses_connections():
+    """
+    ホストごとの同時接続数を超えずに並行に取得し、接続を使い回すこと
+    """
+    routes = {f"/page/{i}": (200, "text/plain", f"page {i}") for i in range(8)}
+    routes["/error"] = (500, "text/plain", "error")
+    with StubServer(routes, delay=0.05) as server:
+        urls = [f"{server.base_url}/page/{i}" for i in range(8)]
+        results = fetch_urls(
+            urls + [f"{server.base_url}/error"], per_host_limit=2, retries=1,
+            retry_backoff=0,
+        )
+
+    assert [r.content for r in results[:8]] == [f"page {i}".encode() for i in range(8)]
+    assert all(r.ok for r in results[:8])
+    assert results[8].status_code == 500 and not results[8].ok
+    assert server.requests.count("/error") == 2
+    assert server.max_in_flight == 2
+    assert len(server.client_ports) <= 2
+
+
+def test_collect_source_registers_new_items(db: Session):
+    """
+    フィードのアイテムを発言として登録し、2回目は同じ本文を解析しないこと
+    """
+    suffix = uuid.uuid4().hex[:8]
+    politician = Politician(name=f"収集太郎_{suffix}", status="active")
+    db.add(politician)
+    db.commit()
+
+    with StubServer({
+        "/feed.xml": (200, "application/rss+xml", RSS),
+        "/missing.xml": (404, "text/plain", "not found"),
+    }) as server:
+        source = DataCollectionSource(
+            name=f"feed_{suffix}",
+            source_type="rss",
+            url=f"{server.base_url}/feed.xml",
+            config=json.dumps({
+                "politician_id": politician.id,
+                "urls": [f"{server.base_url}/missing.xml"],
+            }),
+        )
+        db.add(source)
+        db.commit()
+
+        first = collect_source(source.id)
+        second = collect_source(source.id)
+
+    assert first["status"] == "partial"
+    assert first["new_items"] == 2 and first["failed_urls"] == 1
+    # 本文が前回と同じため解析しない
+    assert second["unchanged_urls"] == 1 and second["total_items"] == 0
+
+    statements = db.query(Statement).filter(
+        Statement.politician_id == politician.id
+    ).order_by(Statement.title).all()
+    assert [s.title for s in statements] == ["予算委員会での答弁", "記者会見"]
+    assert statements[0].content == "経済政策について答弁した"
+    assert statements[0].statement_date == datetime(2024, 8, 1, 1, 0)
+    assert statements[0].source == source.name
+
+    logs = db.query(DataCollectionLog).filter(
+        DataCollectionLog.source_id == source.id
+    ).all()
+    assert len(logs) == 2
+    assert all(log.duration_ms is not None for log in logs)
+    db.refresh(source)
+    assert source.last_run_at is not None
+
+
+def _feed(base_items):
+    entries = "".join(
+        f"<item><title>{title}</title><link>{{base}}/items/{n}</link>"
+        f"<description>{content}</description><pubDate>{date}</pubDate></item>"
+        for n, title, content, date in base_items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'
+
+
+def test_collect_source_fetches_incrementally(db: Session):
+    """
+    条件付きリクエストで304を受けた本文を解析せず、変わったアイテムだけを反映し、
+    通信量とスキップした件数をJSONで収集ログに記録すること
+    """
+    suffix = uuid.uuid4().hex[:8]
+    politician = Politician(name=f"差分太郎_{suffix}", status="active")
+    db.add(politician)
+    db.commit()
+
+    routes = {
+        "/feed.xml": (200, "application/rss+xml", _feed([
+            (1, "予算委員会", "経済政策", "Thu, 01 Aug 2024 10:00:00 +0000"),
+            (2, "記者会見", "外交政策", "Fri, 02 Aug 2024 10:00:00 +0000"),
+        ]), {"ETag": '"v1"'}),
+    }
+    with StubServer(routes) as server:
+        source = DataCollectionSource(
+            name=f"incremental_{suffix}",
+            source_type="rss",
+            url=f"{server.base_url}/feed.xml",
+            config=json.dumps({"politician_id": politician.id}),
+        )
+        db.add(source)
+        db.commit()
+
+        first = collect_source(source.id)
+        second = collect_source(source.id)
+        routes["/feed.xml"] = (200, "application/rss+xml", _feed([
+            (1, "予算委員会", "経済政策（訂正）", "Thu, 01 Aug 2024 10:00:00 +0000"),
+            (2, "記者会見", "外交政策", "Fri, 02 Aug 2024 10:00:00 +0000"),
+            (3, "街頭演説", "社会保障", "Sat, 03 Aug 2024 10:00:00 +0000"),
+            (4, "古い発言", "教育改革", "Mon, 15 Jul 2024 10:00:00 +0000"),
+        ]), {"ETag": '"v2"'})
+        third = collect_source(source.id)
+
+    assert first["new_items"] == 2 and first["bytes_downloaded"] > 0
+    assert server.request_headers[1].get("If-None-Match") == '"v1"'
+    assert second["not_modified_urls"] == 1 and second["total_items"] == 0
+    assert third["new_items"] == 1
+    assert third["updated_items"] == 1
+    assert third["unchanged_items"] == 1
+    assert third["old_items"] == 1
+    assert third["skipped_items"] == 2
+
+    statements = {
+        s.title: s for s in db.query(Statement).filter(
+            Statement.politician_id == politician.id
+        )
+    }
+    assert set(statements) == {"予算委員会", "記者会見", "街頭演説"}
+    assert statements["予算委員会"].content == "経済政策（訂正）"
+    db.refresh(source)
+    assert source.last_item_at == datetime(2024, 8, 3, 10, 0)
+    assert source.last_item_id.endswith("/items/3")
+
+    logs = db.query(DataCollectionLog).filter(
+        DataCollectionLog.source_id == source.id
+    ).order_by(DataCollectionLog.started_at).all()
+    details = [json.loads(log.details) for log in logs]
+    assert details[1]["not_modified_urls"] == 1
+    assert details[1]["bytes_downloaded"] < details[0]["bytes_downloaded"]
+    assert details[2]["skipped_items"] == 2
+
+
+def test_collect_source_retries_failed_items(db: Session):
+    """
+    登録に失敗したアイテムより新しい日時にソースの最新アイテムを進めず、
+    取得状態も保存しないで、次回そのアイテムを取り込み直すこと
+    """
+    suffix = uuid.uuid4().hex[:8]
+    politician = Politician(name=f"再試行太郎_{suffix}", status="active")
+    db.add(politician)
+    db.commit()
+    # まだ登録されていない政治家の発言は登録に失敗する
+    pending_id = str(uuid.uuid4())
+
+    body = json.dumps([
+        {"url": f"https://example.com/{suffix}/1", "title": "新しい発言",
+         "content": "経済政策", "published_at": "2024-08-03T10:00:00Z",
+         "politician_id": politician.id},
+        {"url": f"https://example.com/{suffix}/2", "title": "古い発言",
+         "content": "外交政策", "published_at": "2024-08-01T10:00:00Z",
+         "politician_id": pending_id},
+    ])
+    # StubServerは本文をformatするため波括弧をエスケープする
+    body = body.replace("{", "{{").replace("}", "}}")
+    routes = {"/api": (200, "application/json", body, {"ETag": '"v1"'})}
+    with StubServer(routes) as server:
+        source = DataCollectionSource(
+            name=f"retry_{suffix}", source_type="api", url=f"{server.base_url}/api"
+        )
+        db.add(source)
+        db.commit()
+
+        first = collect_source(source.id)
+        db.refresh(source)
+        assert source.last_item_at is None
+        db.add(Politician(id=pending_id, name=f"後から太郎_{suffix}", status="active"))
+        db.commit()
+        second = collect_source(source.id)
+
+    assert first["status"] == "partial"
+    assert first["new_items"] == 1 and first["failed_items"] == 1
+    # 取得状態を保存していないため、条件付きリクエストを送らない
+    assert "If-None-Match" not in server.request_headers[1]
+    assert second["new_items"] == 1 and second["old_items"] == 0
+    assert second["failed_items"] == 0
+    assert db.query(Statement).filter(Statement.politician_id == pending_id).count() == 1
+    db.refresh(source)
+    assert source.last_item_at == datetime(2024, 8, 3, 10, 0)
+
+
+def test_collect_source_saves_fetch_state_despite_invalid_items(db: Session):
+    """
+    登録できない不正なアイテム（タイトルが無いなど）があっても取得状態を保存すること
+    """
+    suffix = uuid.uuid4().hex[:8]
+    politician = Politician(name=f"不正太郎_{suffix}", status="active")
+    db.add(politician)
+    db.commit()
+
+    routes = {
+        "/feed.xml": (200, "application/rss+xml", _feed([
+            (1, "予算委員会", "経済政策", "Thu, 01 Aug 2024 10:00:00 +0000"),
+            (2, "", "タイトルが無い", "Fri, 02 Aug 2024 10:00:00 +0000"),
+        ]), {"ETag": '"v1"'}),
+    }
+    with StubServer(routes) as server:
+        source = DataCollectionSource(
+            name=f"invalid_{suffix}",
+            source_type="rss",
+            url=f"{server.base_url}/feed.xml",
+            config=json.dumps({"politician_id": politician.id}),
+        )
+        db.add(source)
+        db.commit()
+
+        first = collect_source(source.id)
+        second = collect_source(source.id)
+
+    assert first["status"] == "partial"
+    assert first["new_items"] == 1
+    assert first["invalid_items"] == 1 and first["failed_items"] == 0
+    assert server.request_headers[1].get("If-None-Match") == '"v1"'
+    assert second["not_modified_urls"] == 1 and second["total_items"] == 0
+    db.refresh(source)
+    assert source.last_item_at == datetime(2024, 8, 1, 10, 0)
@@ -0,0 +1,85 @@
+"""
+コネクションプールの計測とレプリカへの振り分けのテスト
+"""
+import uuid
+
+import pytest
+from app.core.config import settings
+from app.db.pool import instrument_engine
+from app.db.session import RoutingSession, create_db_engine
+from app.models.topic import Topic
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+DATABASE_URL = "sqlite:///./test.db"
+
+
+def test_pool_metrics_count_checkouts_and_timeouts():
+    """
+    使用中の接続数と、空きを待ってタイムアウトした回数が記録されること
+    """
+    engine = create_db_engine(DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    metrics = instrument_engine(engine, "test")
+    try:
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+            stats = metrics.snapshot(engine.pool)
+            assert stats["in_use"] == 1
+            assert stats["checkout_timeouts"] == 1
+        stats = metrics.snapshot(engine.pool)
+        assert stats["checkouts"] == 1
+        assert stats["in_use"] == 0
+        assert stats["checked_in"] == 1
+    finally:
+        engine.dispose()
+
+
+def test_read_only_session_routes_selects_to_replica(db):
+    """
+    読み取り専用のセッションはSELECTをレプリカに送り、書き込み後はプライマリを使うこと
+    """
+    primary = create_db_engine(DATABASE_URL)
+    replica = create_db_engine(DATABASE_URL)
+    session = RoutingSession(bind=primary, replicas=[replica])
+    session.info["read_only"] = True
+    try:
+        query = select(Topic.id).limit(1)
+        assert session.get_bind(clause=query) is replica
+        session.execute(query)
+
+        suffix = uuid.uuid4().hex[:8]
+        session.add(Topic(name=f"振り分け_{suffix}", slug=f"routing-{suffix}", category="other"))
+        session.flush()
+        assert session.get_bind(clause=query) is primary
+    finally:
+        session.rollback()
+        session.close()
+        primary.dispose()
+        replica.dispose()
+
+
+def test_write_session_uses_primary():
+    """
+    読み取り専用でないセッションはレプリカを使わないこと
+    """
+    primary = create_db_engine(DATABASE_URL)
+    replica = create_db_engine(DATABASE_URL)
+    session = RoutingSession(bind=primary, replicas=[replica])
+    try:
+        assert session.get_bind(clause=select(Topic.id)) is primary
+    finally:
+        session.close()
+        primary.dispose()
+        replica.dispose()
+
+
+def test_health_db_reports_primary_pool(client: TestClient):
+    """
+    /health/dbでプライマリのプールの計測値を取得できること
+    """
+    response = client.get(f"{settings.API_V1_STR}/health/db")
+    assert response.status_code == 200
+    primary = response.json()["primary"]
+    assert {"checkouts", "checkout_wait_max_ms", "in_use", "overflow"} <= set(primary)
@@ -0,0 +1,169 @@
+"""
+エンティティキャッシュのテスト
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+from app import services
+from app.models.party import Party
+from app.models.topic import Topic
+from app.schemas.topic import TopicUpdate
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from tests.db_session import TestSessionLocal
+
+
+class DictRedis:
+    """
+    Redisの代わりに使う辞書（キャッシュが使うコマンドのみ）
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def execute(self):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def cached_topics(db: Session):
+    """
+    キャッシュを空にした上でトピックを作成するフィクスチャ
+    """
+    services.entity_cache.clear_all()
+    suffix = uuid.uuid4().hex[:8]
+    topics = [
+        Topic(name=f"キャッシュ{i}_{suffix}", slug=f"cache-{i}-{suffix}", category="other")
+        for i in range(3)
+    ]
+    db.add_all(topics)
+    db.commit()
+    yield [topic.id for topic in topics]
+    services.entity_cache.clear_all()
+
+
+def _count_queries(session: Session, func, *args, **kwargs):
+    queries = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_query)
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+    return len(queries), result
+
+
+def test_get_many_reads_through_and_hits_local_cache(cached_topics):
+    """
+    初回はまとめて1回のクエリで取得し、別のセッションでもキャッシュから返ること
+    """
+    cache = services.entity_cache.topics
+    before = cache.stats()
+
+    first = TestSessionLocal()
+    try:
+        count, topics = _count_queries(
+            first, services.topic.get_topics_by_ids, first, cached_topics + ["missing"]
+        )
+        assert count == 1
+        assert set(topics) == set(cached_topics)
+    finally:
+        first.close()
+
+    second = TestSessionLocal()
+    try:
+        count, topic = _count_queries(
+            second, services.topic.get_topic, second, cached_topics[0]
+        )
+        assert count == 0
+        assert topic.name.startswith("キャッシュ0_")
+        # セッションに関連付いているため、そのまま更新にも使える
+        assert topic in second
+    finally:
+        second.close()
+
+    after = cache.stats()
+    assert after["misses"] - before["misses"] == 4
+    assert after["local_hits"] - before["local_hits"] == 1
+
+
+def test_update_invalidates_and_slug_lookup_follows_rename(db: Session, cached_topics):
+    """
+    更新でキャッシュが破棄され、変更前のスラッグでは取得できなくなること
+    """
+    topic = services.topic.get_topic(db, cached_topics[0])
+    old_slug = topic.slug
+    assert services.topic.get_topic_by_slug(db, old_slug).id == topic.id
+
+    services.topic.update_topic(
+        db, db_obj=topic, obj_in=TopicUpdate(slug=f"{old_slug}-renamed", name=topic.name)
+    )
+
+    other = TestSessionLocal()
+    try:
+        assert services.topic.get_topic(other, topic.id).slug == f"{old_slug}-renamed"
+        assert services.topic.get_topic_by_slug(other, old_slug) is None
+        assert services.topic.get_topic_by_slug(other, f"{old_slug}-renamed").id == topic.id
+    finally:
+        other.close()
+
+
+def test_redis_tier_round_trip(db: Session, monkeypatch):
+    """
+    Redisに保存した値からプロセス内キャッシュが空でも復元できること
+    """
+    fake = DictRedis()
+    monkeypatch.setattr(services.entity_cache.settings, "ENTITY_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(services.entity_cache, "_redis_client", fake)
+
+    party = Party(
+        name=f"キャッシュ党_{uuid.uuid4().hex[:8]}",
+        status="active",
+        founded_date=datetime(2001, 2, 3, 4, 5, 6),
+    )
+    db.add(party)
+    db.commit()
+    party_id = party.id
+
+    cache = services.entity_cache.parties
+    cache.clear()
+    session = TestSessionLocal()
+    try:
+        cache.get(session, party_id)
+    finally:
+        session.close()
+    assert f"entity:party:{party_id}" in fake.data
+
+    cache.clear()
+    before = cache.stats()["redis_hits"]
+    session = TestSessionLocal()
+    try:
+        count, restored = _count_queries(session, cache.get, session, party_id)
+        assert count == 0
+        assert restored.founded_date == datetime(2001, 2, 3, 4, 5, 6)
+    finally:
+        session.close()
+    assert cache.stats()["redis_hits"] == before + 1
+
+    services.party.delete_party(db, id=party_id)
+    assert f"entity:party:{party_id}" not in fake.data
+    cache.clear()
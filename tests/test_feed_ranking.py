@@ -0,0 +1,182 @@
+"""
+パーソナライズドフィードのランキングのテスト
+"""
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from app import services
+from app.models.follows import PoliticianFollow, TopicFollow
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementTopic
+from app.models.topic import Topic
+from app.models.user import User
+from app.models.user_settings import UserSettings
+from sqlalchemy.orm import Session
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def feed_data(db: Session):
+    """
+    政治家とトピックをフォローしているユーザーと、候補になる発言を作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"feed_{suffix}@example.com",
+        username=f"feed_{suffix}",
+        password_hash="x",
+    )
+    followed = Politician(name=f"フィード太郎_{suffix}", status="active")
+    other = Politician(name=f"フィード次郎_{suffix}", status="active")
+    topic = Topic(name=f"フィード_{suffix}", slug=f"feed-{suffix}", category="economy")
+    db.add_all([user, followed, other, topic])
+    db.commit()
+
+    def statement(politician, hours, importance=0):
+        return Statement(
+            politician_id=politician.id,
+            title=f"フィード発言{hours}",
+            content="フィードのテスト",
+            statement_date=NOW - timedelta(hours=hours),
+            status="published",
+            importance=importance,
+        )
+
+    statements = {
+        "recent": statement(followed, 1),
+        "important": statement(followed, 72, importance=100),
+        "topic": statement(other, 2),
+        "unrelated": statement(other, 1),
+        "expired": statement(followed, 24 * 60),
+    }
+    db.add_all(list(statements.values()))
+    db.commit()
+
+    db.add_all([
+        PoliticianFollow(politician_id=followed.id, user_id=user.id),
+        TopicFollow(topic_id=topic.id, user_id=user.id),
+        StatementTopic(statement_id=statements["topic"].id, topic_id=topic.id, relevance=90),
+    ])
+    db.commit()
+    return user, {key: value.id for key, value in statements.items()}
+
+
+def test_parse_feed_preference_overrides_and_ignores_invalid():
+    """
+    feed_preferenceの数値のみが重みとして反映されること
+    """
+    default = services.ranking.parse_feed_preference(None)
+    assert default.recency == services.ranking.DEFAULT_FEED_WEIGHTS["recency"]
+
+    weights = services.ranking.parse_feed_preference(json.dumps({
+        "recency": 2, "importance": "high", "unknown": 1, "recency_half_life_hours": 48
+    }))
+    assert weights.recency == 2.0
+    assert weights.importance == default.importance
+    assert weights.recency_half_life_hours == 48.0
+
+    assert services.ranking.parse_feed_preference("{invalid") == default
+    assert services.ranking.parse_feed_preference("[1, 2]") == default
+
+
+def test_top_k_matches_full_sort():
+    """
+    上位k件の選択が全件ソートと同じ結果になること
+    """
+    rng = np.random.default_rng(0)
+    size = 10000
+    candidates = services.ranking.FeedCandidates(
+        ids=[str(i) for i in range(size)],
+        age_hours=rng.uniform(0, 720, size),
+        importance=rng.integers(0, 101, size).astype(float),
+        relevance=rng.integers(0, 101, size).astype(float),
+        engagement=rng.integers(0, 5000, size).astype(float),
+        from_politician=rng.integers(0, 2, size).astype(float),
+    )
+    scores = services.ranking.score_candidates(
+        candidates, services.ranking.parse_feed_preference(None)
+    )
+    assert scores.shape == (size,)
+
+    expected = np.lexsort((candidates.age_hours, -scores))[:50]
+    assert services.ranking.top_k(scores, candidates.age_hours, 50).tolist() == expected.tolist()
+    assert len(services.ranking.top_k(scores, candidates.age_hours, size + 1)) == size
+
+
+def test_rank_feed_uses_follows_and_preference(db: Session, feed_data):
+    """
+    フォロー中の政治家・トピックの発言が、ユーザーの重みに従って並ぶこと
+    """
+    user, ids = feed_data
+
+    statements, total = services.ranking.rank_feed(db, user_id=user.id, now=NOW)
+    # 期間内の候補でページが埋まらないため、期間外の古い発言も末尾に並ぶ
+    assert total == 4
+    assert [s.id for s in statements] == [
+        ids["recent"], ids["topic"], ids["important"], ids["expired"]
+    ]
+
+    statements, total = services.ranking.rank_feed(db, user_id=user.id, limit=2, now=NOW)
+    assert [s.id for s in statements] == [ids["recent"], ids["topic"]]
+    assert total == 4
+
+    # トピックの関連度のみを重視する
+    db.add(UserSettings(user_id=user.id, feed_preference=json.dumps({
+        "recency": 0, "importance": 0, "engagement": 0, "politician": 0, "relevance": 1
+    })))
+    db.commit()
+    statements, _ = services.ranking.rank_feed(db, user_id=user.id, limit=1, now=NOW)
+    assert [s.id for s in statements] == [ids["topic"]]
+
+    statements, _ = services.ranking.rank_feed(db, user_id=user.id, skip=1, limit=5, now=NOW)
+    assert ids["topic"] not in [s.id for s in statements]
+
+
+def test_rank_feed_falls_back_beyond_window(db: Session, monkeypatch):
+    """
+    フォロー中の発言が候補の期間より古いものだけでもフィードが空にならず、
+    候補の上限を超えてスクロールできること
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"feed_old_{suffix}@example.com",
+        username=f"feed_old_{suffix}",
+        password_hash="x",
+    )
+    politician = Politician(name=f"フィード三郎_{suffix}", status="active")
+    db.add_all([user, politician])
+    db.commit()
+    old = [
+        Statement(
+            politician_id=politician.id,
+            title=f"古い発言{days}",
+            content="フィードのテスト",
+            statement_date=NOW - timedelta(days=days),
+            status="published",
+            importance=0,
+        )
+        for days in (45, 90, 120)
+    ]
+    db.add_all(old)
+    db.add(PoliticianFollow(politician_id=politician.id, user_id=user.id))
+    db.commit()
+
+    statements, total = services.ranking.rank_feed(db, user_id=user.id, now=NOW)
+    assert [s.id for s in statements] == [s.id for s in old]
+    assert total == 3
+
+    # 候補の上限より先のページも取得でき、総数は候補数ではなく発言数になる
+    monkeypatch.setattr(services.ranking.settings, "FEED_CANDIDATE_LIMIT", 1)
+    statements, total = services.ranking.rank_feed(
+        db, user_id=user.id, skip=1, limit=1, now=NOW
+    )
+    assert [s.id for s in statements] == [old[1].id]
+    assert total == 3
+    statements, total = services.ranking.rank_feed(
+        db, user_id=user.id, limit=1, now=NOW
+    )
+    assert total == 3
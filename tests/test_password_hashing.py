@@ -0,0 +1,69 @@
+"""
+パスワードハッシュ計算（プロセスプール・再計算・429）のテスト
+"""
+import threading
+import uuid
+
+import pytest
+from app.core import security
+from app.core.config import settings
+from app.models.user import User
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+LOGIN_URL = f"{settings.API_V1_STR}/auth/login"
+
+
+@pytest.fixture
+def weak_hash_user(db: Session):
+    """
+    設定より低いコストのハッシュを持つユーザーを作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"rehash_{suffix}@example.com",
+        username=f"rehash_{suffix}",
+        password_hash=security._crypt_context(4).hash("password123"),
+        role="user",
+        status="active",
+        email_verified=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_login_rehashes_when_cost_changes(client: TestClient, db: Session, weak_hash_user):
+    """
+    コストの異なるハッシュはログイン時に現在の設定で再計算されること
+    """
+    assert security.password_needs_rehash(weak_hash_user.password_hash)
+
+    response = client.post(
+        LOGIN_URL, data={"username": weak_hash_user.email, "password": "password123"}
+    )
+    assert response.status_code == 200
+
+    db.refresh(weak_hash_user)
+    assert not security.password_needs_rehash(weak_hash_user.password_hash)
+    assert security.verify_password("password123", weak_hash_user.password_hash)
+
+
+def test_login_returns_429_when_hashing_is_saturated(
+    client: TestClient, weak_hash_user, monkeypatch
+):
+    """
+    ハッシュ計算の待ちが上限に達している場合は429を返すこと
+    """
+    pending = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(security, "_pending", pending)
+    pending.acquire()
+    try:
+        response = client.post(
+            LOGIN_URL, data={"username": weak_hash_user.email, "password": "password123"}
+        )
+    finally:
+        pending.release()
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
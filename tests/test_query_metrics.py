@@ -0,0 +1,108 @@
+"""
+リクエストごとのクエリ計測のテスト
+"""
+
+import logging
+import re
+
+from app.core import query_metrics
+from app.core.config import settings
+from app.core.query_metrics import (
+    RequestQueryStats,
+    redact_parameters,
+    redact_statement,
+)
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from tests.db_session import engine
+
+
+def _db_timing(response) -> int:
+    matched = re.search(
+        r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["server-timing"]
+    )
+    assert matched, response.headers["server-timing"]
+    return int(matched.group(1))
+
+
+def test_server_timing_counts_queries(client: TestClient, auth_token: str):
+    """
+    同期・非同期どちらのエンドポイントでもServer-Timingにクエリ数が入ること
+    """
+    response = client.get(f"{settings.API_V1_STR}/politicians/")
+    assert response.status_code == 200
+    assert _db_timing(response) > 0
+    assert "app;dur=" in response.headers["server-timing"]
+
+    response = client.get(
+        f"{settings.API_V1_STR}/statements/",
+        params={"limit": 2},
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 200
+    assert _db_timing(response) > 0
+
+    response = client.get(f"{settings.API_V1_STR}/health")
+    assert _db_timing(response) == 0
+
+
+def test_metrics_exposes_route_histograms(client: TestClient):
+    """
+    /metricsでルートのテンプレートごとのヒストグラムを取得できること
+    """
+    client.get(f"{settings.API_V1_STR}/politicians/")
+    client.get(f"{settings.API_V1_STR}/politicians/no-such-id")
+    client.get(f"{settings.API_V1_STR}/no-such-route/12345")
+
+    response = client.get(f"{settings.API_V1_STR}/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    route = f"{settings.API_V1_STR}/politicians/"
+    assert "# TYPE http_request_db_queries histogram" in body
+    assert f'http_request_db_queries_count{{method="GET",route="{route}"}}' in body
+    assert f'route="{route}{{id}}"' in body
+    assert 'route="unmatched"' in body
+    assert "no-such-id" not in body
+    assert "12345" not in body
+    assert 'db_pool_checkouts{engine="primary"}' in body
+
+
+def test_slowest_statements_are_kept_in_order():
+    """
+    遅い順に指定件数だけ保持されること
+    """
+    stats = RequestQueryStats(keep_slowest=2)
+    for seconds, statement in [(0.1, "a"), (0.3, "b"), (0.2, "c")]:
+        stats.record(statement, seconds)
+    assert stats.count == 3
+    assert [s for _, s in stats.slowest] == ["b", "c"]
+
+
+def test_slow_query_log_redacts_values(monkeypatch, caplog):
+    """
+    遅いSQLのログにはパラメータやリテラルの値が出ないこと
+    """
+    assert redact_statement("SELECT * FROM users WHERE email = 'a@b.c' LIMIT 10") == (
+        "SELECT * FROM users WHERE email = ? LIMIT ?"
+    )
+    assert redact_parameters(("secret@example.com", 3, None)) == [
+        "<str len=18>",
+        "<int>",
+        None,
+    ]
+
+    query_metrics.install()
+    monkeypatch.setattr(query_metrics.settings, "SLOW_QUERY_LOG_ENABLED", True)
+    monkeypatch.setattr(query_metrics.settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        with engine.connect() as connection:
+            connection.execute(
+                text("SELECT id FROM users WHERE email = :email"),
+                {"email": "secret@example.com"},
+            )
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.slow_query"]
+    assert messages
+    assert "FROM users WHERE email = ?" in messages[-1]
+    assert "secret@example.com" not in messages[-1]
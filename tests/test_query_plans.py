@@ -0,0 +1,207 @@
+"""
+一覧系クエリの実行計画とマイグレーションのテスト
+
+サービスが発行するSQLをそのままEXPLAINし、複合インデックスが使われていることを確認する。
+クエリの形が変わってインデックスが効かなくなった場合に検知するためのもの。
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from app.models.activity import Notification, UserActivity
+from app.models.comment import Comment
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementReaction
+from app.models.user import User
+from app.services import activity, comment, statement
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+
+from tests.db_session import Base
+
+COMPOSITE_INDEXES = {
+    "statements": [
+        "ix_statements_status_date_id",
+        "ix_statements_politician_status_date_id",
+    ],
+    "comments": ["ix_comments_statement_parent_status_created"],
+    "user_activities": ["ix_user_activities_user_type_target_created"],
+    "notifications": ["ix_notifications_user_read_created"],
+    "statement_reactions": ["ix_statement_reactions_user_type_created"],
+}
+
+
+@pytest.fixture
+def seeded(db: Session):
+    """
+    各テーブルに行を持つユーザー・政治家・発言を作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"plan_{suffix}@example.com",
+        username=f"plan_{suffix}",
+        password_hash="x",
+    )
+    politician = Politician(name=f"計画太郎_{suffix}", status="active")
+    db.add_all([user, politician])
+    db.flush()
+
+    now = datetime.utcnow()
+    statements = [
+        Statement(
+            politician_id=politician.id,
+            title=f"計画{suffix}の発言{i}",
+            content="内容",
+            statement_date=now - timedelta(days=i),
+        )
+        for i in range(5)
+    ]
+    db.add_all(statements)
+    db.flush()
+    for i, s in enumerate(statements):
+        db.add_all(
+            [
+                Comment(user_id=user.id, statement_id=s.id, content=f"コメント{i}"),
+                StatementReaction(
+                    statement_id=s.id, user_id=user.id, reaction_type="like"
+                ),
+                UserActivity(
+                    user_id=user.id,
+                    activity_type="view",
+                    target_type="statement",
+                    target_id=s.id,
+                ),
+                Notification(
+                    user_id=user.id,
+                    type="system",
+                    target_type="statement",
+                    target_id=s.id,
+                    message="通知",
+                    is_read=bool(i % 2),
+                ),
+            ]
+        )
+    db.commit()
+    return {"user": user, "politician": politician, "statement": statements[0]}
+
+
+def capture_selects(db: Session, func, *args, **kwargs) -> List[Tuple[str, object]]:
+    """
+    関数の実行中に発行されたSELECT文とパラメータを記録する
+    """
+    captured = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        func(db, *args, **kwargs)
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(db: Session, sql: str, parameters) -> str:
+    """
+    SQLの実行計画を文字列で返す（SQLite / MySQL）
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters)
+        return "\n".join(row[-1] for row in rows)
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}", parameters).mappings()
+    return "\n".join(f"{row['table']}: {row['key']}" for row in rows)
+
+
+def assert_uses_index(db: Session, index: str, func, *args, **kwargs) -> None:
+    plans = [
+        explain(db, sql, params)
+        for sql, params in capture_selects(db, func, *args, **kwargs)
+    ]
+    assert any(index in plan for plan in plans), "\n---\n".join(plans)
+
+
+def test_statement_lists_use_composite_indexes(db: Session, seeded):
+    """
+    公開中の発言一覧と政治家ごとの発言一覧が複合インデックスを使うこと
+    """
+    assert_uses_index(
+        db, "ix_statements_status_date_id", statement.get_statements, limit=20
+    )
+    assert_uses_index(
+        db,
+        "ix_statements_politician_status_date_id",
+        statement.get_statements_by_politician,
+        politician_id=seeded["politician"].id,
+    )
+
+
+def test_comment_list_uses_composite_index(db: Session, seeded):
+    """
+    発言ごとのコメント一覧が複合インデックスを使うこと
+    """
+    assert_uses_index(
+        db,
+        "ix_comments_statement_parent_status_created",
+        comment.get_statement_comments,
+        statement_id=seeded["statement"].id,
+    )
+
+
+def test_activity_lists_use_composite_indexes(db: Session, seeded):
+    """
+    いいね一覧・閲覧履歴・通知一覧が複合インデックスを使うこと
+    """
+    user_id = seeded["user"].id
+    assert_uses_index(
+        db,
+        "ix_statement_reactions_user_type_created",
+        activity.get_user_liked_statements,
+        user_id,
+    )
+    assert_uses_index(
+        db,
+        "ix_user_activities_user_type_target_created",
+        activity.get_user_view_history,
+        user_id,
+    )
+    assert_uses_index(
+        db,
+        "ix_notifications_user_read_created",
+        activity.get_user_notifications,
+        user_id,
+        read=False,
+    )
+
+
+def test_migrations_add_missing_indexes(tmp_path, monkeypatch):
+    """
+    create_allで作成済みのデータベースに、未作成のテーブル・インデックスだけを追加すること
+    """
+    url = f"sqlite:///{tmp_path / 'migration.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for names in COMPOSITE_INDEXES.values():
+            for name in names:
+                connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text("DROP TABLE user_timeline"))
+
+    monkeypatch.setenv("DATABASE_URL", url)
+    command.upgrade(Config("alembic.ini"), "head")
+
+    inspector = inspect(engine)
+    assert inspector.has_table("user_timeline")
+    for table, names in COMPOSITE_INDEXES.items():
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        assert set(names) <= existing
+    engine.dispose()
@@ -0,0 +1,96 @@
+"""
+HTTPレスポンスキャッシュのテスト
+"""
+import uuid
+
+import pytest
+from app import services
+from app.core import response_cache
+from app.core.config import settings
+from app.models.party import Party
+from app.schemas.party import PartyUpdate
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def cache():
+    """
+    空のプロセス内キャッシュに差し替えるフィクスチャ
+    """
+    store = response_cache.InMemoryResponseCache()
+    response_cache.set_response_cache(store)
+    yield store
+    response_cache.set_response_cache(None)
+
+
+@pytest.fixture
+def party(db: Session):
+    party = Party(name=f"キャッシュ政党_{uuid.uuid4().hex[:8]}", status="active")
+    db.add(party)
+    db.commit()
+    return party
+
+
+def test_miss_then_hit_and_conditional_get(client: TestClient, cache, party):
+    """
+    2回目はキャッシュから返り、ETagが一致する場合は304を返すこと
+    """
+    url = f"{settings.API_V1_STR}/parties/{party.id}"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.headers["Cache-Control"].startswith("public")
+
+    second = client.get(url)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    not_modified = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_query_parameters_are_normalized(client: TestClient, cache):
+    """
+    クエリパラメータの順序や空の値はキーに影響しないこと
+    """
+    url = f"{settings.API_V1_STR}/parties"
+    assert client.get(f"{url}?skip=0&limit=5").headers["X-Cache"] == "MISS"
+    assert client.get(f"{url}?limit=5&status=&skip=0").headers["X-Cache"] == "HIT"
+    assert client.get(f"{url}?limit=6&skip=0").headers["X-Cache"] == "MISS"
+
+
+def test_update_purges_tagged_responses(client: TestClient, db: Session, cache, party):
+    """
+    サービス層の更新でタグの付いたレスポンスが破棄されること
+    """
+    url = f"{settings.API_V1_STR}/parties/{party.id}"
+    client.get(url)
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+    new_name = f"{party.name}_改"
+    services.party.update_party(db, db_obj=party, obj_in=PartyUpdate(name=new_name))
+
+    response = client.get(url)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["name"] == new_name
+
+
+@pytest.mark.parametrize("workers, expected", [
+    (1, response_cache.InMemoryResponseCache),
+    (4, response_cache.RedisResponseCache),
+])
+def test_auto_backend_shares_cache_across_workers(monkeypatch, workers, expected):
+    """
+    autoの場合、複数ワーカー構成では破棄が全プロセスに届くRedisを使うこと
+    """
+    monkeypatch.setattr(response_cache.settings, "RESPONSE_CACHE_BACKEND", "auto")
+    monkeypatch.setattr(response_cache.settings, "WEB_CONCURRENCY", workers)
+    monkeypatch.setattr(response_cache.settings, "REDIS_URL", "redis://localhost:6379/0")
+    response_cache.set_response_cache(None)
+    try:
+        assert isinstance(response_cache.get_response_cache(), expected)
+    finally:
+        response_cache.set_response_cache(None)
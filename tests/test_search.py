@@ -0,0 +1,305 @@
+"""
+全文検索バックエンドのテスト
+"""
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from app import services
+from app.models.politician import Politician
+from app.schemas.statement import StatementCreate, StatementUpdate
+from app.search import (
+    InvertedIndex,
+    LikeSearchBackend,
+    MemorySearchBackend,
+    set_search_backend,
+    tokenize,
+)
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(params=["memory", "like"])
+def search_backend(request):
+    """
+    検索バックエンドを差し替えるフィクスチャ
+    """
+    if request.param == "memory":
+        backend = MemorySearchBackend(refresh_seconds=0)
+    else:
+        backend = LikeSearchBackend()
+    set_search_backend(backend)
+    yield backend
+    set_search_backend(None)
+
+
+@pytest.fixture
+def search_politician(db: Session):
+    """
+    検索対象の発言を持つ政治家を作成するフィクスチャ
+    """
+    politician = Politician(
+        name=f"検索太郎_{uuid.uuid4().hex[:8]}",
+        status="active",
+    )
+    db.add(politician)
+    db.commit()
+    return politician
+
+
+def test_tokenize_japanese_bigrams():
+    """
+    日本語はbigram、英数字は単語単位で分割されること
+    """
+    assert tokenize("消費税 TAX", for_query=True) == ["消費", "費税", "tax"]
+    # 索引側は1文字クエリにも一致するようunigramを含む
+    assert "税" in tokenize("消費税")
+    # 全角英数字は半角に正規化される
+    assert tokenize("ＡＢＣ１２３", for_query=True) == ["abc123"]
+
+
+def test_inverted_index_bm25_ranking():
+    """
+    全ての語を含む文書のみが、出現頻度の高い順に返ること
+    """
+    index = InvertedIndex()
+    index.add("a", {token: 1.0 for token in tokenize("消費税の引き上げ")})
+    index.add("b", {token: 3.0 for token in tokenize("消費税")})
+    index.add("c", {token: 1.0 for token in tokenize("消費者保護")})
+
+    results = index.search("消費税")
+    assert [doc_id for doc_id, _ in results] == ["b", "a"]
+
+    index.remove("b")
+    assert [doc_id for doc_id, _ in index.search("消費税")] == ["a"]
+    assert index.search("存在しない語") == []
+
+
+def test_search_statements_follows_writes(db: Session, search_backend, search_politician):
+    """
+    発言の作成・更新・削除が検索結果に反映されること
+    """
+    keyword = f"量子暗号{uuid.uuid4().hex[:6]}"
+    statement = services.statement.create_statement(db, StatementCreate(
+        politician_id=search_politician.id,
+        title=f"{keyword}について",
+        content="研究開発を推進します",
+        statement_date=datetime(2024, 3, 1),
+    ))
+
+    result = services.search.search_statements(db, query=keyword)
+    assert [s.id for s in result["statements"]] == [statement.id]
+    assert result["total"] == 1
+
+    services.statement.update_statement(
+        db, db_obj=statement, obj_in=StatementUpdate(title="別の話題")
+    )
+    assert services.search.search_statements(db, query=keyword)["total"] == 0
+
+    services.statement.delete_statement(db, id=statement.id)
+    result = services.search.search_statements(db, query="別の話題", limit=100)
+    assert statement.id not in [s.id for s in result["statements"]]
+
+
+def test_search_politicians_by_name(db: Session, search_backend, search_politician):
+    """
+    政治家名の一部で検索できること
+    """
+    suffix = search_politician.name.split("_")[1]
+    result = services.search.search_politicians(db, query=suffix)
+    assert [p.id for p in result["politicians"]] == [search_politician.id]
+
+
+def test_search_all_types_and_timeout(db: Session, search_backend, search_politician, monkeypatch):
+    """
+    typesで検索対象を絞り込め、遅いエンティティはタイムアウトして部分結果が返ること
+    """
+    suffix = search_politician.name.split("_")[1]
+
+    result = services.search.search_all(db, query=suffix, types=["politicians"])
+    assert result["types"] == ["politicians"]
+    assert [p.id for p in result["politicians"]] == [search_politician.id]
+    assert result["total_statements"] is None
+    assert result["statements"] == []
+
+    def slow_search_topics(db, **kwargs):
+        time.sleep(0.5)
+        return {"topics": [], "total": 0, "next_cursor": None}
+
+    monkeypatch.setattr(services.search, "search_topics", slow_search_topics)
+    result = services.search.search_all(
+        db, query=suffix, types=["politicians,topics"], timeout=0.1
+    )
+    assert result["timed_out"] == ["topics"]
+    assert result["total_topics"] is None
+    assert result["total_politicians"] == 1
+
+
+def test_search_query_interrupted_at_deadline(db: Session):
+    """
+    期限を過ぎたクエリがデータベース側で中断されること
+    """
+    def slow_query(db, **kwargs):
+        db.execute(text(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+            "WHERE x < 1000000000) SELECT count(*) FROM c"
+        )).scalar()
+        return {"total": 0}
+
+    started = time.monotonic()
+    with pytest.raises(OperationalError) as exc_info:
+        services.search._run_in_session(db.get_bind(), slow_query, started + 0.1)
+    assert services.search.is_interrupted(exc_info.value)
+    assert time.monotonic() - started < 2
+
+
+def test_search_all_bounds_pending_searches(db: Session, search_politician, monkeypatch):
+    """
+    実行待ちの検索が上限に達している場合は投入せずタイムアウト扱いにすること
+    """
+    monkeypatch.setattr(services.search, "_slots", threading.BoundedSemaphore(1))
+    suffix = search_politician.name.split("_")[1]
+    result = services.search.search_all(
+        db, query=suffix, types=["politicians,topics"], timeout=1
+    )
+    assert result["total_politicians"] == 1
+    assert result["timed_out"] == ["topics"]
+    # 完了した検索の枠は解放される
+    assert services.search._slots.acquire(timeout=1)
+
+
+def test_parse_search_types_rejects_unknown():
+    """
+    未対応の検索対象はエラーになること
+    """
+    assert services.search.parse_search_types(None) == ["statements", "politicians", "topics"]
+    with pytest.raises(ValueError):
+        services.search.parse_search_types(["users"])
+
+
+def test_memory_search_fills_filtered_page_beyond_candidates(db: Session, search_politician):
+    """
+    関連度の高い候補がフィルタで除かれても次の候補に広げてページを埋め、
+    正確な件数を返すこと
+    """
+    backend = MemorySearchBackend(refresh_seconds=0, max_candidates=1)
+    set_search_backend(backend)
+    try:
+        keyword = f"宇宙開発{uuid.uuid4().hex[:6]}"
+        for year, title in [
+            (2023, f"{keyword} {keyword} {keyword}"),
+            (2023, f"{keyword} {keyword} {keyword}"),
+            (2024, f"{keyword}について"),
+            (2024, f"{keyword}の予算"),
+        ]:
+            services.statement.create_statement(db, StatementCreate(
+                politician_id=search_politician.id,
+                title=title,
+                content="方針を説明しました",
+                statement_date=datetime(year, 5, 1),
+            ))
+
+        result = services.search.search_statements(
+            db, query=keyword, limit=1, filter_date_start="2024-01-01"
+        )
+        assert len(result["statements"]) == 1
+        assert result["statements"][0].statement_date.year == 2024
+        assert result["total"] == 2
+        assert result["next_cursor"] is not None
+    finally:
+        set_search_backend(None)
+
+
+def test_memory_search_counts_in_one_query_and_matches_list(db: Session, search_politician):
+    """
+    残りの候補の件数を1回のCOUNTで数え、発言一覧のキーワード検索も
+    SEARCH_MAX_CANDIDATES件を超えた一致を落とさず同じ件数を返すこと
+    """
+    backend = MemorySearchBackend(refresh_seconds=0, max_candidates=2)
+    set_search_backend(backend)
+    try:
+        keyword = f"再生医療{uuid.uuid4().hex[:6]}"
+        for i in range(7):
+            services.statement.create_statement(db, StatementCreate(
+                politician_id=search_politician.id,
+                title=f"{keyword}の推進{i}",
+                content="方針を説明しました",
+                statement_date=datetime(2024, 5, 1 + i),
+            ))
+
+        counts = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "count(" in statement.lower():
+                counts.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            result = services.search.search_statements(db, query=keyword, limit=1)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert result["total"] == 7
+        assert len(counts) == 1
+
+        page = services.statement.list_statements(db, search=keyword, limit=10)
+        assert page["total"] == 7
+        assert len(page["statements"]) == 7
+    finally:
+        set_search_backend(None)
+
+
+def test_memory_index_rebuilds_in_background(db: Session, search_politician):
+    """
+    期限切れの索引は検索を待たせずにバックグラウンドで作り直し、
+    作り直し中の更新も新しい索引に残ること
+    """
+    backend = MemorySearchBackend(refresh_seconds=3600)
+    set_search_backend(backend)
+    try:
+        keyword = f"核融合{uuid.uuid4().hex[:6]}"
+        first = services.statement.create_statement(db, StatementCreate(
+            politician_id=search_politician.id,
+            title=f"{keyword}の研究",
+            content="研究を支援します",
+            statement_date=datetime(2024, 6, 1),
+        ))
+        assert services.search.search_statements(db, query=keyword)["total"] == 1
+        old_index = backend._indexes["statement"]
+
+        # 作り直しの途中（データベースの読み出し後）に発言が追加された状態を再現する
+        second = services.statement.create_statement(db, StatementCreate(
+            politician_id=search_politician.id,
+            title=f"{keyword}の実用化",
+            content="実証実験を進めます",
+            statement_date=datetime(2024, 6, 2),
+        ))
+        documents = backend._documents
+
+        def documents_without_second(db, entity):
+            for doc_id, terms in documents(db, entity):
+                if doc_id != second.id:
+                    yield doc_id, terms
+
+        backend._documents = documents_without_second
+        backend._pending["statement"] = []
+        backend.index_document("statement", second)
+        backend.build(db, "statement")
+        backend._documents = documents
+
+        assert backend._indexes["statement"] is not old_index
+        result = services.search.search_statements(db, query=keyword)
+        assert {s.id for s in result["statements"]} == {first.id, second.id}
+
+        # 期限切れの場合は現在の索引で答え、作り直しは別スレッドで行う
+        backend._built_at["statement"] = 0
+        current = backend._indexes["statement"]
+        assert services.search.search_statements(db, query=keyword)["total"] == 2
+        assert backend.wait_for_rebuild("statement")
+        assert backend._indexes["statement"] is not current
+        assert services.search.search_statements(db, query=keyword)["total"] == 2
+    finally:
+        set_search_backend(None)
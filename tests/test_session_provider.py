@@ -0,0 +1,55 @@
+"""
+セッションプロバイダーのテスト
+"""
+from types import SimpleNamespace
+
+from app.db.provider import PooledSessionProvider, SharedSessionProvider
+
+from tests.db_session import TestSessionLocal
+
+
+class RecordingFactory:
+    """
+    作成したセッションを記録するセッションファクトリ
+    """
+
+    def __init__(self):
+        self.sessions = []
+
+    def __call__(self):
+        session = TestSessionLocal()
+        self.sessions.append(session)
+        return session
+
+
+def test_pooled_provider_marks_reads_and_closes():
+    """
+    リクエストごとに新しいセッションを作り、GETは読み取り専用にして終了時にクローズすること
+    """
+    factory = RecordingFactory()
+    provider = PooledSessionProvider(factory)
+
+    for method, read_only in [("GET", True), ("POST", False)]:
+        request = SimpleNamespace(method=method)
+        generator = provider(request)
+        session = next(generator)
+        assert session.info["read_only"] is read_only
+        generator.close()
+
+    assert len(factory.sessions) == 2
+    assert factory.sessions[0] is not factory.sessions[1]
+
+
+def test_shared_provider_reuses_one_session():
+    """
+    全てのリクエストで同じセッションを使い、作成は最初の1回だけであること
+    """
+    factory = RecordingFactory()
+    provider = SharedSessionProvider(factory)
+    request = SimpleNamespace(method="GET")
+
+    first = next(provider(request))
+    second = next(provider(request))
+    assert first is second
+    assert len(factory.sessions) == 1
+    first.close()
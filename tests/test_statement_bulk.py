@@ -0,0 +1,154 @@
+"""
+発言の一括作成（POST /statements/bulk）のテスト
+"""
+import json
+import uuid
+
+import pytest
+from app.api.v1.endpoints import statements as statements_endpoint
+from app.core.config import settings
+from app.models.follows import PoliticianFollow
+from app.models.party import Party
+from app.models.party_topic_stat import PartyTopicStat
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementTopic
+from app.models.timeline import UserTimeline
+from app.models.topic import Topic
+from app.models.user import User
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+BULK_URL = f"{settings.API_V1_STR}/statements/bulk"
+
+
+@pytest.fixture
+def bulk_data(db: Session, auth_token: str):
+    """
+    政党に所属する政治家・トピックと、その政治家をフォローする管理者を用意するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    party = Party(name=f"一括党_{suffix}", status="active")
+    topic = Topic(name=f"一括_{suffix}", slug=f"bulk-{suffix}", category="other")
+    db.add_all([party, topic])
+    db.commit()
+    politician = Politician(
+        name=f"一括太郎_{suffix}", status="active", current_party_id=party.id
+    )
+    db.add(politician)
+    db.commit()
+    admin = db.query(User).filter(User.email == "test_auth@example.com").one()
+    db.add(PoliticianFollow(politician_id=politician.id, user_id=admin.id))
+    db.commit()
+    return {
+        "politician_id": politician.id,
+        "party_id": party.id,
+        "topic_id": topic.id,
+        "user_id": admin.id,
+        "headers": {
+            "Authorization": f"Bearer {auth_token}",
+            "Content-Type": "application/x-ndjson",
+        },
+    }
+
+
+def _line(politician_id: str, title: str, topic_ids=None) -> str:
+    return json.dumps({
+        "politician_id": politician_id,
+        "title": title,
+        "content": f"{title}の内容",
+        "statement_date": "2024-08-01T10:00:00",
+        "topic_ids": topic_ids,
+    }, ensure_ascii=False)
+
+
+def _post(client: TestClient, body: str, headers):
+    response = client.post(BULK_URL, content=body.encode("utf-8"), headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_bulk_create_reports_each_line(
+    client: TestClient, db: Session, bulk_data, monkeypatch
+):
+    """
+    行ごとの結果が入力の順に返り、正しい行だけが作成・展開・集計されること
+    """
+    monkeypatch.setattr(statements_endpoint.settings, "STATEMENT_BULK_CHUNK_SIZE", 2)
+    politician_id = bulk_data["politician_id"]
+    topic_id = bulk_data["topic_id"]
+    body = "\n".join([
+        _line(politician_id, "一括1", [topic_id]),
+        _line("no-such-politician", "一括2"),
+        "",
+        "{broken json",
+        _line(politician_id, "一括3", [topic_id, "no-such-topic"]),
+        _line(politician_id, "一括4", [topic_id, topic_id]),
+        _line(politician_id, "一括5"),
+    ])
+    results = _post(client, body, bulk_data["headers"])
+
+    assert [r["line"] for r in results] == [1, 2, 4, 5, 6, 7]
+    assert [r["status"] for r in results] == [
+        "created", "error", "error", "error", "created", "created"
+    ]
+    assert results[1]["error"] == "政治家が見つかりません"
+    assert results[3]["error"] == "トピックが見つかりません: no-such-topic"
+
+    created = [r["id"] for r in results if r["status"] == "created"]
+    db.expire_all()
+    titles = db.query(Statement.title).filter(Statement.id.in_(created)).all()
+    assert sorted(t for t, in titles) == ["一括1", "一括4", "一括5"]
+    assert db.query(StatementTopic).filter(
+        StatementTopic.statement_id.in_(created)
+    ).count() == 2
+    assert db.query(UserTimeline).filter(
+        UserTimeline.user_id == bulk_data["user_id"],
+        UserTimeline.statement_id.in_(created),
+    ).count() == 3
+    stat = db.query(PartyTopicStat).filter(
+        PartyTopicStat.party_id == bulk_data["party_id"],
+        PartyTopicStat.topic_id == topic_id,
+    ).one()
+    assert stat.statement_count == 2
+
+
+def test_bulk_create_checks_ids_once_per_chunk(client: TestClient, db: Session, bulk_data):
+    """
+    政治家・トピックの存在確認が件数によらずチャンクごとに1回であること
+    """
+    politician_id = bulk_data["politician_id"]
+    body = "\n".join(
+        _line(politician_id, f"集合確認{i}", [bulk_data["topic_id"]]) for i in range(20)
+    )
+    lookups = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and (
+            "FROM politicians" in statement or "FROM topics" in statement
+        ):
+            lookups.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        results = _post(client, body, bulk_data["headers"])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert all(r["status"] == "created" for r in results)
+    # 存在確認の問い合わせ（タイムラインの有名政治家の判定は除く）
+    id_checks = [
+        s for s in lookups
+        if "IN (" in s and "GROUP BY" not in s and "fan_out_on_read" not in s
+    ]
+    assert len(id_checks) == 2
+
+
+def test_bulk_create_requires_superuser(client: TestClient, db: Session):
+    """
+    管理者以外は一括作成できないこと
+    """
+    response = client.post(BULK_URL, content=b"{}\n")
+    assert response.status_code == 401
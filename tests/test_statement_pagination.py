@@ -0,0 +1,134 @@
+"""
+発言一覧のキーセットページネーションのテスト
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from app import services
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models.politician import Politician
+from app.models.statement import Statement
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def paged_politician(db: Session):
+    """
+    同日時の発言を含む7件の発言を持つ政治家を作成するフィクスチャ
+    """
+    politician = Politician(
+        name=f"ページング太郎_{uuid.uuid4().hex[:8]}",
+        status="active",
+    )
+    db.add(politician)
+    db.commit()
+
+    base_date = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(7):
+        # 3件ずつ同じ日時にして、ID順のタイブレークを確認する
+        db.add(Statement(
+            politician_id=politician.id,
+            title=f"ページング発言{i}",
+            content="ページングのテスト",
+            statement_date=base_date - timedelta(days=i // 3),
+            status="published",
+            importance=0,
+        ))
+    db.commit()
+    return politician
+
+
+def test_cursor_round_trip():
+    """
+    カーソルのエンコードとデコードが往復できること
+    """
+    date = datetime(2024, 5, 1, 9, 30)
+    cursor = encode_cursor("date_desc", date, "abc")
+    assert decode_cursor(cursor, "date_desc") == (date, "abc")
+
+    cursor = encode_cursor("likes", 12, "xyz")
+    assert decode_cursor(cursor, "likes") == (12, "xyz")
+
+
+def test_cursor_rejects_invalid_values():
+    """
+    壊れたカーソルやソート順の異なるカーソルは拒否されること
+    """
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", "date_desc")
+
+    cursor = encode_cursor("date_asc", datetime(2024, 1, 1), "abc")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "date_desc")
+
+
+@pytest.mark.parametrize("sort", ["date_desc", "date_asc", "likes"])
+def test_keyset_pages_match_offset_order(db: Session, paged_politician, sort):
+    """
+    カーソルで辿った結果がOFFSETで一括取得した結果と一致すること
+    """
+    expected = services.statement.get_statements_by_politician(
+        db, politician_id=paged_politician.id, limit=100, sort=sort
+    )
+    assert len(expected) == 7
+
+    collected = []
+    cursor = None
+    while True:
+        page = services.statement.get_statements_by_politician(
+            db, politician_id=paged_politician.id, limit=3, sort=sort,
+            cursor=cursor
+        )
+        collected.extend(page)
+        cursor = services.statement.get_next_cursor(db, page, 3, sort)
+        if cursor is None:
+            break
+
+    assert [s.id for s in collected] == [s.id for s in expected]
+
+
+def test_split_page_detects_next_page():
+    """
+    limit+1件取得した結果から次ページの有無を判定できること
+    """
+    page, has_more = services.statement.split_page([1, 2, 3, 4], 3)
+    assert page == [1, 2, 3]
+    assert has_more is True
+
+    page, has_more = services.statement.split_page([1, 2], 3)
+    assert page == [1, 2]
+    assert has_more is False
+
+
+def test_resolve_total_modes(db: Session, paged_politician):
+    """
+    count_modeに応じて総件数の取得方法が切り替わること
+    """
+    calls = []
+
+    def count_fn(db, politician_id):
+        calls.append(politician_id)
+        return services.statement.count_statements_by_politician(
+            db, politician_id=politician_id
+        )
+
+    services.statement.invalidate_statement_counts()
+    assert services.statement.resolve_total(
+        db, "none", count_fn, politician_id=paged_politician.id
+    ) is None
+    assert calls == []
+
+    for _ in range(2):
+        total = services.statement.resolve_total(
+            db, "cached", count_fn, politician_id=paged_politician.id
+        )
+        assert total == 7
+    assert len(calls) == 1
+
+    # 書き込み時にキャッシュが破棄されること
+    services.statement.invalidate_statement_counts()
+    services.statement.resolve_total(
+        db, "cached", count_fn, politician_id=paged_politician.id
+    )
+    assert len(calls) == 2
@@ -0,0 +1,247 @@
+"""
+発言リアクションの一括取得のテスト
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+from app import services
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementReaction
+from app.models.user import User
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def reaction_data(db: Session):
+    """
+    ユーザーと、リアクションの有無が混在する発言を作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"reaction_{suffix}@example.com",
+        username=f"reaction_{suffix}",
+        password_hash="x",
+    )
+    politician = Politician(name=f"リアクション太郎_{suffix}", status="active")
+    db.add_all([user, politician])
+    db.commit()
+
+    statements = [
+        Statement(
+            politician_id=politician.id,
+            title=f"リアクション発言{i}",
+            content="リアクションのテスト",
+            statement_date=datetime(2024, 2, 1),
+            status="published",
+            importance=0,
+        )
+        for i in range(3)
+    ]
+    db.add_all(statements)
+    db.commit()
+
+    db.add_all([
+        StatementReaction(statement_id=statements[0].id, user_id=user.id, reaction_type="like"),
+        StatementReaction(statement_id=statements[0].id, user_id=user.id, reaction_type="important"),
+        StatementReaction(statement_id=statements[1].id, user_id=user.id, reaction_type="agree"),
+    ])
+    db.commit()
+    return user, statements
+
+
+def test_apply_user_reactions_uses_single_query(db: Session, reaction_data):
+    """
+    1ページ分のリアクションが1回のクエリで設定されること
+    """
+    user, statements = reaction_data
+    # コミット後に期限切れになった属性を先に読み込んでおく
+    user_id = user.id
+    for statement in statements:
+        db.refresh(statement)
+    queries = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count_query)
+    try:
+        services.statement.apply_user_reactions(db, statements, user_id=user_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+
+    assert len(queries) == 1
+    assert statements[0].user_reactions == ["important", "like"]
+    assert statements[0].is_liked is True
+    assert statements[1].user_reactions == ["agree"]
+    assert statements[1].is_liked is False
+    assert statements[2].user_reactions == []
+
+
+def test_liked_statements_include_reactions(db: Session, reaction_data):
+    """
+    いいねした発言一覧にも全てのリアクション種別が設定されること
+    """
+    user, statements = reaction_data
+    result = services.activity.get_user_liked_statements(db, user_id=user.id)
+    assert result["total"] == 1
+    assert [s.id for s in result["statements"]] == [statements[0].id]
+    assert result["statements"][0].user_reactions == ["important", "like"]
+
+
+def test_reaction_counters_follow_add_and_remove(db: Session, reaction_data):
+    """
+    リアクションの追加・削除でカウンタが加減算され、0未満にならないこと
+    """
+    user, statements = reaction_data
+    statement_id = statements[2].id
+
+    reaction = services.statement.add_statement_reaction(
+        db, statement_id=statement_id, user_id=user.id, reaction_type="like"
+    )
+    assert services.statement.get_statement_likes_count(db, statement_id=statement_id) == 1
+
+    services.statement.remove_statement_reaction(db, reaction=reaction)
+    assert services.statement.get_statement_likes_count(db, statement_id=statement_id) == 0
+
+    services.statement.adjust_statement_counter(
+        db, statement_id=statement_id, column="likes_count", delta=-1
+    )
+    db.commit()
+    assert services.statement.get_statement_likes_count(db, statement_id=statement_id) == 0
+
+
+def test_reconcile_statement_counters_repairs_drift(db: Session, reaction_data):
+    """
+    カウンタを経由せずに作成されたリアクションが補正タスクで反映されること
+    """
+    user, statements = reaction_data
+    services.statement.reconcile_statement_counters(db, batch_size=2)
+
+    db.expire_all()
+    assert statements[0].likes_count == 1
+    assert statements[0].important_count == 1
+    assert statements[1].agrees_count == 1
+    assert statements[2].likes_count == 0
+
+    # 補正済みであれば再実行しても更新されない
+    assert services.statement.reconcile_statement_counters(db) == 0
+
+
+@pytest.fixture
+def memory_buffer():
+    """
+    プロセス内のリアクションバッファを有効にするフィクスチャ
+    """
+    buffer = services.reaction_buffer.InMemoryReactionBuffer()
+    services.reaction_buffer.set_reaction_buffer(buffer)
+    yield buffer
+    services.reaction_buffer.set_reaction_buffer(None)
+
+
+def test_reaction_buffer_is_idempotent_and_flushes(db: Session, reaction_data, memory_buffer):
+    """
+    バッファ経由のいいねが冪等に扱われ、反映後に永続化されること
+    """
+    user, statements = reaction_data
+    services.statement.reconcile_statement_counters(db)
+    liked_id, fresh_id = statements[0].id, statements[2].id
+
+    # 既にいいね済みの発言への追加は何も変えない
+    assert not services.reaction_buffer.buffer_reaction(
+        db, statement_id=liked_id, user_id=user.id, add=True
+    )
+    # 新規のいいねは2回目以降は無視される
+    for expected in (True, False):
+        assert services.reaction_buffer.buffer_reaction(
+            db, statement_id=fresh_id, user_id=user.id, add=True
+        ) is expected
+    assert services.reaction_buffer.get_reaction_count(db, statement_id=fresh_id) == 1
+
+    # いいね解除もバッファ上で件数に反映される
+    services.reaction_buffer.buffer_reaction(
+        db, statement_id=liked_id, user_id=user.id, add=False
+    )
+    assert services.reaction_buffer.get_reaction_count(db, statement_id=liked_id) == 0
+
+    services.statement.apply_user_reactions(db, statements, user_id=user.id)
+    assert statements[0].user_reactions == ["important"]
+    assert statements[2].is_liked is True
+
+    stats = services.reaction_buffer.flush_reaction_buffer(db)
+    assert stats == {"entries": 2, "inserted": 1, "deleted": 1}
+    assert services.statement.get_statement_likes_count(db, statement_id=fresh_id) == 1
+    assert services.statement.get_statement_likes_count(db, statement_id=liked_id) == 0
+    assert services.reaction_buffer.get_reaction_count(db, statement_id=fresh_id) == 1
+    assert services.reaction_buffer.flush_reaction_buffer(db)["entries"] == 0
+
+
+def test_reaction_buffer_cancels_round_trip(db: Session, reaction_data, memory_buffer):
+    """
+    いいねして解除した場合は何も反映されないこと
+    """
+    user, statements = reaction_data
+    for add in (True, False):
+        services.reaction_buffer.buffer_reaction(
+            db, statement_id=statements[2].id, user_id=user.id, add=add
+        )
+    assert services.reaction_buffer.get_reaction_count(db, statement_id=statements[2].id) == 0
+    assert memory_buffer.drain() == []
+
+
+def test_reaction_buffer_overlapping_flushes_apply_once(
+    db: Session, reaction_data, memory_buffer, monkeypatch
+):
+    """
+    反映が重なっても行とカウンタが二重に更新されないこと
+    """
+    user, statements = reaction_data
+    services.statement.reconcile_statement_counters(db)
+    fresh_id = statements[2].id
+    services.reaction_buffer.buffer_reaction(
+        db, statement_id=fresh_id, user_id=user.id, add=True
+    )
+
+    # 1つ目の反映の途中で2つ目の反映が始まった場合、2つ目は何もしない
+    flush_chunk = services.reaction_buffer._flush_chunk
+    overlapped = []
+
+    def flush_chunk_with_overlap(db, entries):
+        overlapped.append(services.reaction_buffer.flush_reaction_buffer(db))
+        return flush_chunk(db, entries)
+
+    monkeypatch.setattr(
+        services.reaction_buffer, "_flush_chunk", flush_chunk_with_overlap
+    )
+    stats = services.reaction_buffer.flush_reaction_buffer(db)
+    monkeypatch.setattr(services.reaction_buffer, "_flush_chunk", flush_chunk)
+    assert overlapped == [{"entries": 0, "inserted": 0, "deleted": 0}]
+    assert stats == {"entries": 1, "inserted": 1, "deleted": 0}
+
+    # ロックの期限切れなどで同じエントリが再び反映されても何も変わらない
+    entry = services.reaction_buffer.PendingReaction(
+        fresh_id, user.id, "like", add=True, persisted=False
+    )
+    for _ in range(2):
+        result = flush_chunk(db, [entry])
+        db.commit()
+        assert result == {"inserted": 0, "deleted": 0}
+
+    # 既存の行の確認をすり抜けた重複のINSERTは一意制約で無視される
+    db.execute(services.reaction_buffer._insert_ignore(db), [{
+        "id": str(uuid.uuid4()),
+        "statement_id": fresh_id,
+        "user_id": user.id,
+        "reaction_type": "like",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }])
+    db.commit()
+
+    assert db.query(StatementReaction).filter(
+        StatementReaction.statement_id == fresh_id
+    ).count() == 1
+    assert services.statement.get_statement_likes_count(db, statement_id=fresh_id) == 1
+    assert services.reaction_buffer.get_reaction_count(db, statement_id=fresh_id) == 1
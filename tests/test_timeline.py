@@ -0,0 +1,176 @@
+"""
+ホームタイムライン（fan-out-on-write）のテスト
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from app import services
+from app.models.follows import PoliticianFollow
+from app.models.politician import Politician
+from app.models.timeline import UserTimeline
+from app.models.user import User
+from app.schemas.statement import StatementCreate, StatementUpdate
+from sqlalchemy.orm import Session
+
+
+def _create_statement(db: Session, politician_id: str, days: int, status: str = "published"):
+    return services.statement.create_statement(db, StatementCreate(
+        politician_id=politician_id,
+        title=f"タイムライン発言{days}",
+        content="タイムラインのテスト",
+        statement_date=datetime(2024, 4, 1) + timedelta(days=days),
+        status=status,
+    ))
+
+
+@pytest.fixture
+def timeline_data(db: Session, monkeypatch):
+    """
+    通常の政治家と有名政治家を1人ずつフォローしているユーザーを作成するフィクスチャ
+    """
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"timeline_{suffix}@example.com",
+        username=f"timeline_{suffix}",
+        password_hash="x",
+    )
+    other = User(
+        email=f"timeline_other_{suffix}@example.com",
+        username=f"timeline_other_{suffix}",
+        password_hash="x",
+    )
+    regular = Politician(name=f"一般太郎_{suffix}", status="active")
+    celebrity = Politician(name=f"有名花子_{suffix}", status="active")
+    db.add_all([user, other, regular, celebrity])
+    db.commit()
+
+    db.add_all([
+        PoliticianFollow(politician_id=regular.id, user_id=user.id),
+        PoliticianFollow(politician_id=celebrity.id, user_id=user.id),
+        PoliticianFollow(politician_id=celebrity.id, user_id=other.id),
+    ])
+    db.commit()
+
+    # フォロワー2人以上を有名政治家として扱う
+    monkeypatch.setattr(services.timeline.settings, "HOME_TIMELINE_CELEBRITY_FOLLOWERS", 2)
+    assert services.timeline.update_celebrity_status(db, celebrity.id) is True
+    db.commit()
+    return user, regular, celebrity
+
+
+def test_fan_out_on_write_and_read_merge(db: Session, timeline_data):
+    """
+    通常の政治家の発言は展開され、有名政治家の発言は読み出し時にマージされること
+    """
+    user, regular, celebrity = timeline_data
+    regular_old = _create_statement(db, regular.id, 0)
+    celebrity_mid = _create_statement(db, celebrity.id, 1)
+    regular_new = _create_statement(db, regular.id, 2)
+    _create_statement(db, regular.id, 3, status="draft")
+
+    rows = db.query(UserTimeline.statement_id).filter(UserTimeline.user_id == user.id).all()
+    assert {row[0] for row in rows} == {regular_old.id, regular_new.id}
+
+    expected = [regular_new.id, celebrity_mid.id, regular_old.id]
+    timeline = services.timeline.get_timeline(db, user_id=user.id, limit=10)
+    assert [s.id for s in timeline] == expected
+    assert services.timeline.count_timeline(db, user_id=user.id) == 3
+
+    # カーソルで辿っても同じ順序になること
+    collected = []
+    cursor = None
+    while True:
+        page = services.timeline.get_timeline(db, user_id=user.id, limit=2, cursor=cursor)
+        collected.extend(page)
+        cursor = services.statement.get_next_cursor(db, page, 2, "date_desc")
+        if cursor is None:
+            break
+    assert [s.id for s in collected] == expected
+
+    # 非公開にした発言はタイムラインから消えること
+    services.statement.update_statement(
+        db, db_obj=regular_new, obj_in=StatementUpdate(status="archived")
+    )
+    timeline = services.timeline.get_timeline(db, user_id=user.id, limit=10)
+    assert [s.id for s in timeline] == [celebrity_mid.id, regular_old.id]
+
+
+def test_follow_changes_update_timeline(db: Session, timeline_data):
+    """
+    フォロー解除で発言が取り除かれ、再フォローで取り込まれること
+    """
+    user, regular, _ = timeline_data
+    statement = _create_statement(db, regular.id, 0)
+
+    services.timeline.on_politician_unfollowed(db, user_id=user.id, politician_id=regular.id)
+    assert services.timeline.get_timeline(
+        db, user_id=user.id, politician_ids=[], limit=10
+    ) == []
+
+    services.timeline.on_politician_followed(db, user_id=user.id, politician_id=regular.id)
+    timeline = services.timeline.get_timeline(db, user_id=user.id, limit=10)
+    assert statement.id in [s.id for s in timeline]
+
+    assert services.timeline.rebuild_user_timeline(db, user_id=user.id) == 1
+
+
+def test_unfollow_below_threshold_backfills_followers(db: Session, timeline_data):
+    """
+    フォロー解除でしきい値を下回った政治家は、有名政治家だった間の発言を
+    残りのフォロワーのタイムラインへ取り込み、以降は書き込み時に展開すること
+    """
+    user, _, celebrity = timeline_data
+    other_id = db.query(PoliticianFollow.user_id).filter(
+        PoliticianFollow.politician_id == celebrity.id,
+        PoliticianFollow.user_id != user.id,
+    ).scalar()
+    during = _create_statement(db, celebrity.id, 0)
+    assert db.query(UserTimeline).filter(UserTimeline.statement_id == during.id).count() == 0
+
+    db.query(PoliticianFollow).filter(
+        PoliticianFollow.politician_id == celebrity.id,
+        PoliticianFollow.user_id == other_id,
+    ).delete()
+    db.commit()
+    services.timeline.on_politician_unfollowed(
+        db, user_id=other_id, politician_id=celebrity.id
+    )
+
+    db.refresh(celebrity)
+    assert celebrity.fan_out_on_read is False
+    assert services.timeline.get_celebrity_ids(db, [celebrity.id]) == set()
+    rows = db.query(UserTimeline.user_id).filter(UserTimeline.statement_id == during.id).all()
+    assert rows == [(user.id,)]
+    timeline = services.timeline.get_timeline(db, user_id=user.id, limit=10)
+    assert during.id in [s.id for s in timeline]
+
+    after = _create_statement(db, celebrity.id, 1)
+    rows = db.query(UserTimeline.user_id).filter(UserTimeline.statement_id == after.id).all()
+    assert rows == [(user.id,)]
+
+
+def test_politician_change_moves_statement_between_timelines(db: Session, timeline_data):
+    """
+    発言の政治家を変更すると、変更前のフォロワーから取り除かれ変更後のフォロワーに展開されること
+    """
+    user, regular, celebrity = timeline_data
+    other_id = db.query(PoliticianFollow.user_id).filter(
+        PoliticianFollow.politician_id == celebrity.id,
+        PoliticianFollow.user_id != user.id,
+    ).scalar()
+    moved_to = Politician(name=f"移籍次郎_{uuid.uuid4().hex[:8]}", status="active")
+    db.add(moved_to)
+    db.commit()
+    db.add(PoliticianFollow(politician_id=moved_to.id, user_id=other_id))
+    db.commit()
+
+    statement = _create_statement(db, regular.id, 0)
+    services.statement.update_statement(
+        db, db_obj=statement, obj_in=StatementUpdate(politician_id=moved_to.id)
+    )
+
+    rows = db.query(UserTimeline.user_id, UserTimeline.politician_id).filter(
+        UserTimeline.statement_id == statement.id
+    ).all()
+    assert rows == [(other_id, moved_to.id)]
@@ -0,0 +1,166 @@
+"""
+トピック別スタンス集計のテスト
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from app import services
+from app.models.party import Party
+from app.models.politician import Politician
+from app.models.statement import Statement, StatementTopic
+from app.models.topic import Topic
+from app.schemas.statement import StatementCreate
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def _create_topics(db: Session, politician: Politician, topic_count: int, per_topic: int):
+    """
+    トピックごとにper_topic件の発言を作成する
+    """
+    suffix = uuid.uuid4().hex[:8]
+    topics = [
+        Topic(name=f"スタンス{i}_{suffix}", slug=f"stance-{i}-{suffix}", category="other")
+        for i in range(topic_count)
+    ]
+    db.add_all(topics)
+    db.commit()
+
+    links = []
+    for topic in topics:
+        for i in range(per_topic):
+            statement = Statement(
+                politician_id=politician.id,
+                title=f"{topic.name}の発言{i}",
+                content="スタンスのテスト",
+                statement_date=datetime(2024, 5, 1) + timedelta(days=i),
+                status="published",
+            )
+            db.add(statement)
+            db.flush()
+            links.append(StatementTopic(statement_id=statement.id, topic_id=topic.id))
+    db.add_all(links)
+    db.commit()
+    return topics
+
+
+def _count_queries(db: Session, func, **kwargs):
+    """
+    関数の実行中に発行されたクエリ数と戻り値を返す
+    """
+    queries = []
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count_query)
+    try:
+        result = func(db, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+    return len(queries), result
+
+
+@pytest.mark.parametrize("topic_count", [2, 12])
+def test_politician_topics_use_constant_queries(db: Session, topic_count):
+    """
+    トピック数に関わらず2回のクエリで集計されること
+    """
+    politician = Politician(name=f"スタンス太郎_{uuid.uuid4().hex[:8]}", status="active")
+    db.add(politician)
+    db.commit()
+    politician_id = politician.id
+    _create_topics(db, politician, topic_count, per_topic=7)
+
+    count, result = _count_queries(
+        db, services.statement.get_politician_statement_topics, politician_id=politician_id
+    )
+    assert count == 2
+    assert len(result) == topic_count
+    for topic in result:
+        assert topic["count"] == 7
+        assert topic["last_updated"] == datetime(2024, 5, 7).isoformat()
+        assert len(topic["latest_statement_ids"]) == services.statement.TOPIC_STANCE_LATEST_LIMIT
+
+
+def test_party_topics_read_from_stats_table(db: Session):
+    """
+    政党の集計は再構築済みの集計表から1回のクエリで返ること
+    """
+    suffix = uuid.uuid4().hex[:8]
+    party = Party(name=f"スタンス党_{suffix}", status="active")
+    db.add(party)
+    db.commit()
+    politicians = [
+        Politician(name=f"スタンス党員{i}_{suffix}", status="active", current_party_id=party.id)
+        for i in range(3)
+    ]
+    db.add_all(politicians)
+    db.commit()
+    party_id = party.id
+    topics = _create_topics(db, politicians[0], 3, per_topic=2)
+    for politician in politicians[1:]:
+        _create_topics(db, politician, 3, per_topic=2)
+    topic_id = topics[0].id
+
+    services.party_topic_stats.rebuild_party_topic_stats(db)
+
+    count, result = _count_queries(
+        db, services.statement.get_party_statement_topics, party_id=party_id
+    )
+    assert count == 1
+    assert len(result) == 9
+    assert all(topic["manifesto_url"] is None for topic in result)
+    assert all(len(topic["latest_statement_ids"]) == 2 for topic in result)
+
+    count, result = _count_queries(
+        db, services.statement.get_topic_party_stances, topic_id=topic_id
+    )
+    assert count == 1
+    assert [(p["party_id"], p["count"]) for p in result] == [(party_id, 2)]
+
+
+def test_party_topic_stats_follow_statement_and_membership_changes(db: Session):
+    """
+    発言の作成・削除と政治家の移籍で集計表が差分更新されること
+    """
+    suffix = uuid.uuid4().hex[:8]
+    party = Party(name=f"差分党_{suffix}", status="active")
+    other_party = Party(name=f"移籍先党_{suffix}", status="active")
+    topic = Topic(name=f"差分_{suffix}", slug=f"diff-{suffix}", category="other")
+    db.add_all([party, other_party, topic])
+    db.commit()
+    politician = Politician(
+        name=f"差分太郎_{suffix}", status="active", current_party_id=party.id
+    )
+    db.add(politician)
+    db.commit()
+
+    statements = [
+        services.statement.create_statement(db, StatementCreate(
+            politician_id=politician.id,
+            title=f"差分発言{i}",
+            content="差分更新のテスト",
+            statement_date=datetime(2024, 5, 1) + timedelta(days=i),
+            topic_ids=[topic.id],
+        ))
+        for i in range(2)
+    ]
+
+    result = services.statement.get_topic_party_stances(db, topic_id=topic.id)
+    assert [(p["party_id"], p["count"]) for p in result] == [(party.id, 2)]
+    assert result[0]["latest_statement_ids"] == [statements[1].id, statements[0].id]
+    assert result[0]["last_updated"] == datetime(2024, 5, 2).isoformat()
+
+    services.statement.delete_statement(db, id=statements[1].id)
+    result = services.statement.get_topic_party_stances(db, topic_id=topic.id)
+    assert [(p["party_id"], p["count"]) for p in result] == [(party.id, 1)]
+
+    services.politician.update_politician(
+        db, db_obj=politician, obj_in={"current_party_id": other_party.id}
+    )
+    result = services.statement.get_topic_party_stances(db, topic_id=topic.id)
+    assert [(p["party_id"], p["count"]) for p in result] == [(other_party.id, 1)]
+    assert services.statement.get_party_statement_topics(db, party_id=party.id) == []